@@ -3,7 +3,8 @@ from .diffusion import LinearDiffuser
 from .fire_generator import FireGenerator
 from .detachment_ltd_erosion import DetachmentLtdErosion, DepthSlopeProductErosion
 from .flexure import Flexure
-from .flow_routing import FlowRouter, DepressionFinderAndRouter
+from .flow_routing import (FlowRouter, DepressionFinderAndRouter,
+                           PriorityFloodDepressionFinder)
 from .nonlinear_diffusion import PerronNLDiffuse
 from .flow_director import FlowDirectorD8
 from .flow_director import FlowDirectorSteepest
@@ -39,6 +40,7 @@ from .lithology import Lithology, LithoLayers
 
 COMPONENTS = [ChiFinder, LinearDiffuser,
               Flexure, FlowRouter, DepressionFinderAndRouter,
+              PriorityFloodDepressionFinder,
               PerronNLDiffuse, OverlandFlowBates, OverlandFlow,
               KinwaveImplicitOverlandFlow,
               PotentialEvapotranspiration, PotentialityFlowRouter,
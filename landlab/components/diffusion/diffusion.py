@@ -1,7 +1,8 @@
 #! /usr/env/python
 """
 
-Component that models 2D diffusion using an explicit finite-volume method.
+Component that models 2D diffusion using an explicit or implicit finite-volume
+method.
 
 Created July 2013 GT
 Last updated March 2016 DEJH with LL v1.0 component style
@@ -15,7 +16,7 @@ from inspect import getmro
 
 from landlab import ModelParameterDictionary, Component, FieldError, \
     create_and_initialize_grid, FIXED_GRADIENT_BOUNDARY, FIXED_LINK, \
-    RasterModelGrid, INACTIVE_LINK
+    RasterModelGrid, INACTIVE_LINK, CORE_NODE
 from landlab.core.model_parameter_dictionary import MissingKeyError
 from landlab.utils.decorators import use_file_name_or_kwds
 
@@ -130,7 +131,7 @@ class LinearDiffuser(Component):
 
     @use_file_name_or_kwds
     def __init__(self, grid, linear_diffusivity=None, method='simple',
-                 deposit=True, **kwds):
+                 deposit=True, solver='explicit', **kwds):
         """
         Parameters
         ----------
@@ -166,10 +167,28 @@ class LinearDiffuser(Component):
             fluvial detachment-limited incision with linear diffusion, the channels
             will not reach the predicted analytical solution unless deposit is set
             to False.
+        solver : {'explicit', 'implicit'}
+            How to step forward in time. 'explicit' divides each time step
+            into sub-steps that are short enough to be stable. 'implicit'
+            takes each time step in a single backward Euler step, solving a
+            sparse system of equations for the new values. The system is
+            factorized once, and the factorization reused for as long as the
+            time step, diffusivities, and boundary conditions do not change.
+            'implicit' is only available with the 'simple' method, and with
+            deposit=True.
         """
         self._grid = grid
         self._bc_set_code = self.grid.bc_set_code
         assert method in ('simple', 'resolve_on_patches', 'on_diagonals')
+        if solver not in ('explicit', 'implicit'):
+            raise ValueError('{solver}: solver not understood'.format(
+                solver=solver))
+        if solver == 'implicit' and (method != 'simple' or not deposit):
+            raise ValueError("the implicit solver requires method='simple' "
+                             "and deposit=True")
+        self._implicit = solver == 'implicit'
+        self._implicit_system = None
+        self._implicit_lu = None
         if method == 'resolve_on_patches':
             assert isinstance(self.grid, RasterModelGrid)
             self._use_patches = True
@@ -372,6 +391,9 @@ class LinearDiffuser(Component):
         if self._use_diags:
             self.g.fill(0.)
 
+        self._implicit_system = None
+        self._implicit_lu = None
+
         if self._kd_on_links or self._use_patches:
             mg = self.grid
             x_link_patch_pres = mg.patches_present_at_link[self._hoz]
@@ -410,6 +432,10 @@ class LinearDiffuser(Component):
             self.updated_boundary_conditions()
             self._bc_set_code = self.grid.bc_set_code
 
+        if self._implicit:
+            self._diffuse_implicit(dt)
+            return self.grid
+
         core_nodes = self.grid.node_at_core_cell
         # do mapping of array kd here, in case it points at an updating
         # field:
@@ -558,6 +584,121 @@ class LinearDiffuser(Component):
 
         return self.grid
 
+    def _kd_at_link(self):
+        """Diffusivity at every link."""
+        if type(self._kd) is np.ndarray:
+            if self._kd_on_links:
+                return self._kd
+            else:
+                return self.grid.map_max_of_link_nodes_to_link(self._kd)
+        else:
+            return np.full(self.grid.number_of_links, self._kd, dtype=float)
+
+    def _setup_implicit_system(self):
+        """Find the terms of the implicit system for the current BCs.
+
+        Each active link adds a flux term to the rate of change of each
+        core node at its ends, proportional to the difference between the
+        values at its two ends. A term is stored as the core node
+        (a row of the system), the link, and either the core node at
+        the other end (a column) or, if the other end is not a core node,
+        the value that it contributes. Fixed gradient nodes are replaced
+        by their anchor (if it is a core node) plus their fixed offset.
+        """
+        grid = self.grid
+        core_nodes = grid.node_at_core_cell
+        column_at_node = np.full(grid.number_of_nodes, -1, dtype=int)
+        column_at_node[core_nodes] = np.arange(len(core_nodes))
+
+        links = grid.active_links
+        node = np.concatenate((grid.node_at_link_tail[links],
+                               grid.node_at_link_head[links]))
+        other = np.concatenate((grid.node_at_link_head[links],
+                                grid.node_at_link_tail[links]))
+        links = np.concatenate((links, links))
+
+        is_row = grid.status_at_node[node] == CORE_NODE
+        (node, other, links) = (node[is_row], other[is_row], links[is_row])
+
+        offset = np.zeros(len(other), dtype=float)
+        anchor_at_node = np.arange(grid.number_of_nodes)
+        anchor_at_node[self.fixed_grad_nodes] = self.fixed_grad_anchors
+        offset_at_node = np.zeros(grid.number_of_nodes, dtype=float)
+        offset_at_node[self.fixed_grad_nodes] = self.fixed_grad_offsets
+        is_anchored = column_at_node[anchor_at_node[other]] >= 0
+        offset[is_anchored] = offset_at_node[other[is_anchored]]
+        other[is_anchored] = anchor_at_node[other[is_anchored]]
+
+        # The flux through a face, per unit diffusivity and difference in
+        # value, divided by the area of the cell. On a raster this is
+        # dy / dx / (dx * dy) for horizontal links and dx / dy / (dx * dy)
+        # for vertical ones, which is 1 / length ** 2. (A raster's
+        # width_of_face does not give these widths when dx != dy.)
+        if isinstance(grid, RasterModelGrid):
+            scale = 1. / grid.length_of_link[links] ** 2
+        else:
+            scale = (grid.width_of_face[grid.face_at_link[links]] /
+                     grid.length_of_link[links] /
+                     grid.area_of_cell[grid.cell_at_node[node]])
+
+        self._implicit_system = {
+            'row': column_at_node[node],
+            'column': column_at_node[other],
+            'other': other,
+            'offset': offset,
+            'link': links,
+            'scale': scale,
+            'n_rows': len(core_nodes),
+        }
+        self._implicit_lu = None
+
+    def _diffuse_implicit(self, dt):
+        """Diffuse for a time *dt* with a single backward Euler step."""
+        from scipy.sparse import coo_matrix, identity
+        from scipy.sparse.linalg import splu
+
+        if self._implicit_system is None:
+            self._setup_implicit_system()
+        system = self._implicit_system
+
+        grid = self.grid
+        z = grid.at_node[self.values_to_diffuse]
+        core_nodes = grid.node_at_core_cell
+        kd_links = self._kd_at_link()
+
+        coef = kd_links[system['link']] * system['scale']
+
+        (row, column) = (system['row'], system['column'])
+        is_core = column >= 0
+        n_rows = system['n_rows']
+
+        if (self._implicit_lu is None or self._implicit_lu[0] != dt or
+                not np.array_equal(self._implicit_lu[1], coef)):
+            rows = np.concatenate((row, row[is_core]))
+            cols = np.concatenate((row, column[is_core]))
+            values = np.concatenate((coef, - coef[is_core])) * dt
+            matrix = (identity(n_rows, format='csc') +
+                      coo_matrix((values, (rows, cols)),
+                                 shape=(n_rows, n_rows)).tocsc())
+            self._implicit_lu = (dt, coef.copy(), splu(matrix))
+        lu = self._implicit_lu[2]
+
+        known = np.where(is_core, system['offset'], z[system['other']])
+        rhs = z[core_nodes] + dt * np.bincount(
+            row, weights=coef * known, minlength=n_rows)
+
+        z_new = lu.solve(rhs)
+        self.dqsds[core_nodes] = (z[core_nodes] - z_new) / dt
+        z[core_nodes] = z_new
+        z[self.fixed_grad_nodes] = (z[self.fixed_grad_anchors] +
+                                    self.fixed_grad_offsets)
+
+        active_links = grid.active_links
+        self.g[active_links] = grid.calc_grad_at_link(z)[active_links]
+        self.qs[active_links] = (- kd_links[active_links] *
+                                 self.g[active_links])
+        self.dt = dt
+
     def run_one_step(self, dt, **kwds):
         """Run the diffuser for one timestep, dt.
 
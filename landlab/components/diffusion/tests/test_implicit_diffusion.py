@@ -0,0 +1,177 @@
+"""Test the implicit solver of the diffuser component."""
+import numpy as np
+import pytest
+from numpy.testing import assert_array_almost_equal
+
+from landlab import RasterModelGrid, CLOSED_BOUNDARY, FIXED_GRADIENT_BOUNDARY
+from landlab.components.diffusion import LinearDiffuser
+
+
+def _grid_with_bump(shape=(9, 12), spacing=10.):
+    grid = RasterModelGrid(shape, spacing)
+    z = grid.add_zeros('node', 'topographic__elevation')
+    z[grid.core_nodes] = np.random.rand(len(grid.core_nodes))
+    return grid
+
+
+@pytest.mark.parametrize('kd', ['scalar', 'node', 'link'])
+def test_small_steps_match_explicit(kd):
+    diffusivity = {
+        'scalar': 1.,
+        'node': np.random.uniform(.5, 1.5, 9 * 12),
+        'link': np.random.uniform(.5, 1.5, 8 * 12 + 9 * 11),
+    }[kd]
+
+    grid = _grid_with_bump()
+    expected = grid.at_node['topographic__elevation'].copy()
+    explicit = LinearDiffuser(grid, linear_diffusivity=diffusivity)
+    implicit = LinearDiffuser(grid, linear_diffusivity=diffusivity,
+                              solver='implicit')
+
+    z = grid.at_node['topographic__elevation']
+    actual = z.copy()
+    for _ in range(100):
+        z[:] = expected
+        explicit.run_one_step(.1)
+        expected[:] = z
+
+        z[:] = actual
+        implicit.run_one_step(.1)
+        actual[:] = z
+
+    assert_array_almost_equal(actual, expected, decimal=3)
+
+
+def test_non_square_raster():
+    grid = RasterModelGrid((21, 31), spacing=(1., 3.))
+    (length_x, length_y) = (30 * grid.dx, 20 * grid.dy)
+    z = grid.add_field('node', 'topographic__elevation',
+                       np.sin(np.pi * grid.x_of_node / length_x) *
+                       np.sin(np.pi * grid.y_of_node / length_y))
+    initial = z.copy()
+
+    (kd, dt) = (0.1, 0.5)
+    eigenvalue = kd * (
+        (2. / grid.dx * np.sin(np.pi * grid.dx / (2. * length_x))) ** 2 +
+        (2. / grid.dy * np.sin(np.pi * grid.dy / (2. * length_y))) ** 2)
+    decay = 1. / (1. + dt * eigenvalue)
+
+    diffuser = LinearDiffuser(grid, linear_diffusivity=kd, solver='implicit')
+    for step in range(1, 4):
+        diffuser.run_one_step(dt)
+        assert_array_almost_equal(z, initial * decay ** step, decimal=12)
+
+
+def test_non_square_raster_matches_explicit():
+    grid = _grid_with_bump(spacing=(10., 25.))
+    expected = grid.at_node['topographic__elevation'].copy()
+    explicit = LinearDiffuser(grid, linear_diffusivity=1.)
+    implicit = LinearDiffuser(grid, linear_diffusivity=1., solver='implicit')
+
+    z = grid.at_node['topographic__elevation']
+    actual = z.copy()
+    for _ in range(100):
+        z[:] = expected
+        explicit.run_one_step(.1)
+        expected[:] = z
+
+        z[:] = actual
+        implicit.run_one_step(.1)
+        actual[:] = z
+
+    assert_array_almost_equal(actual, expected, decimal=3)
+
+
+def test_mass_conserved_with_long_step():
+    grid = _grid_with_bump()
+    grid.set_closed_boundaries_at_grid_edges(True, True, True, True)
+    z = grid.at_node['topographic__elevation']
+    total = z[grid.core_nodes].sum()
+
+    diffuser = LinearDiffuser(grid, linear_diffusivity=1., solver='implicit')
+    diffuser.run_one_step(1e9)
+
+    assert z[grid.core_nodes].sum() == pytest.approx(total)
+    assert np.allclose(z[grid.core_nodes], total / len(grid.core_nodes))
+
+
+def test_steady_state():
+    grid = RasterModelGrid((3, 21), 10.)
+    grid.set_closed_boundaries_at_grid_edges(False, True, False, True)
+    z = grid.add_zeros('node', 'topographic__elevation')
+    diffuser = LinearDiffuser(grid, linear_diffusivity=2., solver='implicit')
+
+    for _ in range(100):
+        z[grid.core_nodes] += 1e-3 * 1e4
+        diffuser.run_one_step(1e4)
+
+    x = grid.x_of_node[grid.core_nodes]
+    assert_array_almost_equal(
+        z[grid.core_nodes], 1e-3 / (2. * 2.) * x * (200. - x))
+
+
+def test_fixed_gradient_boundaries():
+    grid = _grid_with_bump()
+    z = grid.at_node['topographic__elevation']
+    grid.at_link['topographic__slope'] = grid.calc_grad_at_link(z)
+    grid.set_fixed_link_boundaries_at_grid_edges(True, True, True, True)
+
+    diffuser = LinearDiffuser(grid, linear_diffusivity=1., solver='implicit')
+    diffuser.run_one_step(1e3)
+
+    assert np.allclose(
+        z[diffuser.fixed_grad_nodes],
+        z[diffuser.fixed_grad_anchors] + diffuser.fixed_grad_offsets)
+
+
+def test_fixed_gradient_nodes_match_explicit():
+    grid = _grid_with_bump()
+    grid.status_at_node[grid.nodes_at_right_edge[1:-1]] = (
+        FIXED_GRADIENT_BOUNDARY)
+    z = grid.at_node['topographic__elevation']
+    z[grid.nodes_at_right_edge] = np.random.rand(9)
+    expected = z.copy()
+    explicit = LinearDiffuser(grid, linear_diffusivity=1.)
+    implicit = LinearDiffuser(grid, linear_diffusivity=1., solver='implicit')
+
+    actual = z.copy()
+    for _ in range(100):
+        z[:] = expected
+        explicit.run_one_step(.1)
+        expected[:] = z
+
+        z[:] = actual
+        implicit.run_one_step(.1)
+        actual[:] = z
+
+    assert_array_almost_equal(actual, expected, decimal=3)
+
+
+def test_factorization_reused():
+    grid = _grid_with_bump()
+    diffuser = LinearDiffuser(grid, linear_diffusivity=1., solver='implicit')
+
+    diffuser.run_one_step(10.)
+    lu = diffuser._implicit_lu
+    diffuser.run_one_step(10.)
+    assert diffuser._implicit_lu is lu
+
+    diffuser.run_one_step(20.)
+    assert diffuser._implicit_lu is not lu
+
+    lu = diffuser._implicit_lu
+    grid.status_at_node[grid.core_nodes[0]] = CLOSED_BOUNDARY
+    diffuser.run_one_step(20.)
+    assert diffuser._implicit_lu is not lu
+    assert diffuser._implicit_system['n_rows'] == len(grid.core_nodes)
+
+
+@pytest.mark.parametrize('kwds', [
+    dict(solver='not-a-solver'),
+    dict(solver='implicit', method='on_diagonals'),
+    dict(solver='implicit', deposit=False),
+])
+def test_bad_solver(kwds):
+    grid = _grid_with_bump()
+    with pytest.raises(ValueError):
+        LinearDiffuser(grid, linear_diffusivity=1., **kwds)
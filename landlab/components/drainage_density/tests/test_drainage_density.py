@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 from landlab import RasterModelGrid
@@ -14,3 +15,19 @@ def test_route_to_multiple_error_raised():
 
     with pytest.raises(NotImplementedError):
         DrainageDensity(mg, channel__mask=channel__mask)
+
+
+def test_int32_ids():
+    """Grids with 32-bit ids give the same drainage density."""
+    densities = []
+    for index_dtype in (int, np.int32):
+        mg = RasterModelGrid((10, 12), index_dtype=index_dtype)
+        mg.add_field('node', 'topographic__elevation',
+                     mg.x_of_node + mg.y_of_node +
+                     np.random.RandomState(0).rand(mg.number_of_nodes))
+        FlowAccumulator(mg, flow_director='D8').run_one_step()
+        channel__mask = (mg.at_node['drainage_area'] > 5).astype(np.uint8)
+        dd = DrainageDensity(mg, channel__mask=channel__mask)
+        densities.append(dd.calc_drainage_density())
+
+    assert densities[1] == densities[0]
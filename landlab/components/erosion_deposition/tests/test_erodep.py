@@ -176,3 +176,22 @@ def test_can_run_with_hex():
     s28 = sa_factor * (a28 ** -0.5)
     testing.assert_equal(np.round(s[18], 3), np.round(s18, 3))
     testing.assert_equal(np.round(s[28], 3), np.round(s28, 3))
+
+
+def test_int32_ids():
+    """Grids with 32-bit ids give the same elevations."""
+    elevations = []
+    for index_dtype in (int, np.int32):
+        mg = RasterModelGrid((10, 12), index_dtype=index_dtype)
+        z = mg.add_field('node', 'topographic__elevation',
+                         mg.x_of_node + mg.y_of_node +
+                         np.random.RandomState(0).rand(mg.number_of_nodes))
+        fa = FlowAccumulator(mg, flow_director='D8')
+        ed = ErosionDeposition(mg, K=0.01, phi=0., v_s=1., m_sp=0.5,
+                               n_sp=1.)
+        for _ in range(3):
+            fa.run_one_step()
+            ed.run_one_step(1.)
+        elevations.append(z)
+
+    testing.assert_array_equal(elevations[1], elevations[0])
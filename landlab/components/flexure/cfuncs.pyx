@@ -1,20 +1,21 @@
-from multiprocessing import Pool
-
 import numpy as np
 cimport numpy as np
 cimport cython
 
 from libc.math cimport fabs
-from libc.stdlib cimport abs
 
 
 _RHO_MANTLE = 3300.
 _GRAVITY = 9.81
 
+_LOAD_THRESHOLD = 1e-6
+
 
 DTYPE = np.double
 ctypedef np.double_t DTYPE_t
 
+ctypedef np.int_t ITYPE_t
+
 
 @cython.boundscheck(False)
 def subside_parallel_row(np.ndarray[DTYPE_t, ndim=1] w,
@@ -29,43 +30,105 @@ def subside_parallel_row(np.ndarray[DTYPE_t, ndim=1] w,
   cdef int j
 
   for i in range(ncols):
-    if fabs(load[i]) > 1e-6:
+    if fabs(load[i]) > _LOAD_THRESHOLD:
       c = load[i] * inv_c
       for j in range(ncols):
         w[j] += - c * r[abs(j - i)]
 
 
-def subside_grid(np.ndarray[DTYPE_t, ndim=2] w,
-                 np.ndarray[DTYPE_t, ndim=2] load,
-                 np.ndarray[DTYPE_t, ndim=2] r,
-                 DTYPE_t alpha, DTYPE_t gamma_mantle):
-  cdef int nrows = w.shape[0]
-  cdef int i
-  cdef int j
+def find_loads(np.ndarray[DTYPE_t, ndim=2] load):
+  """Find the loads that are not negligible.
 
-  for i in range(nrows):
-    for j in range(nrows):
-      subside_parallel_row(w[j], load[i], r[abs(j - i)], alpha, gamma_mantle)
+  Returns
+  -------
+  (ndarray of int, ndarray of int, ndarray of float)
+      Row, column, and value of each load.
+  """
+  (rows, cols) = np.nonzero(np.abs(load) > _LOAD_THRESHOLD)
+  return (rows.astype(np.int), cols.astype(np.int),
+          np.ascontiguousarray(load[rows, cols]))
 
 
-def subside_grid_strip(np.ndarray[DTYPE_t, ndim=2] load,
-                       np.ndarray[DTYPE_t, ndim=2] r,
-                       DTYPE_t alpha, DTYPE_t gamma_mantle, strip_range):
-  (start, stop) = strip_range
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void _subside_rows(DTYPE_t [:, :] w,
+                        ITYPE_t [:] load_row,
+                        ITYPE_t [:] load_col,
+                        DTYPE_t [:] load_value,
+                        DTYPE_t [:, :] r,
+                        double inv_c,
+                        long start, long stop) nogil:
+  """Add deflections due to point loads to rows *start* to *stop*."""
+  cdef long ncols = w.shape[1]
+  cdef long n_loads = load_value.shape[0]
+  cdef long row
+  cdef long col
+  cdef long k
+  cdef long dr
+  cdef long dc
+  cdef double c
 
-  cdef np.ndarray w = np.zeros((stop - start, load.shape[1]), dtype=DTYPE)
-  cdef i
+  for row in range(start, stop):
+    for k in range(n_loads):
+      c = load_value[k] * inv_c
+      dr = row - load_row[k]
+      if dr < 0:
+        dr = - dr
+      for col in range(ncols):
+        dc = col - load_col[k]
+        if dc < 0:
+          dc = - dc
+        w[row, col] -= c * r[dr, dc]
 
-  for i in range(load.shape[0]):
-    for j in range(start, stop):
-      subside_parallel_row(w[j - start], load[i], r[abs(j - i)], alpha,
-                           gamma_mantle)
 
-  return w, strip_range
+def subside_rows(np.ndarray[DTYPE_t, ndim=2] w, loads,
+                 np.ndarray[DTYPE_t, ndim=2] r,
+                 DTYPE_t alpha, DTYPE_t gamma_mantle, row_range):
+  """Add deflections due to point loads to a range of rows.
+
+  Parameters
+  ----------
+  w : ndarray of float
+      Deflections to add to.
+  loads : tuple of ndarray
+      Row, column, and value of each load (see :func:`find_loads`).
+  r : ndarray of float
+      Kei function at row and column distances from a load.
+  alpha : float
+      Flexure parameter.
+  gamma_mantle : float
+      Specific weight of the mantle.
+  row_range : tuple of int
+      Start and stop rows of *w* to add deflections to.
+  """
+  cdef DTYPE_t [:, :] w_view = w
+  cdef DTYPE_t [:, :] r_view = r
+  cdef ITYPE_t [:] load_row = loads[0]
+  cdef ITYPE_t [:] load_col = loads[1]
+  cdef DTYPE_t [:] load_value = loads[2]
+  cdef double inv_c = 1. / (2. * np.pi * gamma_mantle * alpha ** 2.)
+  cdef long start = row_range[0]
+  cdef long stop = row_range[1]
+
+  with nogil:
+    _subside_rows(w_view, load_row, load_col, load_value, r_view, inv_c,
+                  start, stop)
+
+
+def subside_grid(np.ndarray[DTYPE_t, ndim=2] w,
+                 np.ndarray[DTYPE_t, ndim=2] load,
+                 np.ndarray[DTYPE_t, ndim=2] r,
+                 DTYPE_t alpha, DTYPE_t gamma_mantle):
+  subside_rows(w, find_loads(load), r, alpha, gamma_mantle,
+               (0, w.shape[0]))
+
+
+def _subside_rows_helper(args):
+  return subside_rows(*args)
 
 
 def tile_grid_into_strips(grid, n_strips):
-    rows_per_strip = grid.shape[0] // n_strips
+    rows_per_strip = max(grid.shape[0] // n_strips, 1)
 
     starts = np.arange(0, grid.shape[0], rows_per_strip)
     stops = starts + rows_per_strip
@@ -74,24 +137,25 @@ def tile_grid_into_strips(grid, n_strips):
     return zip(starts, stops)
 
 
-def _subside_grid_strip_helper(args):
-  return subside_grid_strip(*args)
-
-
 def subside_grid_in_parallel(np.ndarray[DTYPE_t, ndim=2] w,
                              np.ndarray[DTYPE_t, ndim=2] load,
                              np.ndarray[DTYPE_t, ndim=2] r,
-                             DTYPE_t alpha, DTYPE_t gamma_mantle, n_procs):
-    if n_procs == 1:
-        return subside_grid(w, load, r, alpha, gamma_mantle)
+                             DTYPE_t alpha, DTYPE_t gamma_mantle, n_procs,
+                             pool=None):
+    """Add deflections due to loads at grid nodes.
 
-    strips = tile_grid_into_strips(w, n_procs)
+    Only nodes with loads contribute, so the time taken is proportional
+    to the number of loaded nodes. Strips of rows are deflected on
+    separate threads of *pool*, which are free to run at the same time.
+    """
+    loads = find_loads(load)
+
+    if n_procs == 1 or pool is None:
+        return subside_rows(w, loads, r, alpha, gamma_mantle,
+                            (0, w.shape[0]))
 
-    args = [(load, r, alpha, gamma_mantle, strip) for strip in strips]
+    strips = tile_grid_into_strips(w, n_procs)
 
-    pool = Pool(processes=n_procs)
+    args = [(w, loads, r, alpha, gamma_mantle, strip) for strip in strips]
 
-    results = pool.map(_subside_grid_strip_helper, args)
-    for dz, strip in results:
-        start, stop = strip
-        w[start:stop] += dz
+    pool.map(_subside_rows_helper, args)
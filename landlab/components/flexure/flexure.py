@@ -59,10 +59,13 @@ array([ 0., 0., 0., 0.,
 import numpy as np
 
 from landlab import Component
-from .funcs import get_flexure_parameter
+from .funcs import get_flexure_parameter, get_thread_pool
 from ...utils.decorators import use_file_name_or_kwds
 
 
+_LOAD_THRESHOLD = 1e-6
+
+
 class Flexure(Component):
 
     """Deform the lithosphere with 1D or 2D flexure.
@@ -156,6 +159,9 @@ class Flexure(Component):
         method="airy",
         rho_mantle=3300.,
         gravity=9.80665,
+        solver="fft",
+        incremental=False,
+        load_threshold=1e-6,
         **kwds
     ):
         """Initialize the flexure component.
@@ -174,14 +180,38 @@ class Flexure(Component):
             Density of the mantle (kg / m^3).
         gravity : float, optional
             Acceleration due to gravity (m / s^2).
+        solver : {'fft', 'direct'}, optional
+            How to sum the deflections due to the loads at all nodes, for
+            the 'flexure' method. 'fft' convolves the loads with the
+            deflection due to a point load using fast Fourier transforms,
+            unless there are only a few loads, which are then superposed
+            directly. 'direct' adds up the deflections due to each load,
+            which takes time proportional to the number of nodes times the
+            number of loads.
+        incremental : bool, optional
+            If True, each update only calculates the deflection due to the
+            change in load since the last update, and adds it to the
+            deflection of the last update. Because flexure is linear, the
+            result is the same, but costs little if only a few loads have
+            changed. Changes in load smaller than *load_threshold* are not
+            applied until they have added up to more than it.
+        load_threshold : float, optional
+            Smallest change in load (Pa) applied by an incremental update.
         """
         if method not in ("airy", "flexure"):
             raise ValueError("{method}: method not understood".format(method=method))
+        if solver not in ("fft", "direct"):
+            raise ValueError("{solver}: solver not understood".format(solver=solver))
 
         self._grid = grid
 
         self._youngs = youngs
         self._method = method
+        self._solver = solver
+        self._incremental = incremental
+        self._load_threshold = load_threshold
+        self._last_load = None
+        self._last_deflection = None
         self._rho_mantle = rho_mantle
         self._gravity = gravity
         self.eet = eet
@@ -213,6 +243,8 @@ class Flexure(Component):
         self._r = self._create_kei_func_grid(
             self._grid.shape, (self.grid.dy, self.grid.dx), self.alpha
         )
+        self._r_fft = None
+        self._last_load = None
 
     @property
     def youngs(self):
@@ -239,6 +271,16 @@ class Flexure(Component):
         """Name of method used to calculate deflections."""
         return self._method
 
+    @property
+    def incremental(self):
+        """If updates only calculate the deflection due to changes in load."""
+        return self._incremental
+
+    @property
+    def solver(self):
+        """Name of solver used to sum deflections."""
+        return self._solver
+
     @property
     def alpha(self):
         """Flexure parameter (m)."""
@@ -256,19 +298,61 @@ class Flexure(Component):
 
         return kei(np.sqrt(dx ** 2 + dy ** 2) / alpha)
 
+    @staticmethod
+    def _create_kei_func_fft(r):
+        """Transform the kei function grid for convolution with loads.
+
+        The kei function grid, *r*, gives the response at each distance
+        (in rows and columns) from a load. It is mirrored to negative
+        distances and padded with zeros, so that a circular convolution
+        with loads on a grid of the same shape as *r* does not wrap around.
+
+        Returns
+        -------
+        (ndarray of complex, tuple of int)
+            The transformed, padded grid, and its shape before being
+            transformed.
+        """
+        from scipy.fftpack import next_fast_len
+
+        shape = tuple(next_fast_len(2 * n - 1) for n in r.shape)
+        (dst_rows, src_rows), (dst_cols, src_cols) = [
+            (
+                np.concatenate((np.arange(n), np.arange(size - n + 1, size))),
+                np.concatenate((np.arange(n), np.arange(n - 1, 0, -1))),
+            )
+            for n, size in zip(r.shape, shape)
+        ]
+
+        kernel = np.zeros(shape, dtype=float)
+        kernel[np.ix_(dst_rows, dst_cols)] = r[np.ix_(src_rows, src_cols)]
+
+        return np.fft.rfft2(kernel), shape
+
+    @property
+    def _kei_func_fft(self):
+        """Transformed kei function grid, cached until *eet* changes."""
+        if self._r_fft is None:
+            self._r_fft = self._create_kei_func_fft(self._r)
+        return self._r_fft
+
     def update(self, n_procs=1):
         """Update fields with current loading conditions.
 
         Parameters
         ----------
         n_procs : int, optional
-            Number of processors to use for calculations.
+            Number of threads to use for calculations.
         """
         load = self.grid.at_node["lithosphere__overlying_pressure_increment"]
         deflection = self.grid.at_node["lithosphere_surface__elevation_increment"]
 
         new_load = load.copy()
 
+        if self._method == "flexure" and self._incremental:
+            self._update_incremental(new_load, deflection, n_procs=n_procs)
+            return
+
         deflection.fill(0.)
 
         if self._method == "airy":
@@ -276,6 +360,27 @@ class Flexure(Component):
         else:
             self.subside_loads(new_load, deflection=deflection, n_procs=n_procs)
 
+    def _update_incremental(self, load, deflection, n_procs=1):
+        """Add the deflection due to the change in load since the last update.
+
+        Loads, and deflections, as of the last update are kept so that the
+        result does not depend on other changes to the output field.
+        """
+        if self._last_load is None:
+            self._last_load = np.zeros_like(load)
+            self._last_deflection = np.zeros_like(deflection)
+
+        delta = load - self._last_load
+        changed = np.abs(delta) > self._load_threshold
+        delta[~changed] = 0.
+        self._last_load[changed] = load[changed]
+
+        if np.any(changed):
+            self.subside_loads(delta, deflection=self._last_deflection,
+                               n_procs=n_procs)
+
+        deflection[:] = self._last_deflection
+
     def subside_loads(self, loads, deflection=None, n_procs=1):
         """Subside surface due to multiple loads.
 
@@ -286,7 +391,9 @@ class Flexure(Component):
         deflection : ndarray of float, optional
             Buffer to place resulting deflection values.
         n_procs : int, optional
-            Number of processors to use for calculations.
+            Number of threads to use for calculations. Only used by the
+            'direct' solver, for which the time taken is proportional to
+            the number of nodes with loads.
 
         Returns
         -------
@@ -294,13 +401,46 @@ class Flexure(Component):
             Deflections caused by the loading.
         """
         if deflection is None:
-            deflection = np.empty(self.shape, dtype=np.float)
-
-        from .cfuncs import subside_grid_in_parallel
+            deflection = np.zeros(self._grid.number_of_nodes, dtype=np.float)
 
         w = deflection.reshape(self._grid.shape)
         load = loads.reshape(self._grid.shape)
 
+        if self._solver == "fft" and not self._is_sparse(load):
+            self._subside_loads_fft(w, load)
+        else:
+            self._subside_loads_direct(w, load, n_procs=n_procs)
+
+        return deflection
+
+    @staticmethod
+    def _is_sparse(load):
+        """Check if there are few enough loads to superpose them directly.
+
+        Superposing loads takes time proportional to the number of nodes
+        times the number of loads, whereas convolution takes time
+        proportional to N log N, where N is the number of nodes. Direct
+        superposition is faster for up to about 8 log2 N loads.
+        """
+        n_loads = np.count_nonzero(np.abs(load) > _LOAD_THRESHOLD)
+        return n_loads < 8 * np.log2(load.size + 1)
+
+    def _subside_loads_fft(self, w, load):
+        """Add deflections due to loads by convolution with FFTs."""
+        r_fft, shape = self._kei_func_fft
+        c = -self._grid.dx * self._grid.dy / (
+            2. * np.pi * self.gamma_mantle * self.alpha ** 2
+        )
+
+        dz = np.fft.irfft2(np.fft.rfft2(load, s=shape) * r_fft, s=shape)
+        w += c * dz[: w.shape[0], : w.shape[1]]
+
+    def _subside_loads_direct(self, w, load, n_procs=1):
+        """Add deflections due to loads by superposing each load."""
+        from .cfuncs import subside_grid_in_parallel
+
+        pool = get_thread_pool(n_procs) if n_procs > 1 else None
+
         subside_grid_in_parallel(
             w,
             load * self._grid.dx * self._grid.dy,
@@ -308,6 +448,5 @@ class Flexure(Component):
             self.alpha,
             self.gamma_mantle,
             n_procs,
+            pool=pool,
         )
-
-        return deflection
@@ -2,12 +2,39 @@
 
 import numpy as np
 import scipy.special
-from multiprocessing import Pool
+from multiprocessing.pool import ThreadPool
 
 _POISSON = .25
 
 _N_PROCS = 4
 
+_POOLS = {}
+
+_BLOCK_SIZE = 2 ** 20
+
+
+def get_thread_pool(n_procs):
+    """Get a pool of threads to share among flexure calculations.
+
+    Pools are created the first time they are asked for, and then kept
+    so that later calculations do not pay the cost of starting threads.
+
+    Parameters
+    ----------
+    n_procs : int
+        Number of threads in the pool.
+
+    Returns
+    -------
+    multiprocessing.pool.ThreadPool
+        A pool of *n_procs* threads.
+    """
+    try:
+        return _POOLS[n_procs]
+    except KeyError:
+        _POOLS[n_procs] = ThreadPool(processes=n_procs)
+        return _POOLS[n_procs]
+
 
 def get_flexure_parameter(h, E, n_dim, gamma_mantle=33000.):
     """
@@ -185,57 +212,79 @@ def subside_point_loads(loads, locs, coords, params=None, deflection=None, n_pro
         - *eet*: Effective elastic thickness
         - *youngs*: Young's modulus
         - *gamma_mantle*: Specific weight of the mantle
-    out : ndarray, optional
-        Array to put deflections into.
+    deflection : ndarray, optional
+        Array to add deflections to.
+    n_procs : int, optional
+        Number of threads to use for calculations. Threads are kept in a
+        pool, and reused, between calls.
 
     Returns
     -------
     out : ndarray
         Array of deflections.
+
+    Examples
+    --------
+    >>> from landlab.components.flexure import (subside_point_load,
+    ...                                         subside_point_loads)
+    >>> params = dict(eet=65000., youngs=7e10)
+    >>> x, y = np.meshgrid(np.arange(0, 10000, 1000.), np.arange(0, 5000, 1000.))
+    >>> x.shape = y.shape = (x.size, )
+
+    Points without a load do not add to the deflection.
+
+    >>> loads = np.zeros(x.size)
+    >>> loads[[3, 17]] = 1e9
+    >>> dz = subside_point_loads(loads, (x, y), (x, y), params=params)
+    >>> expected = (
+    ...     subside_point_load(1e9, (x[3], y[3]), (x, y), params=params)
+    ...     + subside_point_load(1e9, (x[17], y[17]), (x, y), params=params))
+    >>> np.allclose(dz, expected)
+    True
     """
     params = params or dict(eet=6500., youngs=7.e10)
-    eet, youngs = params["eet"], params["youngs"]
-    gamma_mantle = params.get("gamma_mantle", 33000.)
 
     if deflection is None:
-        deflection = np.empty(coords[0].size, dtype=np.float)
+        deflection = np.zeros(coords[0].size, dtype=np.float)
 
     assert len(coords) in [1, 2]
     assert len(locs) == len(coords)
     assert loads.size == locs[0].size
 
+    nonzero = np.flatnonzero(loads)
+    loads = np.asarray(loads).flat[nonzero]
+    locs = [np.asarray(loc).flat[nonzero] for loc in locs]
+
+    loads_per_block = max(_BLOCK_SIZE // coords[0].size, 1)
+    args = [
+        (loads[start:start + loads_per_block],
+         [loc[start:start + loads_per_block] for loc in locs],
+         coords, params)
+        for start in range(0, loads.size, loads_per_block)
+    ]
+
     if n_procs > 1:
-        _subside_in_parallel(
-            deflection, loads, locs, coords, eet, youngs, gamma_mantle, n_procs=n_procs
-        )
+        results = get_thread_pool(n_procs).map(_subside_point_loads_helper, args)
     else:
-        for index in loads.nonzero()[0]:
-            loc = [dim.flat[index] for dim in locs]
-            deflection += subside_point_load(
-                loads.flat[index], loc, coords, eet, youngs, gamma_mantle
-            )
-    return deflection
+        results = (_subside_point_loads_helper(arg) for arg in args)
 
+    for result in results:
+        deflection += result
 
-def _subside_point_load_helper(args):
-    return subside_point_load(*args)
-
+    return deflection
 
-def _subside_in_parallel(dz, loads, locs, coords, eet, youngs, gamma_mantle, n_procs=4):
-    args = []
-    for index in loads.nonzero()[0]:
-        loc = (locs[0].flat[index], locs[1].flat[index])
-        args.append((loads.flat[index], loc, coords, eet, youngs, gamma_mantle))
 
-    pool = Pool(processes=n_procs)
+def _subside_point_loads_helper(args):
+    """Sum deflections due to a block of point loads."""
+    loads, locs, coords, params = args
 
-    results = pool.map(_subside_point_load_helper, args)
-    for result in results:
-        try:
-            dz += result
-        except ValueError:
-            result.shape = dz.shape
-            dz += result
+    if len(locs) == 2:
+        return subside_point_load(loads, locs, coords, params=params)
+    else:
+        out = np.zeros(coords[0].size, dtype=np.float)
+        for load, loc in zip(loads, locs[0]):
+            out += subside_point_load(load, (loc, ), coords, params=params)
+        return out
 
 
 if __name__ == "__main__":
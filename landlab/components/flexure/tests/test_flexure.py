@@ -61,3 +61,115 @@ def test_field_initialized_to_zero(flex):
     for name in flex.grid["node"]:
         field = flex.grid["node"][name]
         assert np.all(field == 0.)
+
+
+@pytest.mark.parametrize("shape", [(20, 20), (9, 7), (13, 6)])
+def test_fft_matches_direct(shape):
+    from landlab import RasterModelGrid
+    from landlab.components.flexure import Flexure
+
+    loads = np.random.uniform(1e8, 1e9, shape[0] * shape[1])
+
+    deflections = []
+    for solver in ("fft", "direct"):
+        grid = RasterModelGrid(shape, spacing=(8e3, 10e3))
+        flex = Flexure(grid, method="flexure", solver=solver)
+        deflections.append(flex.subside_loads(loads))
+
+    assert np.allclose(deflections[0], deflections[1], rtol=1e-10, atol=0.)
+
+
+def test_fft_kernel_cached(flex):
+    kernel = flex._kei_func_fft
+    assert flex._kei_func_fft is kernel
+
+    flex.eet = flex.eet * 2.
+    assert flex._kei_func_fft is not kernel
+
+
+def test_bad_solver():
+    from landlab import RasterModelGrid
+    from landlab.components.flexure import Flexure
+
+    with pytest.raises(ValueError):
+        Flexure(RasterModelGrid((3, 3)), solver="not-a-solver")
+
+
+@pytest.mark.parametrize("n_procs", [1, 3])
+def test_sparse_loads(n_procs):
+    from landlab import RasterModelGrid
+    from landlab.components.flexure import Flexure, subside_point_loads
+
+    grid = RasterModelGrid((15, 20), spacing=10e3)
+    flex = Flexure(grid, method="flexure")
+    loads = np.zeros(grid.number_of_nodes)
+    loads[[22, 147, 148]] = 1e9
+    assert flex._is_sparse(loads)
+
+    dz = flex.subside_loads(loads, n_procs=n_procs)
+
+    params = dict(eet=flex.eet, youngs=flex.youngs,
+                  gamma_mantle=flex.gamma_mantle)
+    expected = subside_point_loads(
+        loads * grid.dx * grid.dy, (grid.x_of_node, grid.y_of_node),
+        (grid.x_of_node, grid.y_of_node), params=params, n_procs=n_procs)
+    assert np.allclose(dz, expected, rtol=1e-10, atol=0.)
+
+
+def test_direct_with_threads():
+    from landlab import RasterModelGrid
+    from landlab.components.flexure import Flexure
+
+    grid = RasterModelGrid((15, 20), spacing=10e3)
+    flex = Flexure(grid, method="flexure", solver="direct")
+    loads = np.random.uniform(1e8, 1e9, grid.number_of_nodes)
+
+    assert np.allclose(flex.subside_loads(loads, n_procs=4),
+                       flex.subside_loads(loads, n_procs=1),
+                       rtol=1e-12, atol=0.)
+
+
+@pytest.mark.parametrize("solver", ["fft", "direct"])
+def test_incremental_update(solver):
+    from landlab import RasterModelGrid
+    from landlab.components.flexure import Flexure
+
+    grids = [RasterModelGrid((15, 20), spacing=10e3) for _ in range(2)]
+    flexes = [
+        Flexure(grid, method="flexure", solver=solver, incremental=incremental)
+        for grid, incremental in zip(grids, (False, True))
+    ]
+
+    for step in range(4):
+        load = np.random.uniform(1e8, 1e9, grids[0].number_of_nodes)
+        load[load < 8e8] = 0.
+        for grid, flex in zip(grids, flexes):
+            grid.at_node["lithosphere__overlying_pressure_increment"][:] = load
+            grid.at_node["lithosphere_surface__elevation_increment"][:] = -1.
+            flex.update()
+
+        assert np.allclose(
+            grids[1].at_node["lithosphere_surface__elevation_increment"],
+            grids[0].at_node["lithosphere_surface__elevation_increment"],
+            rtol=1e-10,
+            atol=1e-12,
+        )
+
+
+def test_incremental_small_changes_not_lost():
+    from landlab import RasterModelGrid
+    from landlab.components.flexure import Flexure
+
+    grid = RasterModelGrid((15, 20), spacing=10e3)
+    flex = Flexure(grid, method="flexure", incremental=True, load_threshold=1.)
+    load = grid.at_node["lithosphere__overlying_pressure_increment"]
+    dz = grid.at_node["lithosphere_surface__elevation_increment"]
+
+    for _ in range(4):
+        load[47] += .4
+        flex.update()
+    assert flex._last_load[47] == pytest.approx(1.2)
+
+    expected = Flexure(RasterModelGrid((15, 20), spacing=10e3),
+                       method="flexure").subside_loads(flex._last_load)
+    assert np.allclose(dz, expected, rtol=1e-10, atol=0.)
@@ -1,7 +1,11 @@
 from .flow_accum_bw import (
     make_ordered_node_array,
+    make_stack_and_donor_arrays,
     find_drainage_area_and_discharge,
+    find_drainage_area_and_discharge_compiled,
     flow_accumulation,
+    reroute_drainage_area_and_discharge,
+    update_stack_and_donor_arrays,
 )
 
 from .flow_accumulator import FlowAccumulator
@@ -9,6 +13,10 @@ from .flow_accumulator import FlowAccumulator
 __all__ = [
     "FlowAccumulator",
     "make_ordered_node_array",
+    "make_stack_and_donor_arrays",
     "find_drainage_area_and_discharge",
+    "find_drainage_area_and_discharge_compiled",
     "flow_accumulation",
+    "reroute_drainage_area_and_discharge",
+    "update_stack_and_donor_arrays",
 ]
@@ -6,6 +6,10 @@ cimport cython
 DTYPE = np.int
 ctypedef np.int_t DTYPE_INT_t
 
+ctypedef fused id_t:
+    int
+    long
+
 
 @cython.boundscheck(False)
 cpdef _add_to_stack(DTYPE_INT_t l, DTYPE_INT_t j,
@@ -29,3 +33,573 @@ cpdef _add_to_stack(DTYPE_INT_t l, DTYPE_INT_t j,
             j = _add_to_stack(m, j, s, delta, donors)
 
     return j
+
+
+DTYPE_FLOAT = np.double
+ctypedef np.double_t DTYPE_FLOAT_t
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef _make_donors(np.ndarray[id_t, ndim=1] r,
+                   np.ndarray[id_t, ndim=1] delta,
+                   np.ndarray[id_t, ndim=1] donors):
+    """Fill the array of donors, D, from the receivers and delta.
+
+    Parameters
+    ----------
+    r : ndarray of int
+        Receiver of each node.
+    delta : ndarray of int
+        Index into *donors* where each node's donor list begins.
+    donors : ndarray of int
+        Output array of donors (the D array of Braun & Willett, 2012).
+    """
+    cdef int n_nodes = r.shape[0]
+    cdef int i
+    cdef DTYPE_INT_t ri
+    cdef np.ndarray[DTYPE_INT_t, ndim=1] w = np.zeros(n_nodes, dtype=int)
+
+    for i in range(n_nodes):
+        ri = r[i]
+        donors[delta[ri] + w[ri]] = i
+        w[ri] += 1
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef long _make_stack(np.ndarray[id_t, ndim=1] r,
+                       np.ndarray[id_t, ndim=1] delta,
+                       np.ndarray[id_t, ndim=1] donors,
+                       np.ndarray[id_t, ndim=1] s):
+    """Build the downstream-to-upstream stack without recursion.
+
+    Nodes are added to the stack in exactly the same order as repeated
+    calls to :func:`_add_to_stack` on each base-level node (in order of
+    increasing node ID), but an explicit work list replaces the recursion
+    so very long flow paths cannot overflow the C stack.
+
+    Parameters
+    ----------
+    r : ndarray of int
+        Receiver of each node.
+    delta : ndarray of int
+        Index into *donors* where each node's donor list begins.
+    donors : ndarray of int
+        Array of donors (the D array of Braun & Willett, 2012).
+    s : ndarray of int
+        Output array of node IDs in downstream-to-upstream order.
+
+    Returns
+    -------
+    int
+        Number of nodes added to the stack.
+    """
+    cdef int n_nodes = r.shape[0]
+    cdef int j = 0
+    cdef int top
+    cdef int k, n
+    cdef DTYPE_INT_t l, m
+    cdef np.ndarray[DTYPE_INT_t, ndim=1] work = np.empty(n_nodes, dtype=int)
+
+    for k in range(n_nodes):
+        if r[k] != k:
+            continue
+
+        work[0] = k
+        top = 1
+        while top > 0:
+            top -= 1
+            l = work[top]
+            s[j] = l
+            j += 1
+            # Push donors in reverse so that they come off the work list
+            # in the same order the recursive version visits them.
+            for n in range(delta[l + 1] - 1, delta[l] - 1, -1):
+                m = donors[n]
+                if m != l:
+                    work[top] = m
+                    top += 1
+
+    return j
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef _accumulate_bw(np.ndarray[id_t, ndim=1] s,
+                     np.ndarray[id_t, ndim=1] r,
+                     np.ndarray[DTYPE_FLOAT_t, ndim=1] drainage_area,
+                     np.ndarray[DTYPE_FLOAT_t, ndim=1] discharge):
+    """Accumulate drainage area and discharge down the stack, in place.
+
+    Parameters
+    ----------
+    s : ndarray of int
+        Ordered (downstream to upstream) array of node IDs.
+    r : ndarray of int
+        Receiver of each node.
+    drainage_area : ndarray of float
+        On entry, the local area at each node; on exit, the drainage area.
+    discharge : ndarray of float
+        On entry, the local runoff at each node; on exit, the discharge.
+    """
+    cdef int n_nodes = s.shape[0]
+    cdef int i
+    cdef DTYPE_INT_t donor, recvr
+
+    for i in range(n_nodes - 1, -1, -1):
+        donor = s[i]
+        recvr = r[donor]
+        if donor != recvr:
+            drainage_area[recvr] += drainage_area[donor]
+            discharge[recvr] += discharge[donor]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef _reroute_bw(np.ndarray[id_t, ndim=1] nodes,
+                  np.ndarray[id_t, ndim=1] new_receivers,
+                  np.ndarray[id_t, ndim=1] r,
+                  np.ndarray[DTYPE_FLOAT_t, ndim=1] drainage_area,
+                  np.ndarray[DTYPE_FLOAT_t, ndim=1] discharge):
+    """Update drainage area and discharge for a few changed receivers.
+
+    On entry, *r* holds the old receivers and *drainage_area* and
+    *discharge* are consistent with them. Each changed node is first cut
+    from the network (its area and discharge are removed from every node
+    on its old downstream path) and is then attached to its new receiver
+    (its area and discharge are added to every node on its new downstream
+    path). Cutting every node before attaching any means the network is
+    always a forest, so the paths always end at a node that is its own
+    receiver. On exit, *r* holds the new receivers.
+
+    Parameters
+    ----------
+    nodes : ndarray of int
+        Nodes whose receiver has changed.
+    new_receivers : ndarray of int
+        New receiver of each of *nodes*.
+    r : ndarray of int
+        Receiver of each node.
+    drainage_area : ndarray of float
+        Drainage area at each node, updated in place.
+    discharge : ndarray of float
+        Discharge at each node, updated in place.
+    """
+    cdef int n_changed = nodes.shape[0]
+    cdef int i
+    cdef DTYPE_INT_t node, n
+    cdef double area, q
+
+    for i in range(n_changed):
+        node = nodes[i]
+        area = drainage_area[node]
+        q = discharge[node]
+        n = r[node]
+        r[node] = node
+        if n != node:
+            while True:
+                drainage_area[n] -= area
+                discharge[n] -= q
+                if r[n] == n:
+                    break
+                n = r[n]
+
+    for i in range(n_changed):
+        node = nodes[i]
+        area = drainage_area[node]
+        q = discharge[node]
+        n = new_receivers[i]
+        r[node] = n
+        if n != node:
+            while True:
+                drainage_area[n] += area
+                discharge[n] += q
+                if r[n] == n:
+                    break
+                n = r[n]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef _count_upstream_nodes(np.ndarray[DTYPE_INT_t, ndim=1] s,
+                            np.ndarray[DTYPE_INT_t, ndim=1] r,
+                            np.ndarray[DTYPE_INT_t, ndim=1] size):
+    """Count the nodes that drain through each node, including itself.
+
+    Parameters
+    ----------
+    s : ndarray of int
+        Ordered (downstream to upstream) array of node IDs.
+    r : ndarray of int
+        Receiver of each node.
+    size : ndarray of int
+        Output number of nodes in the stack above (and including) each
+        node.
+    """
+    cdef int n_nodes = s.shape[0]
+    cdef int i
+    cdef DTYPE_INT_t donor, recvr
+
+    for i in range(n_nodes):
+        size[i] = 1
+    for i in range(n_nodes - 1, -1, -1):
+        donor = s[i]
+        recvr = r[donor]
+        if donor != recvr:
+            size[recvr] += size[donor]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void _move_subtree(DTYPE_INT_t node, DTYPE_INT_t new,
+                        np.ndarray[DTYPE_INT_t, ndim=1] r,
+                        np.ndarray[DTYPE_INT_t, ndim=1] delta,
+                        np.ndarray[DTYPE_INT_t, ndim=1] donors,
+                        np.ndarray[DTYPE_INT_t, ndim=1] s,
+                        np.ndarray[DTYPE_INT_t, ndim=1] position,
+                        np.ndarray[DTYPE_INT_t, ndim=1] size,
+                        np.ndarray[DTYPE_INT_t, ndim=1] block,
+                        np.ndarray[DTYPE_INT_t, ndim=1] bounds):
+    """Give a node a new receiver, moving it and its donors in the stack."""
+    cdef int n_nodes = r.shape[0]
+    cdef DTYPE_INT_t old = r[node]
+    cdef DTYPE_INT_t p = position[node]
+    cdef DTYPE_INT_t k = size[node]
+    cdef DTYPE_INT_t q, m, a, e, i
+
+    # Nodes are stacked after their receiver, with the donors of a node (and
+    # the base-level nodes) in order of increasing ID. Find where the
+    # subtree goes among those of its new siblings.
+    if new == node:
+        q = n_nodes
+        for m in range(node + 1, n_nodes):
+            if r[m] == m:
+                q = position[m]
+                break
+    else:
+        q = position[new] + size[new]
+        for i in range(delta[new], delta[new + 1]):
+            m = donors[i]
+            if m > node and m != new:
+                q = position[m]
+                break
+
+    for i in range(k):
+        block[i] = s[p + i]
+    if q < p:
+        for i in range(p - 1, q - 1, -1):
+            s[i + k] = s[i]
+            position[s[i + k]] = i + k
+        for i in range(k):
+            s[q + i] = block[i]
+            position[block[i]] = q + i
+        bounds[0] = min(bounds[0], q)
+        bounds[1] = max(bounds[1], p + k)
+    elif q > p + k:
+        for i in range(p + k, q):
+            s[i - k] = s[i]
+            position[s[i - k]] = i - k
+        for i in range(k):
+            s[q - k + i] = block[i]
+            position[block[i]] = q - k + i
+        bounds[0] = min(bounds[0], p)
+        bounds[1] = max(bounds[1], q)
+
+    if old != node:
+        m = old
+        while True:
+            size[m] -= k
+            if r[m] == m:
+                break
+            m = r[m]
+    r[node] = new
+    if new != node:
+        m = new
+        while True:
+            size[m] += k
+            if r[m] == m:
+                break
+            m = r[m]
+
+    # Move the node from the donors of its old receiver to those of its new
+    # one, shifting the donors of the nodes in between by one place.
+    a = delta[old]
+    while donors[a] != node:
+        a += 1
+    e = delta[new + 1]
+    for i in range(delta[new], delta[new + 1]):
+        if donors[i] > node:
+            e = i
+            break
+    if old < new:
+        for i in range(a, e - 1):
+            donors[i] = donors[i + 1]
+        donors[e - 1] = node
+        for i in range(old + 1, new + 1):
+            delta[i] -= 1
+        bounds[2] = min(bounds[2], a)
+        bounds[3] = max(bounds[3], e)
+        bounds[4] = min(bounds[4], old + 1)
+        bounds[5] = max(bounds[5], new + 1)
+    else:
+        for i in range(a, e, -1):
+            donors[i] = donors[i - 1]
+        donors[e] = node
+        for i in range(new + 1, old + 1):
+            delta[i] += 1
+        bounds[2] = min(bounds[2], e)
+        bounds[3] = max(bounds[3], a + 1)
+        bounds[4] = min(bounds[4], new + 1)
+        bounds[5] = max(bounds[5], old + 1)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef long _update_stack_bw(np.ndarray[DTYPE_INT_t, ndim=1] nodes,
+                            np.ndarray[DTYPE_INT_t, ndim=1] new_receivers,
+                            np.ndarray[DTYPE_INT_t, ndim=1] r,
+                            np.ndarray[DTYPE_INT_t, ndim=1] delta,
+                            np.ndarray[DTYPE_INT_t, ndim=1] donors,
+                            np.ndarray[DTYPE_INT_t, ndim=1] s,
+                            np.ndarray[DTYPE_INT_t, ndim=1] position,
+                            np.ndarray[DTYPE_INT_t, ndim=1] size,
+                            np.ndarray[DTYPE_INT_t, ndim=1] bounds):
+    """Update the stack, delta and donors for a few changed receivers.
+
+    On entry, *r* holds the old receivers and the other arrays are
+    consistent with them. Each changed node is moved, with the nodes that
+    drain through it, to its place among the donors of its new receiver, so
+    only the part of the stack between its old and new places, and of the
+    donors between its old and new receivers, changes. A node whose new
+    receiver drains through it is moved after the nodes that would
+    otherwise make a loop. On exit, *r* holds the new receivers of the
+    nodes that have been moved.
+
+    Parameters
+    ----------
+    nodes : ndarray of int
+        Nodes whose receiver has changed.
+    new_receivers : ndarray of int
+        New receiver of each of *nodes*.
+    r : ndarray of int
+        Receiver of each node.
+    delta : ndarray of int
+        Index into *donors* where each node's donor list begins.
+    donors : ndarray of int
+        Array of donors (the D array of Braun & Willett, 2012).
+    s : ndarray of int
+        Node IDs in downstream-to-upstream order.
+    position : ndarray of int
+        Position of each node in *s*.
+    size : ndarray of int
+        Number of nodes that drain through each node, including itself.
+    bounds : ndarray of int
+        Lower and upper bounds of the parts of *s*, *donors* and *delta*
+        that have changed, widened in place.
+
+    Returns
+    -------
+    int
+        Number of nodes that could not be moved without making a loop.
+    """
+    cdef int n_left = nodes.shape[0]
+    cdef int i, j
+    cdef DTYPE_INT_t node, new
+    cdef np.ndarray[DTYPE_INT_t, ndim=1] pending = nodes.copy()
+    cdef np.ndarray[DTYPE_INT_t, ndim=1] pending_receivers = (
+        new_receivers.copy())
+    cdef np.ndarray[DTYPE_INT_t, ndim=1] block = np.empty(r.shape[0],
+                                                          dtype=int)
+
+    while n_left > 0:
+        j = 0
+        for i in range(n_left):
+            node = pending[i]
+            new = pending_receivers[i]
+            if new == r[node]:
+                continue
+            if (new != node and position[node] <= position[new] and
+                    position[new] < position[node] + size[node]):
+                pending[j] = node
+                pending_receivers[j] = new
+                j += 1
+                continue
+            _move_subtree(node, new, r, delta, donors, s, position, size,
+                          block, bounds)
+        if j == n_left:
+            break
+        n_left = j
+
+    return n_left
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef _make_donors_to_n(np.ndarray[id_t, ndim=2] r,
+                        np.ndarray[DTYPE_FLOAT_t, ndim=2] p,
+                        np.ndarray[id_t, ndim=1] delta,
+                        np.ndarray[id_t, ndim=1] donors):
+    """Fill the array of donors, D, for route-to-many flow.
+
+    Only receivers that get a positive proportion of flow are counted.
+    Donors are added receiver-column by receiver-column, in the same order
+    as ``_make_array_of_donors_to_n``.
+
+    Parameters
+    ----------
+    r : ndarray of int, shape (n_nodes, n_receivers)
+        Receivers of each node.
+    p : ndarray of float, shape (n_nodes, n_receivers)
+        Proportion of flow going to each receiver.
+    delta : ndarray of int
+        Index into *donors* where each node's donor list begins.
+    donors : ndarray of int
+        Output array of donors.
+    """
+    cdef int n_nodes = r.shape[0]
+    cdef int n_receivers = r.shape[1]
+    cdef int i, v
+    cdef DTYPE_INT_t ri
+    cdef np.ndarray[DTYPE_INT_t, ndim=1] w = np.zeros(n_nodes, dtype=int)
+
+    for v in range(n_receivers):
+        for i in range(n_nodes):
+            if p[i, v] > 0:
+                ri = r[i, v]
+                donors[delta[ri] + w[ri]] = i
+                w[ri] += 1
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef _make_visit_time_to_n(np.ndarray[id_t, ndim=1] base,
+                            np.ndarray[id_t, ndim=1] delta,
+                            np.ndarray[id_t, ndim=1] donors,
+                            np.ndarray[id_t, ndim=1] num_receivers,
+                            np.ndarray[DTYPE_FLOAT_t, ndim=1] visit_time):
+    """Find the time of last visit of each node in a route-to-many network.
+
+    This is the compiled equivalent of the set-based walk of
+    ``_DrainageStack_to_n.construct__stack``. Starting from the base-level
+    nodes, nodes are visited one level at a time and a node is expanded
+    only once all of its receivers have been expanded. The stack is then
+    the argsort of *visit_time*.
+
+    Parameters
+    ----------
+    base : ndarray of int
+        Base-level nodes.
+    delta : ndarray of int
+        Index into *donors* where each node's donor list begins.
+    donors : ndarray of int
+        Array of donors.
+    num_receivers : ndarray of int
+        Number of receivers of each node.
+    visit_time : ndarray of float
+        Output array with the time of last visit of each node, or -1 for
+        nodes that are never visited.
+    """
+    cdef int n_nodes = visit_time.shape[0]
+    cdef int n_base = base.shape[0]
+    cdef int n_current, n_next
+    cdef int i, k, n
+    cdef DTYPE_INT_t node, donor
+    cdef double level
+    cdef np.ndarray[DTYPE_INT_t, ndim=1] num_visits = np.zeros(n_nodes,
+                                                               dtype=int)
+    cdef np.ndarray[DTYPE_INT_t, ndim=1] is_base = np.zeros(n_nodes,
+                                                            dtype=int)
+    cdef np.ndarray[DTYPE_INT_t, ndim=1] is_queued = np.zeros(n_nodes,
+                                                              dtype=int)
+    cdef np.ndarray[DTYPE_INT_t, ndim=1] current = np.empty(n_nodes,
+                                                            dtype=int)
+    cdef np.ndarray[DTYPE_INT_t, ndim=1] next_ = np.empty(n_nodes, dtype=int)
+    cdef np.ndarray[DTYPE_INT_t, ndim=1] swap
+
+    for i in range(n_nodes):
+        visit_time[i] = -1.
+
+    for i in range(n_base):
+        node = base[i]
+        visit_time[node] = 0.
+        num_visits[node] += 1
+        is_base[node] = 1
+
+    # The first level is the donors of the base-level nodes. A node is
+    # complete once it has been visited from each of its receivers.
+    n_next = 0
+    for i in range(n_base):
+        node = base[i]
+        for n in range(delta[node], delta[node + 1]):
+            donor = donors[n]
+            if is_base[donor]:
+                continue
+            visit_time[donor] = 1.
+            num_visits[donor] += 1
+    for i in range(n_base):
+        node = base[i]
+        for n in range(delta[node], delta[node + 1]):
+            donor = donors[n]
+            if (not is_base[donor] and not is_queued[donor] and
+                    num_visits[donor] == num_receivers[donor]):
+                is_queued[donor] = 1
+                next_[n_next] = donor
+                n_next += 1
+
+    level = 1.
+    while n_next > 0:
+        swap = current
+        current = next_
+        next_ = swap
+        n_current = n_next
+        n_next = 0
+        level += 1.
+
+        for k in range(n_current):
+            node = current[k]
+            for n in range(delta[node], delta[node + 1]):
+                donor = donors[n]
+                visit_time[donor] = level
+                num_visits[donor] += 1
+                if num_visits[donor] == num_receivers[donor]:
+                    next_[n_next] = donor
+                    n_next += 1
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef _accumulate_to_n(np.ndarray[id_t, ndim=1] s,
+                       np.ndarray[id_t, ndim=2] r,
+                       np.ndarray[DTYPE_FLOAT_t, ndim=2] p,
+                       np.ndarray[DTYPE_FLOAT_t, ndim=1] drainage_area,
+                       np.ndarray[DTYPE_FLOAT_t, ndim=1] discharge):
+    """Accumulate drainage area and discharge for route-to-many flow.
+
+    Parameters
+    ----------
+    s : ndarray of int
+        Ordered (downstream to upstream) array of node IDs.
+    r : ndarray of int, shape (n_nodes, n_receivers)
+        Receivers of each node.
+    p : ndarray of float, shape (n_nodes, n_receivers)
+        Proportion of flow going to each receiver.
+    drainage_area : ndarray of float
+        On entry, the local area at each node; on exit, the drainage area.
+    discharge : ndarray of float
+        On entry, the local runoff at each node; on exit, the discharge.
+    """
+    cdef int n_nodes = s.shape[0]
+    cdef int n_receivers = r.shape[1]
+    cdef int i, v
+    cdef DTYPE_INT_t donor, recvr
+    cdef double proportion
+
+    for i in range(n_nodes - 1, -1, -1):
+        donor = s[i]
+        for v in range(n_receivers):
+            recvr = r[donor, v]
+            proportion = p[donor, v]
+            if proportion > 0 and donor != recvr:
+                drainage_area[recvr] += proportion * drainage_area[donor]
+                discharge[recvr] += proportion * discharge[donor]
@@ -26,7 +26,15 @@ Created: GT Nov 2013
 """
 import numpy
 from six.moves import range
-from .cfuncs import _add_to_stack
+from .cfuncs import (
+    _accumulate_bw,
+    _add_to_stack,
+    _count_upstream_nodes,
+    _make_donors,
+    _make_stack,
+    _reroute_bw,
+    _update_stack_bw,
+)
 
 
 class _DrainageStack:
@@ -243,6 +251,54 @@ def make_ordered_node_array(receiver_nodes):
     return dstack.s
 
 
+def make_stack_and_donor_arrays(receiver_nodes):
+
+    """Build delta, D and the ordered node array in compiled code.
+
+    This is a compiled, non-recursive equivalent of calling
+    :func:`_make_delta_array`, :func:`_make_array_of_donors` and
+    :func:`make_ordered_node_array` one after the other. The number of
+    donors and delta arrays are built only once, and the stack is filled
+    from an explicit work list rather than through recursion.
+
+    Parameters
+    ----------
+    receiver_nodes : ndarray of int
+        ID of receiver for each node.
+
+    Returns
+    -------
+    tuple of ndarray of int
+        The delta array, the array of donors (D), and the array of node IDs
+        ordered from downstream to upstream.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.components.flow_accum import make_stack_and_donor_arrays
+    >>> r = np.array([2, 5, 2, 7, 5, 5, 6, 5, 7, 8])-1
+    >>> delta, D, s = make_stack_and_donor_arrays(r)
+    >>> delta
+    array([ 0,  0,  2,  2,  2,  6,  7,  9, 10, 10, 10])
+    >>> D
+    array([0, 2, 1, 4, 5, 7, 6, 3, 8, 9])
+    >>> s
+    array([4, 1, 0, 2, 5, 6, 3, 8, 7, 9])
+    """
+    receiver_nodes = numpy.asarray(receiver_nodes, dtype=int)
+
+    nd = _make_number_of_donors_array(receiver_nodes)
+    delta = _make_delta_array(nd)
+
+    D = numpy.empty(receiver_nodes.size, dtype=int)
+    _make_donors(receiver_nodes, delta, D)
+
+    s = numpy.empty(receiver_nodes.size, dtype=int)
+    _make_stack(receiver_nodes, delta, D, s)
+
+    return delta, D, s
+
+
 def find_drainage_area_and_discharge(
     s, r, node_cell_area=1.0, runoff=1.0, boundary_nodes=None
 ):
@@ -322,6 +378,188 @@ def find_drainage_area_and_discharge(
     return drainage_area, discharge
 
 
+def find_drainage_area_and_discharge_compiled(
+    s, r, node_cell_area=1.0, runoff=1.0, boundary_nodes=None
+):
+
+    """Calculate the drainage area and water discharge in compiled code.
+
+    Takes the same arguments, and returns the same values, as
+    :func:`find_drainage_area_and_discharge` but the accumulation down the
+    stack is done in a single compiled pass. Drainage area and discharge are
+    always returned as arrays of float.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.components.flow_accum import (
+    ...     find_drainage_area_and_discharge_compiled)
+    >>> r = np.array([2, 5, 2, 7, 5, 5, 6, 5, 7, 8])-1
+    >>> s = np.array([4, 1, 0, 2, 5, 6, 3, 8, 7, 9])
+    >>> a, q = find_drainage_area_and_discharge_compiled(s, r)
+    >>> a
+    array([  1.,   3.,   1.,   1.,  10.,   4.,   3.,   2.,   1.,   1.])
+    >>> q
+    array([  1.,   3.,   1.,   1.,  10.,   4.,   3.,   2.,   1.,   1.])
+    """
+    np = len(s)
+
+    drainage_area = numpy.zeros(np, dtype=float) + node_cell_area
+    discharge = numpy.zeros(np, dtype=float) + node_cell_area * runoff
+
+    if boundary_nodes is not None:
+        drainage_area[boundary_nodes] = 0
+        discharge[boundary_nodes] = 0
+
+    _accumulate_bw(
+        numpy.asarray(s, dtype=int),
+        numpy.asarray(r, dtype=int),
+        drainage_area,
+        discharge,
+    )
+
+    return drainage_area, discharge
+
+
+def reroute_drainage_area_and_discharge(
+    nodes, old_receivers, receiver_nodes, drainage_area, discharge
+):
+
+    """Update drainage area and discharge after a few receivers change.
+
+    Rather than re-accumulating the whole network, only the nodes downstream
+    of each changed node, along both its old and its new flow path, are
+    updated. The cost therefore scales with the number of changed nodes and
+    the length of their flow paths rather than with the number of nodes.
+    Results are the same as a full accumulation up to round-off.
+
+    Parameters
+    ----------
+    nodes : ndarray of int
+        Nodes whose receiver has changed.
+    old_receivers : ndarray of int
+        Previous receiver of each of *nodes*.
+    receiver_nodes : ndarray of int
+        New receiver of each node.
+    drainage_area : ndarray of float
+        Drainage area consistent with the old receivers, updated in place.
+    discharge : ndarray of float
+        Discharge consistent with the old receivers, updated in place.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.components.flow_accum import (
+    ...     flow_accumulation, reroute_drainage_area_and_discharge)
+    >>> r = np.array([2, 5, 2, 7, 5, 5, 6, 5, 7, 8])-1
+    >>> a, q, s = flow_accumulation(r)
+
+    Node 9 now drains to node 8 rather than to node 7.
+
+    >>> r[9] = 8
+    >>> reroute_drainage_area_and_discharge(
+    ...     np.array([9]), np.array([7]), r, a, q)
+    >>> a
+    array([  1.,   3.,   1.,   1.,  10.,   5.,   4.,   1.,   2.,   1.])
+    >>> a2, q2, s2 = flow_accumulation(r)
+    >>> np.all(a == a2)
+    True
+    """
+    nodes = numpy.asarray(nodes, dtype=receiver_nodes.dtype)
+    new_receivers = receiver_nodes[nodes]
+
+    receiver_nodes[nodes] = old_receivers
+    _reroute_bw(nodes, new_receivers, receiver_nodes, drainage_area, discharge)
+
+
+def update_stack_and_donor_arrays(
+    nodes, old_receivers, receiver_nodes, delta, D, s, stack_position, upstream_count
+):
+
+    """Update delta, D and the ordered node array after a few receivers change.
+
+    Rather than rebuilding them, each changed node is moved, together with
+    the nodes that drain through it, from its place among the donors of its
+    old receiver to its place among those of its new one. Only the part of
+    *s* between those two places, and of *D* and *delta* between the two
+    receivers, changes. Results are the same as those of
+    :func:`make_stack_and_donor_arrays`. All arrays are updated in place,
+    and must be arrays of int.
+
+    Parameters
+    ----------
+    nodes : ndarray of int
+        Nodes whose receiver has changed.
+    old_receivers : ndarray of int
+        Previous receiver of each of *nodes*.
+    receiver_nodes : ndarray of int
+        New receiver of each node.
+    delta : ndarray of int
+        The delta array for the old receivers.
+    D : ndarray of int
+        The array of donors for the old receivers.
+    s : ndarray of int
+        Node IDs in downstream-to-upstream order for the old receivers.
+    stack_position : ndarray of int
+        Position of each node in *s*.
+    upstream_count : ndarray of int
+        Number of nodes that drain through each node, including itself.
+
+    Returns
+    -------
+    tuple of slice
+        The parts of *s*, *D* and *delta* that have changed.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.components.flow_accum import (
+    ...     make_stack_and_donor_arrays, update_stack_and_donor_arrays)
+    >>> r = np.array([2, 5, 2, 7, 5, 5, 6, 5, 7, 8])-1
+    >>> delta, D, s = make_stack_and_donor_arrays(r)
+    >>> position = np.empty_like(s)
+    >>> position[s] = np.arange(len(s))
+    >>> upstream_count = np.array([1, 3, 1, 1, 10, 4, 3, 2, 1, 1])
+
+    Node 9 now drains to node 8 rather than to node 7.
+
+    >>> r[9] = 8
+    >>> update_stack_and_donor_arrays(
+    ...     [9], [7], r, delta, D, s, position, upstream_count)
+    (slice(8, 10, None), slice(9, 10, None), slice(8, 9, None))
+    >>> s
+    array([4, 1, 0, 2, 5, 6, 3, 8, 9, 7])
+    >>> delta2, D2, s2 = make_stack_and_donor_arrays(r)
+    >>> np.all(s == s2), np.all(D == D2), np.all(delta == delta2)
+    (True, True, True)
+    """
+    n_nodes = len(s)
+    nodes = numpy.asarray(nodes, dtype=int)
+    new_receivers = receiver_nodes[nodes]
+    receiver_nodes[nodes] = old_receivers
+
+    bounds = numpy.array([n_nodes, 0, n_nodes, 0, n_nodes + 1, 0])
+    n_left = _update_stack_bw(
+        nodes,
+        new_receivers,
+        receiver_nodes,
+        delta,
+        D,
+        s,
+        stack_position,
+        upstream_count,
+        bounds,
+    )
+    if n_left > 0:
+        raise ValueError("receivers do not make a tree")
+
+    return (
+        slice(bounds[0], max(bounds[0], bounds[1])),
+        slice(bounds[2], max(bounds[2], bounds[3])),
+        slice(bounds[4], max(bounds[4], bounds[5])),
+    )
+
+
 def flow_accumulation(
     receiver_nodes, node_cell_area=1.0, runoff_rate=1.0, boundary_nodes=None
 ):
@@ -49,6 +49,8 @@ Created: KRB Oct 2016 (modified from flow_accumu_bw)
 import numpy
 from six.moves import range
 
+from .cfuncs import _accumulate_to_n, _make_donors_to_n, _make_visit_time_to_n
+
 
 class _DrainageStack_to_n:
 
@@ -312,7 +314,7 @@ def _make_delta_array_to_n(nd):
 
     # DEJH efficient delooping (only a small gain)
 
-    nt = sum(nd)
+    nt = numpy.sum(nd)
     np = len(nd)
     delta = numpy.zeros(np + 1, dtype=int)
     delta.fill(nt)
@@ -459,6 +461,87 @@ def make_ordered_node_array_to_n(receiver_nodes, receiver_proportion):
     return dstack.s
 
 
+def make_stack_and_donor_arrays_to_n(receiver_nodes, receiver_proportion):
+
+    """Build delta, D and the ordered node array in compiled code.
+
+    This is a compiled equivalent of calling :func:`_make_delta_array_to_n`,
+    :func:`_make_array_of_donors_to_n` and
+    :func:`make_ordered_node_array_to_n` one after the other. The walk
+    up the flow network visits the same nodes at the same times as
+    :meth:`_DrainageStack_to_n.construct__stack`, so the returned stack is
+    the same.
+
+    Parameters
+    ----------
+    receiver_nodes : ndarray of int, shape (n_nodes, n_receivers)
+        Receivers of each node.
+    receiver_proportion : ndarray of float, shape (n_nodes, n_receivers)
+        Proportion of flow going to each receiver.
+
+    Returns
+    -------
+    tuple of ndarray of int
+        The delta array, the array of donors (D), and the array of node IDs
+        ordered from downstream to upstream.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.components.flow_accum.flow_accum_to_n import(
+    ... make_stack_and_donor_arrays_to_n)
+    >>> r = np.array([[ 1,  2],
+    ...               [ 4,  5],
+    ...               [ 1,  5],
+    ...               [ 6,  2],
+    ...               [ 4, -1],
+    ...               [ 4, -1],
+    ...               [ 5,  7],
+    ...               [ 4,  5],
+    ...               [ 6,  7],
+    ...               [ 7,  8]])
+    >>> p = np.array([[ 0.6,   0.4 ],
+    ...               [ 0.85,  0.15],
+    ...               [ 0.65,  0.35],
+    ...               [ 0.9,   0.1 ],
+    ...               [ 1.,    0.  ],
+    ...               [ 1.,    0.  ],
+    ...               [ 0.75,  0.25],
+    ...               [ 0.55,  0.45],
+    ...               [ 0.8,   0.2 ],
+    ...               [ 0.95,  0.05]])
+    >>> delta, D, s = make_stack_and_donor_arrays_to_n(r, p)
+    >>> delta
+    array([ 0,  0,  2,  4,  4,  8,  12,  14, 17, 18, 18])
+    >>> D
+    array([0, 2, 0, 3, 1, 4, 5, 7, 6, 1, 2, 7, 3, 8, 9, 6, 8, 9])
+    >>> s[0] == 4
+    True
+    >>> s[1] == 5
+    True
+    >>> s[9] == 9
+    True
+    """
+    receiver_nodes = numpy.asarray(receiver_nodes, dtype=int)
+    receiver_proportion = numpy.asarray(receiver_proportion, dtype=float)
+
+    node_id = numpy.arange(receiver_nodes.shape[0])
+    baselevel_nodes = numpy.where(node_id == receiver_nodes[:, 0])[0]
+
+    nd = _make_number_of_donors_array_to_n(receiver_nodes, receiver_proportion)
+    delta = _make_delta_array_to_n(nd)
+
+    D = numpy.empty(delta[-1], dtype=int)
+    _make_donors_to_n(receiver_nodes, receiver_proportion, delta, D)
+
+    num_receivers = numpy.sum(receiver_nodes >= 0, axis=1)
+
+    visit_time = numpy.empty(receiver_nodes.shape[0], dtype=float)
+    _make_visit_time_to_n(baselevel_nodes, delta, D, num_receivers, visit_time)
+
+    return delta, D, numpy.argsort(visit_time)
+
+
 def find_drainage_area_and_discharge_to_n(
     s, r, p, node_cell_area=1.0, runoff=1.0, boundary_nodes=None
 ):
@@ -586,6 +669,67 @@ def find_drainage_area_and_discharge_to_n(
     return drainage_area, discharge
 
 
+def find_drainage_area_and_discharge_to_n_compiled(
+    s, r, p, node_cell_area=1.0, runoff=1.0, boundary_nodes=None
+):
+
+    """Calculate the drainage area and water discharge in compiled code.
+
+    Takes the same arguments, and returns the same values, as
+    :func:`find_drainage_area_and_discharge_to_n` but the accumulation down
+    the stack is done in a single compiled pass.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.components.flow_accum.flow_accum_to_n import(
+    ... find_drainage_area_and_discharge_to_n_compiled)
+    >>> r = np.array([[ 1,  2],
+    ...               [ 4,  5],
+    ...               [ 1,  5],
+    ...               [ 6,  2],
+    ...               [ 4, -1],
+    ...               [ 4, -1],
+    ...               [ 5,  7],
+    ...               [ 4,  5],
+    ...               [ 6,  7],
+    ...               [ 7,  8]])
+    >>> p = np.array([[ 0.6,   0.4 ],
+    ...               [ 0.85,  0.15],
+    ...               [ 0.65,  0.35],
+    ...               [ 0.9,   0.1 ],
+    ...               [ 1.,    0.  ],
+    ...               [ 1.,    0.  ],
+    ...               [ 0.75,  0.25],
+    ...               [ 0.55,  0.45],
+    ...               [ 0.8,   0.2 ],
+    ...               [ 0.95,  0.05]])
+    >>> s = np.array([4, 5, 1, 7, 2, 6, 0, 8, 3, 9])
+    >>> a, q = find_drainage_area_and_discharge_to_n_compiled(s, r, p)
+    >>> a
+    array([  1.    ,   2.575 ,   1.5   ,   1.    ,  10.    ,   5.2465,
+             2.74  ,   2.845 ,   1.05  ,   1.    ])
+    """
+    np = r.shape[0]
+
+    drainage_area = numpy.zeros(np) + node_cell_area
+    discharge = numpy.zeros(np) + node_cell_area * runoff
+
+    if boundary_nodes is not None:
+        drainage_area[boundary_nodes] = 0
+        discharge[boundary_nodes] = 0
+
+    _accumulate_to_n(
+        numpy.asarray(s, dtype=int),
+        numpy.asarray(r, dtype=int),
+        numpy.asarray(p, dtype=float),
+        drainage_area,
+        discharge,
+    )
+
+    return drainage_area, discharge
+
+
 def flow_accumulation_to_n(
     receiver_nodes,
     receiver_proportions,
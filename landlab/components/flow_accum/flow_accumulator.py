@@ -107,7 +107,33 @@ class FlowAccumulator(Component):
          A string of class name (e.g., 'DepressionFinderAndRouter'), an
          uninstantiated DepressionFinder class, or an instance of a
          DepressionFinder class.
-         This sets the method for depression finding.
+         This sets the method for depression finding. Use
+         'PriorityFloodDepressionFinder' for a faster, compiled alternative
+         to 'DepressionFinderAndRouter' on large grids.
+    accumulation_engine : {'python', 'compiled'}, optional
+        Implementation used to build the drainage stack and accumulate
+        drainage area and discharge. The 'compiled' engine builds the donor
+        arrays and stack with non-recursive compiled kernels, for both
+        route-to-one and route-to-many flow directors, and gives identical
+        results to the default 'python' engine, but is much faster on large
+        grids. It has no effect on flow that is rerouted by a depression
+        finder.
+    incremental : bool, optional
+        If True, each call to run_one_step finds the nodes whose surface
+        value has changed since the last call and only updates flow
+        directions near those nodes, drainage area and discharge along
+        the flow paths whose receivers have changed, and the parts of the
+        drainage stack (and of the D and delta data structures) between the
+        old and new places of the nodes upstream of them. Changed nodes are
+        found by comparing the whole surface with its last value, unless
+        callers mark them with :meth:`mark_changed`. A full update is done
+        on the first call, if boundary conditions or *water__unit_flux_in*
+        have changed, or if the fraction of changed nodes is larger than
+        *incremental_threshold*. Only available for route-to-one flow
+        directors and without a depression finder. Default is False.
+    incremental_threshold : float, optional
+        Fraction of changed nodes above which a full update is done rather
+        than an incremental one. Default is 0.05.
     **kwargs : any additional parameters to pass to a FlowDirector or
          DepressionFinderAndRouter instance (e.g., partion_method for
          FlowDirectorMFD). This will have no effect if an instantiated component
@@ -577,6 +603,9 @@ class FlowAccumulator(Component):
         flow_director="FlowDirectorSteepest",
         runoff_rate=None,
         depression_finder=None,
+        accumulation_engine="python",
+        incremental=False,
+        incremental_threshold=0.05,
         **kwargs
     ):
         """
@@ -594,6 +623,13 @@ class FlowAccumulator(Component):
         self._is_raster = isinstance(self._grid, RasterModelGrid)
         self._is_Voroni = isinstance(self._grid, VoronoiDelaunayGrid)
 
+        if accumulation_engine not in ("python", "compiled"):
+            raise ValueError(
+                "accumulation_engine must be one of 'python' or 'compiled' "
+                "(got {engine!r})".format(engine=accumulation_engine)
+            )
+        self._accumulation_engine = accumulation_engine
+
         self.kwargs = kwargs
         # STEP 1: Testing of input values, supplied either in function call or
         # as part of the grid.
@@ -614,6 +650,26 @@ class FlowAccumulator(Component):
         self._add_director(flow_director)
         self._add_depression_finder(depression_finder)
 
+        self._incremental = incremental
+        self._incremental_threshold = incremental_threshold
+        self._track_changes = False
+        self._changed_nodes = []
+        self._last_surface = None
+        self._last_runoff = None
+        self._receivers = None
+        if self._incremental:
+            if self.flow_director.to_n_receivers != "one":
+                raise NotImplementedError(
+                    "Incremental flow accumulation only works with route to "
+                    "one FlowDirectors such as FlowDirectorSteepest and "
+                    "FlowDirectorD8."
+                )
+            if self.depression_finder is not None:
+                raise NotImplementedError(
+                    "Incremental flow accumulation does not work with a "
+                    "depression finder."
+                )
+
         # This component will track of the following variables.
         # Attempt to create each, if they already exist, assign the existing
         # version to the local copy.
@@ -638,9 +694,9 @@ class FlowAccumulator(Component):
         if "flow__upstream_node_order" not in grid.at_node:
             self.upstream_ordered_nodes = grid.add_field(
                 "flow__upstream_node_order",
-                BAD_INDEX_VALUE * grid.ones(at="node", dtype=int),
+                BAD_INDEX_VALUE * grid.ones(at="node", dtype=grid.index_dtype),
                 at="node",
-                dtype=int,
+                dtype=grid.index_dtype,
             )
         else:
             self.upstream_ordered_nodes = grid.at_node["flow__upstream_node_order"]
@@ -648,9 +704,9 @@ class FlowAccumulator(Component):
         if "flow__data_structure_delta" not in grid.at_node:
             self.delta_structure = grid.add_field(
                 "flow__data_structure_delta",
-                BAD_INDEX_VALUE * grid.ones(at="node", dtype=int),
+                BAD_INDEX_VALUE * grid.ones(at="node", dtype=grid.index_dtype),
                 at="node",
-                dtype=int,
+                dtype=grid.index_dtype,
             )
         else:
             self.delta_structure = grid.at_node["flow__data_structure_delta"]
@@ -812,7 +868,10 @@ class FlowAccumulator(Component):
 
     def _add_depression_finder(self, depression_finder):
         """Test and add the depression finder component."""
-        PERMITTED_DEPRESSION_FINDERS = ["DepressionFinderAndRouter"]
+        PERMITTED_DEPRESSION_FINDERS = [
+            "DepressionFinderAndRouter",
+            "PriorityFloodDepressionFinder",
+        ]
 
         # now do a similar thing for the depression finder.
         self.depression_finder_provided = depression_finder
@@ -861,10 +920,14 @@ class FlowAccumulator(Component):
             # depression finder is provided as a string.
             if isinstance(self.depression_finder_provided, six.string_types):
 
-                from landlab.components import DepressionFinderAndRouter
+                from landlab.components import (
+                    DepressionFinderAndRouter,
+                    PriorityFloodDepressionFinder,
+                )
 
                 DEPRESSION_METHODS = {
-                    "DepressionFinderAndRouter": DepressionFinderAndRouter
+                    "DepressionFinderAndRouter": DepressionFinderAndRouter,
+                    "PriorityFloodDepressionFinder": PriorityFloodDepressionFinder,
                 }
 
                 try:
@@ -936,6 +999,13 @@ class FlowAccumulator(Component):
             4. Depression finding and mapping, which updates drainage area and
             discharge.
         """
+        if update_flow_director and self._incremental:
+            if self._accumulate_flow_incrementally():
+                return (
+                    self._grid["node"]["drainage_area"],
+                    self._grid["node"]["surface_water__discharge"],
+                )
+
         # step 1. Find flow directions by specified method
         if update_flow_director == True:
             self.flow_director.run_one_step()
@@ -958,10 +1028,13 @@ class FlowAccumulator(Component):
                 r = self._grid["node"]["flow__receiver_node"]
 
                 # step 2. Stack, D, delta construction
-                nd = flow_accum_bw._make_number_of_donors_array(r)
-                delta = flow_accum_bw._make_delta_array(nd)
-                D = flow_accum_bw._make_array_of_donors(r, delta)
-                s = flow_accum_bw.make_ordered_node_array(r)
+                if self._accumulation_engine == "compiled":
+                    delta, D, s = flow_accum_bw.make_stack_and_donor_arrays(r)
+                else:
+                    nd = flow_accum_bw._make_number_of_donors_array(r)
+                    delta = flow_accum_bw._make_delta_array(nd)
+                    D = flow_accum_bw._make_array_of_donors(r, delta)
+                    s = flow_accum_bw.make_ordered_node_array(r)
 
                 # put theese in grid so that depression finder can use it.
                 # store the generated data in the grid
@@ -970,7 +1043,15 @@ class FlowAccumulator(Component):
                 self._grid["node"]["flow__upstream_node_order"][:] = s
 
                 # step 4. Accumulate (to one or to N depending on direction method. )
-                a, q = flow_accum_bw.find_drainage_area_and_discharge(
+                if self._accumulation_engine == "compiled":
+                    find_area_and_discharge = (
+                        flow_accum_bw.find_drainage_area_and_discharge_compiled
+                    )
+                else:
+                    find_area_and_discharge = (
+                        flow_accum_bw.find_drainage_area_and_discharge
+                    )
+                a, q = find_area_and_discharge(
                     s, r, self.node_cell_area, self._grid.at_node["water__unit_flux_in"]
                 )
                 self._grid["node"]["drainage_area"][:] = a
@@ -982,10 +1063,13 @@ class FlowAccumulator(Component):
             p = self._grid["node"]["flow__receiver_proportions"]
 
             # step 2. Stack, D, delta construction
-            nd = flow_accum_to_n._make_number_of_donors_array_to_n(r, p)
-            delta = flow_accum_to_n._make_delta_array_to_n(nd)
-            D = flow_accum_to_n._make_array_of_donors_to_n(r, p, delta)
-            s = flow_accum_to_n.make_ordered_node_array_to_n(r, p)
+            if self._accumulation_engine == "compiled":
+                delta, D, s = flow_accum_to_n.make_stack_and_donor_arrays_to_n(r, p)
+            else:
+                nd = flow_accum_to_n._make_number_of_donors_array_to_n(r, p)
+                delta = flow_accum_to_n._make_delta_array_to_n(nd)
+                D = flow_accum_to_n._make_array_of_donors_to_n(r, p, delta)
+                s = flow_accum_to_n.make_ordered_node_array_to_n(r, p)
 
             # put theese in grid so that depression finder can use it.
             # store the generated data in the grid
@@ -1005,7 +1089,15 @@ class FlowAccumulator(Component):
             # at present this must go at the end.
 
             # step 4. Accumulate (to one or to N depending on direction method. )
-            a, q = flow_accum_to_n.find_drainage_area_and_discharge_to_n(
+            if self._accumulation_engine == "compiled":
+                find_area_and_discharge = (
+                    flow_accum_to_n.find_drainage_area_and_discharge_to_n_compiled
+                )
+            else:
+                find_area_and_discharge = (
+                    flow_accum_to_n.find_drainage_area_and_discharge_to_n
+                )
+            a, q = find_area_and_discharge(
                 s, r, p, self.node_cell_area, self._grid.at_node["water__unit_flux_in"]
             )
             # store drainage area and discharge.
@@ -1017,8 +1109,161 @@ class FlowAccumulator(Component):
             # if self.depression_finder_provided is not None:
             #     self.depression_finder.map_depressions()
 
+        if self._incremental:
+            self._save_incremental_state()
+
         return (a, q)
 
+    def mark_changed(self, nodes):
+        """Mark nodes whose surface value or runoff has changed.
+
+        In incremental mode, the nodes that have changed are otherwise found
+        by comparing the whole surface, and *water__unit_flux_in*, with
+        their values at the last update. Once this has been called, they
+        are not compared, and the next update looks only at the nodes that
+        have been marked since the last one, so callers must then mark
+        every node that they change.
+
+        Parameters
+        ----------
+        nodes : array_like of int
+            Nodes whose surface value or runoff has changed.
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid
+        >>> from landlab.components import FlowAccumulator
+        >>> mg = RasterModelGrid((3, 4))
+        >>> mg.set_closed_boundaries_at_grid_edges(True, True, True, False)
+        >>> z = mg.add_field('topographic__elevation',
+        ...                  mg.node_x + mg.node_y, at='node')
+        >>> fa = FlowAccumulator(mg, flow_director='D4', incremental=True)
+        >>> fa.run_one_step()
+        >>> mg.at_node['drainage_area'][1:3]
+        array([ 1.,  1.])
+
+        Lower node 5 so that node 6 now drains to it.
+
+        >>> z[5] = 1.5
+        >>> fa.mark_changed([5])
+        >>> fa.run_one_step()
+        >>> mg.at_node['drainage_area'][1:3]
+        array([ 2.,  0.])
+        """
+        self._track_changes = True
+        self._changed_nodes.append(np.asarray(nodes, dtype=int).reshape((-1,)))
+
+    def _save_incremental_state(self):
+        """Save what is needed to find what changes before the next update.
+
+        Native copies of the receivers, delta, D and the stack are kept,
+        with the position of each node in the stack and the number of nodes
+        upstream of it, so that they can be updated in place.
+        """
+        self._changed_nodes = []
+        self._last_surface = self.flow_director.surface_values.copy()
+        self._last_runoff = self._grid.at_node["water__unit_flux_in"].copy()
+        self._last_bc_set_code = self._grid.bc_set_code
+
+        n_nodes = self._grid.number_of_nodes
+        self._receivers = np.array(self._grid["node"]["flow__receiver_node"], dtype=int)
+        self._stack = np.array(self._grid["node"]["flow__upstream_node_order"], dtype=int)
+        self._delta = np.zeros(n_nodes + 1, dtype=int)
+        self._delta[1:] = self._grid["node"]["flow__data_structure_delta"]
+        self._donors = np.array(
+            self._grid["link"]["flow__data_structure_D"][:n_nodes], dtype=int
+        )
+        self._stack_position = np.empty(n_nodes, dtype=int)
+        self._stack_position[self._stack] = np.arange(n_nodes)
+        self._upstream_count = np.empty(n_nodes, dtype=int)
+        flow_accum_bw._count_upstream_nodes(
+            self._stack, self._receivers, self._upstream_count
+        )
+
+    def _find_changed_nodes(self):
+        """Find the nodes that have changed since the last update.
+
+        Returns
+        -------
+        ndarray of int or None
+            The changed nodes, or None if runoff has changed and a full
+            update is needed.
+        """
+        surface = self.flow_director.surface_values
+        runoff = self._grid.at_node["water__unit_flux_in"]
+
+        if not self._track_changes:
+            if not np.array_equal(runoff, self._last_runoff):
+                return None
+            (changed,) = np.where(surface != self._last_surface)
+            self._last_surface[changed] = surface[changed]
+            return changed
+
+        if len(self._changed_nodes) == 0:
+            return np.empty(0, dtype=int)
+        changed = np.unique(np.concatenate(self._changed_nodes))
+        self._changed_nodes = []
+        if np.any(runoff[changed] != self._last_runoff[changed]):
+            return None
+        return changed
+
+    def _accumulate_flow_incrementally(self):
+        """Update flow directions and accumulation near changed nodes only.
+
+        Returns
+        -------
+        bool
+            True if the update was done, or False if a full update is needed.
+        """
+        self.flow_director._changed_surface()
+
+        if (
+            self._receivers is None
+            or self._last_bc_set_code != self._grid.bc_set_code
+        ):
+            return False
+
+        changed = self._find_changed_nodes()
+        if (
+            changed is None
+            or changed.size > self._incremental_threshold * self._grid.number_of_nodes
+        ):
+            return False
+
+        if changed.size > 0:
+            nodes, old_receivers = self.flow_director.direct_flow_near_nodes(changed)
+
+            if nodes.size > 0:
+                r = self._grid["node"]["flow__receiver_node"]
+                flow_accum_bw.reroute_drainage_area_and_discharge(
+                    nodes,
+                    old_receivers,
+                    r,
+                    self._grid["node"]["drainage_area"],
+                    self._grid["node"]["surface_water__discharge"],
+                )
+
+                # Move the subtrees of the changed nodes in the stack, and
+                # copy only the parts that have changed to the fields.
+                self._receivers[nodes] = r[nodes]
+                s, D, delta = flow_accum_bw.update_stack_and_donor_arrays(
+                    nodes,
+                    old_receivers,
+                    self._receivers,
+                    self._delta,
+                    self._donors,
+                    self._stack,
+                    self._stack_position,
+                    self._upstream_count,
+                )
+                self._grid["node"]["flow__upstream_node_order"][s] = self._stack[s]
+                self._grid["link"]["flow__data_structure_D"][D] = self._donors[D]
+                self._grid["node"]["flow__data_structure_delta"][
+                    delta.start - 1 : delta.stop - 1
+                ] = self._delta[delta]
+
+        return True
+
     def run_one_step(self):
         """
         Accumulate flow and save to the model grid.
@@ -3,9 +3,25 @@ import numpy as np
 from numpy.testing import assert_array_equal
 
 from landlab.components.flow_accum.flow_accum_to_n import (
-    find_drainage_area_and_discharge_to_n
+    _make_array_of_donors_to_n,
+    _make_delta_array_to_n,
+    _make_number_of_donors_array_to_n,
+    find_drainage_area_and_discharge_to_n,
+    find_drainage_area_and_discharge_to_n_compiled,
+    make_ordered_node_array_to_n,
+    make_stack_and_donor_arrays_to_n,
+)
+from landlab.components.flow_accum import (
+    find_drainage_area_and_discharge,
+    find_drainage_area_and_discharge_compiled,
+    make_ordered_node_array,
+    make_stack_and_donor_arrays,
+)
+from landlab.components.flow_accum.flow_accum_bw import (
+    _make_array_of_donors,
+    _make_delta_array,
+    _make_number_of_donors_array,
 )
-from landlab.components.flow_accum import find_drainage_area_and_discharge
 
 
 def test_boundary_to_n():
@@ -50,3 +66,96 @@ def test_boundary_bw():
     a, q = find_drainage_area_and_discharge(s, r, boundary_nodes=[0])
     true_a = np.array([0., 2., 1., 1., 9., 4., 3., 2., 1., 1.])
     assert_array_equal(a, true_a)
+
+
+def test_boundary_bw_compiled():
+    r = np.array([2, 5, 2, 7, 5, 5, 6, 5, 7, 8]) - 1
+    s = np.array([4, 1, 0, 2, 5, 6, 3, 8, 7, 9])
+    a, q = find_drainage_area_and_discharge_compiled(s, r, boundary_nodes=[0])
+    true_a = np.array([0., 2., 1., 1., 9., 4., 3., 2., 1., 1.])
+    assert_array_equal(a, true_a)
+
+
+def test_compiled_stack_matches_python():
+    np.random.seed(42)
+    n_nodes = 2000
+    # A random forest: every node drains to a node with a smaller ID, or to
+    # itself, so there are no cycles.
+    r = np.array([np.random.randint(0, i + 1) for i in range(n_nodes)])
+    area = np.random.rand(n_nodes)
+    runoff = np.random.rand(n_nodes)
+
+    delta, D, s = make_stack_and_donor_arrays(r)
+
+    assert_array_equal(delta, _make_delta_array(_make_number_of_donors_array(r)))
+    assert_array_equal(D, _make_array_of_donors(r, delta))
+    assert_array_equal(s, make_ordered_node_array(r))
+
+    a_py, q_py = find_drainage_area_and_discharge(s, r, area, runoff)
+    a_c, q_c = find_drainage_area_and_discharge_compiled(s, r, area, runoff)
+    assert_array_equal(a_c, a_py)
+    assert_array_equal(q_c, q_py)
+
+
+def test_compiled_stack_long_chain():
+    n_nodes = 200000
+    r = np.arange(n_nodes) - 1
+    r[0] = 0
+
+    delta, D, s = make_stack_and_donor_arrays(r)
+    assert_array_equal(s, np.arange(n_nodes))
+
+    a, q = find_drainage_area_and_discharge_compiled(s, r)
+    assert_array_equal(a, np.arange(n_nodes, 0, -1))
+
+
+def test_compiled_stack_to_n_matches_python():
+    np.random.seed(42)
+    n_nodes = 1000
+    # Every node drains to up to three distinct nodes with smaller IDs;
+    # the first few nodes are base level and drain to themselves.
+    r = -np.ones((n_nodes, 3), dtype=int)
+    p = np.zeros((n_nodes, 3))
+    for node in range(n_nodes):
+        if node < 5:
+            r[node, 0] = node
+            p[node, 0] = 1.
+        else:
+            n_receivers = np.random.randint(1, 4)
+            r[node, :n_receivers] = np.random.choice(
+                node, size=n_receivers, replace=False
+            )
+            p[node, :n_receivers] = np.random.rand(n_receivers)
+            p[node] /= p[node].sum()
+    area = np.random.rand(n_nodes)
+
+    delta, D, s = make_stack_and_donor_arrays_to_n(r, p)
+
+    assert_array_equal(
+        delta, _make_delta_array_to_n(_make_number_of_donors_array_to_n(r, p))
+    )
+    assert_array_equal(D, _make_array_of_donors_to_n(r, p, delta))
+    assert_array_equal(s, make_ordered_node_array_to_n(r, p))
+
+    a_py, q_py = find_drainage_area_and_discharge_to_n(s, r, p, area)
+    a_c, q_c = find_drainage_area_and_discharge_to_n_compiled(s, r, p, area)
+    assert_array_equal(a_c, a_py)
+    assert_array_equal(q_c, q_py)
+
+
+def test_boundary_to_n_compiled():
+    r = np.array(
+        [[1, 2], [4, 5], [1, 5], [6, 2], [4, -1],
+         [4, -1], [5, 7], [4, 5], [6, 7], [7, 8]]
+    )
+    p = np.array(
+        [[0.6, 0.4], [0.85, 0.15], [0.65, 0.35], [0.9, 0.1], [1., 0.],
+         [1., 0.], [0.75, 0.25], [0.55, 0.45], [0.8, 0.2], [0.95, 0.05]]
+    )
+    s = np.array([4, 5, 1, 7, 2, 6, 0, 8, 3, 9])
+
+    a, q = find_drainage_area_and_discharge_to_n_compiled(
+        s, r, p, boundary_nodes=[0]
+    )
+    true_a = np.array([0., 1.715, 1.1, 1., 9., 4.9775, 2.74, 2.845, 1.05, 1.])
+    assert_array_equal(a, true_a)
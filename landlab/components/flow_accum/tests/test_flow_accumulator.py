@@ -1024,3 +1024,196 @@ def test_hex_mfd():
     z = mg.add_field("topographic__elevation", mg.node_x + mg.node_y, at="node")
     fa = FlowAccumulator(mg, flow_director="MFD")
     fa.run_one_step()
+
+
+@pytest.mark.parametrize("flow_director", ["D4", "D8", "MFD", "DINF"])
+def test_compiled_engine_matches_python(flow_director):
+    np.random.seed(1)
+    z = np.random.rand(30 * 40)
+    runoff = np.random.rand(30 * 40)
+
+    grids = []
+    for engine in ("python", "compiled"):
+        mg = RasterModelGrid((30, 40), spacing=(1, 1))
+        mg.set_closed_boundaries_at_grid_edges(True, False, True, False)
+        mg.add_field("topographic__elevation", z.copy(), at="node")
+        mg.add_field("water__unit_flux_in", runoff.copy(), at="node")
+        fa = FlowAccumulator(
+            mg, flow_director=flow_director, accumulation_engine=engine
+        )
+        fa.run_one_step()
+        grids.append(mg)
+
+    for name in (
+        "flow__upstream_node_order",
+        "flow__data_structure_delta",
+        "drainage_area",
+    ):
+        assert_array_equal(grids[0].at_node[name], grids[1].at_node[name])
+    assert_array_equal(
+        grids[0].at_link["flow__data_structure_D"],
+        grids[1].at_link["flow__data_structure_D"],
+    )
+    assert_array_almost_equal(
+        grids[0].at_node["surface_water__discharge"],
+        grids[1].at_node["surface_water__discharge"],
+    )
+
+
+def test_bad_accumulation_engine():
+    mg = RasterModelGrid((5, 5), spacing=(1, 1))
+    mg.add_field("topographic__elevation", mg.node_x + mg.node_y, at="node")
+    with pytest.raises(ValueError):
+        FlowAccumulator(mg, accumulation_engine="fortran")
+
+
+@pytest.mark.parametrize("mark_changed", [False, True])
+@pytest.mark.parametrize("flow_director", ["D4", "D8"])
+def test_incremental_matches_full(flow_director, mark_changed):
+    np.random.seed(7)
+    z = np.random.rand(25 * 30)
+
+    grids = []
+    accumulators = []
+    for incremental in (False, True):
+        mg = RasterModelGrid((25, 30), spacing=(2., 3.))
+        mg.set_closed_boundaries_at_grid_edges(True, False, True, False)
+        mg.add_field("topographic__elevation", z.copy(), at="node")
+        fa = FlowAccumulator(
+            mg, flow_director=flow_director, incremental=incremental
+        )
+        fa.run_one_step()
+        grids.append(mg)
+        accumulators.append(fa)
+
+    for _ in range(20):
+        row, col = np.random.randint(1, 22), np.random.randint(1, 27)
+        patch = (
+            np.arange(row, row + 3).reshape((-1, 1)) * 30 + np.arange(col, col + 3)
+        ).flatten()
+        dz = np.random.rand(patch.size) - 0.5
+        for mg, fa in zip(grids, accumulators):
+            mg.at_node["topographic__elevation"][patch] += dz
+            if mark_changed and fa._incremental:
+                fa.mark_changed(patch)
+            fa.run_one_step()
+
+        for name in (
+            "flow__receiver_node",
+            "flow__link_to_receiver_node",
+            "topographic__steepest_slope",
+            "flow__sink_flag",
+            "flow__upstream_node_order",
+            "flow__data_structure_delta",
+        ):
+            assert_array_equal(grids[0].at_node[name], grids[1].at_node[name])
+        assert_array_equal(
+            grids[0].at_link["flow__data_structure_D"],
+            grids[1].at_link["flow__data_structure_D"],
+        )
+        assert_array_almost_equal(
+            grids[0].at_node["drainage_area"], grids[1].at_node["drainage_area"]
+        )
+        assert_array_almost_equal(
+            grids[0].at_node["surface_water__discharge"],
+            grids[1].at_node["surface_water__discharge"],
+        )
+
+
+def test_incremental_falls_back_to_full_update():
+    mg = RasterModelGrid((10, 10), spacing=(1, 1))
+    z = mg.add_field("topographic__elevation", mg.node_x + mg.node_y, at="node")
+    fa = FlowAccumulator(mg, flow_director="D8", incremental=True)
+    fa.run_one_step()
+
+    z[:] = mg.node_y - mg.node_x
+    fa.run_one_step()
+
+    mg2 = RasterModelGrid((10, 10), spacing=(1, 1))
+    mg2.add_field("topographic__elevation", mg2.node_y - mg2.node_x, at="node")
+    FlowAccumulator(mg2, flow_director="D8").run_one_step()
+    assert_array_equal(mg.at_node["drainage_area"], mg2.at_node["drainage_area"])
+
+
+def test_incremental_only_looks_at_marked_nodes():
+    mg = RasterModelGrid((10, 10), spacing=(1, 1))
+    z = mg.add_field("topographic__elevation", mg.node_x + mg.node_y, at="node")
+    fa = FlowAccumulator(mg, flow_director="D8", incremental=True)
+    fa.run_one_step()
+    fa.mark_changed([])
+    area = mg.at_node["drainage_area"].copy()
+
+    z[55] = -1.
+    fa.run_one_step()
+    assert_array_equal(mg.at_node["drainage_area"], area)
+
+    fa.mark_changed([55])
+    fa.run_one_step()
+    mg2 = RasterModelGrid((10, 10), spacing=(1, 1))
+    mg2.add_field("topographic__elevation", z.copy(), at="node")
+    FlowAccumulator(mg2, flow_director="D8").run_one_step()
+    assert_array_almost_equal(
+        mg.at_node["drainage_area"], mg2.at_node["drainage_area"]
+    )
+    assert_array_equal(
+        mg.at_node["flow__upstream_node_order"],
+        mg2.at_node["flow__upstream_node_order"],
+    )
+
+
+def test_incremental_with_to_many_or_depression_finder():
+    mg = RasterModelGrid((5, 5), spacing=(1, 1))
+    mg.add_field("topographic__elevation", mg.node_x + mg.node_y, at="node")
+    with pytest.raises(NotImplementedError):
+        FlowAccumulator(mg, flow_director="MFD", incremental=True)
+    with pytest.raises(NotImplementedError):
+        FlowAccumulator(
+            mg,
+            flow_director="D8",
+            depression_finder="DepressionFinderAndRouter",
+            incremental=True,
+        )
+
+
+@pytest.mark.parametrize(
+    "kwds",
+    [
+        dict(flow_director="D4"),
+        dict(flow_director="D8"),
+        dict(flow_director="MFD"),
+        dict(flow_director="D8", depression_finder="DepressionFinderAndRouter"),
+        dict(
+            flow_director="D8",
+            depression_finder="DepressionFinderAndRouter",
+            depression_finder_kwds=dict(method="priority_flood"),
+        ),
+        dict(flow_director="D8", incremental=True),
+    ],
+)
+def test_int32_ids(kwds):
+    np.random.seed(3)
+    z = np.random.rand(12 * 15)
+    z[40] -= 2.
+
+    grids = []
+    for index_dtype in (int, np.int32):
+        mg = RasterModelGrid((12, 15), index_dtype=index_dtype)
+        mg.add_field("topographic__elevation", z.copy(), at="node")
+        fa = FlowAccumulator(mg, **kwds)
+        fa.run_one_step()
+        mg.at_node["topographic__elevation"][60:63] += 0.5
+        fa.run_one_step()
+        grids.append(mg)
+
+    if kwds["flow_director"] != "MFD":
+        assert grids[1].at_node["flow__receiver_node"].dtype == np.int32
+        assert grids[1].at_node["flow__link_to_receiver_node"].dtype == np.int32
+    assert grids[1].at_node["flow__upstream_node_order"].dtype == np.int32
+    for name in (
+        "flow__receiver_node",
+        "flow__link_to_receiver_node",
+        "flow__upstream_node_order",
+        "drainage_area",
+        "surface_water__discharge",
+    ):
+        assert_array_equal(grids[1].at_node[name], grids[0].at_node[name])
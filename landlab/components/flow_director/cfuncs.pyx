@@ -10,18 +10,25 @@ DTYPE_INT = np.int
 #ctypedef np.longlong_t DTYPE_INT_t
 ctypedef np.int_t DTYPE_INT_t
 
+ctypedef fused id_t:
+    int
+    long
+
 
 @cython.boundscheck(False)
-def adjust_flow_receivers(np.ndarray[DTYPE_INT_t, ndim=1] src_nodes,
-                          np.ndarray[DTYPE_INT_t, ndim=1] dst_nodes,
+def adjust_flow_receivers(np.ndarray[id_t, ndim=1] src_nodes,
+                          np.ndarray[id_t, ndim=1] dst_nodes,
                           np.ndarray[DTYPE_FLOAT_t, ndim=1] z,
                           np.ndarray[DTYPE_FLOAT_t, ndim=1] link_slope,
-                          np.ndarray[DTYPE_INT_t, ndim=1] active_links,
-                          np.ndarray[DTYPE_INT_t, ndim=1] receiver,
-                          np.ndarray[DTYPE_INT_t, ndim=1] receiver_link,
+                          np.ndarray[id_t, ndim=1] active_links,
+                          np.ndarray[id_t, ndim=1] receiver,
+                          np.ndarray[id_t, ndim=1] receiver_link,
                           np.ndarray[DTYPE_FLOAT_t, ndim=1] steepest_slope):
     """Adjust flow receivers based on link slopes and steepest gradients.
 
+    The arrays of IDs must all be of the same type, either 32- or 64-bit
+    integers.
+
     Parameters
     ----------
     src_nodes : array_like
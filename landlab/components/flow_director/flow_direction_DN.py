@@ -91,11 +91,16 @@ def flow_directions(
     # *  Pass active_links in as argument
     # *  In calling code, only refer to receiver_links for active nodes
 
-    # Setup
+    # Setup. IDs are of the same type as those of the active links.
+    active_links = np.asarray(active_links)
+    tail_node = np.asarray(tail_node, dtype=active_links.dtype)
+    head_node = np.asarray(head_node, dtype=active_links.dtype)
+
     num_nodes = len(elev)
     steepest_slope = np.zeros(num_nodes)
-    receiver = np.arange(num_nodes)
-    receiver_link = UNDEFINED_INDEX + np.zeros(num_nodes, dtype=np.int)
+    receiver = np.arange(num_nodes, dtype=active_links.dtype)
+    receiver_link = np.full(num_nodes, UNDEFINED_INDEX,
+                            dtype=active_links.dtype)
 
     # For each link, find the higher of the two nodes. The higher is the
     # potential donor, and the lower is the potential receiver. If the slope
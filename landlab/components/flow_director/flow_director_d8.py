@@ -14,6 +14,7 @@ from landlab.components.flow_director.flow_director_to_one import _FlowDirectorT
 from landlab.components.flow_director import flow_direction_DN
 from landlab import FIXED_VALUE_BOUNDARY, FIXED_GRADIENT_BOUNDARY
 from landlab import VoronoiDelaunayGrid
+from landlab.grid.structured_quad import links as squad_links
 import numpy
 
 
@@ -132,6 +133,14 @@ class FlowDirectorD8(_FlowDirectorToOne):
         self._activelink_tail = nodes_at_d8[:, 0]
         self._activelink_head = nodes_at_d8[:, 1]
 
+    def _length_of_active_links(self):
+        """Length of each active link and diagonal, as used to find slopes."""
+        is_vertical = squad_links.is_vertical_link(self._grid.shape, self._active_links)
+        length = numpy.where(is_vertical, self._grid.dy, self._grid.dx)
+        is_diagonal = self._active_links >= self._grid.number_of_links
+        length[is_diagonal] = numpy.sqrt(self._grid.dy ** 2. + self._grid.dx ** 2.)
+        return length
+
     def run_one_step(self):
         """
         Find flow directions and save to the model grid.
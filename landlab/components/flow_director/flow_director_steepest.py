@@ -168,6 +168,10 @@ class FlowDirectorSteepest(_FlowDirectorToOne):
         self._activelink_tail = self.grid.node_at_link_tail[self.grid.active_links]
         self._activelink_head = self.grid.node_at_link_head[self.grid.active_links]
 
+    def _length_of_active_links(self):
+        """Length of each active link, as used to find link slopes."""
+        return self._grid.length_of_link[self._active_links]
+
     def run_one_step(self):
         """
         Find flow directions and save to the model grid.
@@ -9,8 +9,11 @@ fields are set up correctly.
 
 from landlab import FieldError
 from landlab.components.flow_director.flow_director import _FlowDirector
+from landlab.components.flow_director.cfuncs import adjust_flow_receivers
+from landlab.core.utils import as_id_array
 import numpy
 from landlab import BAD_INDEX_VALUE
+from landlab import FIXED_VALUE_BOUNDARY, FIXED_GRADIENT_BOUNDARY
 
 
 class _FlowDirectorToOne(_FlowDirector):
@@ -113,9 +116,9 @@ class _FlowDirectorToOne(_FlowDirector):
         if "flow__receiver_node" not in grid.at_node:
             self.receiver = grid.add_field(
                 "flow__receiver_node",
-                BAD_INDEX_VALUE * grid.ones(at="node", dtype=int),
+                BAD_INDEX_VALUE * grid.ones(at="node", dtype=grid.index_dtype),
                 at="node",
-                dtype=int,
+                dtype=grid.index_dtype,
             )
         else:
             self.receiver = grid.at_node["flow__receiver_node"]
@@ -130,9 +133,9 @@ class _FlowDirectorToOne(_FlowDirector):
         if "flow__link_to_receiver_node" not in grid.at_node:
             self.links_to_receiver = grid.add_field(
                 "flow__link_to_receiver_node",
-                BAD_INDEX_VALUE * grid.ones(at="node", dtype=int),
+                BAD_INDEX_VALUE * grid.ones(at="node", dtype=grid.index_dtype),
                 at="node",
-                dtype=int,
+                dtype=grid.index_dtype,
             )
 
         else:
@@ -144,6 +147,140 @@ class _FlowDirectorToOne(_FlowDirector):
         """run_one_step is not implemented for this component."""
         raise NotImplementedError("run_one_step()")
 
+    def _length_of_active_links(self):
+        """Length of each of the links over which flow may be directed."""
+        raise NotImplementedError("_length_of_active_links()")
+
+    def _setup_local_update(self):
+        """Index the active links attached to each node."""
+        ends = numpy.concatenate((self._activelink_tail, self._activelink_head))
+        positions = numpy.concatenate((numpy.arange(len(self._active_links)),) * 2)
+
+        self._link_positions_at_node = positions[numpy.argsort(ends, kind="mergesort")]
+        self._link_positions_offset = numpy.zeros(
+            self._grid.number_of_nodes + 1, dtype=int
+        )
+        numpy.cumsum(
+            numpy.bincount(ends, minlength=self._grid.number_of_nodes),
+            out=self._link_positions_offset[1:],
+        )
+        self._length_of_active = self._length_of_active_links()
+        self._local_update_bc_set_code = self._bc_set_code
+
+    def _active_link_positions_at_nodes(self, nodes):
+        """Sorted positions, within the active links, of links at nodes."""
+        start = self._link_positions_offset[nodes]
+        count = self._link_positions_offset[nodes + 1] - start
+        index = numpy.repeat(start - numpy.cumsum(count) + count, count)
+        index += numpy.arange(index.size)
+        return numpy.unique(self._link_positions_at_node[index])
+
+    def direct_flow_near_nodes(self, nodes):
+        """Update flow directions near a set of nodes only.
+
+        Flow directions are recalculated for *nodes* and for their
+        neighbors (which are the only other nodes whose steepest descent can
+        be affected by a change in elevation at *nodes*). Results are the
+        same as those from a call to :func:`run_one_step`, provided that the
+        surface has not changed anywhere else since the last time flow
+        directions were found.
+
+        Parameters
+        ----------
+        nodes : array_like of int
+            Nodes whose surface value has changed.
+
+        Returns
+        -------
+        tuple of ndarray of int
+            The nodes whose receiver has changed, and their previous
+            receivers.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab import RasterModelGrid
+        >>> from landlab.components import FlowDirectorSteepest
+        >>> mg = RasterModelGrid((3, 4))
+        >>> mg.set_closed_boundaries_at_grid_edges(True, True, True, False)
+        >>> z = mg.add_field('topographic__elevation',
+        ...                  mg.node_x + mg.node_y, at='node')
+        >>> fd = FlowDirectorSteepest(mg)
+        >>> fd.run_one_step()
+        >>> mg.at_node['flow__receiver_node'][5:7]
+        array([1, 2])
+
+        Lower node 5 so that node 6 now drains to it.
+
+        >>> z[5] = 1.5
+        >>> nodes, old_receivers = fd.direct_flow_near_nodes([5])
+        >>> nodes, old_receivers
+        (array([6]), array([2]))
+        >>> mg.at_node['flow__receiver_node'][5:7]
+        array([1, 5])
+        """
+        self._check_updated_bc()
+        self._changed_surface()
+
+        if getattr(self, "_local_update_bc_set_code", None) != self._bc_set_code:
+            self._setup_local_update()
+
+        nodes = as_id_array(numpy.asarray(nodes))
+        z = self.surface_values
+
+        positions = self._active_link_positions_at_nodes(nodes)
+        candidates = numpy.unique(
+            numpy.concatenate(
+                (
+                    nodes,
+                    self._activelink_tail[positions],
+                    self._activelink_head[positions],
+                )
+            )
+        )
+
+        positions = self._active_link_positions_at_nodes(candidates)
+        tail = self._activelink_tail[positions]
+        head = self._activelink_head[positions]
+        touched = numpy.unique(numpy.concatenate((candidates, tail, head)))
+
+        receiver = self._grid["node"]["flow__receiver_node"]
+        steepest_slope = self._grid["node"]["topographic__steepest_slope"]
+        recvr_link = self._grid["node"]["flow__link_to_receiver_node"]
+        old_receivers = receiver[touched]
+
+        receiver[candidates] = candidates
+        steepest_slope[candidates] = 0.
+        recvr_link[candidates] = BAD_INDEX_VALUE
+
+        # Only candidate nodes have been reset, so the strict comparison in
+        # adjust_flow_receivers leaves the receivers of other nodes alone.
+        link_slope = -((z[head] - z[tail]) / self._length_of_active[positions])
+        id_dtype = receiver.dtype
+        adjust_flow_receivers(
+            tail.astype(id_dtype, copy=False),
+            head.astype(id_dtype, copy=False),
+            z,
+            link_slope,
+            self._active_links[positions].astype(id_dtype, copy=False),
+            receiver,
+            recvr_link,
+            steepest_slope,
+        )
+
+        status = self._grid.status_at_node[touched]
+        baselevel_nodes = touched[
+            (status == FIXED_VALUE_BOUNDARY) | (status == FIXED_GRADIENT_BOUNDARY)
+        ]
+        receiver[baselevel_nodes] = baselevel_nodes
+        recvr_link[baselevel_nodes] = BAD_INDEX_VALUE
+        steepest_slope[baselevel_nodes] = 0.
+
+        self._grid["node"]["flow__sink_flag"][touched] = receiver[touched] == touched
+
+        is_changed = receiver[touched] != old_receivers
+        return touched[is_changed], old_receivers[is_changed]
+
 
 if __name__ == "__main__":  # pragma: no cover
     import doctest
@@ -1,8 +1,10 @@
 from .route_flow_dn import FlowRouter
 from .lake_mapper import DepressionFinderAndRouter
+from .priority_flood import PriorityFloodDepressionFinder
 from ..flow_director import flow_direction_DN
 from ..flow_director.flow_direction_DN import flow_directions
 
 
 __all__ = ['FlowRouter', 'DepressionFinderAndRouter',
+           'PriorityFloodDepressionFinder',
            'flow_directions', 'flow_direction_DN']
@@ -0,0 +1,765 @@
+import numpy as np
+cimport numpy as np
+cimport cython
+
+from libc.stdlib cimport malloc, free
+from libc.math cimport nextafter, INFINITY
+
+from landlab import CORE_NODE, CLOSED_BOUNDARY
+
+
+DTYPE = np.int
+ctypedef np.int_t DTYPE_INT_t
+DTYPE_FLOAT = np.double
+ctypedef np.double_t DTYPE_FLOAT_t
+
+cdef int _CORE = CORE_NODE
+cdef int _CLOSED = CLOSED_BOUNDARY
+
+
+cdef struct HeapItem:
+    double level
+    long order
+    long node
+
+
+cdef inline bint _comes_before(HeapItem * a, HeapItem * b):
+    if a.level < b.level:
+        return True
+    elif a.level > b.level:
+        return False
+    else:
+        return a.order < b.order
+
+
+cdef void _heap_push(HeapItem * heap, long * size, double level, long order,
+                     long node):
+    cdef long i = size[0]
+    cdef long parent
+    cdef HeapItem item
+
+    item.level = level
+    item.order = order
+    item.node = node
+
+    size[0] += 1
+    while i > 0:
+        parent = (i - 1) // 2
+        if _comes_before(&item, &heap[parent]):
+            heap[i] = heap[parent]
+            i = parent
+        else:
+            break
+    heap[i] = item
+
+
+cdef long _heap_pop(HeapItem * heap, long * size):
+    cdef long node = heap[0].node
+    cdef long i = 0
+    cdef long child
+    cdef HeapItem last
+
+    size[0] -= 1
+    last = heap[size[0]]
+    while True:
+        child = 2 * i + 1
+        if child >= size[0]:
+            break
+        if (child + 1 < size[0] and
+                _comes_before(&heap[child + 1], &heap[child])):
+            child += 1
+        if _comes_before(&heap[child], &last):
+            heap[i] = heap[child]
+            i = child
+        else:
+            break
+    heap[i] = last
+
+    return node
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef DTYPE_INT_t _priority_flood(
+    np.ndarray[DTYPE_FLOAT_t, ndim=1] z,
+    np.ndarray[DTYPE_INT_t, ndim=2] nbrs,
+    np.ndarray[DTYPE_INT_t, ndim=1] seeds,
+    np.ndarray[np.uint8_t, ndim=1] is_pit,
+    np.ndarray[DTYPE_FLOAT_t, ndim=1] water_level,
+    np.ndarray[DTYPE_INT_t, ndim=1] outlet):
+    """Fill the depressions of a surface with a priority flood.
+
+    The flood starts from the *seeds* and works inward, always expanding
+    from the lowest node on the flooded region's margin (Barnes et al., 2014,
+    Priority-Flood+). Nodes that are reached at a level above their own
+    elevation are filled to that level and processed from a FIFO queue,
+    so only nodes that rise above the current level pass through the heap.
+
+    On return, *water_level* holds the spill level of each node (its own
+    elevation if it is not in a depression), and *outlet* holds, for each
+    node in a depression or pit, the first node outside of the depression
+    on the path along which it was flooded. Nodes not connected to a seed
+    keep their elevation and an outlet of -1.
+
+    Returns the number of nodes that were reached by the flood.
+    """
+    cdef long n_nodes = z.shape[0]
+    cdef long n_nbrs = nbrs.shape[1]
+    cdef long n_seeds = seeds.shape[0]
+    cdef long heap_size = 0
+    cdef long queue_head = 0
+    cdef long queue_tail = 0
+    cdef long order = 0
+    cdef long n_visited = 0
+    cdef long i, k, node, nbr
+    cdef double level
+    cdef bint from_lake
+    cdef HeapItem * heap = <HeapItem *>malloc(n_nodes * sizeof(HeapItem))
+    cdef long * queue = <long *>malloc(n_nodes * sizeof(long))
+    cdef np.uint8_t * visited = <np.uint8_t *>malloc(n_nodes * sizeof(np.uint8_t))
+
+    if heap == NULL or queue == NULL or visited == NULL:
+        free(heap)
+        free(queue)
+        free(visited)
+        raise MemoryError()
+
+    try:
+        for node in range(n_nodes):
+            visited[node] = 0
+            water_level[node] = z[node]
+            outlet[node] = -1
+
+        for i in range(n_seeds):
+            node = seeds[i]
+            if not visited[node]:
+                visited[node] = 1
+                n_visited += 1
+                _heap_push(heap, &heap_size, z[node], order, node)
+                order += 1
+
+        while heap_size > 0 or queue_head < queue_tail:
+            if queue_head < queue_tail:
+                node = queue[queue_head]
+                queue_head += 1
+            else:
+                node = _heap_pop(heap, &heap_size)
+
+            level = water_level[node]
+            from_lake = level > z[node] or is_pit[node]
+            for k in range(n_nbrs):
+                nbr = nbrs[node, k]
+                if nbr == -1 or visited[nbr]:
+                    continue
+                visited[nbr] = 1
+                n_visited += 1
+
+                if from_lake:
+                    outlet[nbr] = outlet[node]
+                else:
+                    outlet[nbr] = node
+
+                if z[nbr] <= level:
+                    water_level[nbr] = level
+                    queue[queue_tail] = nbr
+                    queue_tail += 1
+                else:
+                    _heap_push(heap, &heap_size, z[nbr], order, nbr)
+                    order += 1
+    finally:
+        free(heap)
+        free(queue)
+        free(visited)
+
+    return n_visited
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef DTYPE_INT_t _fill_depressions(
+    np.ndarray[DTYPE_FLOAT_t, ndim=1] z,
+    np.ndarray[DTYPE_INT_t, ndim=2] nbrs,
+    np.ndarray[DTYPE_FLOAT_t, ndim=2] nbr_distance,
+    np.ndarray[DTYPE_INT_t, ndim=1] seeds,
+    double slope,
+    np.ndarray[DTYPE_FLOAT_t, ndim=1] filled):
+    """Fill the depressions of a surface so that every node can drain.
+
+    A priority flood, as in *_priority_flood*, but with the filled surface
+    given a *slope* down toward the outlet of each depression
+    (Priority-Flood+Epsilon, Barnes et al., 2014). A node reached from a
+    node at a higher level is raised to that level plus *slope* times the
+    distance between the two, and never by less than the smallest step
+    that a double can take. With a *slope* of zero, depressions are filled
+    flat.
+
+    On return, *filled* holds the filled surface. Nodes not connected to a
+    seed keep their elevation.
+
+    Returns the number of nodes that were reached by the flood.
+    """
+    cdef long n_nodes = z.shape[0]
+    cdef long n_nbrs = nbrs.shape[1]
+    cdef long n_seeds = seeds.shape[0]
+    cdef long heap_size = 0
+    cdef long queue_head = 0
+    cdef long queue_tail = 0
+    cdef long order = 0
+    cdef long n_visited = 0
+    cdef long i, k, node, nbr
+    cdef double level, raised
+    cdef HeapItem * heap = <HeapItem *>malloc(n_nodes * sizeof(HeapItem))
+    cdef long * queue = <long *>malloc(n_nodes * sizeof(long))
+    cdef np.uint8_t * visited = <np.uint8_t *>malloc(n_nodes * sizeof(np.uint8_t))
+
+    if heap == NULL or queue == NULL or visited == NULL:
+        free(heap)
+        free(queue)
+        free(visited)
+        raise MemoryError()
+
+    try:
+        for node in range(n_nodes):
+            visited[node] = 0
+            filled[node] = z[node]
+
+        for i in range(n_seeds):
+            node = seeds[i]
+            if not visited[node]:
+                visited[node] = 1
+                n_visited += 1
+                _heap_push(heap, &heap_size, z[node], order, node)
+                order += 1
+
+        while heap_size > 0 or queue_head < queue_tail:
+            if queue_head < queue_tail:
+                node = queue[queue_head]
+                queue_head += 1
+            else:
+                node = _heap_pop(heap, &heap_size)
+
+            level = filled[node]
+            for k in range(n_nbrs):
+                nbr = nbrs[node, k]
+                if nbr == -1 or visited[nbr]:
+                    continue
+                visited[nbr] = 1
+                n_visited += 1
+
+                if z[nbr] <= level:
+                    if slope > 0.:
+                        raised = level + slope * nbr_distance[node, k]
+                        if raised <= level:
+                            raised = nextafter(level, INFINITY)
+                        filled[nbr] = raised
+                    else:
+                        filled[nbr] = level
+                    queue[queue_tail] = nbr
+                    queue_tail += 1
+                else:
+                    _heap_push(heap, &heap_size, z[nbr], order, nbr)
+                    order += 1
+    finally:
+        free(heap)
+        free(queue)
+        free(visited)
+
+    return n_visited
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef bint _can_drain(long node,
+                     np.ndarray[DTYPE_INT_t, ndim=2] nbrs,
+                     np.ndarray[DTYPE_FLOAT_t, ndim=1] z,
+                     np.ndarray[DTYPE_FLOAT_t, ndim=1] water_level,
+                     np.ndarray[np.uint8_t, ndim=1] is_seed):
+    cdef long k, nbr
+
+    if is_seed[node]:
+        return True
+    for k in range(nbrs.shape[1]):
+        nbr = nbrs[node, k]
+        if nbr != -1 and water_level[nbr] < z[node]:
+            return True
+    return False
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef _absorb_undrainable_outlets(
+    np.ndarray[DTYPE_INT_t, ndim=1] candidates,
+    np.ndarray[DTYPE_INT_t, ndim=2] nbrs,
+    np.ndarray[DTYPE_FLOAT_t, ndim=1] z,
+    np.ndarray[DTYPE_FLOAT_t, ndim=1] water_level,
+    np.ndarray[np.uint8_t, ndim=1] is_seed,
+    np.ndarray[np.uint8_t, ndim=1] in_lake,
+    np.ndarray[DTYPE_INT_t, ndim=1] outlet):
+    """Move lake outlets that sit on a flat off the flat.
+
+    A lake outlet must be a seed of the flood or have a neighbor with a
+    water surface below it. An outlet on a flat at the level of its lake can
+    not drain, so, as ``DepressionFinderAndRouter`` does, the lake takes in
+    the flat, one ring of nodes at a time, until it reaches a node that can
+    drain, which becomes the outlet of the nodes taken in and of every lake
+    that drained to one of them.
+    """
+    cdef long n_nodes = z.shape[0]
+    cdef long n_nbrs = nbrs.shape[1]
+    cdef long n_candidates = candidates.shape[0]
+    cdef long i, k, j, head, tail, node, nbr, start, drain
+    cdef double level
+    cdef long * queue = <long *>malloc(n_nodes * sizeof(long))
+    cdef np.uint8_t * visited = <np.uint8_t *>malloc(
+        n_nodes * sizeof(np.uint8_t))
+
+    if queue == NULL or visited == NULL:
+        free(queue)
+        free(visited)
+        raise MemoryError()
+
+    try:
+        for node in range(n_nodes):
+            visited[node] = 0
+
+        for i in range(n_candidates):
+            start = candidates[i]
+            if (start == -1 or in_lake[start] or
+                    _can_drain(start, nbrs, z, water_level, is_seed)):
+                continue
+
+            level = water_level[start]
+            queue[0] = start
+            visited[start] = 1
+            head = 0
+            tail = 1
+            drain = -1
+            while head < tail:
+                node = queue[head]
+                if (not in_lake[node] and
+                        _can_drain(node, nbrs, z, water_level, is_seed)):
+                    drain = node
+                    break
+                head += 1
+                for k in range(n_nbrs):
+                    nbr = nbrs[node, k]
+                    if (nbr != -1 and not visited[nbr]
+                            and water_level[nbr] == level):
+                        visited[nbr] = 1
+                        queue[tail] = nbr
+                        tail += 1
+
+            if drain != -1:
+                for j in range(head):
+                    in_lake[queue[j]] = 1
+                    outlet[queue[j]] = drain
+
+            for j in range(tail):
+                visited[queue[j]] = 0
+
+        # Lakes that drained to a node that has now been taken in drain to
+        # wherever that node now drains.
+        for node in range(n_nodes):
+            if in_lake[node] and outlet[node] != -1:
+                drain = outlet[node]
+                while in_lake[drain]:
+                    drain = outlet[drain]
+                outlet[node] = drain
+    finally:
+        free(queue)
+        free(visited)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef DTYPE_INT_t _label_connected_nodes(
+    np.ndarray[DTYPE_INT_t, ndim=2] nbrs,
+    np.ndarray[np.uint8_t, ndim=1] is_member,
+    np.ndarray[DTYPE_FLOAT_t, ndim=1] value,
+    np.ndarray[DTYPE_INT_t, ndim=1] labels):
+    """Label connected groups of nodes that share the same value.
+
+    Nodes flagged in *is_member* are grouped with any neighboring member
+    node that has the same *value*. Each group is labelled with the lowest
+    node ID it contains; non-member nodes are labelled -1.
+
+    Returns the number of groups.
+    """
+    cdef long n_nodes = nbrs.shape[0]
+    cdef long n_nbrs = nbrs.shape[1]
+    cdef long n_groups = 0
+    cdef long head, tail, root, node, nbr, k
+    cdef long * queue = <long *>malloc(n_nodes * sizeof(long))
+
+    if queue == NULL:
+        raise MemoryError()
+
+    try:
+        for node in range(n_nodes):
+            labels[node] = -1
+
+        for root in range(n_nodes):
+            if not is_member[root] or labels[root] != -1:
+                continue
+            labels[root] = root
+            n_groups += 1
+            queue[0] = root
+            head = 0
+            tail = 1
+            while head < tail:
+                node = queue[head]
+                head += 1
+                for k in range(n_nbrs):
+                    nbr = nbrs[node, k]
+                    if (nbr != -1 and is_member[nbr] and labels[nbr] == -1
+                            and value[nbr] == value[node]):
+                        labels[nbr] = root
+                        queue[tail] = nbr
+                        tail += 1
+    finally:
+        free(queue)
+
+    return n_groups
+
+
+cdef long _find_root(long * uf_parent, long node):
+    cdef long root = node
+    cdef long next_node
+
+    while uf_parent[root] != root:
+        root = uf_parent[root]
+    while uf_parent[node] != root:
+        next_node = uf_parent[node]
+        uf_parent[node] = root
+        node = next_node
+
+    return root
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef DTYPE_INT_t _build_lake_hierarchy(
+    np.ndarray[DTYPE_INT_t, ndim=1] sorted_nodes,
+    np.ndarray[DTYPE_INT_t, ndim=2] nbrs,
+    np.ndarray[DTYPE_INT_t, ndim=1] lake_map,
+    np.ndarray[DTYPE_INT_t, ndim=1] pit_code,
+    np.ndarray[DTYPE_FLOAT_t, ndim=1] z,
+    np.ndarray[DTYPE_FLOAT_t, ndim=1] water_level,
+    np.ndarray[DTYPE_INT_t, ndim=1] first_basin,
+    np.ndarray[DTYPE_INT_t, ndim=1] top_basin,
+    np.ndarray[DTYPE_FLOAT_t, ndim=1] basin_level,
+    np.ndarray[DTYPE_INT_t, ndim=1] basin_code,
+    np.ndarray[DTYPE_INT_t, ndim=1] basin_parent):
+    """Find the nested basins that fill, one by one, to make up each lake.
+
+    The lake nodes, *sorted_nodes*, are added in order of elevation. A node
+    with no neighbors yet added from its lake starts a new basin; a node that
+    joins two or more basins closes them at its elevation and starts a basin
+    that contains them. Basins that join at the level of their floor are
+    parts of one flat, and are merged instead. Each basin is coded by the pit
+    it would be filled from: the lowest of the *pit_code* (-1 for nodes that
+    are not pits) of the nodes on its floor, or, for a basin made of others,
+    the highest code of those basins. The top basin of each lake has the
+    lake's water level.
+
+    On return, *first_basin* holds the basin each lake node was first added
+    to, and *top_basin* the top basin of its lake. Returns the number of
+    basins.
+    """
+    cdef long n_nodes = lake_map.shape[0]
+    cdef long n_sorted = sorted_nodes.shape[0]
+    cdef long n_nbrs = nbrs.shape[1]
+    cdef long n_basins = 0
+    cdef long i, k, j, node, nbr, root, n_roots, n_deep, basin, child, flat
+    cdef long code
+    cdef long * uf_parent = <long *>malloc(n_nodes * sizeof(long))
+    cdef long * basin_at_root = <long *>malloc(n_nodes * sizeof(long))
+    cdef double * basin_floor = <double *>malloc(
+        basin_code.shape[0] * sizeof(double))
+    cdef long * roots = <long *>malloc(n_nbrs * sizeof(long))
+    cdef np.uint8_t * added = <np.uint8_t *>malloc(n_nodes * sizeof(np.uint8_t))
+
+    if (uf_parent == NULL or basin_at_root == NULL or basin_floor == NULL or
+            roots == NULL or added == NULL):
+        free(uf_parent)
+        free(basin_at_root)
+        free(basin_floor)
+        free(roots)
+        free(added)
+        raise MemoryError()
+
+    try:
+        for node in range(n_nodes):
+            added[node] = 0
+
+        for i in range(n_sorted):
+            node = sorted_nodes[i]
+
+            n_roots = 0
+            for k in range(n_nbrs):
+                nbr = nbrs[node, k]
+                if nbr == -1 or not added[nbr] or lake_map[nbr] != lake_map[node]:
+                    continue
+                root = _find_root(uf_parent, nbr)
+                for j in range(n_roots):
+                    if roots[j] == root:
+                        break
+                else:
+                    roots[n_roots] = root
+                    n_roots += 1
+
+            added[node] = 1
+            uf_parent[node] = node
+
+            # Basins whose floor is at the level of this node are flats that
+            # it extends, rather than basins that it closes.
+            n_deep = 0
+            for j in range(n_roots):
+                if basin_floor[basin_at_root[roots[j]]] < z[node]:
+                    roots[j], roots[n_deep] = roots[n_deep], roots[j]
+                    n_deep += 1
+
+            if n_roots == 0:
+                basin = n_basins
+                n_basins += 1
+                basin_code[basin] = pit_code[node]
+                basin_level[basin] = water_level[node]
+                basin_parent[basin] = -1
+                basin_floor[basin] = z[node]
+            elif n_deep == 0:
+                basin = basin_at_root[roots[0]]
+                code = basin_code[basin]
+                if pit_code[node] != -1 and (code == -1 or pit_code[node] < code):
+                    code = pit_code[node]
+                for j in range(1, n_roots):
+                    flat = basin_at_root[roots[j]]
+                    if basin_code[flat] != -1 and (code == -1 or
+                                                   basin_code[flat] < code):
+                        code = basin_code[flat]
+                basin_code[basin] = code
+            elif n_deep == 1:
+                basin = basin_at_root[roots[0]]
+            else:
+                basin = n_basins
+                n_basins += 1
+                basin_code[basin] = -1
+                basin_level[basin] = water_level[node]
+                basin_parent[basin] = -1
+                basin_floor[basin] = basin_floor[basin_at_root[roots[0]]]
+                for j in range(n_deep):
+                    child = basin_at_root[roots[j]]
+                    basin_level[child] = z[node]
+                    basin_parent[child] = basin
+                    if basin_code[child] > basin_code[basin]:
+                        basin_code[basin] = basin_code[child]
+
+            for j in range(n_roots):
+                child = basin_at_root[roots[j]]
+                if child != basin and basin_parent[child] == -1:
+                    basin_code[child] = -1
+                    basin_parent[child] = basin
+                uf_parent[roots[j]] = node
+            basin_at_root[node] = basin
+
+            first_basin[node] = basin
+
+        for i in range(n_sorted):
+            node = sorted_nodes[i]
+            top_basin[node] = basin_at_root[_find_root(uf_parent, node)]
+    finally:
+        free(uf_parent)
+        free(basin_at_root)
+        free(basin_floor)
+        free(roots)
+        free(added)
+
+    return n_basins
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline double _surface_before_lake(
+    long node, long code,
+    np.ndarray[DTYPE_FLOAT_t, ndim=1] z,
+    np.ndarray[DTYPE_INT_t, ndim=1] lake_map,
+    np.ndarray[DTYPE_INT_t, ndim=1] first_basin,
+    np.ndarray[DTYPE_FLOAT_t, ndim=1] basin_level,
+    np.ndarray[DTYPE_INT_t, ndim=1] basin_code,
+    np.ndarray[DTYPE_INT_t, ndim=1] basin_parent):
+    """Water surface at a node once every lake coded below *code* is filled.
+    """
+    cdef double surface = z[node]
+    cdef long basin
+
+    if lake_map[node] == -1:
+        return surface
+
+    basin = first_basin[node]
+    while basin != -1 and basin_code[basin] < code:
+        if basin_code[basin] != -1:
+            surface = basin_level[basin]
+        basin = basin_parent[basin]
+
+    return surface
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef _assign_outlet_receivers(
+    np.ndarray[DTYPE_INT_t, ndim=1] outlets,
+    np.ndarray[DTYPE_INT_t, ndim=1] lake_codes,
+    np.ndarray[DTYPE_INT_t, ndim=1] lake_map,
+    np.ndarray[DTYPE_FLOAT_t, ndim=1] z,
+    np.ndarray[DTYPE_INT_t, ndim=1] first_basin,
+    np.ndarray[DTYPE_FLOAT_t, ndim=1] basin_level,
+    np.ndarray[DTYPE_INT_t, ndim=1] basin_code,
+    np.ndarray[DTYPE_INT_t, ndim=1] basin_parent,
+    np.ndarray[DTYPE_INT_t, ndim=1] status,
+    np.ndarray[DTYPE_INT_t, ndim=2] nbrs,
+    np.ndarray[DTYPE_INT_t, ndim=2] links,
+    np.ndarray[DTYPE_FLOAT_t, ndim=1] length_of_link,
+    np.ndarray[DTYPE_INT_t, ndim=2] diag_nbrs,
+    DTYPE_FLOAT_t diag_length,
+    np.ndarray[DTYPE_INT_t, ndim=1] receivers):
+    """Point the outlet of each lake down its steepest way out of the lake.
+
+    Uses the same rules as ``DepressionFinderAndRouter``: the receiver of an
+    outlet is its steepest downhill neighbor that is not in the outlet's own
+    lake, is not closed, and whose (water) surface is below that of the
+    current best receiver. Orthogonal neighbors are checked before diagonal
+    ones. Lakes are filled one pit at a time, in order of lake code, so the
+    water surface of a neighbor is the one it had once the basins (see
+    :func:`_build_lake_hierarchy`) with lower codes were filled. Outlets that
+    are boundary nodes drain to themselves, and outlets with no such neighbor
+    are left unchanged.
+    """
+    cdef long n_lakes = outlets.shape[0]
+    cdef long n_nbrs = nbrs.shape[1]
+    cdef long n_diags = diag_nbrs.shape[1]
+    cdef long i, k, outlet, code, nbr, receiver
+    cdef double grad, max_grad, surface
+
+    for i in range(n_lakes):
+        outlet = outlets[i]
+        code = lake_codes[i]
+
+        if status[outlet] != _CORE:
+            receivers[outlet] = outlet
+            continue
+
+        receiver = outlet
+        max_grad = 0.
+        for k in range(n_nbrs):
+            nbr = nbrs[outlet, k]
+            if nbr == -1 or lake_map[nbr] == code or status[nbr] == _CLOSED:
+                continue
+            surface = _surface_before_lake(nbr, code, z, lake_map,
+                                           first_basin, basin_level,
+                                           basin_code, basin_parent)
+            if surface < z[receiver]:
+                grad = (z[outlet] - z[nbr]) / length_of_link[links[outlet, k]]
+                if grad > max_grad:
+                    max_grad = grad
+                    receiver = nbr
+
+        for k in range(n_diags):
+            nbr = diag_nbrs[outlet, k]
+            if nbr == -1 or lake_map[nbr] == code or status[nbr] == _CLOSED:
+                continue
+            surface = _surface_before_lake(nbr, code, z, lake_map,
+                                           first_basin, basin_level,
+                                           basin_code, basin_parent)
+            if surface < z[receiver]:
+                grad = (z[outlet] - z[nbr]) / diag_length
+                if grad > max_grad:
+                    max_grad = grad
+                    receiver = nbr
+
+        if receiver != outlet:
+            receivers[outlet] = receiver
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef _route_flow_across_lakes(
+    np.ndarray[DTYPE_INT_t, ndim=1] outlets,
+    np.ndarray[DTYPE_INT_t, ndim=1] lake_codes,
+    np.ndarray[DTYPE_INT_t, ndim=1] lake_map,
+    np.ndarray[DTYPE_FLOAT_t, ndim=1] z,
+    np.ndarray[DTYPE_INT_t, ndim=2] nbrs,
+    np.ndarray[DTYPE_INT_t, ndim=2] links,
+    np.ndarray[DTYPE_FLOAT_t, ndim=1] length_of_link,
+    np.ndarray[DTYPE_INT_t, ndim=2] diag_nbrs,
+    np.ndarray[DTYPE_INT_t, ndim=2] diag_links,
+    DTYPE_FLOAT_t diag_length,
+    np.ndarray[DTYPE_INT_t, ndim=1] receivers,
+    np.ndarray[DTYPE_INT_t, ndim=1] link_to_receiver,
+    np.ndarray[DTYPE_FLOAT_t, ndim=1] steepest_slope):
+    """Route flow across each lake toward its outlet.
+
+    Each lake is swept outward from its outlet one ring at a time, in the
+    same order as ``DepressionFinderAndRouter``: within a ring, every node
+    first claims its unresolved orthogonal neighbors, and then its unresolved
+    diagonal neighbors. Claimed nodes drain to the node that claimed them.
+    """
+    cdef long n_nodes = lake_map.shape[0]
+    cdef long n_lakes = outlets.shape[0]
+    cdef long n_nbrs = nbrs.shape[1]
+    cdef long n_diags = diag_nbrs.shape[1]
+    cdef long i, k, code, node, nbr, link
+    cdef long ring_start, ring_end, tail, j
+    cdef double slope
+    cdef long * queue = <long *>malloc(n_nodes * sizeof(long))
+    cdef np.uint8_t * resolved = <np.uint8_t *>malloc(
+        n_nodes * sizeof(np.uint8_t))
+
+    if queue == NULL or resolved == NULL:
+        free(queue)
+        free(resolved)
+        raise MemoryError()
+
+    try:
+        for node in range(n_nodes):
+            resolved[node] = 0
+
+        for i in range(n_lakes):
+            code = lake_codes[i]
+            queue[0] = outlets[i]
+            ring_start = 0
+            ring_end = 1
+            tail = 1
+            while ring_start < ring_end:
+                for j in range(ring_start, ring_end):
+                    node = queue[j]
+                    for k in range(n_nbrs):
+                        nbr = nbrs[node, k]
+                        if nbr == -1 or lake_map[nbr] != code or resolved[nbr]:
+                            continue
+                        resolved[nbr] = 1
+                        link = links[node, k]
+                        receivers[nbr] = node
+                        link_to_receiver[nbr] = link
+                        slope = (z[nbr] - z[node]) / length_of_link[link]
+                        steepest_slope[nbr] = slope if slope > 0. else 0.
+                        queue[tail] = nbr
+                        tail += 1
+
+                for j in range(ring_start, ring_end):
+                    node = queue[j]
+                    for k in range(n_diags):
+                        nbr = diag_nbrs[node, k]
+                        if nbr == -1 or lake_map[nbr] != code or resolved[nbr]:
+                            continue
+                        resolved[nbr] = 1
+                        receivers[nbr] = node
+                        link_to_receiver[nbr] = diag_links[node, k]
+                        slope = (z[nbr] - z[node]) / diag_length
+                        steepest_slope[nbr] = slope if slope > 0. else 0.
+                        queue[tail] = nbr
+                        tail += 1
+
+                ring_start = ring_end
+                ring_end = tail
+    finally:
+        free(queue)
+        free(resolved)
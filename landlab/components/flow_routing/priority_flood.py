@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""Find depressions on a topographic surface with a priority flood."""
+from __future__ import print_function
+
+import numpy as np
+
+from landlab import FIXED_VALUE_BOUNDARY
+from landlab.grid.base import BAD_INDEX_VALUE as LOCAL_BAD_INDEX_VALUE
+from landlab.components.flow_accum.flow_accum_bw import (
+    make_stack_and_donor_arrays, find_drainage_area_and_discharge_compiled)
+from .lake_mapper import DepressionFinderAndRouter, _UNFLOODED, _FLOODED
+from .cfuncs import (_priority_flood, _absorb_undrainable_outlets,
+                     _label_connected_nodes, _build_lake_hierarchy,
+                     _assign_outlet_receivers, _route_flow_across_lakes)
+
+
+class PriorityFloodDepressionFinder(DepressionFinderAndRouter):
+
+    """Find depressions on a topographic surface with a priority flood.
+
+    A drop-in replacement for :class:`DepressionFinderAndRouter` that maps
+    all of the depressions of a grid in a single O(N log N) priority flood
+    (Barnes et al., 2014) run in compiled code, rather than growing each lake
+    outward from its pit. Unlike DepressionFinderAndRouter, only fixed-value
+    boundary nodes act as outlets to the flood, so they alone win ties for
+    an outlet, and lakes form only at the pits passed to *map_depressions*.
+
+    Otherwise the outputs are the same: the 'depression__depth' and
+    'depression__outlet_node' fields, the lake properties (*lake_map*,
+    *lake_codes*, *lake_outlets*, *lake_areas*, ...), and, if asked to,
+    rerouted flow receivers, drainage areas and discharges.
+
+    As with DepressionFinderAndRouter, each lake is labelled with the ID of
+    one of its pits. Where the basins of several pits join to make a lake,
+    this is the pit that DepressionFinderAndRouter would have grown the lake
+    from, so lake codes match between the two components.
+
+    The components can also differ where elevations tie. If several nodes on
+    the rim of a lake share the lowest elevation, the outlet may be a
+    different one of them, and a lake that spills onto a flat takes in only
+    as much of the flat as it needs to reach a node that can drain.
+
+    The component can be used wherever DepressionFinderAndRouter is used,
+    including as the *depression_finder* of a FlowAccumulator.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.components import (FlowAccumulator,
+    ...                                 PriorityFloodDepressionFinder)
+    >>> mg = RasterModelGrid((7, 7))
+    >>> z = mg.add_field('node', 'topographic__elevation',
+    ...                  mg.x_of_node + 0.1 * mg.y_of_node)
+    >>> z[mg.nodes[2:5, 2:5]] = [[0.5, 0.4, 0.5],
+    ...                          [0.4, 0.1, 0.4],
+    ...                          [0.5, 0.4, 0.5]]
+    >>> fa = FlowAccumulator(mg, flow_director='D8',
+    ...                      depression_finder=PriorityFloodDepressionFinder)
+    >>> fa.run_one_step()
+    >>> fa.depression_finder.lake_codes
+    array([24])
+    >>> fa.depression_finder.lake_outlets
+    array([8])
+    >>> mg.at_node['depression__depth'][mg.nodes[2:5, 2:5]]
+    array([[ 0.6,  0.7,  0.6],
+           [ 0.7,  1. ,  0.7],
+           [ 0.6,  0.7,  0.6]])
+    >>> fa.depression_finder.lake_volumes
+    array([ 6.2])
+    >>> mg.at_node['drainage_area'][mg.nodes[1:4, :2]]
+    array([[ 21.,  21.],
+           [  1.,   1.],
+           [  1.,   1.]])
+
+    The result is the same as that of DepressionFinderAndRouter.
+
+    >>> from landlab.components import DepressionFinderAndRouter
+    >>> mg2 = RasterModelGrid((7, 7))
+    >>> _ = mg2.add_field('node', 'topographic__elevation', z.copy())
+    >>> fa2 = FlowAccumulator(mg2, flow_director='D8',
+    ...                       depression_finder=DepressionFinderAndRouter)
+    >>> fa2.run_one_step()
+    >>> np.all(mg2.at_node['flow__receiver_node'] ==
+    ...        mg.at_node['flow__receiver_node'])
+    True
+    """
+
+    _name = 'PriorityFloodDepressionFinder'
+
+    def updated_boundary_conditions(self):
+        """
+            Call this if boundary conditions on the grid are updated after the
+            component is instantiated.
+        """
+        super(PriorityFloodDepressionFinder,
+              self).updated_boundary_conditions()
+        # The compiled kernels work with native ints, whatever the grid's
+        # index_dtype.
+        self._node_nbrs = np.ascontiguousarray(self._node_nbrs, dtype=int)
+        self._adjacent_nodes = np.ascontiguousarray(
+            self._grid.adjacent_nodes_at_node, dtype=int)
+        self._links_at_node = np.ascontiguousarray(
+            self._grid.links_at_node, dtype=int)
+        self._is_seed = (self._grid.status_at_node ==
+                         FIXED_VALUE_BOUNDARY).astype(np.uint8)
+        self._flood_seeds = np.where(self._is_seed)[0]
+        if self._D8:
+            self._diag_nbrs = np.ascontiguousarray(
+                self._grid.diagonal_adjacent_nodes_at_node, dtype=int)
+            self._diag_links = np.ascontiguousarray(
+                self._grid.d8s_at_node[:, 4:], dtype=int)
+            self._diag_length = self._diag_link_length
+        else:
+            self._diag_nbrs = np.empty((self._grid.number_of_nodes, 0),
+                                       dtype=int)
+            self._diag_links = self._diag_nbrs
+            self._diag_length = 1.
+
+    def _identify_depressions_and_outlets(self, reroute_flow=True):
+        """Find depression and lakes on a topographic surface.
+
+        Find and map the depressions/lakes in a topographic surface,
+        given a previously identified list of pits (if any) in the surface.
+        """
+        elev = np.asarray(self._elev, dtype=float)
+        is_pit = self.is_pit.astype(np.uint8)
+
+        water_level = np.empty(self._grid.number_of_nodes, dtype=float)
+        outlet = np.empty(self._grid.number_of_nodes, dtype=int)
+        _priority_flood(elev, self._node_nbrs, self._flood_seeds, is_pit,
+                        water_level, outlet)
+
+        # Nodes flooded above their own elevation, and the pits, make up the
+        # lakes. Lakes whose outlet is on a flat take in the flat.
+        in_lake = (((water_level > elev) | self.is_pit) &
+                   (outlet != -1)).astype(np.uint8)
+        _absorb_undrainable_outlets(np.unique(outlet[in_lake == 1]),
+                                    self._node_nbrs, elev, water_level,
+                                    self._is_seed, in_lake, outlet)
+
+        # Label each lake by the pit that the DepressionFinderAndRouter
+        # would have grown it from. Pits fill one at a time, in order of ID,
+        # so where the basins of two or more pits join the lake takes the
+        # highest code of the basins. The basins are also needed to see how
+        # full each lake was when that of a neighboring outlet was filled.
+        lake_id = np.empty_like(outlet)
+        _label_connected_nodes(self._node_nbrs, in_lake, water_level,
+                               lake_id)
+        in_lake = in_lake.astype(bool)
+
+        lake_nodes = np.where(in_lake)[0]
+        lake_nodes = lake_nodes[np.argsort(elev[lake_nodes], kind='mergesort')]
+        pit_code = np.where(self.is_pit, np.arange(self._grid.number_of_nodes),
+                            LOCAL_BAD_INDEX_VALUE)
+        first_basin = np.empty_like(outlet)
+        top_basin = np.empty_like(outlet)
+        basin_level = np.empty(2 * lake_nodes.size, dtype=float)
+        basin_code = np.empty(2 * lake_nodes.size, dtype=int)
+        basin_parent = np.empty(2 * lake_nodes.size, dtype=int)
+        _build_lake_hierarchy(lake_nodes, self._node_nbrs, lake_id, pit_code,
+                              elev, water_level, first_basin, top_basin,
+                              basin_level, basin_code, basin_parent)
+
+        self._lake_map.fill(LOCAL_BAD_INDEX_VALUE)
+        self._lake_map[in_lake] = basin_code[top_basin[in_lake]]
+        in_lake = self._lake_map != LOCAL_BAD_INDEX_VALUE
+
+        self.flood_status.fill(_UNFLOODED)
+        self.flood_status[in_lake] = _FLOODED
+        self.depression_depth[in_lake] = (water_level - elev)[in_lake]
+        self.depression_outlet_map[in_lake] = outlet[self._lake_map[in_lake]]
+
+        self._unique_pits = np.zeros_like(self.pit_node_ids, dtype=bool)
+        self._unique_pits[np.searchsorted(
+            self.pit_node_ids, np.unique(self._lake_map[in_lake]))] = True
+        self.depression_outlets = np.full_like(self.pit_node_ids,
+                                               LOCAL_BAD_INDEX_VALUE)
+        self.depression_outlets[self._unique_pits] = outlet[self.lake_codes]
+        self._pits_flooded = self.number_of_lakes
+
+        self.unique_lake_outlets = self.lake_outlets
+
+        if reroute_flow and 'flow__receiver_node' in self._grid.at_node:
+            receivers = self._grid.at_node['flow__receiver_node']
+            int_receivers = receivers.astype(int, copy=False)
+            _assign_outlet_receivers(
+                self.lake_outlets, self.lake_codes, self._lake_map, elev,
+                first_basin, basin_level, basin_code, basin_parent,
+                self._grid.status_at_node.astype(int),
+                self._adjacent_nodes, self._links_at_node,
+                self._grid.length_of_link, self._diag_nbrs,
+                self._diag_length, int_receivers)
+            receivers[:] = int_receivers
+
+    def _route_flow(self):
+        """Route flow across lake flats.
+
+        Route flow across lake flats, which have already been identified.
+        """
+        outlets = self.lake_outlets
+        codes = self.lake_codes
+
+        # An outlet can still drain back into its lake if it found no other
+        # way out; send it to its lowest neighbor outside of the lake. Lakes
+        # can share an outlet, so go through every lake with one of these
+        # outlets, in turn.
+        drains_back = self._lake_map[self.receivers[outlets]] == codes
+        shares_outlet = np.in1d(outlets, outlets[drains_back])
+        for outlet_node, lake_code in zip(outlets[shares_outlet],
+                                          codes[shares_outlet]):
+            if self._lake_map[self.receivers[outlet_node]] == lake_code:
+                nbrs = self.grid.active_adjacent_nodes_at_node[outlet_node]
+                not_lake = nbrs[np.where((self.lake_map[nbrs] != lake_code) &
+                                         (nbrs != -1))[0]]
+                min_index = np.argmin(self._elev[not_lake])
+                self.receivers[outlet_node] = not_lake[min_index]
+
+        assert np.all(self._lake_map[self.receivers[outlets]] != codes), \
+            'outlet of lake drains to itself!'
+
+        if 'flow__link_to_receiver_node' in self._grid.at_node:
+            links = self._grid.at_node['flow__link_to_receiver_node']
+        else:
+            links = np.empty(self._grid.number_of_nodes, dtype=int)
+        int_receivers = self.receivers.astype(int, copy=False)
+        int_links = links.astype(int, copy=False)
+
+        _route_flow_across_lakes(
+            outlets, codes, self._lake_map,
+            np.asarray(self._elev, dtype=float),
+            self._adjacent_nodes, self._links_at_node,
+            self._grid.length_of_link, self._diag_nbrs, self._diag_links,
+            self._diag_length, int_receivers, int_links, self.grads)
+        self.receivers[:] = int_receivers
+        links[:] = int_links
+
+        self.sinks[self.pit_node_ids] = False
+
+    def _reaccumulate_flow(self):
+        """Update drainage area, discharge, and upstream order.
+
+        Invoke the accumulator a second time to update drainage area,
+        discharge, and upstream order.
+        """
+        Q_in = self._grid.at_node['water__unit_flux_in']
+        areas = self._grid.cell_area_at_node.copy()
+        areas[self._grid.closed_boundary_nodes] = 0.
+
+        _, _, s = make_stack_and_donor_arrays(self.receivers)
+        self.a, q = find_drainage_area_and_discharge_compiled(
+            s, self.receivers, node_cell_area=areas, runoff=Q_in)
+
+        self.grid.at_node['drainage_area'][:] = self.a
+        self.grid.at_node['surface_water__discharge'][:] = q
+        self.grid.at_node['flow__upstream_node_order'][:] = s
+
+    def _sum_over_lakes(self, values):
+        """Sum a node quantity over each lake, in the order of *lake_codes*."""
+        in_lake = self.lake_at_node
+        return np.bincount(
+            np.searchsorted(self.lake_codes, self._lake_map[in_lake]),
+            weights=values[in_lake], minlength=self.number_of_lakes)
+
+    @property
+    def lake_areas(self):
+        """
+        A nlakes-long array of the area of each lake. The order is the same as
+        that returned by *lake_codes*.
+        """
+        return self._sum_over_lakes(self._grid.cell_area_at_node)
+
+    @property
+    def lake_volumes(self):
+        """
+        A nlakes-long array of the volume of each lake. The order is the same
+        as that returned by *lake_codes*.
+        """
+        return self._sum_over_lakes(self._grid.cell_area_at_node *
+                                    self.depression_depth)
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""Tests for PriorityFloodDepressionFinder."""
+import pytest
+
+import numpy as np
+from numpy.testing import assert_array_equal, assert_array_almost_equal
+
+from landlab import RasterModelGrid, CLOSED_BOUNDARY
+from landlab import BAD_INDEX_VALUE as XX
+from landlab.components import (FlowAccumulator, DepressionFinderAndRouter,
+                                PriorityFloodDepressionFinder)
+
+
+_FIELDS = ('flow__receiver_node', 'flow__link_to_receiver_node',
+           'topographic__steepest_slope', 'flow__sink_flag',
+           'depression__depth', 'depression__outlet_node', 'drainage_area',
+           'surface_water__discharge', 'flood_status_code')
+_LAKE_PROPERTIES = ('lake_map', 'lake_codes', 'lake_outlets', 'lake_areas',
+                    'lake_volumes')
+
+
+def _route(depression_finder, z, shape, flow_director, routing,
+           closed_right=False, index_dtype=int):
+    mg = RasterModelGrid(shape, index_dtype=index_dtype)
+    if closed_right:
+        mg.status_at_node[mg.nodes_at_right_edge] = CLOSED_BOUNDARY
+    mg.add_field('node', 'topographic__elevation', z.copy())
+    fa = FlowAccumulator(mg, flow_director=flow_director, routing=routing,
+                         depression_finder=depression_finder)
+    fa.run_one_step()
+    return mg, fa.depression_finder
+
+
+@pytest.mark.parametrize('seed', range(12))
+@pytest.mark.parametrize('flow_director,routing', [('D8', 'D8'),
+                                                   ('Steepest', 'D4')])
+def test_same_as_lake_mapper(seed, flow_director, routing):
+    """Match DepressionFinderAndRouter on a surface without ties."""
+    rng = np.random.RandomState(seed)
+    shape = (rng.randint(3, 20), rng.randint(3, 20))
+    z = rng.rand(shape[0] * shape[1])
+
+    mg1, pf = _route(PriorityFloodDepressionFinder, z, shape, flow_director,
+                     routing, closed_right=seed % 3 == 0)
+    mg2, dfr = _route(DepressionFinderAndRouter, z, shape, flow_director,
+                      routing, closed_right=seed % 3 == 0)
+
+    for name in _FIELDS:
+        assert_array_almost_equal(mg1.at_node[name], mg2.at_node[name])
+    for name in _LAKE_PROPERTIES:
+        assert_array_almost_equal(getattr(pf, name), getattr(dfr, name))
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_flats_drain_to_boundary(seed):
+    """Flow on a surface full of flats still all leaves the grid."""
+    rng = np.random.RandomState(seed)
+    shape = (rng.randint(3, 20), rng.randint(3, 20))
+    z = np.round(rng.rand(shape[0] * shape[1]) * rng.randint(2, 8))
+
+    mg, _ = _route(PriorityFloodDepressionFinder, z, shape, 'D8', 'D8')
+    receivers = mg.at_node['flow__receiver_node']
+
+    base = np.arange(mg.number_of_nodes)
+    for _ in range(mg.number_of_nodes):
+        base = receivers[base]
+    assert_array_equal(receivers[base], base)
+    assert np.all(mg.status_at_node[base] != 0)
+    assert np.unique(mg.at_node['flow__upstream_node_order']).size == \
+        mg.number_of_nodes
+    assert mg.at_node['drainage_area'][mg.boundary_nodes].sum() == \
+        pytest.approx(mg.cell_area_at_node.sum())
+
+    mg2, _ = _route(DepressionFinderAndRouter, z, shape, 'D8', 'D8')
+    assert_array_almost_equal(mg.at_node['depression__depth'],
+                              mg2.at_node['depression__depth'])
+
+
+def test_composite_pits():
+    """Label a lake with inset pits the same as DepressionFinderAndRouter."""
+    mg = RasterModelGrid((10, 10))
+    z = mg.add_field('node', 'topographic__elevation', mg.x_of_node.copy())
+    z.reshape((10, 10))[3:8, 3:8] = 0.
+    z[57] = -1.
+    z[44] = -2.
+    z[54] = -10.
+    z[71] = 0.9
+
+    fa = FlowAccumulator(mg, flow_director='D8',
+                         depression_finder='PriorityFloodDepressionFinder')
+    fa.run_one_step()
+    pf = fa.depression_finder
+
+    assert isinstance(pf, PriorityFloodDepressionFinder)
+    assert_array_equal(pf.lake_codes, [57])
+    assert_array_equal(pf.lake_outlets, [72])
+    assert pf.lake_volumes == pytest.approx([63.])
+
+    lake_map = np.full(100, XX, dtype=int)
+    lake_map.reshape((10, 10))[3:8, 3:8] = 57
+    assert_array_equal(pf.lake_map, lake_map)
+    assert mg.at_node['drainage_area'][70] == pytest.approx(50.)
+
+
+def test_d4_lakes_split():
+    """A lake that is one under D8 routing is three under D4 routing."""
+    lake_nodes = np.array([10, 16, 17, 18, 24, 32, 33, 38, 40])
+    mg1 = RasterModelGrid((7, 7))
+    mg2 = RasterModelGrid((7, 7))
+    z = mg1.x_of_node + 1.
+    z[lake_nodes] = 0.
+    mg1.add_field('node', 'topographic__elevation', z.copy())
+    mg2.add_field('node', 'topographic__elevation', z.copy())
+
+    FlowAccumulator(mg1, flow_director='D8').run_one_step()
+    FlowAccumulator(mg2, flow_director='D4').run_one_step()
+    pf_d8 = PriorityFloodDepressionFinder(mg1, routing='D8')
+    pf_d4 = PriorityFloodDepressionFinder(mg2, routing='D4')
+    pf_d8.map_depressions(reroute_flow=False)
+    pf_d4.map_depressions(reroute_flow=False)
+
+    assert pf_d8.number_of_lakes == 1
+    assert pf_d4.number_of_lakes == 3
+
+    lake_map_d8 = np.full(7 * 7, XX, dtype=int)
+    lake_map_d8[lake_nodes] = 10
+    lake_map_d4 = lake_map_d8.copy()
+    lake_map_d4[lake_nodes[5:]] = 32
+    lake_map_d4[lake_nodes[-2]] = 38
+    assert_array_equal(pf_d8.lake_map, lake_map_d8)
+    assert_array_equal(pf_d4.lake_map, lake_map_d4)
+
+    depths_d8 = np.zeros(7 * 7)
+    depths_d8[lake_nodes] = 2.
+    depths_d4 = depths_d8.copy()
+    depths_d4[lake_nodes[5:]] = 4.
+    depths_d4[lake_nodes[-2]] = 3.
+    assert_array_almost_equal(mg1.at_node['depression__depth'], depths_d8)
+    assert_array_almost_equal(mg2.at_node['depression__depth'], depths_d4)
+
+
+@pytest.mark.parametrize('flow_director,routing', [('D8', 'D8'),
+                                                   ('Steepest', 'D4')])
+def test_int32_ids(flow_director, routing):
+    """Grids with 32-bit ids give the same lakes and flow."""
+    z = np.random.RandomState(4).rand(12 * 15)
+    mg1, pf1 = _route(PriorityFloodDepressionFinder, z, (12, 15),
+                      flow_director, routing, index_dtype=np.int32)
+    mg2, pf2 = _route(PriorityFloodDepressionFinder, z, (12, 15),
+                      flow_director, routing)
+
+    assert mg1.at_node['flow__receiver_node'].dtype == np.int32
+    for name in _FIELDS:
+        assert_array_equal(mg1.at_node[name], mg2.at_node[name])
+    for name in _LAKE_PROPERTIES:
+        assert_array_equal(getattr(pf1, name), getattr(pf2, name))
+
+    mg1.at_node['topographic__elevation'][:] = z
+    mg2.at_node['topographic__elevation'][:] = z
+    PriorityFloodDepressionFinder(mg1, routing=routing).map_depressions()
+    PriorityFloodDepressionFinder(mg2, routing=routing).map_depressions()
+    for name in _FIELDS:
+        assert_array_equal(mg1.at_node[name], mg2.at_node[name])
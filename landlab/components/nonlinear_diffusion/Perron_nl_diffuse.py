@@ -11,6 +11,12 @@ from landlab import ModelParameterDictionary, Component
 from landlab.utils.decorators import use_file_name_or_kwds
 # from copy import copy
 
+# incomplete LU preconditioner of the iterative solver, which is refreshed
+# once the solver takes more than _REFRESH_ITERS iterations with it
+_ILU_DROP_TOL = 1e-4
+_REFRESH_ITERS = 10
+_MAX_ITERS = 100
+
 # Things to add: 1. Explicit stability check.
 # 2. Implicit handling of scenarios where kappa*dt exceeds critical step -
 #    subdivide dt automatically.
@@ -75,7 +81,8 @@ class PerronNLDiffuse(Component):
 
     @use_file_name_or_kwds
     def __init__(self, grid, nonlinear_diffusivity=None, S_crit=33.*np.pi/180.,
-                 rock_density=2700., sed_density=2700., **kwds):
+                 rock_density=2700., sed_density=2700., solver='direct',
+                 solver_tol=1e-10, **kwds):
         """
         Parameters
         ----------
@@ -89,7 +96,24 @@ class PerronNLDiffuse(Component):
             The density of intact rock
         sed_density : float (kg*m**-3)
             The density of the mobile (sediment) layer
+        solver : {'direct', 'bicgstab'}
+            How to solve for the new elevations at each step. 'direct'
+            factorizes the matrix of each step with a sparse direct solver.
+            'bicgstab' iterates, starting from the elevations of the
+            previous step, with an incomplete LU preconditioner that is
+            reused over many steps. This is much faster on large grids. If
+            it does not converge, the step is solved directly.
+        solver_tol : float
+            Relative tolerance of the 'bicgstab' solver.
         """
+        if solver not in ('direct', 'bicgstab'):
+            raise ValueError('{solver}: solver not understood'.format(
+                solver=solver))
+        self._solver = solver
+        self._solver_tol = solver_tol
+        self._operating_matrix_structure = None
+        self._preconditioner = None
+
         # disable internal_uplift option:
         internal_uplift = None
         self._grid = grid
@@ -327,6 +351,8 @@ class PerronNLDiffuse(Component):
                 'values_to_add']
 
         self.corner_flags = grid.status_at_node[[0, ncols - 1, -ncols, -1]]
+        self._operating_matrix_structure = None
+        self._preconditioner = None
 
         op_mat_just_corners = self.operating_matrix_ID_map[
             self.corner_interior_IDs, :]
@@ -568,6 +594,8 @@ class PerronNLDiffuse(Component):
                 'values_to_add']
 
         self.corner_flags = grid.status_at_node[[0, ncols - 1, -ncols, -1]]
+        self._operating_matrix_structure = None
+        self._preconditioner = None
 
         op_mat_just_corners = operating_matrix_ID_map[self.corner_interior_IDs,
                                                       :]
@@ -1324,28 +1352,93 @@ class PerronNLDiffuse(Component):
             raise NameError('''Something is very wrong with your boundary
                             conditions...!''')
 
-        # new approach using COO sparse matrix requires we build the matrix
-        # only now...
-        self._operating_matrix = sparse.coo_matrix(
-            (np.concatenate((core_op_mat_data, corners_op_mat_data,
-                             bottom_op_mat_data, top_op_mat_data,
-                             left_op_mat_data, right_op_mat_data,
-                             bottom_op_mat_data_add, top_op_mat_data_add,
-                             left_op_mat_data_add, right_op_mat_data_add)),
-             (np.concatenate((core_op_mat_row, corners_op_mat_row,
-                              bottom_op_mat_row, top_op_mat_row,
-                              left_op_mat_row, right_op_mat_row,
-                              bottom_op_mat_row_add, top_op_mat_row_add,
-                              left_op_mat_row_add, right_op_mat_row_add)),
-              np.concatenate((core_op_mat_col, corners_op_mat_col,
-                              bottom_op_mat_col, top_op_mat_col,
-                              left_op_mat_col, right_op_mat_col,
-                              bottom_op_mat_col_add, top_op_mat_col_add,
-                              left_op_mat_col_add, right_op_mat_col_add)))),
-            shape=(n_interior_nodes, n_interior_nodes)).tocsr()
+        # the matrix is only built now, from the entries of each part of
+        # the grid:
+        self._operating_matrix = self._assemble_operating_matrix(
+            np.concatenate((core_op_mat_data, corners_op_mat_data,
+                            bottom_op_mat_data, top_op_mat_data,
+                            left_op_mat_data, right_op_mat_data,
+                            bottom_op_mat_data_add, top_op_mat_data_add,
+                            left_op_mat_data_add, right_op_mat_data_add)),
+            np.concatenate((core_op_mat_row, corners_op_mat_row,
+                            bottom_op_mat_row, top_op_mat_row,
+                            left_op_mat_row, right_op_mat_row,
+                            bottom_op_mat_row_add, top_op_mat_row_add,
+                            left_op_mat_row_add, right_op_mat_row_add)),
+            np.concatenate((core_op_mat_col, corners_op_mat_col,
+                            bottom_op_mat_col, top_op_mat_col,
+                            left_op_mat_col, right_op_mat_col,
+                            bottom_op_mat_col_add, top_op_mat_col_add,
+                            left_op_mat_col_add, right_op_mat_col_add)),
+            n_interior_nodes)
         self._mat_RHS = _mat_RHS
 
 
+    def _assemble_operating_matrix(self, data, rows, cols, n_rows):
+        """Build a CSR matrix from entries, summing duplicates.
+
+        The sparsity structure of the matrix, and the position within it of
+        each entry, are kept, so that when the same rows and columns come
+        again (as they do at every step until the boundary conditions
+        change) only the values need to be added up.
+        """
+        structure = self._operating_matrix_structure
+        if (structure is None or not np.array_equal(structure[0], rows) or
+                not np.array_equal(structure[1], cols)):
+            (keys, index_map) = np.unique(rows.astype(np.int64) * n_rows +
+                                          cols.astype(np.int64),
+                                          return_inverse=True)
+            indptr = np.concatenate(([0], np.cumsum(np.bincount(
+                keys // n_rows, minlength=n_rows))))
+            indices = keys % n_rows
+            structure = (rows.copy(), cols.copy(), indptr, indices, index_map)
+            self._operating_matrix_structure = structure
+
+        (indptr, indices, index_map) = structure[2:]
+        values = np.bincount(index_map, weights=data, minlength=len(indices))
+
+        return sparse.csr_matrix((values, indices, indptr),
+                                 shape=(n_rows, n_rows))
+
+    def _solve(self):
+        """Solve the operating matrix for the new interior elevations.
+
+        The iterative solver is preconditioned with an incomplete LU
+        factorization of the matrix. The matrix changes little from one
+        step to the next, so the factorization is kept and reused until
+        the solver starts to need many iterations, or fails, with it.
+        """
+        matrix = self._operating_matrix
+
+        if self._solver == 'bicgstab':
+            x0 = self.grid.at_node[self.values_to_diffuse][
+                self.interior_IDs_as_real]
+            for _ in range(2):
+                is_fresh = self._preconditioner is None
+                if is_fresh:
+                    self._preconditioner = linalg.spilu(
+                        matrix.tocsc(), drop_tol=_ILU_DROP_TOL)
+                preconditioner = linalg.LinearOperator(
+                    matrix.shape, self._preconditioner.solve)
+
+                n_iters = [0]
+
+                def count_iters(x):
+                    n_iters[0] += 1
+
+                (elevs, info) = linalg.bicgstab(
+                    matrix, self._mat_RHS, x0=x0, tol=self._solver_tol,
+                    atol=0., M=preconditioner, maxiter=_MAX_ITERS,
+                    callback=count_iters)
+                if info != 0 or n_iters[0] > _REFRESH_ITERS:
+                    self._preconditioner = None
+                if info == 0:
+                    return elevs
+                if is_fresh:
+                    break
+
+        return linalg.spsolve(matrix, self._mat_RHS)
+
 # These methods translate ID numbers between arrays of differing sizes
     def _realIDtointerior(self, ID):
         ncols = self.ncols
@@ -1424,8 +1517,7 @@ class PerronNLDiffuse(Component):
             self._uplift = self.inputs.read_float('uplift_rate')
             self._delta_t = self.timestep_in
             self._set_variables(self.grid)
-            _interior_elevs = linalg.spsolve(self._operating_matrix,
-                                             self._mat_RHS)
+            _interior_elevs = self._solve()
             self.grid['node'][self.values_to_diffuse][
                 self.interior_IDs_as_real] = _interior_elevs
             grid_in = self.grid
@@ -1437,8 +1529,7 @@ class PerronNLDiffuse(Component):
             # Initialize the variables for the step:
                 self._set_variables(grid_in)
                 # Solve interior of grid:
-                _interior_elevs = linalg.spsolve(self._operating_matrix,
-                                                 self._mat_RHS)
+                _interior_elevs = self._solve()
                 # this fn solves Ax=B for x
 
                 # Handle the BC cells; test common cases first for speed
@@ -1482,8 +1573,7 @@ class PerronNLDiffuse(Component):
         if self.internal_uplifts:
             self._delta_t = self.timestep_in
             self._set_variables(self.grid)
-            _interior_elevs = linalg.spsolve(self._operating_matrix,
-                                             self._mat_RHS)
+            _interior_elevs = self._solve()
             self.grid['node'][self.values_to_diffuse][
                 self.interior_IDs_as_real] = _interior_elevs
         else:
@@ -1492,8 +1582,7 @@ class PerronNLDiffuse(Component):
                 # Initialize the variables for the step:
                 self._set_variables(self.grid)
                 # Solve interior of grid:
-                _interior_elevs = linalg.spsolve(self._operating_matrix,
-                                                 self._mat_RHS)
+                _interior_elevs = self._solve()
                 # this fn solves Ax=B for x
 
                 # Handle the BC cells; test common cases first for speed
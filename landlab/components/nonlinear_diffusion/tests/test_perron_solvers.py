@@ -0,0 +1,67 @@
+"""Test the solvers of the nonlinear diffuser."""
+import numpy as np
+import pytest
+from numpy.testing import assert_array_almost_equal
+
+from landlab import RasterModelGrid
+from landlab.components.nonlinear_diffusion import PerronNLDiffuse
+
+
+def _run(solver, n_steps=20, shape=(12, 15)):
+    grid = RasterModelGrid(shape)
+    z = grid.add_zeros('node', 'topographic__elevation')
+    diffuser = PerronNLDiffuse(grid, nonlinear_diffusivity=1., solver=solver)
+    for _ in range(n_steps):
+        z[grid.core_nodes] += 0.001 * 100.
+        diffuser.run_one_step(100.)
+    return diffuser, z
+
+
+def test_bicgstab_matches_direct():
+    _, expected = _run('direct')
+    _, actual = _run('bicgstab')
+
+    assert_array_almost_equal(actual, expected, decimal=8)
+
+
+def test_matrix_structure_reused():
+    diffuser, _ = _run('direct', n_steps=1)
+    structure = diffuser._operating_matrix_structure
+    diffuser.run_one_step(100.)
+    assert diffuser._operating_matrix_structure is structure
+
+    diffuser.updated_boundary_conditions()
+    assert diffuser._operating_matrix_structure is None
+
+
+def test_matrix_matches_coo():
+    from scipy.sparse import coo_matrix
+
+    diffuser, _ = _run('direct', n_steps=1)
+    rows, cols = diffuser._operating_matrix_structure[:2]
+    data = np.random.rand(len(rows))
+    n_rows = diffuser.ninteriornodes
+
+    matrix = diffuser._assemble_operating_matrix(data, rows, cols, n_rows)
+    expected = coo_matrix((data, (rows, cols)), shape=(n_rows, n_rows))
+    assert_array_almost_equal(matrix.toarray(), expected.toarray())
+
+
+def test_preconditioner_reused():
+    diffuser, _ = _run('bicgstab', n_steps=1)
+    preconditioner = diffuser._preconditioner
+    assert preconditioner is not None
+
+    diffuser.run_one_step(100.)
+    assert diffuser._preconditioner is preconditioner
+
+    diffuser.updated_boundary_conditions()
+    assert diffuser._preconditioner is None
+
+
+
+def test_bad_solver():
+    grid = RasterModelGrid((5, 5))
+    grid.add_zeros('node', 'topographic__elevation')
+    with pytest.raises(ValueError):
+        PerronNLDiffuse(grid, nonlinear_diffusivity=1., solver='not-a-solver')
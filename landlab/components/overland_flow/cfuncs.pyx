@@ -0,0 +1,295 @@
+import numpy as np
+cimport numpy as np
+cimport cython
+
+from cython.parallel cimport prange
+from libc.math cimport pow, fabs, fmax, sqrt
+
+
+DTYPE = np.int
+ctypedef np.int_t DTYPE_INT_t
+DTYPE_FLOAT = np.double
+ctypedef np.double_t DTYPE_FLOAT_t
+
+ctypedef fused id_t:
+    int
+    long
+
+cdef double _SEVEN_OVER_THREE = 7. / 3.
+
+
+@cython.cdivision(True)
+cdef double _solve_water_depth(double a, double b, double c, double d,
+                               double e, double tol, long max_iter,
+                               bint * converged):
+    """Solve the implicit water-depth equation with Newton's method.
+
+    Finds the root, x, of ``x - c + a * (b * x + (b - 1) * c) ** d - e``
+    (see *water_fn*), starting from the old depth, *c*, and using the
+    analytic derivative. Iteration stops once a step is smaller than *tol*.
+    The effective depth is not allowed to fall below zero. *converged* is
+    set to whether that happened within *max_iter* iterations.
+    """
+    cdef double x = c
+    cdef double h, f, dfdx, step
+    cdef long i
+
+    converged[0] = False
+
+    for i in range(max_iter):
+        h = b * x + (b - 1.) * c
+        if h > 0.:
+            f = x - c + a * pow(h, d) - e
+            dfdx = 1. + a * b * d * pow(h, d - 1.)
+        else:
+            f = x - c - e
+            dfdx = 1.
+        step = f / dfdx
+        x -= step
+        if fabs(step) < tol:
+            converged[0] = True
+            break
+
+    return x
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef long _sweep_implicit_kinwave(
+    np.ndarray[id_t, ndim=1] nodes_ordered,
+    np.ndarray[np.uint8_t, ndim=1] is_core,
+    np.ndarray[id_t, ndim=2] nbrs,
+    np.ndarray[DTYPE_FLOAT_t, ndim=2] proportions,
+    np.ndarray[DTYPE_FLOAT_t, ndim=1] alpha,
+    np.ndarray[DTYPE_FLOAT_t, ndim=1] grad_width_sum,
+    np.ndarray[DTYPE_FLOAT_t, ndim=1] cell_area,
+    np.ndarray[DTYPE_FLOAT_t, ndim=1] depth,
+    np.ndarray[DTYPE_FLOAT_t, ndim=1] disch_in,
+    double dt, double runoff_rate, double weight, double depth_exp,
+    double vel_coef, double tol, long max_iter):
+    """Update water depths from upstream to downstream.
+
+    Core nodes are visited from the end of *nodes_ordered* (the most
+    upstream) to its start. At each, the new *depth* is found from the
+    inflow already accumulated in *disch_in*, and the resulting outflow is
+    passed on to the neighbors in *nbrs* in the given *proportions*.
+    *disch_in* must be zeroed beforehand.
+
+    Parameters
+    ----------
+    nodes_ordered : ndarray of int
+        Nodes ordered downstream to upstream.
+    is_core : ndarray of uint8
+        Flags the nodes whose depth is to be updated.
+    nbrs : ndarray of int, shape (n_nodes, n_nbrs)
+        Neighbors of each node; -1 where there is none.
+    proportions : ndarray of float, shape (n_nodes, n_nbrs)
+        Proportion of the outflow of each node that goes to each neighbor.
+    alpha, grad_width_sum, cell_area : ndarray of float
+        Coefficients of the water-depth equation, and the area of the cell
+        at each node.
+    depth : ndarray of float
+        Water depth; updated in place.
+    disch_in : ndarray of float
+        Inflow discharge; updated in place.
+
+    Returns
+    -------
+    int
+        Number of nodes at which Newton's method did not converge.
+    """
+    cdef long n_nodes = nodes_ordered.shape[0]
+    cdef long n_nbrs = nbrs.shape[1]
+    cdef long n_failed = 0
+    cdef long i, k, node, nbr
+    cdef double old_depth, inflow, h_eff, outflow
+    cdef bint converged
+
+    for i in range(n_nodes - 1, -1, -1):
+        node = nodes_ordered[i]
+        if not is_core[node]:
+            continue
+
+        old_depth = depth[node]
+        inflow = dt * runoff_rate + dt * disch_in[node] / cell_area[node]
+        depth[node] = _solve_water_depth(alpha[node], weight, old_depth,
+                                         depth_exp, inflow, tol, max_iter,
+                                         &converged)
+        if not converged:
+            n_failed += 1
+
+        h_eff = weight * depth[node] + (1. - weight) * old_depth
+        if h_eff > 0.:
+            outflow = vel_coef * pow(h_eff, depth_exp) * grad_width_sum[node]
+        else:
+            outflow = 0.
+
+        for k in range(n_nbrs):
+            nbr = nbrs[node, k]
+            if nbr != -1:
+                disch_in[nbr] += outflow * proportions[node, k]
+
+    return n_failed
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _calc_water_depth_and_slope_at_links(
+    id_t [:] active_links,
+    id_t [:] node_at_head,
+    id_t [:] node_at_tail,
+    DTYPE_FLOAT_t [:] length_of_link,
+    DTYPE_FLOAT_t [:] z,
+    DTYPE_FLOAT_t [:] h,
+    DTYPE_FLOAT_t [:] h_links,
+    DTYPE_FLOAT_t [:] water_surface_slope,
+    int num_threads):
+    """Flow depth and water-surface slope at active links.
+
+    The flow depth is the difference between the highest water surface and
+    the highest bed elevation of a link's nodes (Bates et al., 2010).
+    *node_at_head*, *node_at_tail* and *length_of_link* are given for each
+    of the *active_links*.
+    """
+    cdef long n_links = active_links.shape[0]
+    cdef long i, link, head, tail
+    cdef double w_head, w_tail
+
+    for i in prange(n_links, nogil=True, schedule='static',
+                    num_threads=num_threads):
+        link = active_links[i]
+        head = node_at_head[i]
+        tail = node_at_tail[i]
+        w_head = h[head] + z[head]
+        w_tail = h[tail] + z[tail]
+        h_links[link] = fmax(w_head, w_tail) - fmax(z[head], z[tail])
+        water_surface_slope[link] = (w_head - w_tail) / length_of_link[i]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def _update_discharge_at_links(
+    id_t [:] ids,
+    id_t [:] first_neighbor,
+    id_t [:] second_neighbor,
+    DTYPE_FLOAT_t [:] q_old,
+    DTYPE_FLOAT_t [:] q,
+    DTYPE_FLOAT_t [:] h_links,
+    DTYPE_FLOAT_t [:] water_surface_slope,
+    DTYPE_FLOAT_t [:] mannings_n,
+    double theta, double g, double dt,
+    int num_threads):
+    """Update discharge at links with the de Almeida et al. (2012) scheme.
+
+    New discharges are written to *q* from the discharges of the previous
+    time step, *q_old*. This is one longer than the number of links, with a
+    zero at the end for neighbor IDs of -1.
+    """
+    cdef long n_ids = ids.shape[0]
+    cdef long n_padded = q_old.shape[0]
+    cdef long i, link, a, b
+    cdef double q_link, n_link, numerator, denominator
+    cdef double neighbor_weight = (1. - theta) / 2.
+    cdef double g_dt = g * dt
+
+    for i in prange(n_ids, nogil=True, schedule='static',
+                    num_threads=num_threads):
+        link = ids[i]
+        a = first_neighbor[i]
+        b = second_neighbor[i]
+        if a < 0:
+            a = a + n_padded
+        if b < 0:
+            b = b + n_padded
+        q_link = q_old[link]
+        n_link = mannings_n[link]
+        numerator = (theta * q_link + neighbor_weight * (q_old[a] + q_old[b])
+                     - g * h_links[link] * dt * water_surface_slope[link])
+        denominator = 1. + (g_dt * (n_link * n_link) * fabs(q_link)
+                            / pow(h_links[link], _SEVEN_OVER_THREE))
+        q[link] = numerator / denominator
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def _limit_steep_discharge(
+    DTYPE_FLOAT_t [:] q,
+    DTYPE_FLOAT_t [:] h_links,
+    double g, double dt, double dx,
+    int num_threads):
+    """Reduce discharges that exceed the Froude or Courant limits.
+
+    The same rules as OverlandFlow applies with *steep_slopes*, link by
+    link. A Froude number of 1 is used.
+    """
+    cdef long n_links = q.shape[0]
+    cdef long i
+    cdef double q_link, h_link, celerity, froude, courant
+
+    for i in prange(n_links, nogil=True, schedule='static',
+                    num_threads=num_threads):
+        q_link = q[i]
+        if q_link == 0.:
+            continue
+        h_link = h_links[i]
+        celerity = sqrt(g * h_link)
+        froude = q_link / h_link / celerity
+        courant = q_link * dt / dx
+        if q_link > 0.:
+            if froude > 1.:
+                q[i] = h_link * celerity
+            if courant > h_link / 4.:
+                q[i] = h_link * dx / 5. / dt
+        else:
+            if fabs(froude) > 1.:
+                q[i] = -(h_link * celerity)
+            if fabs(courant) > h_link / 4.:
+                q[i] = -(h_link * dx / 5. / dt)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def _update_water_depth_at_nodes(
+    id_t [:] node_at_cell,
+    id_t [:, :] links_at_cell,
+    DTYPE_FLOAT_t [:, :] width_at_cell,
+    np.int8_t [:, :] dirs_at_cell,
+    DTYPE_FLOAT_t [:] area_of_cell,
+    DTYPE_FLOAT_t [:] q,
+    DTYPE_FLOAT_t [:] rainfall,
+    np.uint8_t [:] is_core,
+    DTYPE_FLOAT_t [:] dhdt,
+    DTYPE_FLOAT_t [:] h,
+    double dt,
+    int num_threads):
+    """Update water depths from the flux divergence at cells.
+
+    *links_at_cell*, *width_at_cell* and *dirs_at_cell* have one row for
+    each face of a cell, and a column for each cell. *dhdt* is the rate of
+    change of water depth (rainfall less flux divergence) at every node;
+    depths are changed only at core nodes.
+    """
+    cdef long n_cells = node_at_cell.shape[0]
+    cdef long n_faces = links_at_cell.shape[0]
+    cdef long n_nodes = dhdt.shape[0]
+    cdef long i, cell, node, face
+    cdef double net_flux
+
+    for i in prange(n_nodes, nogil=True, schedule='static',
+                    num_threads=num_threads):
+        dhdt[i] = rainfall[i]
+
+    for cell in prange(n_cells, nogil=True, schedule='static',
+                       num_threads=num_threads):
+        net_flux = 0.
+        for face in range(n_faces):
+            net_flux = net_flux - (q[links_at_cell[face, cell]]
+                                   * width_at_cell[face, cell]
+                                   * dirs_at_cell[face, cell])
+        node = node_at_cell[cell]
+        dhdt[node] = rainfall[node] - net_flux / area_of_cell[cell]
+        if is_core[node]:
+            h[node] = h[node] + dhdt[node] * dt
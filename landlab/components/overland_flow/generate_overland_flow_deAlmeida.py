@@ -88,8 +88,13 @@ array([ 0. ,  0. ,  0. ,  0. ,
 """
 from landlab import Component, FieldError
 import numpy as np
+from scipy import ndimage
 from landlab.grid.structured_quad import links
 from landlab.utils.decorators import use_file_name_or_kwds
+from .wet_links import WetArea, calc_flux_coefficients_at_nodes
+from .cfuncs import (_calc_water_depth_and_slope_at_links,
+                     _update_discharge_at_links, _limit_steep_discharge,
+                     _update_water_depth_at_nodes)
 
 
 _SEVEN_OVER_THREE = 7.0 / 3.0
@@ -164,7 +169,9 @@ class OverlandFlow(Component):
     @use_file_name_or_kwds
     def __init__(self, grid, default_fixed_links=False, h_init=0.00001,
                  alpha=0.7, mannings_n=0.03, g=9.81, theta=0.8,
-                 rainfall_intensity=0.0, steep_slopes=False, **kwds):
+                 rainfall_intensity=0.0, steep_slopes=False, preallocate=False,
+                 num_threads=None, time_step_levels=0, wet_threshold=None,
+                 **kwds):
         """Create an overland flow component.
 
         Parameters
@@ -185,6 +192,42 @@ class OverlandFlow(Component):
             Weighting factor from de Almeida et al., 2012.
         rainfall_intensity : float, optional
             Rainfall intensity.
+        steep_slopes : bool, optional
+            Modify the algorithm to handle steeper slopes at the expense of
+            speed. If model runs become unstable, consider setting to True.
+        preallocate : bool, optional
+            If True, do all of the work of a time step in buffers that are
+            allocated once, so that no new arrays are created as the model
+            runs. The discharge field is then updated in place rather than
+            replaced at each time step. Results agree with the default to
+            round-off.
+        num_threads : int, optional
+            If given, run each time step with compiled kernels, in parallel
+            over links and nodes on this many OpenMP threads. This implies
+            *preallocate*. Results are the same for any number of threads.
+        time_step_levels : int, optional
+            If greater than zero, use local time steps. The stable time step
+            is found for each link from its own water depth, rather than from
+            the deepest water on the grid, and links (and the nodes they
+            join) are updated with steps of 1, 2, 4, ... up to
+            ``2 ** time_step_levels`` times the global time step, as their
+            depth allows. Dry parts of the grid, away from flowing water, are
+            then updated less often. This implies *preallocate*;
+            *num_threads* is ignored.
+        wet_threshold : float, optional
+            If given, update flow only over the wet part of the grid: the
+            links of nodes with water deeper than this, and one more ring of
+            links around them. Discharge elsewhere is zero. The wet area is
+            kept between time steps, grows as water reaches new nodes and
+            shrinks as they drain, so that a time step takes time in
+            proportion to the wet area rather than to the grid (see
+            :meth:`reset_wet_area`). A scalar *rainfall_intensity* is added
+            to the depth of every core node, as it is without a threshold,
+            and nodes that it makes wet join the wet area. Nodes with a
+            *rainfall_intensity* array greater than
+            zero are always wet; assign a new array, rather than changing
+            one in place, to change them. This implies *preallocate*, and
+            cannot be used with *time_step_levels* or *num_threads*.
         """
         super(OverlandFlow, self).__init__(grid, **kwds)
 
@@ -203,7 +246,17 @@ class OverlandFlow(Component):
         self.theta = theta
         self.rainfall_intensity = rainfall_intensity
         self.steep_slopes = steep_slopes
-
+        self._num_threads = num_threads
+        self._time_step_levels = int(time_step_levels)
+        self._wet_threshold = wet_threshold
+        self._wet_area = None
+        if wet_threshold is not None and (self._time_step_levels > 0 or
+                                          num_threads is not None):
+            raise ValueError('wet_threshold cannot be used with '
+                             'time_step_levels or num_threads')
+        self._preallocate = (preallocate or num_threads is not None or
+                             self._time_step_levels > 0 or
+                             wet_threshold is not None)
 
         # Now setting up fields at the links...
         # For water discharge
@@ -381,6 +434,583 @@ class OverlandFlow(Component):
         # Once the neighbor arrays are set up, we change the flag to True!
         self.neighbor_flag = True
 
+        if self._preallocate:
+            self._set_up_buffers()
+
+    def _set_up_buffers(self):
+        """Allocate the work arrays used by a preallocated time step.
+
+        The discharge is held in an array one longer than the number of
+        links, with a zero at the end that is picked up by the '-1' IDs of
+        non-existent neighbor links. The discharge field is a view into it.
+        """
+        grid = self.grid
+        n_horiz = self.horizontal_ids.size
+        n_vert = self.vertical_ids.size
+
+        self._q_padded = np.zeros(grid.number_of_links + 1)
+
+        # Copies, as numpy copies read-only index arrays when using them.
+        self._active_links = np.array(grid.active_links)
+        self._core_nodes = np.array(grid.core_nodes)
+        self._node_at_cell = np.array(grid.node_at_cell)
+        self._head_of_active = grid.node_at_link_head[self._active_links]
+        self._tail_of_active = grid.node_at_link_tail[self._active_links]
+        self._length_of_active = grid.length_of_link[self._active_links]
+        self._at_head = np.empty(self._active_links.size)
+        self._at_tail = np.empty(self._active_links.size)
+        self._zmax = np.empty(self._active_links.size)
+        self._hflow = np.empty(self._active_links.size)
+        self.water_surface__gradient = np.zeros(self._active_links.size)
+
+        self._w = np.empty(grid.number_of_nodes)
+
+        self._q_old = {'horizontal': np.empty(n_horiz),
+                       'vertical': np.empty(n_vert)}
+        self._work = {'horizontal': [np.empty(n_horiz) for _ in range(4)],
+                      'vertical': [np.empty(n_vert) for _ in range(4)]}
+
+        if self.default_fixed_links is True:
+            self._fixed_links = grid.fixed_links
+            self._q_fixed = np.empty(self._fixed_links.size)
+
+        # Stored face by face (one row per face of the cells) so that each
+        # row is contiguous.
+        self._links_at_cell = np.ascontiguousarray(
+            grid.link_at_face[grid.faces_at_cell].T)
+        self._width_at_cell = np.ascontiguousarray(
+            grid.width_of_face[grid.faces_at_cell].T)
+        self._dirs_at_cell = np.ascontiguousarray(
+            grid.link_dirs_at_node[grid.node_at_cell].T)
+        self._flux_at_cell = np.empty(self._links_at_cell.shape)
+        self._net_flux = np.empty(grid.number_of_cells)
+        self._flux_div = grid.zeros(at='node')
+        self.dhdt = grid.zeros(at='node')
+        self._h_core = np.empty(self._core_nodes.size)
+        self._dhdt_core = np.empty(self._core_nodes.size)
+
+        if self._num_threads is not None:
+            self._set_up_kernel_buffers()
+
+        if self._time_step_levels > 0 or self._wet_threshold is not None:
+            self._set_up_link_subsets()
+
+        if self.steep_slopes is True:
+            self._froude = np.empty(grid.number_of_links)
+            self._courant = np.empty(grid.number_of_links)
+            self._limit = np.empty(grid.number_of_links)
+            self._is_positive = np.empty(grid.number_of_links, dtype=bool)
+            self._is_negative = np.empty(grid.number_of_links, dtype=bool)
+            self._too_fast = np.empty(grid.number_of_links, dtype=bool)
+            self._rules = [np.empty(grid.number_of_links, dtype=bool)
+                           for _ in range(4)]
+            self._too_shallow = np.empty(grid.number_of_nodes, dtype=bool)
+
+    def _set_up_kernel_buffers(self):
+        """Allocate the extra arrays used by the compiled kernels."""
+        grid = self.grid
+        self._q_old_padded = np.zeros(grid.number_of_links + 1)
+        self._mannings_n_at_link = np.empty(grid.number_of_links)
+        if np.ndim(self.mannings_n) == 0:
+            self._mannings_n_at_link.fill(self.mannings_n)
+        self._rainfall_at_node = np.empty(grid.number_of_nodes)
+        self._is_core = (grid.status_at_node == 0).astype(np.uint8)
+        self._area_of_cell = np.array(grid.area_of_cell, dtype=float)
+
+        self._link_ids = {}
+        for direction, ids, neighbors in (
+                ('horizontal', self.horizontal_ids,
+                 (self.west_neighbors, self.east_neighbors)),
+                ('vertical', self.vertical_ids,
+                 (self.north_neighbors, self.south_neighbors))):
+            self._link_ids[direction] = [
+                np.array(ids, dtype=int),
+                np.array(neighbors[0], dtype=int),
+                np.array(neighbors[1], dtype=int)]
+
+    def _set_up_link_subsets(self):
+        """Set up the connectivity used to update some of the links.
+
+        Neighbor links and links at nodes are given as link IDs, where the
+        ID of a missing link is that of the padding zero at the end of the
+        discharge buffer.
+        """
+        grid = self.grid
+        n_links = grid.number_of_links
+
+        self._first_neighbor = np.full(n_links, n_links, dtype=int)
+        self._second_neighbor = np.full(n_links, n_links, dtype=int)
+        for ids, neighbors in ((self.horizontal_ids, (self.west_neighbors,
+                                                      self.east_neighbors)),
+                               (self.vertical_ids, (self.north_neighbors,
+                                                    self.south_neighbors))):
+            for neighbor_at_link, neighbor in zip(
+                    (self._first_neighbor, self._second_neighbor), neighbors):
+                neighbor_at_link[ids] = np.where(neighbor == -1, n_links,
+                                                 neighbor)
+
+        self._is_active_link = np.zeros(n_links, dtype=bool)
+        self._is_active_link[self._active_links] = True
+        self._index_of_active_link = np.full(n_links, -1, dtype=int)
+        self._index_of_active_link[self._active_links] = np.arange(
+            self._active_links.size)
+        self._node_at_link_head = np.array(grid.node_at_link_head)
+        self._node_at_link_tail = np.array(grid.node_at_link_tail)
+        self._length_of_link = np.array(grid.length_of_link)
+
+        self._links_at_node = np.where(grid.links_at_node == -1, n_links,
+                                       grid.links_at_node)
+        self._flux_coef_at_node = calc_flux_coefficients_at_nodes(
+            grid, np.arange(grid.number_of_nodes))
+
+        self._level_at_link = np.empty(n_links + 1, dtype=int)
+        self._wet_area = None
+
+    def _assign_time_step_levels(self, dt_min, max_level):
+        """Sort links and core nodes by the level of their time step.
+
+        A link at level *k* is stable with a time step of
+        ``dt_min * 2 ** k``: from the Courant condition on the speed of the
+        flow plus that of a shallow-water wave, and so that water starting
+        from rest is not accelerated down the water surface across a whole
+        cell in a step (which would drain shallow cells dry). Levels are
+        fixed for a cycle of ``2 ** max_level`` global steps, in which a
+        flood front can move up to about ``2 * alpha * 2 ** max_level``
+        cells, so every node within that distance of a node takes its level.
+        A link takes the lower level of its nodes, and a node the lowest
+        level of its links.
+        """
+        h_links = self.h_links
+        with np.errstate(divide='ignore', invalid='ignore'):
+            speed = (np.abs(self.q) / h_links + np.sqrt(self.g * h_links))
+            dt_link = np.minimum(
+                self.grid.dx / speed,
+                np.sqrt(self.grid.dx / (self.g * np.abs(
+                    self.water_surface_slope))))
+            level = np.floor(np.log2(self.alpha * dt_link / dt_min))
+            level[~(level < max_level)] = max_level
+        level = level.astype(int).clip(0, max_level)
+
+        at_link = self._level_at_link
+        at_link[:-1] = level
+        at_link[-1] = max_level
+        at_node = at_link[self._links_at_node].min(axis=1)
+        reach = int(np.ceil(2. * self.alpha * 2 ** max_level))
+        at_node = ndimage.minimum_filter(
+            at_node.reshape(self.grid.shape), size=2 * reach + 1,
+            mode='nearest').reshape(-1)
+        np.minimum(at_node[self._node_at_link_head],
+                   at_node[self._node_at_link_tail], out=level)
+        at_link[:-1] = level
+        node_level = at_link[self._links_at_node[self._core_nodes]].min(
+            axis=1)
+
+        link_order, dt_at_link, n_links_due = _sort_by_level(
+            level, max_level, dt_min)
+        node_order, dt_at_node, n_nodes_due = _sort_by_level(
+            node_level, max_level, dt_min)
+        return (link_order, dt_at_link, n_links_due,
+                node_order, dt_at_node, n_nodes_due)
+
+    def _run_local_time_steps(self, dt_max):
+        """Advance the flow by one cycle of local time steps.
+
+        The cycle is ``2 ** max_level`` steps of the global time step,
+        *dt_min*, where *max_level* is at most *time_step_levels*, and the
+        cycle is no longer than *dt_max*. At the start of every
+        ``2 ** k``-th of these steps the links (and then the nodes) at
+        levels *k* and below are updated with their own time steps. The
+        discharge at a link is constant between its updates, and the nodes at
+        either end of it both see it for the same time.
+
+        Returns the length of the cycle.
+        """
+        self.h = self.grid.at_node['surface_water__depth']
+        self.z = self.grid.at_node['topographic__elevation']
+        self.h_links = self.grid.at_link['surface_water__depth']
+        self._bind_discharge_to_buffer()
+        self.core_nodes = self._core_nodes
+        self.active_links = self._active_links
+
+        dt_min = self.dt
+        max_level = self._time_step_levels
+        while max_level > 0 and dt_min * 2. ** max_level > dt_max:
+            max_level -= 1
+
+        self._calc_flow_depth_and_slope(self._active_links)
+        (link_order, dt_at_link, n_links_due,
+         node_order, dt_at_node, n_nodes_due) = self._assign_time_step_levels(
+             dt_min, max_level)
+        node_order = self._core_nodes[node_order]
+
+        for step in range(2 ** max_level):
+            if step == 0:
+                level = max_level
+            else:
+                level = min((step & -step).bit_length() - 1, max_level)
+
+            links = link_order[:n_links_due[level]]
+            if step > 0:
+                self._calc_flow_depth_and_slope(
+                    links[self._is_active_link[links]])
+            self._update_discharge_at_due_links(
+                links, dt_at_link[:n_links_due[level]])
+
+            self._update_water_depth_at_due_nodes(
+                node_order[:n_nodes_due[level]],
+                dt_at_node[:n_nodes_due[level]])
+
+        self.water_surface__gradient = self.water_surface_slope[
+            self._active_links]
+
+        return dt_min * 2. ** max_level
+
+    def _calc_time_step_on_wet_area(self):
+        """Calculate the time step from the depths of the wet area."""
+        if self.neighbor_flag is False:
+            self.set_up_neighbor_arrays()
+        h = self.grid.at_node['surface_water__depth']
+        if self._wet_area is None:
+            self._wet_area = WetArea(self.grid, h, self._wet_threshold,
+                                     self._is_active_link)
+            self._wet_rainfall = None
+        self.dt = (self.alpha * self._grid.dx /
+                   np.sqrt(self.g * self._wet_area.max_depth(h)))
+        return self.dt
+
+    def _update_wet_links(self):
+        """Advance one time step of length *dt* over the wet area only."""
+        self.h = self.grid.at_node['surface_water__depth']
+        self.z = self.grid.at_node['topographic__elevation']
+        self.h_links = self.grid.at_link['surface_water__depth']
+        self._bind_discharge_to_buffer()
+        self.core_nodes = self._core_nodes
+        self.active_links = self._active_links
+
+        # Nodes that are rained on are part of the wet area.
+        wet_area = self._wet_area
+        if (np.ndim(self.rainfall_intensity) > 0 and
+                self.rainfall_intensity is not self._wet_rainfall):
+            self._wet_rainfall = self.rainfall_intensity
+            wet_area.add_wet_nodes(np.flatnonzero(self.rainfall_intensity),
+                                   keep=True)
+
+        links = wet_area.links
+        self._calc_flow_depth_and_slope(links)
+        self._update_discharge_at_due_links(links, self.dt)
+        self._update_water_depth_at_due_nodes(wet_area.nodes, self.dt)
+
+        if np.ndim(self.rainfall_intensity) == 0:
+            wet_area.add_rain(self.h, self.rainfall_intensity * self.dt)
+        wet_area.grow(self.h)
+        self._q_padded[wet_area.shrink(self.h)] = 0.
+
+        self.water_surface__gradient[self._index_of_active_link[links]] = (
+            self.water_surface_slope[links])
+
+    def reset_wet_area(self):
+        """Find the area over which flow is updated anew.
+
+        With a *wet_threshold*, the wet area grows as water spreads, and
+        shrinks once more than half of its wet nodes have drained. Call this
+        after changing water depths from outside the component at nodes
+        away from the wet area.
+        """
+        if self._wet_area is not None:
+            dried = self._wet_area.reset(
+                self.grid.at_node['surface_water__depth'])
+            self._q_padded[dried] = 0.
+            self._wet_rainfall = None
+
+    def _update_water_depth_at_due_nodes(self, nodes, dt):
+        """Update water depth at some core nodes, each with its own step."""
+        if np.ndim(self.rainfall_intensity) == 0:
+            rainfall = self.rainfall_intensity
+        else:
+            rainfall = self.rainfall_intensity[nodes]
+        dhdt = rainfall + np.sum(
+            self._q_padded[self._links_at_node[nodes]] *
+            self._flux_coef_at_node[nodes], axis=1)
+        self.dhdt[nodes] = dhdt
+        h = self.h[nodes] + dhdt * dt
+        if self.steep_slopes is True:
+            h[h < self.h_init] = self.h_init * 10.0 ** -3
+        self.h[nodes] = h
+
+    def _calc_flow_depth_and_slope(self, links):
+        """Flow depth and water-surface slope at some active links."""
+        head = self._node_at_link_head[links]
+        tail = self._node_at_link_tail[links]
+        w_head = self.h[head] + self.z[head]
+        w_tail = self.h[tail] + self.z[tail]
+        self.h_links[links] = (np.maximum(w_head, w_tail) -
+                               np.maximum(self.z[head], self.z[tail]))
+        self.water_surface_slope[links] = ((w_head - w_tail) /
+                                           self._length_of_link[links])
+
+    def _update_discharge_at_due_links(self, links, dt):
+        """Update discharge at some links, each with its own time step."""
+        q = self._q_padded
+        if self.default_fixed_links is True:
+            q[self._fixed_links] = q[self.active_neighbors]
+
+        if np.ndim(self.mannings_n) == 0:
+            mannings_n = self.mannings_n
+        else:
+            mannings_n = self.mannings_n[links]
+        h_links = self.h_links[links]
+        q_old = q[links]
+        q[links] = ((
+            self.theta * q_old + (1. - self.theta) / 2. *
+            (q[self._first_neighbor[links]] +
+             q[self._second_neighbor[links]]) -
+            self.g * h_links * dt * self.water_surface_slope[links]) /
+            (1 + self.g * dt * mannings_n ** 2. * abs(q_old) /
+             h_links ** _SEVEN_OVER_THREE))
+
+        if self.default_fixed_links is True:
+            q[self._fixed_links] = q[self.active_neighbors]
+
+        if self.steep_slopes is True:
+            q_links = q[links]
+            celerity = np.sqrt(self.g * h_links)
+            froude = q_links / h_links / celerity
+            courant = q_links * dt / self.grid.dx
+            limit = np.where(np.abs(froude) > 1., h_links * celerity,
+                             np.abs(q_links))
+            limit = np.where(np.abs(courant) > h_links / 4.,
+                             h_links * self.grid.dx / 5. / dt, limit)
+            q[links] = np.sign(q_links) * limit
+
+    def _bind_discharge_to_buffer(self):
+        """Make the discharge field a view into the padded buffer."""
+        q = self.grid.at_link['surface_water__discharge']
+        if q is not self.q or self.q.base is not self._q_padded:
+            self._q_padded[:-1] = q
+            self.q = self._q_padded[:-1]
+            self.grid.at_link['surface_water__discharge'] = self.q
+
+    def _update_discharge_in_place(self, direction, ids, neighbors):
+        """Update discharge on all links of one direction, in place."""
+        q_padded = self._q_padded
+        q_old = self._q_old[direction]
+        neighbor_sum, inertia, friction, h_links = self._work[direction]
+
+        np.take(q_padded, ids, out=q_old, mode='clip')
+        np.take(q_padded, neighbors[0], out=neighbor_sum, mode='wrap')
+        np.take(q_padded, neighbors[1], out=inertia, mode='wrap')
+        neighbor_sum += inertia
+        neighbor_sum *= (1. - self.theta) / 2.
+
+        # The numerator: weighted old and neighbor discharges, less the
+        # water-surface slope term.
+        np.multiply(q_old, self.theta, out=inertia)
+        inertia += neighbor_sum
+        np.take(self.h_links, ids, out=h_links, mode='clip')
+        np.multiply(h_links, self.g, out=neighbor_sum)
+        neighbor_sum *= self.dt
+        np.take(self.water_surface_slope, ids, out=friction,
+                mode='clip')
+        neighbor_sum *= friction
+        inertia -= neighbor_sum
+
+        # The denominator: the friction term.
+        if np.ndim(self.mannings_n) == 0:
+            np.absolute(q_old, out=friction)
+            friction *= self.g * self.dt * self.mannings_n ** 2.
+        else:
+            np.take(self.mannings_n, ids, out=friction, mode='clip')
+            np.square(friction, out=friction)
+            friction *= self.g * self.dt
+            np.absolute(q_old, out=neighbor_sum)
+            friction *= neighbor_sum
+        np.power(h_links, _SEVEN_OVER_THREE, out=h_links)
+        friction /= h_links
+        friction += 1.
+
+        inertia /= friction
+        q_padded[ids] = inertia
+
+    def _limit_steep_discharge(self):
+        """Reduce discharge that exceeds the Froude or Courant limits."""
+        q, h_links = self.q, self.h_links
+        froude, courant, limit = self._froude, self._courant, self._limit
+        rules = self._rules
+        Fr = 1.0
+
+        np.divide(q, h_links, out=froude)
+        np.multiply(h_links, self.g, out=limit)
+        np.sqrt(limit, out=limit)
+        froude /= limit
+        np.multiply(q, self.dt, out=courant)
+        courant /= self.grid.dx
+        np.greater(q, 0., out=self._is_positive)
+        np.less(q, 0., out=self._is_negative)
+
+        np.greater(froude, Fr, out=self._too_fast)
+        np.logical_and(self._is_positive, self._too_fast, out=rules[0])
+        np.absolute(froude, out=froude)
+        np.greater(froude, Fr, out=self._too_fast)
+        np.logical_and(self._is_negative, self._too_fast, out=rules[1])
+
+        np.divide(h_links, 4., out=froude)
+        np.greater(courant, froude, out=self._too_fast)
+        np.logical_and(self._is_positive, self._too_fast, out=rules[2])
+        np.absolute(courant, out=courant)
+        np.greater(courant, froude, out=self._too_fast)
+        np.logical_and(self._is_negative, self._too_fast, out=rules[3])
+
+        # Rules 1 and 2 reduce discharge by the Froude number.
+        limit *= Fr
+        limit *= h_links
+        np.copyto(q, limit, where=rules[0])
+        np.negative(limit, out=limit)
+        np.copyto(q, limit, where=rules[1])
+
+        # Rules 3 and 4 reduce discharge by the Courant number.
+        np.multiply(h_links, self.grid.dx, out=limit)
+        limit /= 5.
+        limit /= self.dt
+        np.copyto(q, limit, where=rules[2])
+        np.negative(limit, out=limit)
+        np.copyto(q, limit, where=rules[3])
+
+    def _update_with_kernels(self):
+        """Advance one time step of length *dt* with the compiled kernels.
+
+        The same calculation as a time step of *overland_flow*, with the
+        loops over links and nodes run on *num_threads* threads.
+        """
+        num_threads = self._num_threads
+        self.h = self.grid.at_node['surface_water__depth']
+        self.z = self.grid.at_node['topographic__elevation']
+        self.h_links = self.grid.at_link['surface_water__depth']
+        self._bind_discharge_to_buffer()
+        self.core_nodes = self._core_nodes
+        self.active_links = self._active_links
+
+        _calc_water_depth_and_slope_at_links(
+            self._active_links, self._head_of_active, self._tail_of_active,
+            self._length_of_active, self.z, self.h, self.h_links,
+            self.water_surface_slope, num_threads)
+        np.take(self.water_surface_slope, self._active_links,
+                out=self.water_surface__gradient, mode='clip')
+
+        if self.default_fixed_links is True:
+            np.take(self._q_padded, self.active_neighbors, out=self._q_fixed,
+                    mode='clip')
+            self._q_padded[self._fixed_links] = self._q_fixed
+
+        # Every link is updated from the discharges at the start of the
+        # step, so that threads do not race on neighboring links.
+        self._q_old_padded[:] = self._q_padded
+        if np.ndim(self.mannings_n) > 0:
+            self._mannings_n_at_link[:] = self.mannings_n
+        for direction in ('horizontal', 'vertical'):
+            ids, first_neighbor, second_neighbor = self._link_ids[direction]
+            _update_discharge_at_links(
+                ids, first_neighbor, second_neighbor, self._q_old_padded,
+                self._q_padded, self.h_links, self.water_surface_slope,
+                self._mannings_n_at_link, self.theta, self.g, self.dt,
+                num_threads)
+
+        if self.default_fixed_links is True:
+            np.take(self._q_padded, self.active_neighbors, out=self._q_fixed,
+                    mode='clip')
+            self._q_padded[self._fixed_links] = self._q_fixed
+
+        if self.steep_slopes is True:
+            _limit_steep_discharge(self.q, self.h_links, self.g, self.dt,
+                                   self.grid.dx, num_threads)
+
+        self._rainfall_at_node[:] = self.rainfall_intensity
+        _update_water_depth_at_nodes(
+            self._node_at_cell, self._links_at_cell, self._width_at_cell,
+            self._dirs_at_cell, self._area_of_cell, self._q_padded,
+            self._rainfall_at_node, self._is_core, self.dhdt, self.h, self.dt,
+            num_threads)
+
+        if self.steep_slopes is True:
+            np.less(self.h, self.h_init, out=self._too_shallow)
+            np.copyto(self.h, self.h_init * 10.0 ** -3,
+                      where=self._too_shallow)
+
+    def _update_in_place(self):
+        """Advance one time step of length *dt* without allocating arrays.
+
+        The same calculation as a time step of *overland_flow*, done in the
+        buffers made by *_set_up_buffers*.
+        """
+        self.h = self.grid.at_node['surface_water__depth']
+        self.z = self.grid.at_node['topographic__elevation']
+        self.h_links = self.grid.at_link['surface_water__depth']
+        self._bind_discharge_to_buffer()
+        self.core_nodes = self._core_nodes
+        self.active_links = self._active_links
+
+        # Water depth at links is the difference between the highest water
+        # surface and the highest bed elevation of the link's nodes.
+        np.take(self.z, self._head_of_active, out=self._at_head, mode='clip')
+        np.take(self.z, self._tail_of_active, out=self._at_tail, mode='clip')
+        np.maximum(self._at_head, self._at_tail, out=self._zmax)
+        np.add(self.h, self.z, out=self._w)
+        np.take(self._w, self._head_of_active, out=self._at_head, mode='clip')
+        np.take(self._w, self._tail_of_active, out=self._at_tail, mode='clip')
+        np.maximum(self._at_head, self._at_tail, out=self._hflow)
+        self._hflow -= self._zmax
+        self.h_links[self._active_links] = self._hflow
+
+        # Water-surface slope at active links.
+        np.subtract(self._at_head, self._at_tail,
+                    out=self.water_surface__gradient)
+        self.water_surface__gradient /= self._length_of_active
+        self.water_surface_slope[self._active_links] = (
+            self.water_surface__gradient)
+
+        if self.default_fixed_links is True:
+            np.take(self._q_padded, self.active_neighbors, out=self._q_fixed,
+                    mode='clip')
+            self._q_padded[self._fixed_links] = self._q_fixed
+
+        self._update_discharge_in_place(
+            'horizontal', self.horizontal_ids,
+            (self.west_neighbors, self.east_neighbors))
+        self._update_discharge_in_place(
+            'vertical', self.vertical_ids,
+            (self.north_neighbors, self.south_neighbors))
+
+        if self.default_fixed_links is True:
+            np.take(self._q_padded, self.active_neighbors, out=self._q_fixed,
+                    mode='clip')
+            self._q_padded[self._fixed_links] = self._q_fixed
+
+        if self.steep_slopes is True:
+            self._limit_steep_discharge()
+
+        # Flux divergence at cells, summed face by face as in
+        # calc_flux_div_at_node.
+        np.take(self._q_padded, self._links_at_cell, out=self._flux_at_cell,
+                mode='clip')
+        self._flux_at_cell *= self._width_at_cell
+        self._flux_at_cell *= self._dirs_at_cell
+        self._net_flux.fill(0.)
+        for flux_at_face in self._flux_at_cell:
+            self._net_flux -= flux_at_face
+        self._net_flux /= self.grid.area_of_cell
+        self._flux_div[self._node_at_cell] = self._net_flux
+        np.subtract(self.rainfall_intensity, self._flux_div, out=self.dhdt)
+
+        np.take(self.h, self._core_nodes, out=self._h_core, mode='clip')
+        np.take(self.dhdt, self._core_nodes, out=self._dhdt_core, mode='clip')
+        self._dhdt_core *= self.dt
+        self._h_core += self._dhdt_core
+        self.h[self._core_nodes] = self._h_core
+
+        if self.steep_slopes is True:
+            np.less(self.h, self.h_init, out=self._too_shallow)
+            np.copyto(self.h, self.h_init * 10.0 ** -3,
+                      where=self._too_shallow)
+
     def overland_flow(self, dt=None):
         """Generate overland flow across a grid.
 
@@ -398,7 +1028,10 @@ class OverlandFlow(Component):
         if dt is None:
             dt = np.inf  # to allow the loop to begin
         while local_elapsed_time < dt:
-            dt_local = self.calc_time_step()
+            if self._wet_threshold is not None:
+                dt_local = self._calc_time_step_on_wet_area()
+            else:
+                dt_local = self.calc_time_step()
             # Can really get into trouble if nothing happens but we still run:
             if not dt_local < np.inf:
                 break
@@ -411,6 +1044,25 @@ class OverlandFlow(Component):
             if self.neighbor_flag is False:
                 self.set_up_neighbor_arrays()
 
+            if self._time_step_levels > 0:
+                self.dt = self._run_local_time_steps(dt - local_elapsed_time)
+                if dt is np.inf:
+                    break
+                local_elapsed_time += self.dt
+                continue
+
+            if self._preallocate:
+                if self._wet_threshold is not None:
+                    self._update_wet_links()
+                elif self._num_threads is None:
+                    self._update_in_place()
+                else:
+                    self._update_with_kernels()
+                if dt is np.inf:
+                    break
+                local_elapsed_time += self.dt
+                continue
+
             # In case another component has added data to the fields, we just
             # reset our water depths, topographic elevations and water
             # discharge variables to the fields.
@@ -683,6 +1335,18 @@ class OverlandFlow(Component):
         return discharge_vals
 
 
+def _sort_by_level(level, max_level, dt_min):
+    """Sort elements by the level of their time step.
+
+    Returns the order of the elements, the time step of each in that order,
+    and the number of elements at or below each level.
+    """
+    at_level = [np.flatnonzero(level == k) for k in range(max_level + 1)]
+    count = np.array([ids.size for ids in at_level])
+    dt = np.repeat(dt_min * 2. ** np.arange(max_level + 1), count)
+    return np.concatenate(at_level), dt, np.cumsum(count)
+
+
 def find_active_neighbors_for_fixed_links(grid):
     """Find active link neighbors for every fixed link.
 
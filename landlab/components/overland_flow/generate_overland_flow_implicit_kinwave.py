@@ -9,17 +9,21 @@ Created on Fri May 27 14:26:13 2016
 """
 
 
-from landlab import Component
+from landlab import Component, CORE_NODE
 from landlab.components import FlowAccumulator
-from scipy.optimize import newton
+from .cfuncs import _sweep_implicit_kinwave
 import numpy as np
 
 
+_NEWTON_TOL = 1.48e-8
+_NEWTON_MAX_ITER = 50
+
+
 def water_fn(x, a, b, c, d, e):
     """Evaluates the solution to the water-depth equation.
 
-    Called by scipy.newton() to find solution for :math:`x`
-    using Newton's method.
+    This is the equation that the component solves for :math:`x` at each
+    node using Newton's method.
 
     Parameters
     ----------
@@ -130,8 +134,9 @@ class KinwaveImplicitOverlandFlow(Component):
     When we combine these equations, we have an equation that includes the
     unknown :math:`H^{t+1}` and a bunch of terms that are known.
     If :math:`w\ne 0`, it is a nonlinear equation in :math:`H^{t+1}`,
-    and must be solved iteratively. We do this using a root-finding
-    method in the scipy.optimize library.
+    and must be solved iteratively. We do this using Newton's method, with
+    the analytic derivative of the equation, in a compiled sweep over the
+    nodes.
 
     Examples
     --------
@@ -271,6 +276,10 @@ class KinwaveImplicitOverlandFlow(Component):
                                     flow_director='MFD',
                                     partition_method='square_root_of_slope')
 
+        # Flags for the nodes whose depth is updated, and their cell areas
+        self._is_core = (grid.status_at_node == CORE_NODE).astype(np.uint8)
+        self._cell_area_at_node = grid.cell_area_at_node
+
         # Flag to let us know whether this is our first iteration
         self.first_iteration = True
 
@@ -297,6 +306,10 @@ class KinwaveImplicitOverlandFlow(Component):
             self.flow_accum.run_one_step()
             self.nodes_ordered = self.grid.at_node['flow__upstream_node_order']
             self.flow_lnks = self.grid.at_node['flow__link_to_receiver_node']
+            self._is_core = (
+                self._grid.status_at_node == CORE_NODE).astype(np.uint8)
+            self._nbrs = self._grid.adjacent_nodes_at_node.astype(
+                self.nodes_ordered.dtype, copy=False)
 
             # (Re)calculate, for each node, sum of sqrt(gradient) x width
             self.grad_width_sum[:] = 0.0
@@ -316,44 +329,29 @@ class KinwaveImplicitOverlandFlow(Component):
         # Zero out inflow discharge
         self.disch_in[:] = 0.0
 
-        # Upstream-to-downstream loop
-        for i in range(len(self.nodes_ordered) - 1, -1, -1):
-            n = self.nodes_ordered[i]
-            if self.grid.status_at_node[n] == 0:
-
-                # Solve for new water depth
-                aa = self.alpha[n]
-                cc = self.depth[n]
-                ee = ((dt * runoff_rate)
-                       + (dt * self.disch_in[n]
-                          / self.grid.area_of_cell[self.grid.cell_at_node[n]]))
-                self.depth[n] = newton(water_fn, self.depth[n],
-                                       args=(aa, self.weight, cc,
-                                             self.depth_exp, ee))
-
-                # Calc outflow
-                Heff = (self.weight * self.depth[n]
-                        + (1.0 - self.weight) * cc)
-                outflow = (self.vel_coef * (Heff ** self.depth_exp)
-                           * self.grad_width_sum[n])  # this is manning/chezy/darcy
-
-                # Send flow downstream. Here we take total inflow discharge
-                # and partition it among the node's neighbors. For this, we use
-                # the flow director's "proportions" array, which contains, for
-                # each node, the proportion of flow that heads out toward each
-                # of its N neighbors. The proportion is zero if the neighbor is
-                # uphill; otherwise, it is S^1/2 / sum(S^1/2). If for example
-                # we have a raster grid, there will be four neighbors and four
-                # proportions, some of which may be zero and some between 0 and
-                # 1.
-                self.disch_in[self.grid.adjacent_nodes_at_node[n]] += (outflow
-                    * self.flow_accum.flow_director.proportions[n])
-
-                # TODO: the above is enough to implement the solution for flow
-                # depth, but it does not provide any information about flow
-                # velocity or discharge on links. This could be added as an
-                # optional method, perhaps done just before output.
-
+        # Upstream-to-downstream sweep. At each core node we solve for the
+        # new water depth, then send the outflow downstream. Here we take
+        # total outflow discharge and partition it among the node's
+        # neighbors using the flow director's "proportions" array, which
+        # contains, for each node, the proportion of flow that heads out
+        # toward each of its N neighbors. The proportion is zero if the
+        # neighbor is uphill; otherwise, it is S^1/2 / sum(S^1/2).
+        n_failed = _sweep_implicit_kinwave(
+            self.nodes_ordered, self._is_core, self._nbrs,
+            self.flow_accum.flow_director.proportions, self.alpha,
+            self.grad_width_sum, self._cell_area_at_node, self.depth,
+            self.disch_in, dt, runoff_rate, self.weight, self.depth_exp,
+            self.vel_coef, _NEWTON_TOL, _NEWTON_MAX_ITER)
+        if n_failed > 0:
+            raise RuntimeError(
+                'water depth failed to converge after {n_iter} iterations '
+                'at {n_failed} node(s)'.format(n_iter=_NEWTON_MAX_ITER,
+                                               n_failed=n_failed))
+
+        # TODO: the above is enough to implement the solution for flow
+        # depth, but it does not provide any information about flow
+        # velocity or discharge on links. This could be added as an
+        # optional method, perhaps done just before output.
 
 if __name__ == '__main__':
     import doctest
@@ -11,6 +11,8 @@ Created on Fri May 27 14:26:13 2016
 from landlab import Component
 import numpy as np
 
+from .wet_links import WetArea, calc_flux_coefficients_at_nodes
+
 
 class KinwaveOverlandFlowModel(Component):
     """Calculate water flow over topography.
@@ -80,7 +82,7 @@ class KinwaveOverlandFlowModel(Component):
     }
 
     def __init__(self, grid, precip_rate=1.0, precip_duration=1.0,
-                 infilt_rate=0.0, roughness=0.01, **kwds):
+                 infilt_rate=0.0, roughness=0.01, wet_threshold=None, **kwds):
         """Initialize the KinwaveOverlandFlowModel.
 
         Parameters
@@ -95,6 +97,16 @@ class KinwaveOverlandFlowModel(Component):
             Maximum rate of infiltration, mm/hr
         roughness : float, defaults to 0.01
             Manning roughness coefficient, s/m^1/3
+        wet_threshold : float, optional
+            If given, calculate flow only over the wet part of the grid: the
+            links of nodes with water deeper than this (m), and one more
+            ring of links around them. Discharge elsewhere is zero. The wet
+            area is kept between time steps, grows as water reaches new
+            nodes and shrinks as they drain, so that a time step takes time
+            in proportion to the wet area rather than to the grid (see
+            :meth:`reset_wet_area`). Rain (less infiltration) is still added
+            to the depth of every core node. With a threshold of zero, the
+            result is the same as without one.
         """
 
         # Store grid and parameters and do unit conversion
@@ -139,11 +151,27 @@ class KinwaveOverlandFlowModel(Component):
         self.sqrt_slope = np.sqrt(self.slope)
         self.sign_slope = np.sign(self.slope)
 
+        self._wet_threshold = wet_threshold
+        if wet_threshold is not None:
+            self._is_active_link = np.zeros(grid.number_of_links, dtype=bool)
+            self._is_active_link[grid.active_links] = True
+            self._links_at_node = np.where(grid.links_at_node == -1,
+                                           grid.number_of_links,
+                                           grid.links_at_node)
+            self._flux_coef_at_node = calc_flux_coefficients_at_nodes(
+                grid, np.arange(grid.number_of_nodes))
+            self._disch_padded = np.zeros(grid.number_of_links + 1)
+        self._wet_area = None
+
     def run_one_step(self, dt, current_time=0.0, **kwds):
         """Calculate water flow for a time period `dt`.
 
         Default units for dt are *seconds*.
         """
+        if self._wet_threshold is not None:
+            self._run_one_step_on_wet_links(dt, current_time=current_time)
+            return
+
         # Calculate water depth at links. This implements an "upwind" scheme
         # in which water depth at the links is the depth at the higher of the
         # two nodes.
@@ -173,6 +201,66 @@ class KinwaveOverlandFlowModel(Component):
         # Very crude numerical hack: prevent negative water depth
         self.depth[np.where(self.depth < 0.0)[0]] = 0.0
 
+    def _run_one_step_on_wet_links(self, dt, current_time=0.0):
+        """Calculate water flow for a time period `dt` over the wet area.
+
+        The velocity and discharge fields are updated in place, and are
+        zero away from the wet area.
+        """
+        if self._wet_area is None:
+            self._wet_area = WetArea(self._grid, self.depth,
+                                     self._wet_threshold,
+                                     self._is_active_link, floor=0.)
+        links = self._wet_area.links
+        nodes = self._wet_area.nodes
+
+        # Upwind water depth at the links.
+        head = self._grid.node_at_link_head[links]
+        tail = self._grid.node_at_link_tail[links]
+        H_link = np.where(self.elev[tail] > self.elev[head],
+                          self.depth[tail], self.depth[head])
+
+        vel = (-self.sign_slope[links] * self.vel_coef * H_link**0.66667 *
+               self.sqrt_slope[links])
+        disch = H_link * vel
+        self.vel[links] = vel
+        self.disch[links] = disch
+        self._disch_padded[links] = disch
+
+        if current_time < self.precip_duration:
+            ppt = self.precip
+        else:
+            ppt = 0.0
+
+        # Update water depth: simple forward Euler scheme
+        inflow = np.sum(self._disch_padded[self._links_at_node[nodes]] *
+                        self._flux_coef_at_node[nodes], axis=1)
+        self.depth[nodes] += (ppt - self.infilt + inflow) * dt
+
+        # Very crude numerical hack: prevent negative water depth
+        self.depth[nodes[self.depth[nodes] < 0.0]] = 0.0
+
+        self._wet_area.add_rain(self.depth, (ppt - self.infilt) * dt)
+        self._wet_area.grow(self.depth)
+        self._zero_dry_links(self._wet_area.shrink(self.depth))
+
+    def reset_wet_area(self):
+        """Find the area over which flow is calculated anew.
+
+        With a *wet_threshold*, the wet area grows as water spreads, and
+        shrinks once more than half of its wet nodes have drained. Call this
+        after changing water depths from outside the component at nodes
+        away from the wet area.
+        """
+        if self._wet_area is not None:
+            self._zero_dry_links(self._wet_area.reset(self.depth))
+
+    def _zero_dry_links(self, links):
+        """Zero the velocity and discharge at links that have dried."""
+        self.vel[links] = 0.
+        self.disch[links] = 0.
+        self._disch_padded[links] = 0.
+
 
 if __name__ == '__main__':
     import doctest
@@ -5,6 +5,7 @@ Unit tests for landlab.components.overland_flow.OverlandFlow
 last updated: 3/14/16
 """
 import numpy as np
+import pytest
 
 from landlab import RasterModelGrid
 from landlab.components.overland_flow import OverlandFlow
@@ -141,3 +142,224 @@ def test_deAlm_analytical_imposed_dt_long():
     hdeAlm = hdeAlm[1][1:]
     hdeAlm = np.append(hdeAlm, [0])
     np.testing.assert_almost_equal(h_analytical, hdeAlm, decimal=1)
+
+
+def _run_on_bumpy_plane(steep_slopes, mannings_n, index_dtype=int, **kwds):
+    grid = RasterModelGrid((20, 30), spacing=10., index_dtype=index_dtype)
+    grid.add_field('node', 'surface_water__depth',
+                   np.full(grid.number_of_nodes, 0.01))
+    grid.add_field('node', 'topographic__elevation',
+                   0.001 * grid.y_of_node +
+                   0.001 * np.random.RandomState(0).rand(grid.number_of_nodes))
+    grid.set_closed_boundaries_at_grid_edges(True, True, True, False)
+    if mannings_n == 'mannings_n':
+        grid.add_field('link', 'mannings_n',
+                       0.01 + 0.02 * np.random.RandomState(1).rand(
+                           grid.number_of_links))
+    of = OverlandFlow(grid, mannings_n=mannings_n, rainfall_intensity=1.e-5,
+                      steep_slopes=steep_slopes, **kwds)
+    for _ in range(20):
+        of.run_one_step(dt=60.)
+    return grid
+
+
+@pytest.mark.parametrize('steep_slopes', [False, True])
+@pytest.mark.parametrize('mannings_n', [0.03, 'mannings_n'])
+def test_preallocate_same_as_default(steep_slopes, mannings_n):
+    """Preallocated time steps give the flow of the default, to round-off.
+
+    Gathers into work arrays and in-place updates may round differently
+    from the temporaries of the default, so results are not bit-for-bit
+    identical.
+    """
+    expected = _run_on_bumpy_plane(steep_slopes, mannings_n)
+    actual = _run_on_bumpy_plane(steep_slopes, mannings_n, preallocate=True)
+
+    assert np.all(np.isfinite(expected.at_link['surface_water__discharge']))
+    np.testing.assert_allclose(actual.at_node['surface_water__depth'],
+                               expected.at_node['surface_water__depth'],
+                               rtol=1e-10, atol=1e-12)
+    for name in ('surface_water__discharge', 'surface_water__depth',
+                 'water_surface__gradient'):
+        np.testing.assert_allclose(actual.at_link[name],
+                                   expected.at_link[name],
+                                   rtol=1e-10, atol=1e-12)
+
+
+@pytest.mark.parametrize('num_threads', [1, 2])
+@pytest.mark.parametrize('steep_slopes', [False, True])
+@pytest.mark.parametrize('mannings_n', [0.03, 'mannings_n'])
+def test_threaded_same_as_default(num_threads, steep_slopes, mannings_n):
+    """Compiled kernels give the flow of the default, to round-off.
+
+    The default takes the flux divergence of a raster by differencing
+    across cells, while the kernels sum fluxes over cell faces.
+    """
+    expected = _run_on_bumpy_plane(steep_slopes, mannings_n)
+    actual = _run_on_bumpy_plane(steep_slopes, mannings_n,
+                                 num_threads=num_threads)
+
+    assert np.all(np.isfinite(expected.at_link['surface_water__discharge']))
+    np.testing.assert_allclose(actual.at_node['surface_water__depth'],
+                               expected.at_node['surface_water__depth'],
+                               rtol=1e-10, atol=1e-12)
+    for name in ('surface_water__discharge', 'surface_water__depth',
+                 'water_surface__gradient'):
+        np.testing.assert_allclose(actual.at_link[name],
+                                   expected.at_link[name],
+                                   rtol=1e-10, atol=1e-12)
+
+
+@pytest.mark.parametrize('num_threads', [1, 2])
+def test_threaded_with_int32_ids(num_threads):
+    expected = _run_on_bumpy_plane(True, 0.03, num_threads=num_threads)
+    actual = _run_on_bumpy_plane(True, 0.03, index_dtype=np.int32,
+                                 num_threads=num_threads)
+
+    np.testing.assert_array_equal(actual.at_node['surface_water__depth'],
+                                  expected.at_node['surface_water__depth'])
+    np.testing.assert_array_equal(actual.at_link['surface_water__discharge'],
+                                  expected.at_link['surface_water__discharge'])
+
+
+def _run_dam_break(steep_slopes, **kwds):
+    grid = RasterModelGrid((40, 60), spacing=10.)
+    grid.add_field('node', 'topographic__elevation',
+                   0.001 * grid.y_of_node +
+                   0.0001 * np.random.RandomState(0).rand(
+                       grid.number_of_nodes))
+    h = grid.add_zeros('node', 'surface_water__depth')
+    h[(grid.x_of_node > 250.) & (grid.x_of_node < 350.) &
+      (grid.y_of_node > 250.)] = 0.5
+    grid.set_closed_boundaries_at_grid_edges(True, True, True, True)
+    of = OverlandFlow(grid, steep_slopes=steep_slopes, **kwds)
+    for _ in range(10):
+        of.run_one_step(dt=60.)
+    return grid
+
+
+@pytest.mark.parametrize('time_step_levels', [1, 3])
+@pytest.mark.parametrize('steep_slopes', [False, True])
+def test_local_time_steps_close_to_global(time_step_levels, steep_slopes):
+    """Local time steps give about the same flood as global ones."""
+    expected = _run_dam_break(steep_slopes)
+    actual = _run_dam_break(steep_slopes, time_step_levels=time_step_levels)
+
+    h = actual.at_node['surface_water__depth']
+    assert np.all(np.isfinite(h))
+    np.testing.assert_allclose(h, expected.at_node['surface_water__depth'],
+                               atol=2.e-3)
+
+
+def test_local_time_steps_same_as_global_for_short_steps():
+    """With no room for longer steps, local time steps are global ones."""
+    grids = []
+    for kwds in ({}, {'time_step_levels': 2}):
+        grid = RasterModelGrid((6, 7), spacing=10.)
+        grid.add_field('node', 'surface_water__depth',
+                       np.full(grid.number_of_nodes, 0.01))
+        grid.add_field('node', 'topographic__elevation',
+                       0.001 * grid.y_of_node +
+                       0.001 * np.random.RandomState(0).rand(
+                           grid.number_of_nodes))
+        grid.set_closed_boundaries_at_grid_edges(True, True, True, False)
+        of = OverlandFlow(grid, rainfall_intensity=1.e-5, **kwds)
+        for _ in range(5):
+            of.run_one_step(dt=5.)
+        grids.append(grid)
+
+    np.testing.assert_allclose(
+        grids[1].at_node['surface_water__depth'],
+        grids[0].at_node['surface_water__depth'], rtol=1e-10, atol=1e-12)
+    np.testing.assert_allclose(
+        grids[1].at_link['surface_water__discharge'],
+        grids[0].at_link['surface_water__discharge'], rtol=1e-10, atol=1e-12)
+
+
+@pytest.mark.parametrize('steep_slopes', [False, True])
+@pytest.mark.parametrize('rainfall_intensity', [0., 1.e-5])
+def test_wet_threshold_close_to_default(steep_slopes, rainfall_intensity):
+    """Flow over only the wet links gives about the same flood."""
+    expected = _run_dam_break(steep_slopes,
+                              rainfall_intensity=rainfall_intensity)
+    actual = _run_dam_break(steep_slopes, wet_threshold=1.e-4,
+                            rainfall_intensity=rainfall_intensity)
+
+    np.testing.assert_allclose(actual.at_node['surface_water__depth'],
+                               expected.at_node['surface_water__depth'],
+                               atol=1.e-3)
+
+
+def test_wet_threshold_zero_discharge_on_dry_links():
+    """Discharge is zero away from the water."""
+    grid = _run_dam_break(False, wet_threshold=1.e-4)
+    h = grid.at_node['surface_water__depth']
+    q = grid.at_link['surface_water__discharge']
+
+    nbrs = grid.adjacent_nodes_at_node[h > 1.e-4]
+    near_wet = np.zeros(grid.number_of_nodes, dtype=bool)
+    near_wet[nbrs[nbrs != -1]] = True
+    near_wet[h > 1.e-4] = True
+    is_dry = ~(near_wet[grid.node_at_link_head] |
+               near_wet[grid.node_at_link_tail])
+    assert np.any(is_dry)
+    assert np.all(q[is_dry] == 0.)
+
+
+def test_wet_area_kept_between_steps():
+    """The wet area grows from the water, and rain falls away from it."""
+    grid = RasterModelGrid((40, 60), spacing=10.)
+    grid.add_field('node', 'topographic__elevation', 0.001 * grid.y_of_node)
+    h = grid.add_zeros('node', 'surface_water__depth')
+    h[grid.nodes[35:, 28:32].flatten()] = 0.5
+    grid.set_closed_boundaries_at_grid_edges(True, True, True, True)
+    of = OverlandFlow(grid, wet_threshold=1.e-4, rainfall_intensity=1.e-7)
+    for _ in range(5):
+        of.run_one_step(dt=60.)
+
+    far = grid.nodes[1, 1]
+    assert len(of._wet_area.nodes) < len(grid.core_nodes)
+    assert far not in of._wet_area.nodes
+    assert h[far] == pytest.approx(1.e-5 + 1.e-7 * 300.)
+
+
+def test_wet_area_shrinks_as_water_drains():
+    """Links leave the wet area, and their discharge is zeroed, as it drains."""
+    grid = RasterModelGrid((20, 40), spacing=10.)
+    grid.add_field('node', 'topographic__elevation', 0.001 * grid.x_of_node)
+    h = grid.add_zeros('node', 'surface_water__depth')
+    h[grid.nodes[8:12, 3:7].flatten()] = 0.1
+    grid.set_closed_boundaries_at_grid_edges(True, True, False, True)
+    of = OverlandFlow(grid, steep_slopes=True, wet_threshold=3.e-3)
+    of.run_one_step(dt=60.)
+    n_links = len(of._wet_area.links)
+    for _ in range(30):
+        of.run_one_step(dt=60.)
+
+    assert len(of._wet_area.links) < n_links
+    q = grid.at_link['surface_water__discharge']
+    is_dry = ~np.in1d(np.arange(grid.number_of_links), of._wet_area.links)
+    assert np.all(q[is_dry] == 0.)
+
+
+def test_wet_threshold_with_time_step_levels():
+    """Local time steps and wet links can't be used together."""
+    grid = RasterModelGrid((4, 5))
+    grid.add_zeros('node', 'topographic__elevation')
+    with pytest.raises(ValueError):
+        OverlandFlow(grid, wet_threshold=1.e-4, time_step_levels=2)
+
+
+def test_preallocate_keeps_fields():
+    """Preallocated time steps update the discharge field in place."""
+    grid = RasterModelGrid((10, 10), spacing=10.)
+    grid.add_zeros('node', 'topographic__elevation')
+    h = grid.add_ones('node', 'surface_water__depth')
+    h[grid.nodes[:, :5].flatten()] = 2.
+    of = OverlandFlow(grid, preallocate=True)
+    of.run_one_step(dt=10.)
+    q = grid.at_link['surface_water__discharge']
+    of.run_one_step(dt=10.)
+    assert grid.at_link['surface_water__discharge'] is q
+    assert grid.at_node['surface_water__depth'] is h
+    assert np.any(q != 0.)
@@ -5,6 +5,7 @@ Unit tests for landlab.components.overland_flow.KinwaveOverlandFlowModel
 last updated: 3/14/16
 """
 import numpy as np
+import pytest
 
 from landlab import RasterModelGrid
 from landlab.components.overland_flow import KinwaveOverlandFlowModel
@@ -75,3 +76,80 @@ def test_run_one_step():
     # numerical solution but the plots match...
     max_h_mm = max(grid['node']['surface_water__depth']) * 1000.
     np.testing.assert_almost_equal(max_h_mm, 1.66666666667)
+
+
+def _run_on_dry_plane(precip_rate, **kwds):
+    grid = RasterModelGrid((20, 30), spacing=10.)
+    grid.add_field('node', 'topographic__elevation',
+                   5. + 0.002 * grid.x_of_node)
+    depth = grid.add_zeros('node', 'surface_water__depth')
+    depth[grid.nodes[8:12, 20:24]] = 0.01
+    kw = KinwaveOverlandFlowModel(grid, precip_rate=precip_rate,
+                                  precip_duration=0.05, roughness=0.02,
+                                  **kwds)
+    for step in range(40):
+        kw.run_one_step(10., current_time=10. * step)
+    return grid
+
+
+def test_wet_threshold_of_zero_same_as_default():
+    """Flow over only the wet links matches flow over all of them."""
+    for precip_rate in (0., 10.):
+        expected = _run_on_dry_plane(precip_rate)
+        actual = _run_on_dry_plane(precip_rate, wet_threshold=0.)
+        np.testing.assert_array_almost_equal(
+            actual.at_node['surface_water__depth'],
+            expected.at_node['surface_water__depth'], decimal=15)
+
+
+def _run_on_flat_plane(n_steps, **kwds):
+    grid = RasterModelGrid((10, 12), spacing=10.)
+    grid.add_zeros('node', 'topographic__elevation')
+    grid.add_zeros('node', 'surface_water__depth')
+    kw = KinwaveOverlandFlowModel(grid, precip_rate=30., infilt_rate=25.,
+                                  precip_duration=0.05, **kwds)
+    for step in range(n_steps):
+        kw.run_one_step(10., current_time=10. * step)
+    return kw
+
+
+@pytest.mark.parametrize('n_steps', [10, 40])
+def test_wet_area_rain_and_infiltration(n_steps):
+    """Rain away from the wet area is added to the depth as it falls."""
+    expected = _run_on_flat_plane(n_steps).depth
+    kw = _run_on_flat_plane(n_steps, wet_threshold=0.1)
+
+    assert len(kw._wet_area.nodes) == 0
+    np.testing.assert_array_almost_equal(kw.depth, expected, decimal=15)
+
+
+def test_wet_area_shrinks_as_water_drains():
+    """Links leave the wet area once their nodes drain."""
+    grid = RasterModelGrid((20, 30), spacing=10.)
+    grid.add_field('node', 'topographic__elevation',
+                   5. + 0.02 * grid.x_of_node)
+    depth = grid.add_zeros('node', 'surface_water__depth')
+    depth[grid.nodes[8:12, 3:7]] = 0.01
+    kw = KinwaveOverlandFlowModel(grid, precip_rate=0., roughness=0.02,
+                                  wet_threshold=2.e-3)
+    kw.run_one_step(10.)
+    n_links = len(kw._wet_area.links)
+    for step in range(1, 40):
+        kw.run_one_step(10., current_time=10. * step)
+
+    assert len(kw._wet_area.links) < n_links
+    q = grid.at_link['water__specific_discharge']
+    is_dry = ~np.in1d(np.arange(grid.number_of_links), kw._wet_area.links)
+    assert np.all(q[is_dry] == 0.)
+
+
+def test_wet_threshold_zero_discharge_on_dry_links():
+    """Discharge is only calculated near water."""
+    grid = _run_on_dry_plane(0., wet_threshold=0.)
+    depth = grid.at_node['surface_water__depth']
+    q = grid.at_link['water__specific_discharge']
+
+    assert np.any(q != 0.)
+    is_dry = ((depth[grid.node_at_link_head] == 0.) &
+              (depth[grid.node_at_link_tail] == 0.))
+    assert np.all(q[is_dry] == 0.)
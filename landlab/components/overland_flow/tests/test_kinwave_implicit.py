@@ -10,8 +10,12 @@ Created on Sat Apr  1 10:49:33 2017
 
 from landlab import RasterModelGrid
 from landlab.components import KinwaveImplicitOverlandFlow
-from numpy.testing import assert_array_equal
+from landlab.components.overland_flow.generate_overland_flow_implicit_kinwave \
+    import water_fn
+from numpy.testing import assert_array_equal, assert_array_almost_equal
+from scipy.optimize import newton
 import numpy as np
+import pytest
 
 
 def test_initialization():
@@ -134,6 +138,68 @@ def test_curved_surface():
         assert round(kw.disch_in[i], 6) == round(runoff_rate * (area[i] - unit_area), 6)
 
 
+def test_same_as_newton_loop():
+    """Compiled sweep matches a node-by-node scipy Newton solution."""
+    rg = RasterModelGrid((8, 9), spacing=(2, 2))
+    rg.add_field('topographic__elevation',
+                 3. * rg.node_x ** 2 + rg.node_y ** 2
+                 + np.random.RandomState(1).rand(rg.number_of_nodes),
+                 at='node')
+    kw = KinwaveImplicitOverlandFlow(rg, weight=0.8, depth_exp=5. / 3.)
+
+    depth = np.zeros(rg.number_of_nodes)
+    for _ in range(5):
+        kw.run_one_step(1.0, runoff_rate=0.001)
+
+        disch_in = np.zeros(rg.number_of_nodes)
+        for n in kw.nodes_ordered[::-1]:
+            if rg.status_at_node[n] != 0:
+                continue
+            area = rg.area_of_cell[rg.cell_at_node[n]]
+            old_depth = depth[n]
+            depth[n] = newton(water_fn, old_depth,
+                              args=(kw.alpha[n], kw.weight, old_depth,
+                                    kw.depth_exp,
+                                    0.001 + disch_in[n] / area))
+            h_eff = kw.weight * depth[n] + (1.0 - kw.weight) * old_depth
+            outflow = kw.vel_coef * h_eff ** kw.depth_exp * kw.grad_width_sum[n]
+            disch_in[rg.adjacent_nodes_at_node[n]] += (
+                outflow * kw.flow_accum.flow_director.proportions[n])
+
+        assert_array_almost_equal(kw.depth, depth, decimal=7)
+        assert_array_almost_equal(kw.disch_in, disch_in, decimal=7)
+
+
+def test_newton_not_converged(monkeypatch):
+    """Raise if the water depth does not converge."""
+    from landlab.components.overland_flow import \
+        generate_overland_flow_implicit_kinwave as kinwave
+
+    rg = RasterModelGrid((4, 5), spacing=(2, 2))
+    rg.add_field('topographic__elevation', 0.1 * rg.node_y, at='node')
+    kw = KinwaveImplicitOverlandFlow(rg)
+
+    monkeypatch.setattr(kinwave, '_NEWTON_MAX_ITER', 0)
+    with pytest.raises(RuntimeError):
+        kw.run_one_step(1.0, runoff_rate=0.001)
+
+
+def test_int32_ids():
+    """Grids with 32-bit ids give the same depths."""
+    depths = []
+    for index_dtype in (int, np.int32):
+        rg = RasterModelGrid((8, 10), spacing=(2, 2), index_dtype=index_dtype)
+        rg.add_field('topographic__elevation',
+                     0.1 * rg.node_y + 0.01 * rg.node_x, at='node')
+        kw = KinwaveImplicitOverlandFlow(rg)
+        for _ in range(5):
+            kw.run_one_step(1.0, runoff_rate=0.001)
+        depths.append(kw.depth.copy())
+
+    assert rg.at_node['flow__upstream_node_order'].dtype == np.int32
+    assert_array_equal(depths[1], depths[0])
+
+
 if __name__ == '__main__':
     test_initialization()
     test_first_iteration()
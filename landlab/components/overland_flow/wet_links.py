@@ -0,0 +1,298 @@
+"""Keep track of the links over which water can flow on a partly dry grid.
+
+Overland flow components that are given a *wet_threshold* update flow only
+near nodes with water on them. A :class:`WetArea` keeps those links, and the
+nodes whose water depth they change, from one time step to the next.
+
+Examples
+--------
+>>> import numpy as np
+>>> from landlab import RasterModelGrid
+>>> from landlab.components.overland_flow.wet_links import WetArea
+>>> grid = RasterModelGrid((4, 8))
+>>> depth = grid.zeros(at='node')
+>>> depth[9] = 1.
+>>> is_active = np.zeros(grid.number_of_links, dtype=bool)
+>>> is_active[grid.active_links] = True
+
+The wet area is the links of the wet node, and those of the nodes next to
+it, and the core nodes at the ends of those links.
+
+>>> wet_area = WetArea(grid, depth, 0.5, is_active)
+>>> np.sort(wet_area.links)
+array([ 8,  9, 15, 16, 17, 23, 24, 30, 31, 38])
+>>> np.sort(wet_area.nodes)
+array([ 9, 10, 11, 17, 18])
+
+When water reaches a node of the wet area, the area grows by another ring.
+
+>>> depth[10] = 1.
+>>> wet_area.grow(depth)
+>>> np.sort(wet_area.nodes)
+array([ 9, 10, 11, 12, 17, 18, 19])
+
+Rain is added to the depth of the core nodes away from the wet area, and
+those that it makes wet join the area.
+
+>>> wet_area.add_rain(depth, 0.25)
+>>> float(depth[14])
+0.25
+>>> wet_area.add_rain(depth, 0.5)
+>>> float(depth[14])
+0.75
+>>> np.sort(wet_area.nodes)
+array([ 9, 10, 11, 12, 13, 14, 17, 18, 19, 20, 21, 22])
+
+As the water drains, nodes fall below the threshold. Once more than half
+of the wet nodes have dried, the area shrinks to fit those that are left,
+and the links that leave it are returned.
+
+>>> depth[grid.core_nodes] = 0.
+>>> depth[9] = 1.
+>>> np.sort(wet_area.shrink(depth))
+array([10, 11, 12, 13, 18, 19, 20, 21, 25, 26, 27, 28, 32, 33, 34, 35, 36,
+       39, 40, 41, 42, 43])
+>>> np.sort(wet_area.nodes)
+array([ 9, 10, 11, 17, 18])
+"""
+import numpy as np
+
+from landlab import CORE_NODE
+
+
+class WetArea(object):
+
+    """The part of a grid that water has reached.
+
+    Nodes are wet where their water is deeper than a threshold. The wet
+    area is made up of the active links of the wet nodes and of the nodes
+    next to them, and the nodes at the ends of those links. It is found
+    once, and then grows by a ring of links around each node that becomes
+    wet, and shrinks (see :meth:`shrink`) once enough of its wet nodes have
+    dried, so keeping it up to date takes time in proportion to its size
+    rather than to that of the grid.
+
+    Rain (see :meth:`add_rain`) is added to the depth of every core node
+    away from the wet area as it falls, so while it rains each step touches
+    every core node once; once it stops, only the wet area is touched.
+
+    Parameters
+    ----------
+    grid : ModelGrid
+        A landlab grid.
+    depth : ndarray of float
+        Water depth at nodes.
+    threshold : float
+        Nodes are wet where *depth* is greater than this.
+    is_active_link : ndarray of bool
+        Flags the links that can carry water.
+    floor : float, optional
+        If given, rain (which may be negative) does not take the depth
+        below this.
+    max_dry_fraction : float, optional
+        The wet area shrinks when more than this fraction of the nodes that
+        made it up have dried.
+    """
+
+    def __init__(self, grid, depth, threshold, is_active_link, floor=None,
+                 max_dry_fraction=0.5):
+        self._grid = grid
+        self._threshold = threshold
+        self._is_active_link = is_active_link
+        self._floor = floor
+        self._max_dry_fraction = max_dry_fraction
+        self._is_core = grid.status_at_node == CORE_NODE
+        self._core_nodes = np.flatnonzero(self._is_core)
+
+        n_nodes = grid.number_of_nodes
+        self._is_wet = np.zeros(n_nodes, dtype=bool)
+        self._has_links = np.zeros(n_nodes, dtype=bool)
+        self._is_end = np.zeros(n_nodes, dtype=bool)
+        self._is_kept = np.zeros(n_nodes, dtype=bool)
+        self._has_link = np.zeros(grid.number_of_links, dtype=bool)
+        self._kept = np.empty(0, dtype=int)
+        self._clear(depth)
+
+    @property
+    def links(self):
+        """IDs of the active links of the wet area."""
+        return self._links
+
+    @property
+    def nodes(self):
+        """IDs of the core nodes at the ends of the links of the wet area."""
+        return self._nodes
+
+    def add_rain(self, depth, rain):
+        """Add a depth of rain to the core nodes away from the wet area.
+
+        Nodes that the rain makes wet join the area.
+        """
+        if rain == 0.:
+            return
+        dry = self._core_nodes[~self._is_end[self._core_nodes]]
+        if self._floor is None:
+            depth[dry] += rain
+        else:
+            depth[dry] = np.maximum(depth[dry] + rain, self._floor)
+        self.add_wet_nodes(dry[depth[dry] > self._threshold])
+
+    def add_wet_nodes(self, nodes, keep=False):
+        """Add nodes to the wet area, whatever their depth.
+
+        If *keep* is ``True``, the nodes stay in the area when it shrinks,
+        even if they are dry.
+        """
+        nodes = np.asarray(nodes)
+        if keep:
+            nodes = nodes[~self._is_kept[nodes]]
+            self._is_kept[nodes] = True
+            self._kept = np.concatenate((self._kept, nodes))
+        nodes = nodes[~self._is_wet[nodes]]
+        if len(nodes) == 0:
+            return
+        self._is_wet[nodes] = True
+
+        ring = np.union1d(nodes, _nodes_at_links(
+            self._grid, _active_links_at_nodes(self._grid, nodes,
+                                               self._is_active_link)))
+        ring = ring[~self._has_links[ring]]
+        self._has_links[ring] = True
+
+        links = _active_links_at_nodes(self._grid, ring, self._is_active_link)
+        links = links[~self._has_link[links]]
+        self._has_link[links] = True
+
+        ends = _nodes_at_links(self._grid, links)
+        ends = ends[~self._is_end[ends]]
+        self._is_end[ends] = True
+
+        self._wet = np.concatenate((self._wet, nodes))
+        self._ring = np.concatenate((self._ring, ring))
+        self._ends = np.concatenate((self._ends, ends))
+        self._links = np.concatenate((self._links, links))
+        self._nodes = np.concatenate((self._nodes, ends[self._is_core[ends]]))
+        self._frontier = np.concatenate((
+            self._frontier[~self._is_wet[self._frontier]],
+            ends[~self._is_wet[ends]]))
+
+    def grow(self, depth):
+        """Add the nodes that have become wet, and a ring around them."""
+        self.add_wet_nodes(
+            self._frontier[depth[self._frontier] > self._threshold])
+
+    def shrink(self, depth):
+        """Fit the wet area to the water, if enough of it has dried.
+
+        If more than *max_dry_fraction* of the nodes that were wet are now
+        at or below the threshold, the area is found anew from the nodes
+        that are still wet. This takes time in proportion to the size of
+        the area.
+
+        Returns
+        -------
+        ndarray of int
+            IDs of the links that have left the wet area.
+        """
+        still_wet = self._wet[depth[self._wet] > self._threshold]
+        if (len(self._wet) - len(still_wet) <=
+                self._max_dry_fraction * len(self._wet)):
+            return np.empty(0, dtype=int)
+
+        links = self._links
+        self._is_wet[self._wet] = False
+        self._has_links[self._ring] = False
+        self._is_end[self._ends] = False
+        self._has_link[links] = False
+        self._set_empty()
+        self.add_wet_nodes(np.union1d(still_wet, self._kept))
+        return links[~self._has_link[links]]
+
+    def max_depth(self, depth):
+        """Greatest water depth on the grid.
+
+        Core nodes away from the wet area are no deeper than the threshold,
+        so while any node is wet the deepest is in the area, or is a
+        boundary node.
+        """
+        if len(self._ends) > 0:
+            max_depth = depth[self._ends].max()
+            if max_depth > self._threshold:
+                return max(max_depth, self._max_fixed_depth)
+        return depth.max() if len(depth) > 0 else 0.
+
+    def reset(self, depth):
+        """Find the wet area anew, from all of the nodes of the grid.
+
+        Returns
+        -------
+        ndarray of int
+            IDs of the links that have left the wet area.
+        """
+        links = self._links
+        self._clear(depth)
+        return links[~self._has_link[links]]
+
+    def _set_empty(self):
+        """Empty the lists of the nodes and links of the wet area."""
+        self._wet = np.empty(0, dtype=int)
+        self._ring = np.empty(0, dtype=int)
+        self._ends = np.empty(0, dtype=int)
+        self._links = np.empty(0, dtype=int)
+        self._nodes = np.empty(0, dtype=int)
+        self._frontier = np.empty(0, dtype=int)
+
+    def _clear(self, depth):
+        """Find the wet area from scratch."""
+        self._is_wet.fill(False)
+        self._has_links.fill(False)
+        self._is_end.fill(False)
+        self._has_link.fill(False)
+        self._set_empty()
+
+        fixed = depth[~self._is_core]
+        self._max_fixed_depth = fixed.max() if len(fixed) > 0 else 0.
+
+        self.add_wet_nodes(np.union1d(
+            np.flatnonzero(depth > self._threshold), self._kept))
+
+
+def calc_flux_coefficients_at_nodes(grid, nodes):
+    """Coefficients that give the net inflow at nodes from link fluxes.
+
+    The rate of change of water depth at each of *nodes* from the fluxes,
+    *q*, along its links is ``np.sum(q[links] * coef, axis=1)``, where
+    *links* is ``grid.links_at_node[nodes]``. Nodes without cells have
+    coefficients of zero.
+
+    Examples
+    --------
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.components.overland_flow.wet_links import (
+    ...     calc_flux_coefficients_at_nodes)
+    >>> grid = RasterModelGrid((3, 4), spacing=2.)
+    >>> calc_flux_coefficients_at_nodes(grid, [0, 5])
+    array([[ 0. ,  0. ,  0. ,  0. ],
+           [-0.5, -0.5,  0.5,  0.5]])
+    """
+    links = grid.links_at_node[nodes]
+    faces = grid.face_at_link[links]
+    width = np.where((links != -1) & (faces != -1),
+                     grid.width_of_face[faces], 0.)
+    area = grid.cell_area_at_node[nodes].reshape((-1, 1))
+    has_cell = area > 0.
+    return np.where(has_cell, grid.link_dirs_at_node[nodes] * width /
+                    np.where(has_cell, area, 1.), 0.)
+
+
+def _active_links_at_nodes(grid, nodes, is_active_link):
+    """Sorted IDs of the active links at *nodes*."""
+    links = np.unique(grid.links_at_node[nodes])
+    links = links[links != -1]
+    return links[is_active_link[links]]
+
+
+def _nodes_at_links(grid, links):
+    """Sorted IDs of the nodes at either end of *links*."""
+    return np.union1d(grid.node_at_link_head[links],
+                      grid.node_at_link_tail[links])
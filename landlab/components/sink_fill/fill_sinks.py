@@ -8,15 +8,20 @@ from __future__ import print_function
 
 import landlab
 from landlab import (ModelParameterDictionary, Component, FieldError,
-                     FIXED_VALUE_BOUNDARY)
+                     FIXED_VALUE_BOUNDARY, CLOSED_BOUNDARY)
 
 from landlab.utils.decorators import use_file_name_or_kwds, deprecated
 from landlab.core.model_parameter_dictionary import MissingKeyError
 from landlab.components import DepressionFinderAndRouter, FlowAccumulator
+from landlab.components.flow_routing.cfuncs import (_fill_depressions,
+                                                    _label_connected_nodes)
 from landlab.grid.base import BAD_INDEX_VALUE
 import numpy as np
 
 
+_FILL_METHODS = ('lake_mapper', 'priority_flood')
+
+
 class SinkFiller(Component):
     """
     This component identifies depressions in a topographic surface, then fills
@@ -26,6 +31,20 @@ class SinkFiller(Component):
     spatially variable, and is chosen to not reverse any drainage directions
     at the perimeter of each lake.
 
+    By default (*method='lake_mapper'*) the depressions are found with the
+    DepressionFinderAndRouter and filled one lake at a time. With
+    *method='priority_flood'* all of the depressions of the grid are instead
+    filled in a single pass of compiled code (the Priority-Flood and
+    Priority-Flood+Epsilon algorithms of Barnes et al., 2014), which is much
+    faster on large grids. With *apply_slope*, this gives the filled surface
+    a gradient of *fill_slope* down toward the outlet of each depression;
+    where that lifts the surface above the rim of the depression, the rim
+    is raised with it so that every node can still drain. Only fixed-value
+    boundary nodes act as outlets.
+
+    After filling, *lake_map*, *lake_codes* and *lake_volumes* describe the
+    filled depressions.
+
     The primary method of this class is 'run_one_step'. 'fill_pits' is a
     synonym.
 
@@ -76,6 +95,35 @@ class SinkFiller(Component):
     >>> fr.run_one_step()
     >>> mg.at_node['flow__sink_flag'][mg.core_nodes].sum()
     0
+
+    The volume filled in each lake is recorded. Lakes are labelled by their
+    lowest node.
+
+    >>> hf.lake_codes
+    array([34, 78])
+    >>> np.round(hf.lake_volumes, 4)
+    array([ 44.0051,  22.2   ])
+
+    The priority flood fills the same depressions:
+
+    >>> field[:] = z
+    >>> hf = SinkFiller(mg, apply_slope=False, method='priority_flood')
+    >>> hf.run_one_step()
+    >>> np.allclose(mg.at_node['topographic__elevation'][lake1], 4.)
+    True
+    >>> np.allclose(mg.at_node['topographic__elevation'][lake2], 7.)
+    True
+    >>> hf.lake_volumes
+    array([ 44.,  21.])
+
+    and, with *apply_slope*, leaves a surface that drains everywhere:
+
+    >>> field[:] = z
+    >>> hf = SinkFiller(mg, apply_slope=True, method='priority_flood')
+    >>> hf.run_one_step()
+    >>> fr.run_one_step()
+    >>> mg.at_node['flow__sink_flag'][mg.core_nodes].sum()
+    0
     """
     _name = 'SinkFiller'
 
@@ -101,7 +149,7 @@ class SinkFiller(Component):
 
     @use_file_name_or_kwds
     def __init__(self, grid, routing='D8', apply_slope=False,
-                 fill_slope=1.e-5, **kwds):
+                 fill_slope=1.e-5, method='lake_mapper', **kwds):
         """
         Parameters
         ----------
@@ -121,6 +169,10 @@ class SinkFiller(Component):
         fill_slope : float (m/m)
             The slope added to the top surface of filled pits to allow flow
             routing across them, if apply_slope.
+        method : {'lake_mapper', 'priority_flood'} (optional)
+            Fill the depressions one at a time with the
+            DepressionFinderAndRouter ('lake_mapper', default), or all at once
+            with a compiled priority flood ('priority_flood').
         """
         if 'flow__receiver_node' in grid.at_node:
             if (grid.at_node['flow__receiver_node'].size != grid.size('node')):
@@ -143,6 +195,9 @@ class SinkFiller(Component):
             self._D8 = False  # useful shorthand for thia test we do a lot
             if type(self._grid) is landlab.grid.raster.RasterModelGrid:
                 self.num_nbrs = 4
+        if method not in _FILL_METHODS:
+            raise ValueError('method must be one of ' + str(_FILL_METHODS))
+        self._method = method
         self._fill_slope = fill_slope
         self._apply_slope = apply_slope
         self.initialize()
@@ -199,8 +254,83 @@ class SinkFiller(Component):
                                                    'sediment_fill__depth',
                                                    noclobber=False)
 
-        self._lf = DepressionFinderAndRouter(self._grid, routing=self._routing)
-        self._fr = FlowAccumulator(self._grid, flow_director=self._routing)
+        self._lake_map = np.full(self._grid.number_of_nodes, BAD_INDEX_VALUE,
+                                 dtype=int)
+        self._lake_codes = np.array([], dtype=int)
+        self._lake_volumes = np.array([], dtype=float)
+
+        self._set_fill_neighbors()
+        if self._method == 'lake_mapper':
+            self._lf = DepressionFinderAndRouter(self._grid,
+                                                 routing=self._routing)
+            self._fr = FlowAccumulator(self._grid,
+                                       flow_director=self._routing)
+
+    def _set_fill_neighbors(self):
+        """Store the neighbors across which depressions fill.
+
+        These are the same as those used by the DepressionFinderAndRouter,
+        with the distance to each.
+        """
+        nbrs = self._grid.active_adjacent_nodes_at_node
+        if self._D8:
+            diag_nbrs = self._grid.diagonal_adjacent_nodes_at_node.copy()
+            diag_nbrs[self._grid.status_at_node[diag_nbrs] ==
+                      CLOSED_BOUNDARY] = -1
+            nbrs = np.concatenate((nbrs, diag_nbrs), 1)
+        self._fill_nbrs = np.ascontiguousarray(nbrs, dtype=int)
+        nodes = np.arange(self._grid.number_of_nodes).reshape((-1, 1))
+        self._fill_nbr_distance = np.hypot(
+            self._grid.x_of_node[self._fill_nbrs] - self._grid.x_of_node[nodes],
+            self._grid.y_of_node[self._fill_nbrs] - self._grid.y_of_node[nodes])
+        self._flood_seeds = np.where(self._grid.status_at_node ==
+                                     FIXED_VALUE_BOUNDARY)[0]
+
+    @property
+    def lake_map(self):
+        """
+        Array of length number_of_nodes, giving the code of the filled lake
+        that each node is in, or BAD_INDEX_VALUE if it was not filled.
+        """
+        return self._lake_map
+
+    @property
+    def lake_codes(self):
+        """
+        The code of each filled lake, which is the ID of its lowest node.
+        """
+        return self._lake_codes
+
+    @property
+    def lake_volumes(self):
+        """
+        A nlakes-long array of the volume of sediment added to each lake. The
+        order is the same as that returned by *lake_codes*.
+        """
+        return self._lake_volumes
+
+    def _map_filled_lakes(self):
+        """Label the connected regions of filled nodes and sum their fill."""
+        is_filled = (self._elev > self.original_elev).astype(np.uint8)
+        labels = np.empty(self._grid.number_of_nodes, dtype=int)
+        _label_connected_nodes(self._fill_nbrs, is_filled,
+                               np.zeros(self._grid.number_of_nodes), labels)
+        filled_nodes = np.where(is_filled)[0]
+        filled_nodes = filled_nodes[np.lexsort(
+            (self.original_elev[filled_nodes], labels[filled_nodes]))]
+        is_first = np.ones(filled_nodes.size, dtype=bool)
+        is_first[1:] = np.diff(labels[filled_nodes]) != 0
+        lowest_node = np.empty_like(labels)
+        lowest_node[labels[filled_nodes[is_first]]] = filled_nodes[is_first]
+
+        self._lake_map.fill(BAD_INDEX_VALUE)
+        self._lake_map[filled_nodes] = lowest_node[labels[filled_nodes]]
+        self._lake_codes, lake_index = np.unique(
+            self._lake_map[filled_nodes], return_inverse=True)
+        self._lake_volumes = np.bincount(
+            lake_index, minlength=self._lake_codes.size,
+            weights=(self.sed_fill_depth * self._grid.cell_area_at_node)[
+                filled_nodes])
 
     def fill_pits(self, **kwds):
         """
@@ -219,6 +349,28 @@ class SinkFiller(Component):
         except KeyError:
             pass
         self.original_elev = self._elev.copy()
+        if self._method == 'priority_flood':
+            self._fill_with_priority_flood()
+        else:
+            self._fill_with_lake_mapper()
+        # fill the output field
+        self.sed_fill_depth[:] = self._elev - self.original_elev
+        self._map_filled_lakes()
+
+    def _fill_with_priority_flood(self):
+        """Fill all depressions at once with a priority flood."""
+        if self._apply_slope:
+            slope = self._fill_slope
+        else:
+            slope = 0.
+        filled = np.empty(self._grid.number_of_nodes, dtype=float)
+        _fill_depressions(np.asarray(self.original_elev, dtype=float),
+                          self._fill_nbrs, self._fill_nbr_distance,
+                          self._flood_seeds, slope, filled)
+        self._elev[:] = filled
+
+    def _fill_with_lake_mapper(self):
+        """Fill depressions one at a time, as mapped by the lake mapper."""
         # We need this, as we'll have to do ALL this again if we manage
         # to jack the elevs too high in one of the "subsidiary" lakes.
         # We're going to implement the lake_mapper component to do the heavy
@@ -275,8 +427,6 @@ class SinkFiller(Component):
                 self._grid.delete_field('node', delete_me)
         for update_me in existing_fields.keys():
             self.grid.at_node[update_me][:] = existing_fields[update_me]
-        # fill the output field
-        self.sed_fill_depth[:] = self._elev - self.original_elev
 
     @deprecated(use='fill_pits', version=1.0)
     def _fill_pits_old(self, apply_slope=None):
@@ -267,3 +267,70 @@ def test_D4_filling(sink_grid5):
     assert_array_almost_equal(
         sink_grid5.at_node["topographic__elevation"][sink_grid5.lake2], hole2
     )
+
+
+def test_bad_method(sink_grid1):
+    with pytest.raises(ValueError):
+        SinkFiller(sink_grid1, method="fill_it_all")
+
+
+@pytest.mark.parametrize("routing", ["D8", "D4"])
+def test_priority_flood_same_as_lake_mapper(sink_grid5, routing):
+    """Flat filling with either method gives the same surface and lakes."""
+    z = sink_grid5.at_node["topographic__elevation"]
+    z_init = z.copy()
+    hf = SinkFiller(sink_grid5, routing=routing)
+    hf.fill_pits()
+    z_lake_mapper = z.copy()
+    lake_volumes = hf.lake_volumes.copy()
+    lake_codes = hf.lake_codes.copy()
+
+    z[:] = z_init
+    hf = SinkFiller(sink_grid5, routing=routing, method="priority_flood")
+    hf.fill_pits()
+    assert_array_almost_equal(z, z_lake_mapper)
+    assert_array_equal(hf.lake_codes, lake_codes)
+    assert_array_almost_equal(hf.lake_volumes, lake_volumes)
+    assert_array_almost_equal(
+        sink_grid5.at_node["sediment_fill__depth"], z - z_init
+    )
+
+
+def test_priority_flood_random_surface():
+    """Flat filling leaves every node at the level of its depression."""
+    rng = np.random.RandomState(42)
+    mg = RasterModelGrid((30, 40))
+    z = mg.add_field("node", "topographic__elevation", rng.rand(1200))
+    z_init = z.copy()
+    hf = SinkFiller(mg)
+    hf.fill_pits()
+    z_lake_mapper = z.copy()
+
+    z[:] = z_init
+    hf = SinkFiller(mg, method="priority_flood")
+    hf.fill_pits()
+    assert_array_almost_equal(z, z_lake_mapper)
+    assert hf.lake_volumes.sum() == pytest.approx(
+        (z - z_init)[mg.core_nodes].sum())
+
+
+@pytest.mark.parametrize("routing", ["D8", "D4"])
+def test_priority_flood_inclined(sink_grid4, routing):
+    """An inclined priority-flood fill leaves no sinks."""
+    z = sink_grid4.at_node["topographic__elevation"]
+    z_init = z.copy()
+    SinkFiller(sink_grid4, routing=routing, method="priority_flood").fill_pits()
+    z_flat = z.copy()
+
+    z[:] = z_init
+    fr = FlowAccumulator(sink_grid4, flow_director=routing)
+    hf = SinkFiller(
+        sink_grid4, routing=routing, apply_slope=True, method="priority_flood"
+    )
+    hf.fill_pits()
+
+    lake = np.concatenate((sink_grid4.lake1, sink_grid4.lake2))
+    assert np.all(z[lake] > z_flat[lake])
+    assert np.all(z - z_flat < 1.e-3)
+    fr.run_one_step()
+    assert sink_grid4.at_node["flow__sink_flag"][sink_grid4.core_nodes].sum() == 0
@@ -11,9 +11,13 @@ ctypedef np.double_t DTYPE_FLOAT_t
 DTYPE_INT = np.int
 ctypedef np.int_t DTYPE_INT_t
 
+ctypedef fused id_t:
+    int
+    long
 
-def calculate_qs_in(np.ndarray[DTYPE_INT_t, ndim=1] stack_flip_ud,
-                    np.ndarray[DTYPE_INT_t, ndim=1] flow_receivers,
+
+def calculate_qs_in(np.ndarray[id_t, ndim=1] stack_flip_ud,
+                    np.ndarray[id_t, ndim=1] flow_receivers,
                     np.ndarray[DTYPE_FLOAT_t, ndim=1] cell_area_at_node,
                     np.ndarray[DTYPE_FLOAT_t, ndim=1] q,
                     np.ndarray[DTYPE_FLOAT_t, ndim=1] qs,
@@ -411,3 +411,24 @@ def test_can_run_with_hex():
         fa.run_one_step()
         sp.run_one_step(dt=dt)
         z[mg.core_nodes] += U * dt
+
+
+def test_int32_ids():
+    """Grids with 32-bit ids give the same elevations."""
+    elevations = []
+    for index_dtype in (int, np.int32):
+        mg = RasterModelGrid((10, 12), index_dtype=index_dtype)
+        z = mg.add_field('node', 'topographic__elevation',
+                         mg.x_of_node + mg.y_of_node +
+                         np.random.RandomState(0).rand(mg.number_of_nodes))
+        mg.add_ones('node', 'soil__depth')
+        mg.add_field('node', 'bedrock__elevation', z - 1.)
+        fa = FlowAccumulator(mg, flow_director='D8')
+        sp = Space(mg, K_sed=0.01, K_br=0.01, F_f=0., phi=0., H_star=1.,
+                   v_s=1., m_sp=0.5, n_sp=1., sp_crit_sed=0, sp_crit_br=0)
+        for _ in range(3):
+            fa.run_one_step()
+            sp.run_one_step(1.)
+        elevations.append(z)
+
+    testing.assert_array_equal(elevations[1], elevations[0])
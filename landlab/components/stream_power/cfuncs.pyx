@@ -14,14 +14,18 @@ ctypedef np.double_t DTYPE_FLOAT_t
 DTYPE_INT = np.int
 ctypedef np.int_t DTYPE_INT_t
 
+ctypedef fused id_t:
+    int
+    long
+
 
 cdef extern from "math.h":
     double fabs(double x) nogil
     double pow(double x, double y) nogil
     
 @cython.boundscheck(False)
-def erode_avoiding_pits(np.ndarray[DTYPE_INT_t, ndim=1] src_nodes,
-                        np.ndarray[DTYPE_INT_t, ndim=1] dst_nodes,
+def erode_avoiding_pits(np.ndarray[id_t, ndim=1] src_nodes,
+                        np.ndarray[id_t, ndim=1] dst_nodes,
                         np.ndarray[DTYPE_FLOAT_t, ndim=1] node_z,
                         np.ndarray[DTYPE_FLOAT_t, ndim=1] node_dz):
     """Erode node elevations while avoiding creating pits.
@@ -55,8 +59,8 @@ def erode_avoiding_pits(np.ndarray[DTYPE_INT_t, ndim=1] src_nodes,
             node_dz[src_id] = (node_z[src_id] - z_dst_after) * 0.999999
 
 
-def erode_with_link_alpha_varthresh(np.ndarray[DTYPE_INT_t, ndim=1] src_nodes,
-                                    np.ndarray[DTYPE_INT_t, ndim=1] dst_nodes,
+def erode_with_link_alpha_varthresh(np.ndarray[id_t, ndim=1] src_nodes,
+                                    np.ndarray[id_t, ndim=1] dst_nodes,
                                     np.ndarray[DTYPE_FLOAT_t, ndim=1] threshsxdt,
                                     np.ndarray[DTYPE_FLOAT_t, ndim=1] alpha,
                                     DTYPE_FLOAT_t n,
@@ -131,8 +135,8 @@ def erode_with_link_alpha_varthresh(np.ndarray[DTYPE_INT_t, ndim=1] src_nodes,
                 z[src_id] = next_z
 
 
-def erode_with_link_alpha_fixthresh(np.ndarray[DTYPE_INT_t, ndim=1] src_nodes,
-                                    np.ndarray[DTYPE_INT_t, ndim=1] dst_nodes,
+def erode_with_link_alpha_fixthresh(np.ndarray[id_t, ndim=1] src_nodes,
+                                    np.ndarray[id_t, ndim=1] dst_nodes,
                                     DTYPE_FLOAT_t threshxdt,
                                     np.ndarray[DTYPE_FLOAT_t, ndim=1] alpha,
                                     DTYPE_FLOAT_t n,
@@ -206,8 +210,8 @@ def erode_with_link_alpha_fixthresh(np.ndarray[DTYPE_INT_t, ndim=1] src_nodes,
                 z[src_id] = next_z
 
 
-def brent_method_erode_variable_threshold(np.ndarray[DTYPE_INT_t, ndim=1] src_nodes,
-                                          np.ndarray[DTYPE_INT_t, ndim=1] dst_nodes,
+def brent_method_erode_variable_threshold(np.ndarray[id_t, ndim=1] src_nodes,
+                                          np.ndarray[id_t, ndim=1] dst_nodes,
                                           np.ndarray[DTYPE_FLOAT_t, ndim=1] threshsxdt,
                                           np.ndarray[DTYPE_FLOAT_t, ndim=1] alpha,
                                           DTYPE_FLOAT_t n,
@@ -333,8 +337,8 @@ def brent_method_erode_variable_threshold(np.ndarray[DTYPE_INT_t, ndim=1] src_no
                 # the array z.
 
 
-def brent_method_erode_fixed_threshold(np.ndarray[DTYPE_INT_t, ndim=1] src_nodes,
-                                       np.ndarray[DTYPE_INT_t, ndim=1] dst_nodes,
+def brent_method_erode_fixed_threshold(np.ndarray[id_t, ndim=1] src_nodes,
+                                       np.ndarray[id_t, ndim=1] dst_nodes,
                                        DTYPE_FLOAT_t threshsxdt,
                                        np.ndarray[DTYPE_FLOAT_t, ndim=1] alpha,
                                        DTYPE_FLOAT_t n,
@@ -545,8 +549,8 @@ def erode_fn(DTYPE_FLOAT_t x,
     return f
 
 
-def smooth_stream_power_eroder_solver(np.ndarray[DTYPE_INT_t, ndim=1] src_nodes,
-                                      np.ndarray[DTYPE_INT_t, ndim=1] dst_nodes,
+def smooth_stream_power_eroder_solver(np.ndarray[id_t, ndim=1] src_nodes,
+                                      np.ndarray[id_t, ndim=1] dst_nodes,
                                       np.ndarray[DTYPE_FLOAT_t, ndim=1] z,
                                       np.ndarray[DTYPE_FLOAT_t, ndim=1] alpha,
                                       np.ndarray[DTYPE_FLOAT_t, ndim=1] gamma,
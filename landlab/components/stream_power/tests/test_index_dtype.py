@@ -0,0 +1,38 @@
+"""Test the stream power components on grids with 32-bit ids."""
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from landlab import RasterModelGrid
+from landlab.components import (FlowAccumulator, FastscapeEroder,
+                                StreamPowerEroder,
+                                StreamPowerSmoothThresholdEroder)
+
+
+def _erode(index_dtype, eroder, **kwds):
+    grid = RasterModelGrid((10, 12), index_dtype=index_dtype)
+    grid.add_field('node', 'topographic__elevation',
+                   grid.x_of_node + grid.y_of_node +
+                   np.random.RandomState(0).rand(grid.number_of_nodes))
+    fa = FlowAccumulator(grid, flow_director='D8')
+    sp = eroder(grid, K_sp=0.01, **kwds)
+    for _ in range(3):
+        fa.run_one_step()
+        sp.run_one_step(1.)
+    return grid
+
+
+@pytest.mark.parametrize('eroder,kwds', [
+    (FastscapeEroder, {}),
+    (FastscapeEroder, {'threshold_sp': 0.1}),
+    (StreamPowerEroder, {}),
+    (StreamPowerEroder, {'threshold_sp': 0.1}),
+    (StreamPowerSmoothThresholdEroder, {'threshold_sp': 0.1}),
+])
+def test_int32_ids(eroder, kwds):
+    expected = _erode(int, eroder, **kwds)
+    actual = _erode(np.int32, eroder, **kwds)
+
+    assert actual.at_node['flow__receiver_node'].dtype == np.int32
+    assert_array_equal(actual.at_node['topographic__elevation'],
+                       expected.at_node['topographic__elevation'])
@@ -846,6 +846,66 @@ class ModelDataFields(object):
         del self._groups[group].units[name]
         del self._groups[group][name]
 
+    def use_memmap(self, group, path, names=None):
+        """Keep fields of a group in memory-mapped files.
+
+        Values of the fields are kept in files within the folder *path*,
+        one file per field, so that the fields need not fit in memory. The
+        arrays of the fields are ordinary numpy arrays, backed by the
+        files, and so can be used like any other field. Fields saved in
+        *path* are added to the group, which allows a model to restart
+        from the state it last left the files in.
+
+        Parameters
+        ----------
+        group : str
+            Name of the group.
+        path : str
+            Folder that holds the files.
+        names : iterable of str, optional
+            Names of the fields to keep in files. If not given, keep all
+            fields of the group.
+
+        Examples
+        --------
+        >>> import tempfile
+        >>> from landlab.field import ModelDataFields
+        >>> path = tempfile.mkdtemp()
+        >>> fields = ModelDataFields()
+        >>> fields.new_field_location('node', 4)
+        >>> fields.use_memmap('node', path)
+        >>> fields.add_zeros('node', 'topographic__elevation')
+        array([ 0.,  0.,  0.,  0.])
+        >>> fields.at_node.memmap_path == path
+        True
+
+        Changes to the values are written to the files.
+
+        >>> fields.at_node['topographic__elevation'] += 1.
+        >>> fields.flush('node')
+
+        >>> fields = ModelDataFields()
+        >>> fields.new_field_location('node', 4)
+        >>> fields.use_memmap('node', path)
+        >>> fields.at_node['topographic__elevation']
+        array([ 1.,  1.,  1.,  1.])
+
+        LLCATS: FIELDCR FIELDIO
+        """
+        self[group].use_memmap(path, names=names)
+
+    def flush(self, group):
+        """Write changes to fields of a group kept in memory-mapped files.
+
+        Parameters
+        ----------
+        group : str
+            Name of the group.
+
+        LLCATS: FIELDIO
+        """
+        self[group].flush()
+
     def __getitem__(self, group):
         """Get a group of fields."""
         try:
@@ -0,0 +1,202 @@
+#! /usr/bin/env python
+"""Keep data fields in memory-mapped files."""
+
+import os
+
+import numpy as np
+
+
+class MemmapStore(object):
+
+    """Memory-mapped files that hold the values of data fields.
+
+    The values of each field are kept in the file *name.npy*, in the numpy
+    binary format, within the folder *path*. Because the files carry their
+    own shape and data type, a later store that uses the same folder can
+    open the saved values, as they were last left, without reading them
+    into memory.
+
+    Parameters
+    ----------
+    path : str
+        Folder that holds the files. It is created if it does not exist.
+    names : iterable of str, optional
+        Names of the fields to keep in files. If not given, keep all
+        fields.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> import tempfile
+    >>> from landlab.field.memmap_store import MemmapStore
+    >>> path = tempfile.mkdtemp()
+    >>> store = MemmapStore(path, names=['air__temperature'])
+    >>> store.stores('air__temperature'), store.stores('land__temperature')
+    (True, False)
+
+    Storing an array copies its values to a file and returns an array that
+    is backed by that file.
+
+    >>> values = store.store('air__temperature', np.arange(4.))
+    >>> values
+    array([ 0.,  1.,  2.,  3.])
+    >>> values[0] = 10.
+    >>> store.flush()
+
+    A new store that uses the same folder finds the saved values.
+
+    >>> store = MemmapStore(path)
+    >>> store.saved()
+    ['air__temperature']
+    >>> store.open('air__temperature')
+    array([ 10.,   1.,   2.,   3.])
+    """
+
+    def __init__(self, path, names=None):
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        self._path = path
+        self._names = None if names is None else set(names)
+        self._memmaps = dict()
+
+    @property
+    def path(self):
+        """Folder that holds the files."""
+        return self._path
+
+    def stores(self, name):
+        """Check if a field is kept in a file.
+
+        Parameters
+        ----------
+        name : str
+            Name of a field.
+
+        Returns
+        -------
+        bool
+            ``True`` if values of the field are kept in a file.
+        """
+        return self._names is None or name in self._names
+
+    def filename(self, name):
+        """Path to the file that holds the values of a field.
+
+        Raises
+        ------
+        ValueError
+            If *name* is not a plain file name.
+        """
+        if not name or os.sep in name or (os.altsep and os.altsep in name):
+            raise ValueError(
+                '{name!r}: field name is not a plain file name'.format(
+                    name=name))
+        return os.path.join(self._path, name + '.npy')
+
+    def saved(self):
+        """Names of fields, kept by the store, with values saved in files.
+
+        Returns
+        -------
+        list of str
+            Names of saved fields, sorted alphabetically.
+        """
+        names = []
+        for fname in os.listdir(self._path):
+            name, ext = os.path.splitext(fname)
+            if ext == '.npy' and self.stores(name):
+                names.append(name)
+        return sorted(names)
+
+    def open(self, name):
+        """Open the saved values of a field.
+
+        Parameters
+        ----------
+        name : str
+            Name of a field.
+
+        Returns
+        -------
+        ndarray
+            Values of the field, backed by its file.
+        """
+        self._memmaps[name] = np.lib.format.open_memmap(self.filename(name),
+                                                        mode='r+')
+        return self._memmaps[name].view(np.ndarray)
+
+    def holds(self, name, values):
+        """Check if an array is the one held in the file of a field.
+
+        Parameters
+        ----------
+        name : str
+            Name of a field.
+        values : ndarray
+            An array of values.
+
+        Returns
+        -------
+        bool
+            ``True`` if *values* is backed by the file of *name*.
+        """
+        try:
+            mapped = self._memmaps[name]
+        except KeyError:
+            return False
+        return (values.shape == mapped.shape and
+                values.dtype == mapped.dtype and
+                values.strides == mapped.strides and
+                values.__array_interface__['data'][0] ==
+                mapped.__array_interface__['data'][0])
+
+    def store(self, name, values):
+        """Keep the values of a field in its file.
+
+        Parameters
+        ----------
+        name : str
+            Name of a field.
+        values : ndarray
+            Values of the field.
+
+        Returns
+        -------
+        ndarray
+            Values of the field, backed by its file.
+        """
+        if self.holds(name, values):
+            return values
+
+        mapped = self._memmaps.pop(name, None)
+        if mapped is not None and np.may_share_memory(values, mapped):
+            values = values.copy()
+        del mapped
+
+        self._memmaps[name] = np.lib.format.open_memmap(
+            self.filename(name), mode='w+', dtype=values.dtype,
+            shape=values.shape)
+        self._memmaps[name][...] = values
+
+        return self._memmaps[name].view(np.ndarray)
+
+    def close(self, name):
+        """Stop holding the values of a field, leaving its file in place."""
+        mapped = self._memmaps.pop(name, None)
+        if mapped is not None:
+            mapped.flush()
+
+    def remove(self, name):
+        """Stop holding the values of a field, and delete its file.
+
+        A store that later uses the same folder no longer finds the field.
+        """
+        self._memmaps.pop(name, None)
+        filename = self.filename(name)
+        if os.path.exists(filename):
+            os.remove(filename)
+
+    def flush(self):
+        """Write any changes to values to their files."""
+        for mapped in self._memmaps.values():
+            mapped.flush()
@@ -3,6 +3,8 @@
 
 import numpy as np
 
+from .memmap_store import MemmapStore
+
 
 _UNKNOWN_UNITS = '?'
 
@@ -134,6 +136,7 @@ class ScalarDataFields(dict):
 
     def __init__(self, size=None):
         self._size = size
+        self._store = None
 
         super(ScalarDataFields, self).__init__()
         self._units = dict()
@@ -167,6 +170,102 @@ class ScalarDataFields(dict):
         else:
             raise ValueError('size has already been set')
 
+    @property
+    def memmap_path(self):
+        """Folder of memory-mapped files that hold fields, if any.
+
+        Returns
+        -------
+        str or None
+            The folder, or ``None`` if fields are held in memory.
+        """
+        if self._store is None:
+            return None
+        else:
+            return self._store.path
+
+    def use_memmap(self, path, names=None):
+        """Keep fields in memory-mapped files rather than in memory.
+
+        The values of each field are kept in the file *name.npy* within
+        the folder *path*, and the arrays of the fields are backed by these
+        files. Fields already in the collection are moved to their files.
+        Fields that have been saved in *path*, but are not yet in the
+        collection, are added to it with their saved values. Deleting a
+        field deletes its file.
+
+        Unlike fields kept in memory, an array given to ``__setitem__`` or
+        :meth:`add_field` is not itself used as the field: its values are
+        copied to the file, and later changes to it do not change the
+        field. Use the array that is returned, or that is got back from
+        the collection, instead.
+
+        Parameters
+        ----------
+        path : str
+            Folder that holds the files.
+        names : iterable of str, optional
+            Names of the fields to keep in files. If not given, keep all
+            fields.
+
+        Raises
+        ------
+        ValueError
+            If a saved field does not have one value for each element.
+
+        Examples
+        --------
+        >>> import tempfile
+        >>> from landlab.field import ScalarDataFields
+        >>> path = tempfile.mkdtemp()
+        >>> fields = ScalarDataFields(4)
+        >>> fields.use_memmap(path, names=['air__temperature'])
+        >>> fields.add_ones('air__temperature')
+        array([ 1.,  1.,  1.,  1.])
+        >>> fields['air__temperature'][0] = 10.
+        >>> fields.flush()
+
+        Fields saved in the folder are found by new collections that use it.
+
+        >>> fields = ScalarDataFields(4)
+        >>> fields.use_memmap(path)
+        >>> fields['air__temperature']
+        array([ 10.,   1.,   1.,   1.])
+
+        LLCATS: FIELDCR FIELDIO
+        """
+        store = MemmapStore(path, names=names)
+
+        saved = dict()
+        for name in store.saved():
+            if name not in self:
+                saved[name] = store.open(name)
+                if self.size is not None and (
+                        saved[name].ndim == 0 or
+                        saved[name].shape[0] != self.size):
+                    for opened in saved:
+                        store.close(opened)
+                    raise ValueError(
+                        'saved field {name} has {n_values} values but the '
+                        'fields have size {size}'.format(
+                            name=name, n_values=saved[name].size,
+                            size=self.size))
+
+        self._store = store
+        for name in sorted(saved):
+            self[name] = saved[name]
+        for name in list(self.keys()):
+            if self._store.stores(name):
+                self[name] = self[name]
+
+    def flush(self):
+        """Write changes to fields kept in memory-mapped files.
+
+        LLCATS: FIELDIO
+        """
+        if self._store is not None:
+            self._store.flush()
+
     def empty(self, **kwds):
         """Uninitialized array whose size is that of the field.
 
@@ -481,11 +580,20 @@ class ScalarDataFields(dict):
         if need_to_reshape_array(value_array, self.size):
             value_array = value_array.reshape((self.size, -1)).squeeze()
 
+        if self._store is not None and self._store.stores(name):
+            value_array = self._store.store(name, value_array)
+
         if name not in self:
             self.set_units(name, None)
 
         super(ScalarDataFields, self).__setitem__(name, value_array)
 
+    def __delitem__(self, name):
+        """Remove a data field by name."""
+        super(ScalarDataFields, self).__delitem__(name)
+        if self._store is not None and self._store.stores(name):
+            self._store.remove(name)
+
     def __getitem__(self, name):
         """Get a data field by name."""
         try:
@@ -0,0 +1,153 @@
+#! /usr/bin/env python
+import os
+
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from landlab import RasterModelGrid
+from landlab.components import LinearDiffuser
+from landlab.field import FieldError, ScalarDataFields
+
+
+def test_fields_in_files(tmpdir):
+    fields = ScalarDataFields(4)
+    fields.use_memmap(str(tmpdir))
+    fields.add_ones('air__temperature')
+    fields['land_surface__temperature'] = np.arange(4.)
+
+    assert fields.memmap_path == str(tmpdir)
+    assert sorted(os.listdir(str(tmpdir))) == [
+        'air__temperature.npy', 'land_surface__temperature.npy']
+    assert type(fields['air__temperature']) is np.ndarray
+
+
+def test_selected_fields_in_files(tmpdir):
+    fields = ScalarDataFields(4)
+    fields.use_memmap(str(tmpdir), names=['air__temperature'])
+    fields.add_ones('air__temperature')
+    fields.add_ones('land_surface__temperature')
+
+    assert os.listdir(str(tmpdir)) == ['air__temperature.npy']
+
+
+def test_existing_fields_moved_to_files(tmpdir):
+    fields = ScalarDataFields(4)
+    fields.add_field('air__temperature', np.arange(4.), units='C')
+    fields.use_memmap(str(tmpdir))
+
+    saved = np.load(str(tmpdir.join('air__temperature.npy')))
+    assert_array_equal(saved, np.arange(4.))
+    assert fields.units['air__temperature'] == 'C'
+
+
+def test_restart_from_files(tmpdir):
+    fields = ScalarDataFields(4)
+    fields.use_memmap(str(tmpdir))
+    values = fields.add_zeros('air__temperature')
+    values += 2.
+    fields.flush()
+
+    fields = ScalarDataFields(4)
+    fields.use_memmap(str(tmpdir))
+    assert_array_equal(fields['air__temperature'], [2., 2., 2., 2.])
+
+
+def test_saved_field_wrong_size(tmpdir):
+    fields = ScalarDataFields(4)
+    fields.use_memmap(str(tmpdir))
+    fields.add_zeros('air__temperature')
+
+    fields = ScalarDataFields(5)
+    with pytest.raises(ValueError):
+        fields.use_memmap(str(tmpdir))
+
+
+def test_saved_field_with_multiple_of_size(tmpdir):
+    np.save(str(tmpdir.join('air__temperature.npy')), np.arange(8.))
+
+    fields = ScalarDataFields(4)
+    with pytest.raises(ValueError):
+        fields.use_memmap(str(tmpdir))
+    assert 'air__temperature' not in fields
+    assert fields.memmap_path is None
+    assert np.load(str(tmpdir.join('air__temperature.npy'))).shape == (8, )
+
+
+@pytest.mark.parametrize('name', ['air/temperature', ''])
+def test_field_name_not_a_file_name(tmpdir, name):
+    fields = ScalarDataFields(4)
+    fields.use_memmap(str(tmpdir))
+    with pytest.raises(ValueError):
+        fields.add_ones(name)
+    assert name not in fields
+
+
+def test_replace_with_view_of_itself(tmpdir):
+    fields = ScalarDataFields(4)
+    fields.use_memmap(str(tmpdir))
+    fields['air__temperature'] = np.arange(4.)
+    fields['air__temperature'] = fields['air__temperature'][::-1]
+
+    assert_array_equal(fields['air__temperature'], [3., 2., 1., 0.])
+    fields.flush()
+    assert_array_equal(np.load(str(tmpdir.join('air__temperature.npy'))),
+                       [3., 2., 1., 0.])
+
+
+def test_delete_field(tmpdir):
+    fields = ScalarDataFields(4)
+    fields.use_memmap(str(tmpdir))
+    fields.add_zeros('air__temperature')
+    del fields['air__temperature']
+
+    with pytest.raises(FieldError):
+        fields['air__temperature']
+    assert not os.path.isfile(str(tmpdir.join('air__temperature.npy')))
+
+
+def test_deleted_field_not_restored(tmpdir):
+    fields = ScalarDataFields(4)
+    fields.use_memmap(str(tmpdir))
+    fields.add_zeros('air__temperature')
+    fields.add_ones('land_surface__temperature')
+    del fields['air__temperature']
+    fields.flush()
+
+    fields = ScalarDataFields(4)
+    fields.use_memmap(str(tmpdir))
+    assert 'air__temperature' not in fields
+    assert_array_equal(fields['land_surface__temperature'], [1., 1., 1., 1.])
+
+
+def test_set_field_copies_to_file(tmpdir):
+    fields = ScalarDataFields(4)
+    fields.use_memmap(str(tmpdir))
+    values = np.arange(4.)
+    fields['air__temperature'] = values
+    values[0] = 10.
+
+    assert fields['air__temperature'] is not values
+    assert fields['air__temperature'][0] == 0.
+
+
+def test_grid_component_with_memmap(tmpdir):
+    grid = RasterModelGrid((10, 12))
+    grid.use_memmap('node', str(tmpdir))
+    z = grid.add_zeros('node', 'topographic__elevation')
+    z[grid.core_nodes] = np.random.rand(len(grid.core_nodes))
+
+    expected = RasterModelGrid((10, 12))
+    expected.add_field('node', 'topographic__elevation', z, copy=True)
+
+    for g in (grid, expected):
+        diffuser = LinearDiffuser(g, linear_diffusivity=1.)
+        for _ in range(5):
+            diffuser.run_one_step(.1)
+
+    grid.flush('node')
+    assert_array_equal(grid.at_node['topographic__elevation'],
+                       expected.at_node['topographic__elevation'])
+    assert_array_equal(
+        np.load(str(tmpdir.join('topographic__elevation.npy'))),
+        expected.at_node['topographic__elevation'])
@@ -5,11 +5,13 @@ from libc.stdlib cimport malloc, free
 
 
 DTYPE = np.int
-ctypedef np.int_t DTYPE_t
+ctypedef fused id_t:
+    int
+    long
 
 
 @cython.boundscheck(False)
-def fill_perimeter_nodes(shape, np.ndarray[DTYPE_t, ndim=1] perimeter_nodes):
+def fill_perimeter_nodes(shape, np.ndarray[id_t, ndim=1] perimeter_nodes):
     cdef int n_rows = shape[0]
     cdef int n_cols = shape[1]
     cdef int n_nodes = n_rows * n_cols
@@ -40,7 +42,7 @@ def fill_perimeter_nodes(shape, np.ndarray[DTYPE_t, ndim=1] perimeter_nodes):
 
 @cython.boundscheck(False)
 def fill_hex_perimeter_nodes(shape,
-                             np.ndarray[DTYPE_t, ndim=1] perimeter_nodes):
+                             np.ndarray[id_t, ndim=1] perimeter_nodes):
     cdef int n_rows = shape[0]
     cdef int n_cols = shape[1]
     cdef int n_bottom_rows = (n_rows + (n_rows + 1) % 2) // 2 + 1
@@ -170,7 +172,7 @@ def get_xy_of_node(shape,
 
 @cython.boundscheck(False)
 def get_nodes_at_link(shape,
-                   np.ndarray[DTYPE_t, ndim=2] nodes_at_link):
+                   np.ndarray[id_t, ndim=2] nodes_at_link):
     """Get nodes at the tail and head of each node."""
     cdef int n_links = nodes_at_link.shape[0]
     cdef int n_short_rows = (shape[0] + 1) // 2
@@ -225,7 +227,7 @@ def get_nodes_at_link(shape,
 
 @cython.boundscheck(False)
 def get_links_at_patch(shape,
-                       np.ndarray[DTYPE_t, ndim=2] links_at_patch):
+                       np.ndarray[id_t, ndim=2] links_at_patch):
     """Get links that bound each patch."""
     cdef int n_patches = links_at_patch.shape[0]
     cdef int n_short_rows = (shape[0] + 1) // 2
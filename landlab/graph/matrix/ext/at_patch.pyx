@@ -4,13 +4,15 @@ cimport cython
 
 
 DTYPE = np.int
-ctypedef np.int_t DTYPE_t
+ctypedef fused id_t:
+    int
+    long
 
 
 @cython.boundscheck(False)
-def fill_links_at_patch(np.ndarray[DTYPE_t, ndim=1] links_at_patch,
-                        np.ndarray[DTYPE_t, ndim=1] offset_to_patch,
-                        np.ndarray[DTYPE_t, ndim=2] out):
+def fill_links_at_patch(np.ndarray[id_t, ndim=1] links_at_patch,
+                        np.ndarray[id_t, ndim=1] offset_to_patch,
+                        np.ndarray[id_t, ndim=2] out):
     cdef int i
     cdef int link
     cdef int patch
@@ -6,7 +6,9 @@ from libc.string cimport memcpy, memmove
 from libc.stdlib cimport malloc, free
 
 DTYPE = np.int
-ctypedef np.int_t DTYPE_t
+ctypedef fused id_t:
+    int
+    long
 
 
 cdef roll(void * values, size_t n_values, size_t size, long shift):
@@ -35,8 +37,8 @@ cdef roll(void * values, size_t n_values, size_t size, long shift):
 
 
 @cython.boundscheck(False)
-def roll_id_matrix_rows(np.ndarray[DTYPE_t, ndim=2] matrix,
-                        np.ndarray[DTYPE_t, ndim=1] shift):
+def roll_id_matrix_rows(np.ndarray[id_t, ndim=2] matrix,
+                        np.ndarray[np.int_t, ndim=1] shift):
     cdef int n_rows = matrix.shape[0]
     cdef int n_cols = matrix.shape[1]
     cdef int row
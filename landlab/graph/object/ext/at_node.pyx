@@ -5,14 +5,16 @@ cimport cython
 from libc.stdlib cimport malloc, free
 
 
-ctypedef np.int_t DTYPE_t
+ctypedef fused id_t:
+    int
+    long
 
 
 @cython.boundscheck(False)
-def find_links_at_node(DTYPE_t node,
-                       np.ndarray[DTYPE_t, ndim=2] nodes_at_link,
-                       np.ndarray[DTYPE_t, ndim=1] links_at_node,
-                       np.ndarray[DTYPE_t, ndim=1] link_dirs_at_node):
+def find_links_at_node(long node,
+                       np.ndarray[id_t, ndim=2] nodes_at_link,
+                       np.ndarray[id_t, ndim=1] links_at_node,
+                       np.ndarray[id_t, ndim=1] link_dirs_at_node):
     """Find links touching a node and their directions.
 
     Parameters
@@ -52,9 +54,9 @@ def find_links_at_node(DTYPE_t node,
 
 
 @cython.boundscheck(False)
-def get_links_at_node(np.ndarray[DTYPE_t, ndim=2] nodes_at_link,
-                      np.ndarray[DTYPE_t, ndim=2] links_at_node,
-                      np.ndarray[DTYPE_t, ndim=2] link_dirs_at_node):
+def get_links_at_node(np.ndarray[id_t, ndim=2] nodes_at_link,
+                      np.ndarray[id_t, ndim=2] links_at_node,
+                      np.ndarray[id_t, ndim=2] link_dirs_at_node):
     """Get links touching each node and their directions.
 
     Parameters
@@ -75,8 +77,8 @@ def get_links_at_node(np.ndarray[DTYPE_t, ndim=2] nodes_at_link,
 
 
 @cython.boundscheck(False)
-def reorder_links_at_node(np.ndarray[DTYPE_t, ndim=2] links_at_node,
-                          np.ndarray[DTYPE_t, ndim=2] sorted_links):
+def reorder_links_at_node(np.ndarray[id_t, ndim=2] links_at_node,
+                          np.ndarray[id_t, ndim=2] sorted_links):
     cdef int n_nodes = links_at_node.shape[0]
     cdef int n_links_per_node = links_at_node.shape[1]
     cdef int i
@@ -7,9 +7,14 @@ from libc.stdlib cimport malloc, free, qsort
 from ...sort.ext.argsort cimport unique_int
 
 
+ctypedef fused id_t:
+    int
+    long
+
+
 @cython.boundscheck(True)
 def get_rightmost_edge_at_patch(
-    np.ndarray[long, ndim=2, mode="c"] links_at_patch,
+    np.ndarray[id_t, ndim=2, mode="c"] links_at_patch,
     np.ndarray[double, ndim=2, mode="c"] xy_of_link,
     np.ndarray[long, ndim=1, mode="c"] edge):
     cdef int n_patches = links_at_patch.shape[0]
@@ -33,7 +38,7 @@ def get_rightmost_edge_at_patch(
         edge[patch] = max_n
 
 
-cdef find_common_node(long * link_a, long * link_b):
+cdef find_common_node(id_t * link_a, id_t * link_b):
     if link_a[0] == link_b[0] or link_a[0] == link_b[1]:
         return link_a[0]
     elif link_a[1] == link_b[0] or link_a[1] == link_b[1]:
@@ -80,9 +85,9 @@ cdef order_nodes_at_patch(long * all_nodes_at_patch, long * out,
 
 
 @cython.boundscheck(True)
-def get_nodes_at_patch(np.ndarray[long, ndim=2, mode="c"] links_at_patch,
-                       np.ndarray[long, ndim=2, mode="c"] nodes_at_link,
-                       np.ndarray[long, ndim=2, mode="c"] nodes_at_patch):
+def get_nodes_at_patch(np.ndarray[id_t, ndim=2, mode="c"] links_at_patch,
+                       np.ndarray[id_t, ndim=2, mode="c"] nodes_at_link,
+                       np.ndarray[id_t, ndim=2, mode="c"] nodes_at_patch):
     cdef int n_patches = links_at_patch.shape[0]
     cdef int max_links_at_patch = links_at_patch.shape[1]
     cdef int patch
@@ -101,10 +106,10 @@ def get_nodes_at_patch(np.ndarray[long, ndim=2, mode="c"] links_at_patch,
         free(all_nodes)
 
 
-cdef _nodes_at_patch(long * links_at_patch, long max_links,
-                     long * nodes_at_link, long * out):
+cdef _nodes_at_patch(id_t * links_at_patch, long max_links,
+                     id_t * nodes_at_link, id_t * out):
     cdef long n_links = max_links
-    cdef long link, next_link, prev_link
+    cdef id_t link, next_link, prev_link
     cdef long i
 
     while links_at_patch[n_links - 1] == -1:
@@ -3,11 +3,13 @@ cimport numpy as np
 cimport cython
 
 DTYPE = np.int
-ctypedef np.int_t DTYPE_t
+ctypedef fused id_t:
+    int
+    long
 
 
 @cython.boundscheck(False)
-def calc_midpoint_of_link(np.ndarray[DTYPE_t, ndim=2] nodes_at_link,
+def calc_midpoint_of_link(np.ndarray[id_t, ndim=2] nodes_at_link,
                           np.ndarray[np.float_t, ndim=1] x_of_node,
                           np.ndarray[np.float_t, ndim=1] y_of_node,
                           np.ndarray[np.float_t, ndim=2] xy_of_link):
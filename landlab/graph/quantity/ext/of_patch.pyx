@@ -5,11 +5,13 @@ cimport cython
 from libc.stdlib cimport malloc, free
 
 DTYPE = np.int
-ctypedef np.int_t DTYPE_t
+ctypedef fused id_t:
+    int
+    long
 
 
 @cython.boundscheck(False)
-def calc_area_at_patch(np.ndarray[long, ndim=2] nodes_at_patch,
+def calc_area_at_patch(np.ndarray[id_t, ndim=2] nodes_at_patch,
                        np.ndarray[np.float_t, ndim=1] x_of_node,
                        np.ndarray[np.float_t, ndim=1] y_of_node,
                        np.ndarray[np.float_t, ndim=1] out):
@@ -22,7 +24,7 @@ def calc_area_at_patch(np.ndarray[long, ndim=2] nodes_at_patch,
                                   &x_of_node[0], &y_of_node[0])
 
 
-cdef calc_area_of_patch(long * nodes_at_patch, long n_vertices,
+cdef calc_area_of_patch(id_t * nodes_at_patch, long n_vertices,
                         double * x_of_node, double * y_of_node):
     cdef int n
     cdef int node
@@ -45,7 +47,7 @@ cdef calc_area_of_patch(long * nodes_at_patch, long n_vertices,
 
 
 @cython.boundscheck(False)
-def calc_centroid_at_patch(np.ndarray[long, ndim=2] nodes_at_patch,
+def calc_centroid_at_patch(np.ndarray[id_t, ndim=2] nodes_at_patch,
                            np.ndarray[np.float_t, ndim=1] x_of_node,
                            np.ndarray[np.float_t, ndim=1] y_of_node,
                            np.ndarray[np.float_t, ndim=2] out):
@@ -59,7 +61,7 @@ def calc_centroid_at_patch(np.ndarray[long, ndim=2] nodes_at_patch,
                                &out[n, 0])
 
 
-cdef calc_centroid_of_patch(long * nodes_at_patch, long n_vertices,
+cdef calc_centroid_of_patch(id_t * nodes_at_patch, long n_vertices,
                             double * x_of_node, double * y_of_node, double * out):
     cdef int n
     cdef int node
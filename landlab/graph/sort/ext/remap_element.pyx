@@ -13,12 +13,14 @@ from .spoke_sort import sort_spokes_at_wheel
 from .argsort cimport argsort_int
 
 DTYPE = np.int
-ctypedef np.int_t DTYPE_t
+ctypedef fused id_t:
+    int
+    long
 
 
 @cython.boundscheck(False)
-def reverse_one_to_one(np.ndarray[DTYPE_t, ndim=1] mapping,
-                       np.ndarray[DTYPE_t, ndim=1] out):
+def reverse_one_to_one(np.ndarray[id_t, ndim=1] mapping,
+                       np.ndarray[id_t, ndim=1] out):
     cdef int n_elements = mapping.size
     cdef int index
     cdef int id_
@@ -30,8 +32,8 @@ def reverse_one_to_one(np.ndarray[DTYPE_t, ndim=1] mapping,
 
 
 @cython.boundscheck(False)
-def reverse_one_to_many(np.ndarray[DTYPE_t, ndim=2] mapping,
-                        np.ndarray[DTYPE_t, ndim=2] out):
+def reverse_one_to_many(np.ndarray[id_t, ndim=2] mapping,
+                        np.ndarray[id_t, ndim=2] out):
     cdef int n_elements = mapping.shape[0]
     cdef int n_cols = mapping.shape[1]
     cdef int out_rows = out.shape[0]
@@ -54,8 +56,8 @@ def reverse_one_to_many(np.ndarray[DTYPE_t, ndim=2] mapping,
 
 
 @cython.boundscheck(False)
-def remap_graph_element(np.ndarray[DTYPE_t, ndim=1] elements,
-                        np.ndarray[DTYPE_t, ndim=1] old_to_new):
+def remap_graph_element(np.ndarray[id_t, ndim=1] elements,
+                        np.ndarray[id_t, ndim=1] old_to_new):
     """Remap elements in an array in place.
 
     Parameters
@@ -73,9 +75,9 @@ def remap_graph_element(np.ndarray[DTYPE_t, ndim=1] elements,
 
 
 @cython.boundscheck(False)
-def remap_graph_element_ignore(np.ndarray[DTYPE_t, ndim=1] elements,
-                               np.ndarray[DTYPE_t, ndim=1] old_to_new,
-                               DTYPE_t bad_val):
+def remap_graph_element_ignore(np.ndarray[id_t, ndim=1] elements,
+                               np.ndarray[id_t, ndim=1] old_to_new,
+                               long bad_val):
     """Remap elements in an array in place, ignoring bad values.
 
     Parameters
@@ -96,9 +98,9 @@ def remap_graph_element_ignore(np.ndarray[DTYPE_t, ndim=1] elements,
 
 
 @cython.boundscheck(False)
-def reorder_patches(np.ndarray[DTYPE_t, ndim=1] links_at_patch,
-                    np.ndarray[DTYPE_t, ndim=1] offset_to_patch,
-                    np.ndarray[DTYPE_t, ndim=1] sorted_patches):
+def reorder_patches(np.ndarray[id_t, ndim=1] links_at_patch,
+                    np.ndarray[id_t, ndim=1] offset_to_patch,
+                    np.ndarray[id_t, ndim=1] sorted_patches):
     cdef int i
     cdef int patch
     cdef int offset
@@ -127,8 +129,8 @@ def reorder_patches(np.ndarray[DTYPE_t, ndim=1] links_at_patch,
 
 
 @cython.boundscheck(False)
-def calc_center_of_patch(np.ndarray[DTYPE_t, ndim=1] links_at_patch,
-                         np.ndarray[DTYPE_t, ndim=1] offset_to_patch,
+def calc_center_of_patch(np.ndarray[id_t, ndim=1] links_at_patch,
+                         np.ndarray[id_t, ndim=1] offset_to_patch,
                          np.ndarray[np.float_t, ndim=2] xy_at_link,
                          np.ndarray[np.float_t, ndim=2] xy_at_patch):
     cdef int patch
@@ -154,8 +156,8 @@ def calc_center_of_patch(np.ndarray[DTYPE_t, ndim=1] links_at_patch,
 
 
 @cython.boundscheck(False)
-def reorder_links_at_patch(np.ndarray[DTYPE_t, ndim=1] links_at_patch,
-                           np.ndarray[DTYPE_t, ndim=1] offset_to_patch,
+def reorder_links_at_patch(np.ndarray[id_t, ndim=1] links_at_patch,
+                           np.ndarray[id_t, ndim=1] offset_to_patch,
                            np.ndarray[np.float_t, ndim=2] xy_of_link):
     cdef int n_patches = len(offset_to_patch) - 1
 
@@ -219,9 +221,9 @@ def connect_links(np.ndarray[long, ndim=1, mode="c"] links,
         free(nodes)
 
 
-cdef reverse_order(long * array, long size):
+cdef reverse_order(id_t * array, long size):
     cdef long i
-    cdef long temp
+    cdef id_t temp
 
     for i in range(size / 2):
         temp = array[i]
@@ -232,8 +234,8 @@ cdef reverse_order(long * array, long size):
 
 
 @cython.boundscheck(False)
-def reverse_element_order(np.ndarray[long, ndim=2] links_at_patch,
-                          np.ndarray[long, ndim=1] patches):
+def reverse_element_order(np.ndarray[id_t, ndim=2] links_at_patch,
+                          np.ndarray[id_t, ndim=1] patches):
     cdef long n_patches = patches.shape[0]
     cdef long max_links = links_at_patch.shape[1]
     cdef long patch
@@ -255,7 +257,7 @@ def reverse_element_order(np.ndarray[long, ndim=2] links_at_patch,
         reverse_order(&links_at_patch[patch, 1], n - 1)
 
 @cython.boundscheck(False)
-def get_angle_of_link(np.ndarray[DTYPE_t, ndim=2] nodes_at_link,
+def get_angle_of_link(np.ndarray[id_t, ndim=2] nodes_at_link,
                       np.ndarray[np.float_t, ndim=2] xy_of_node,
                       np.ndarray[np.float_t, ndim=1] angle_of_link):
     cdef int link
@@ -276,8 +278,8 @@ def get_angle_of_link(np.ndarray[DTYPE_t, ndim=2] nodes_at_link,
 
 
 @cython.boundscheck(False)
-def reorient_links(np.ndarray[DTYPE_t, ndim=2] nodes_at_link,
-                   np.ndarray[DTYPE_t, ndim=1] xy_of_node):
+def reorient_links(np.ndarray[id_t, ndim=2] nodes_at_link,
+                   np.ndarray[id_t, ndim=1] xy_of_node):
     """Reorient links to point up and to the right.
 
     Parameters
@@ -8,6 +8,11 @@ from libc.math cimport atan2
 from argsort cimport argsort
 
 
+ctypedef fused id_t:
+    int
+    long
+
+
 cdef _calc_spoke_angles(double * hub, double * spokes, np.int_t n_spokes,
                         double * angles):
     cdef int i
@@ -26,7 +31,7 @@ cdef _calc_spoke_angles(double * hub, double * spokes, np.int_t n_spokes,
         spoke += 2
 
 
-cdef _argsort_spokes_around_hub(long * spokes, int n_spokes,
+cdef _argsort_spokes_around_hub(id_t * spokes, int n_spokes,
                                 double * xy_of_spoke, double * xy_of_hub,
                                 int * ordered):
     cdef int point
@@ -58,14 +63,14 @@ cdef _argsort_spokes_around_hub(long * spokes, int n_spokes,
         free(points)
 
 
-cdef _sort_spokes_around_hub(long * spokes, int n_spokes, double * xy_of_spoke,
+cdef _sort_spokes_around_hub(id_t * spokes, int n_spokes, double * xy_of_spoke,
                              double * xy_of_hub):
     cdef int point
     cdef int spoke
     # cdef double * points = <double *>malloc(2 * n_spokes * sizeof(double))
     # cdef double * angles = <double *>malloc(n_spokes * sizeof(double))
     cdef int * ordered = <int *>malloc(n_spokes * sizeof(int))
-    cdef int * temp = <int *>malloc(n_spokes * sizeof(int))
+    cdef id_t * temp = <id_t *>malloc(n_spokes * sizeof(id_t))
     
     try:
         _argsort_spokes_around_hub(spokes, n_spokes, xy_of_spoke, xy_of_hub,
@@ -101,7 +106,7 @@ def calc_spoke_angles(np.ndarray[double, ndim=1, mode="c"] hub,
 
 
 @cython.boundscheck(False)
-def sort_spokes_around_hub(np.ndarray[long, ndim=1, mode="c"] spokes,
+def sort_spokes_around_hub(np.ndarray[id_t, ndim=1, mode="c"] spokes,
                            np.ndarray[double, ndim=2, mode="c"] xy_of_spoke,
                            np.ndarray[double, ndim=1, mode="c"] xy_of_hub):
     cdef int n_spokes = spokes.size
@@ -141,15 +146,15 @@ def argsort_points_around_hub(np.ndarray[double, ndim=2, mode="c"] points,
 
 
 @cython.boundscheck(False)
-def argsort_spokes_at_wheel(np.ndarray[long, ndim=1, mode="c"] spokes_at_wheel,
-                            np.ndarray[long, ndim=1, mode="c"] offset_to_wheel,
+def argsort_spokes_at_wheel(np.ndarray[id_t, ndim=1, mode="c"] spokes_at_wheel,
+                            np.ndarray[id_t, ndim=1, mode="c"] offset_to_wheel,
                             np.ndarray[double, ndim=2, mode="c"] xy_of_hub,
                             np.ndarray[double, ndim=2, mode="c"] xy_of_spoke,
                             np.ndarray[int, ndim=1, mode="c"] ordered):
     cdef int n_wheels = len(offset_to_wheel) - 1
     cdef int i
     cdef int n_spokes
-    cdef long * wheel
+    cdef id_t * wheel
     cdef int * order
 
     wheel = &spokes_at_wheel[0]
@@ -165,8 +170,8 @@ def argsort_spokes_at_wheel(np.ndarray[long, ndim=1, mode="c"] spokes_at_wheel,
 
 
 @cython.boundscheck(False)
-def sort_spokes_at_wheel(np.ndarray[long, ndim=1, mode="c"] spokes_at_wheel,
-                         np.ndarray[long, ndim=1, mode="c"] offset_to_wheel,
+def sort_spokes_at_wheel(np.ndarray[id_t, ndim=1, mode="c"] spokes_at_wheel,
+                         np.ndarray[id_t, ndim=1, mode="c"] offset_to_wheel,
                          np.ndarray[double, ndim=2, mode="c"] xy_of_hub,
                          np.ndarray[double, ndim=2, mode="c"] xy_of_spoke):
     """Sort spokes about multiple hubs.
@@ -185,7 +190,7 @@ def sort_spokes_at_wheel(np.ndarray[long, ndim=1, mode="c"] spokes_at_wheel,
     cdef int n_wheels = len(offset_to_wheel) - 1
     cdef int i
     cdef int n_spokes
-    cdef long * wheel
+    cdef id_t * wheel
 
     wheel = &spokes_at_wheel[0]
     for i in range(n_wheels):
@@ -133,7 +133,7 @@ class DualUniformRectilinearGraph(DualRectilinearGraph):
         super(DualUniformRectilinearGraph, self).__init__(node_y_and_x)
 
 
-def get_node_at_cell(shape):
+def get_node_at_cell(shape, dtype=int):
     """Set up an array that gives the node at each cell.
 
     Examples
@@ -146,14 +146,14 @@ def get_node_at_cell(shape):
     """
     from .ext.at_cell import fill_node_at_cell
 
-    node_at_cell = np.empty((shape[0] - 2) * (shape[1] - 2), dtype=int)
+    node_at_cell = np.empty((shape[0] - 2) * (shape[1] - 2), dtype=dtype)
 
     fill_node_at_cell(shape, node_at_cell)
 
     return node_at_cell
 
 
-def get_nodes_at_face(shape):
+def get_nodes_at_face(shape, dtype=int):
     """Set up an array that gives the nodes on either side of each face.
 
     Examples
@@ -167,7 +167,7 @@ def get_nodes_at_face(shape):
     from .ext.at_face import fill_nodes_at_face
 
     n_faces = (shape[1] - 2) * (shape[0] - 1) + (shape[0] - 2) * (shape[1] - 1)
-    nodes_at_face = np.empty((n_faces, 2), dtype=int)
+    nodes_at_face = np.empty((n_faces, 2), dtype=dtype)
     fill_nodes_at_face(shape, nodes_at_face)
 
     return nodes_at_face
@@ -3,11 +3,13 @@ cimport numpy as np
 cimport cython
 
 DTYPE = np.int
-ctypedef np.int_t DTYPE_t
+ctypedef fused id_t:
+    int
+    long
 
 
 @cython.boundscheck(False)
-def fill_node_at_cell(shape, np.ndarray[DTYPE_t, ndim=1] node_at_cell):
+def fill_node_at_cell(shape, np.ndarray[id_t, ndim=1] node_at_cell):
     """Get node contained in a cell.
 
     Parameters
@@ -3,11 +3,13 @@ cimport numpy as np
 cimport cython
 
 DTYPE = np.int
-ctypedef np.int_t DTYPE_t
+ctypedef fused id_t:
+    int
+    long
 
 
 @cython.boundscheck(False)
-def fill_nodes_at_face(shape, np.ndarray[DTYPE_t, ndim=2] nodes_at_face):
+def fill_nodes_at_face(shape, np.ndarray[id_t, ndim=2] nodes_at_face):
     """Get nodes on either side of a face.
 
     Parameters
@@ -3,11 +3,13 @@ cimport numpy as np
 cimport cython
 
 DTYPE = np.int
-ctypedef np.int_t DTYPE_t
+ctypedef fused id_t:
+    int
+    long
 
 
 @cython.boundscheck(False)
-def fill_horizontal_links(shape, np.ndarray[DTYPE_t, ndim=1] horizontal_links):
+def fill_horizontal_links(shape, np.ndarray[id_t, ndim=1] horizontal_links):
     cdef int n_rows = shape[0]
     cdef int n_cols = shape[1]
     cdef int n_links = n_rows * (n_cols - 1) + (n_rows - 1) * n_cols
@@ -22,7 +24,7 @@ def fill_horizontal_links(shape, np.ndarray[DTYPE_t, ndim=1] horizontal_links):
 
 
 @cython.boundscheck(False)
-def fill_vertical_links(shape, np.ndarray[DTYPE_t, ndim=1] vertical_links):
+def fill_vertical_links(shape, np.ndarray[id_t, ndim=1] vertical_links):
     cdef int n_rows = shape[0]
     cdef int n_cols = shape[1]
     cdef int link_stride = 2 * n_cols - 1
@@ -37,7 +39,7 @@ def fill_vertical_links(shape, np.ndarray[DTYPE_t, ndim=1] vertical_links):
 
 
 @cython.boundscheck(False)
-def fill_patches_at_link(shape, np.ndarray[DTYPE_t, ndim=2] patches_at_link):
+def fill_patches_at_link(shape, np.ndarray[id_t, ndim=2] patches_at_link):
     cdef int link
     cdef int patch
     cdef int n_rows = shape[0]
@@ -93,7 +95,7 @@ def fill_patches_at_link(shape, np.ndarray[DTYPE_t, ndim=2] patches_at_link):
 
 
 @cython.boundscheck(False)
-def fill_nodes_at_link(shape, np.ndarray[DTYPE_t, ndim=2] nodes_at_link):
+def fill_nodes_at_link(shape, np.ndarray[id_t, ndim=2] nodes_at_link):
     cdef int row, col
     cdef int link
     cdef int node
@@ -3,11 +3,13 @@ cimport numpy as np
 cimport cython
 
 DTYPE = np.int
-ctypedef np.int_t DTYPE_t
+ctypedef fused id_t:
+    int
+    long
 
 
 @cython.boundscheck(False)
-def fill_perimeter_nodes(shape, np.ndarray[DTYPE_t, ndim=1] perimeter_nodes):
+def fill_perimeter_nodes(shape, np.ndarray[id_t, ndim=1] perimeter_nodes):
     cdef int n_rows = shape[0]
     cdef int n_cols = shape[1]
     cdef int n_nodes = n_rows * n_cols
@@ -37,7 +39,7 @@ def fill_perimeter_nodes(shape, np.ndarray[DTYPE_t, ndim=1] perimeter_nodes):
 
 
 @cython.boundscheck(False)
-def fill_patches_at_node(shape, np.ndarray[DTYPE_t, ndim=2] patches_at_face):
+def fill_patches_at_node(shape, np.ndarray[id_t, ndim=2] patches_at_face):
     cdef int patch
     cdef int node
     cdef int row
@@ -126,7 +128,7 @@ def fill_patches_at_node(shape, np.ndarray[DTYPE_t, ndim=2] patches_at_face):
 
 
 @cython.boundscheck(False)
-def fill_links_at_node(shape, np.ndarray[DTYPE_t, ndim=2] links_at_node):
+def fill_links_at_node(shape, np.ndarray[id_t, ndim=2] links_at_node):
     cdef int n_rows = shape[0]
     cdef int n_cols = shape[1]
     cdef int n_nodes = n_rows * n_cols
@@ -213,7 +215,7 @@ def fill_links_at_node(shape, np.ndarray[DTYPE_t, ndim=2] links_at_node):
 
 @cython.boundscheck(False)
 def fill_link_dirs_at_node(shape,
-                           np.ndarray[DTYPE_t, ndim=2] link_dirs_at_node):
+                           np.ndarray[id_t, ndim=2] link_dirs_at_node):
     cdef int n_rows = shape[0]
     cdef int n_cols = shape[1]
     cdef int n_nodes = n_rows * n_cols
@@ -3,11 +3,13 @@ cimport numpy as np
 cimport cython
 
 DTYPE = np.int
-ctypedef np.int_t DTYPE_t
+ctypedef fused id_t:
+    int
+    long
 
 
 @cython.boundscheck(False)
-def fill_links_at_patch(shape, np.ndarray[DTYPE_t, ndim=2] links_at_patch):
+def fill_links_at_patch(shape, np.ndarray[id_t, ndim=2] links_at_patch):
     cdef int n_rows = shape[0]
     cdef int n_cols = shape[1]
     cdef int links_per_row = 2 * n_cols - 1
@@ -8,44 +8,44 @@ from .ext.at_link import fill_patches_at_link, fill_nodes_at_link
 from .ext.at_patch import fill_links_at_patch
 
 
-def setup_horizontal_links(shape):
+def setup_horizontal_links(shape, dtype=int):
     from .ext.at_link import fill_horizontal_links
     n_horizontal_links = shape[0] * (shape[1] - 1)
-    horizontal_links = np.empty(n_horizontal_links, dtype=int)
+    horizontal_links = np.empty(n_horizontal_links, dtype=dtype)
     fill_horizontal_links(shape, horizontal_links)
     return horizontal_links
 
 
-def setup_vertical_links(shape):
+def setup_vertical_links(shape, dtype=int):
     from .ext.at_link import fill_vertical_links
     n_vertical_links = (shape[0] - 1) * shape[1]
-    vertical_links = np.empty(n_vertical_links, dtype=int)
+    vertical_links = np.empty(n_vertical_links, dtype=dtype)
     fill_vertical_links(shape, vertical_links)
     return vertical_links
 
 
-def setup_perimeter_nodes(shape):
+def setup_perimeter_nodes(shape, dtype=int):
     n_perimeter_nodes = 2 * shape[0] + 2 * (shape[1] - 2)
-    perimeter_nodes = np.empty(n_perimeter_nodes, dtype=int)
+    perimeter_nodes = np.empty(n_perimeter_nodes, dtype=dtype)
     fill_perimeter_nodes(shape, perimeter_nodes)
     return perimeter_nodes
 
 
-def setup_link_dirs_at_node(shape):
+def setup_link_dirs_at_node(shape, dtype=int):
     n_nodes = shape[0] * shape[1]
-    link_dirs_at_node = np.empty((n_nodes , 4), dtype=int)
+    link_dirs_at_node = np.empty((n_nodes , 4), dtype=dtype)
     fill_link_dirs_at_node(shape, link_dirs_at_node)
     return link_dirs_at_node
 
 
-def setup_links_at_node(shape):
+def setup_links_at_node(shape, dtype=int):
     n_nodes = shape[0] * shape[1]
-    links_at_node = np.empty((n_nodes , 4), dtype=int)
+    links_at_node = np.empty((n_nodes , 4), dtype=dtype)
     fill_links_at_node(shape, links_at_node)
     return links_at_node
 
 
-def setup_links_at_patch(shape):
+def setup_links_at_patch(shape, dtype=int):
     """Get links that define patches for a raster grid.
 
     Examples
@@ -54,14 +54,20 @@ def setup_links_at_patch(shape):
     >>> setup_links_at_patch((3, 4)) # doctest: +NORMALIZE_WHITESPACE
     array([[ 4,  7,  3,  0], [ 5,  8,  4,  1], [ 6,  9,  5,  2],
            [11, 14, 10,  7], [12, 15, 11,  8], [13, 16, 12,  9]])
+
+    Links can be stored as 32-bit ints to save memory.
+
+    >>> import numpy as np
+    >>> setup_links_at_patch((3, 4), dtype=np.int32).dtype == np.int32
+    True
     """
     n_patches = (shape[0] - 1) * (shape[1] - 1)
-    links_at_patch = np.empty((n_patches , 4), dtype=int)
+    links_at_patch = np.empty((n_patches , 4), dtype=dtype)
     fill_links_at_patch(shape, links_at_patch)
     return links_at_patch
 
 
-def setup_nodes_at_link(shape):
+def setup_nodes_at_link(shape, dtype=int):
     """
     Examples
     --------
@@ -74,23 +80,23 @@ def setup_nodes_at_link(shape):
            [ 8,  9], [ 9, 10], [10, 11]])
     """
     n_links = shape[0] * (shape[1] - 1) +  (shape[0] - 1) * shape[1]
-    nodes_at_link = np.empty((n_links , 2), dtype=int)
+    nodes_at_link = np.empty((n_links , 2), dtype=dtype)
     fill_nodes_at_link(shape, nodes_at_link)
 
     return nodes_at_link
 
 
-def setup_patches_at_node(shape):
+def setup_patches_at_node(shape, dtype=int):
     n_nodes = shape[0] * shape[1]
-    patches_at_node = np.empty((n_nodes , 4), dtype=int)
+    patches_at_node = np.empty((n_nodes , 4), dtype=dtype)
     fill_patches_at_node(shape, patches_at_node)
 
     return patches_at_node
 
 
-def setup_patches_at_link(shape):
+def setup_patches_at_link(shape, dtype=int):
     n_links = shape[0] * (shape[1] - 1) +  (shape[0] - 1) * shape[1]
-    patches_at_link = np.empty((n_links , 2), dtype=int)
+    patches_at_link = np.empty((n_links , 2), dtype=dtype)
     fill_patches_at_link(shape, patches_at_link)
 
     return patches_at_link
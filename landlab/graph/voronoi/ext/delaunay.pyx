@@ -5,12 +5,14 @@ from libc.stdlib cimport malloc, free
 
 
 DTYPE = np.int
-ctypedef np.int_t DTYPE_t
+ctypedef fused id_t:
+    int
+    long
 
 
 @cython.boundscheck(False)
-def remove_patches(np.ndarray[DTYPE_t, ndim=2] links_at_patch,
-                   np.ndarray[DTYPE_t, ndim=1] patches_to_remove):
+def remove_patches(np.ndarray[id_t, ndim=2] links_at_patch,
+                   np.ndarray[id_t, ndim=1] patches_to_remove):
     cdef int n_bad_patches = len(patches_to_remove)
     cdef int n_patches = links_at_patch.shape[0]
     cdef int max_links = links_at_patch.shape[1]
@@ -28,9 +30,9 @@ def remove_patches(np.ndarray[DTYPE_t, ndim=2] links_at_patch,
 
 
 @cython.boundscheck(False)
-def remove_tris(np.ndarray[DTYPE_t, ndim=2] nodes_at_tri,
-                np.ndarray[DTYPE_t, ndim=2] neighbors_at_tri,
-                np.ndarray[DTYPE_t, ndim=1] bad_tris):
+def remove_tris(np.ndarray[id_t, ndim=2] nodes_at_tri,
+                np.ndarray[id_t, ndim=2] neighbors_at_tri,
+                np.ndarray[id_t, ndim=1] bad_tris):
     cdef int n_tris = nodes_at_tri.shape[0]
     cdef int n_bad_tris = len(bad_tris)
     cdef int n_patches = n_tris - n_bad_tris
@@ -64,10 +66,10 @@ def remove_tris(np.ndarray[DTYPE_t, ndim=2] nodes_at_tri,
 
 
 @cython.boundscheck(False)
-def _setup_links_at_patch(np.ndarray[DTYPE_t, ndim=2] nodes_at_patch,
-                          np.ndarray[DTYPE_t, ndim=2] tri_neighbors,
-                          np.ndarray[DTYPE_t, ndim=2] nodes_at_link,
-                          np.ndarray[DTYPE_t, ndim=2] links_at_patch):
+def _setup_links_at_patch(np.ndarray[id_t, ndim=2] nodes_at_patch,
+                          np.ndarray[id_t, ndim=2] tri_neighbors,
+                          np.ndarray[id_t, ndim=2] nodes_at_link,
+                          np.ndarray[id_t, ndim=2] links_at_patch):
   cdef int i
   cdef int link
   cdef int neighbor
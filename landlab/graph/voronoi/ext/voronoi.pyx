@@ -5,13 +5,15 @@ from libc.stdlib cimport malloc, free
 
 
 DTYPE = np.int
-ctypedef np.int_t DTYPE_t
+ctypedef fused id_t:
+    int
+    long
 
 
-def _is_finite_region(np.ndarray[DTYPE_t, ndim=1] vertices_at_region,
-                      np.ndarray[DTYPE_t, ndim=1] vertices_per_region,
-                      np.ndarray[DTYPE_t, ndim=1] is_finite_region,
-                      DTYPE_t min_patch_size):
+def _is_finite_region(np.ndarray[id_t, ndim=1] vertices_at_region,
+                      np.ndarray[id_t, ndim=1] vertices_per_region,
+                      np.ndarray[id_t, ndim=1] is_finite_region,
+                      long min_patch_size):
     """Test if each region if finite.
 
     Parameters
@@ -44,10 +46,10 @@ def _is_finite_region(np.ndarray[DTYPE_t, ndim=1] vertices_at_region,
         offset += n_vertices
 
 
-def _get_neighbor_regions(np.ndarray[DTYPE_t, ndim=2] ridge_points,
-                          np.ndarray[DTYPE_t, ndim=1] point_region,
-                          np.ndarray[DTYPE_t, ndim=1] is_finite_region,
-                          np.ndarray[DTYPE_t, ndim=2] regions_at_ridge):
+def _get_neighbor_regions(np.ndarray[id_t, ndim=2] ridge_points,
+                          np.ndarray[id_t, ndim=1] point_region,
+                          np.ndarray[id_t, ndim=1] is_finite_region,
+                          np.ndarray[id_t, ndim=2] regions_at_ridge):
     """Get voronoi regions on either side of ridges.
 
     Parameters
@@ -78,9 +80,9 @@ def _get_neighbor_regions(np.ndarray[DTYPE_t, ndim=2] ridge_points,
 
 
 @cython.boundscheck(False)
-def _get_cell_at_region(np.ndarray[DTYPE_t, ndim=2] regions_at_ridge,
-                        np.ndarray[DTYPE_t, ndim=2] ridges_at_cell,
-                        np.ndarray[DTYPE_t, ndim=1] cell_at_region):
+def _get_cell_at_region(np.ndarray[id_t, ndim=2] regions_at_ridge,
+                        np.ndarray[id_t, ndim=2] ridges_at_cell,
+                        np.ndarray[id_t, ndim=1] cell_at_region):
     """Get cell corresponding to each voronoi region.
 
     Parameters
@@ -135,9 +137,9 @@ def _get_cell_at_region(np.ndarray[DTYPE_t, ndim=2] regions_at_ridge,
 
 
 @cython.boundscheck(False)
-def _get_faces_at_cell(np.ndarray[DTYPE_t, ndim=2] ridges_at_cell,
-                       np.ndarray[DTYPE_t, ndim=2] faces_at_cell,
-                       np.ndarray[DTYPE_t, ndim=1] face_at_ridge):
+def _get_faces_at_cell(np.ndarray[id_t, ndim=2] ridges_at_cell,
+                       np.ndarray[id_t, ndim=2] faces_at_cell,
+                       np.ndarray[id_t, ndim=1] face_at_ridge):
     """Get faces that define each cell.
 
     Parameters
@@ -184,10 +186,10 @@ def _get_faces_at_cell(np.ndarray[DTYPE_t, ndim=2] ridges_at_cell,
 
 
 @cython.boundscheck(False)
-def _get_corners_at_face(np.ndarray[DTYPE_t, ndim=1] face_at_ridge,
-                         np.ndarray[DTYPE_t, ndim=2] vertices_at_ridge,
-                         np.ndarray[DTYPE_t, ndim=1] corner_at_vertex,
-                         np.ndarray[DTYPE_t, ndim=2] corners_at_face):
+def _get_corners_at_face(np.ndarray[id_t, ndim=1] face_at_ridge,
+                         np.ndarray[id_t, ndim=2] vertices_at_ridge,
+                         np.ndarray[id_t, ndim=1] corner_at_vertex,
+                         np.ndarray[id_t, ndim=2] corners_at_face):
     """Get corners for each face.
 
     Parameters
@@ -234,7 +236,7 @@ def _get_corners_at_face(np.ndarray[DTYPE_t, ndim=1] face_at_ridge,
 
 @cython.boundscheck(False)
 def _get_xy_at_corners(np.ndarray[np.double_t, ndim=2] vertices,
-                       np.ndarray[DTYPE_t, ndim=1] corner_at_vertex,
+                       np.ndarray[id_t, ndim=1] corner_at_vertex,
                        np.ndarray[np.double_t, ndim=2] xy_at_corner):
     """Get x and y coordinates for each corner.
 
@@ -262,10 +264,10 @@ def _get_xy_at_corners(np.ndarray[np.double_t, ndim=2] vertices,
 
 
 @cython.boundscheck(False)
-def _get_node_at_cell(np.ndarray[DTYPE_t, ndim=2] ridge_points,
-                      np.ndarray[DTYPE_t, ndim=1] point_region,
-                      np.ndarray[DTYPE_t, ndim=1] cell_at_region,
-                      np.ndarray[DTYPE_t, ndim=1] node_at_cell):
+def _get_node_at_cell(np.ndarray[id_t, ndim=2] ridge_points,
+                      np.ndarray[id_t, ndim=1] point_region,
+                      np.ndarray[id_t, ndim=1] cell_at_region,
+                      np.ndarray[id_t, ndim=1] node_at_cell):
     """Get node-to-cell connectivity.
 
     Parameters
@@ -25,7 +25,8 @@ from landlab.field.scalar_data_fields import FieldError
 from . import grid_funcs as gfuncs
 from ..core.utils import as_id_array
 from ..core.utils import add_module_functions_to_class
-from .decorators import (override_array_setitem_and_reset, return_id_array,
+from .decorators import (cache_connectivity,
+                         override_array_setitem_and_reset, return_id_array,
                          return_readonly_id_array)
 from ..utils.decorators import cache_result_in_object
 from ..layers.eventlayers import EventLayersMixIn
@@ -317,6 +318,13 @@ class ModelGrid(ModelDataFieldsMixIn, EventLayersMixIn, MaterialLayersMixIn):
     at_face = {}  # : Values defined at faces
     at_cell = {}  # : Values defined at cells
 
+    # Memory-bounded cache for connectivity arrays (if None, they are kept
+    # as attributes)
+    _connectivity_cache = None
+
+    # Data type of arrays of element ids
+    _index_dtype = np.dtype(int)
+
     def __init__(self, **kwds):
         super(ModelGrid, self).__init__()
 
@@ -379,6 +387,46 @@ class ModelGrid(ModelDataFieldsMixIn, EventLayersMixIn, MaterialLayersMixIn):
         """
         return 2
 
+    @property
+    def index_dtype(self):
+        """Data type of the arrays of element ids of the grid.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab import RasterModelGrid
+        >>> grid = RasterModelGrid((3, 4))
+        >>> grid.index_dtype == np.int
+        True
+        >>> grid.nodes_at_link.dtype == grid.index_dtype
+        True
+
+        LLCATS: GINF
+        """
+        return self._index_dtype
+
+    def _set_index_dtype(self, index_dtype, number_of_ids):
+        """Set the data type of the arrays of element ids.
+
+        Parameters
+        ----------
+        index_dtype : data-type
+            A signed integer type.
+        number_of_ids : int
+            The largest number of elements of any kind in the grid, which
+            must be representable with *index_dtype*.
+        """
+        index_dtype = np.dtype(index_dtype)
+        if index_dtype not in (np.dtype(np.int32), np.dtype(np.int64)):
+            raise ValueError(
+                '{dtype}: index dtype must be int32 or int64'.format(
+                    dtype=index_dtype))
+        if number_of_ids > np.iinfo(index_dtype).max:
+            raise ValueError(
+                'too many elements ({n}) for index dtype {dtype}'.format(
+                    n=number_of_ids, dtype=index_dtype))
+        self._index_dtype = index_dtype
+
     def _setup_nodes(self):
         """Set up the node id array."""
         self._nodes = np.arange(self.number_of_nodes, dtype=int)
@@ -464,7 +512,7 @@ class ModelGrid(ModelDataFieldsMixIn, EventLayersMixIn, MaterialLayersMixIn):
         return self.adjacent_nodes_at_node
 
     @property
-    @cache_result_in_object()
+    @cache_connectivity
     @make_return_array_immutable
     def adjacent_nodes_at_node(self):
         """Get adjacent nodes.
@@ -747,7 +795,8 @@ class ModelGrid(ModelDataFieldsMixIn, EventLayersMixIn, MaterialLayersMixIn):
 
         LLCATS: NINF BC
         """
-        return numpy.where(self.status_at_node == CORE_NODE)[0]
+        return numpy.where(self.status_at_node == CORE_NODE)[0].astype(
+            self.index_dtype, copy=False)
 
     @property
     @return_readonly_id_array
@@ -905,7 +954,7 @@ class ModelGrid(ModelDataFieldsMixIn, EventLayersMixIn, MaterialLayersMixIn):
         """
         self._fixed_grad_links_created = True
         self._fixed_gradient_boundary_node_links = np.empty_like(
-            self.fixed_gradient_boundary_nodes, dtype=int)
+            self.fixed_gradient_boundary_nodes, dtype=self.index_dtype)
         fix_nodes = self.fixed_gradient_boundary_nodes
         neighbor_links = self.links_at_node[fix_nodes]  # -1s
         boundary_exists = self.link_dirs_at_node[fix_nodes]
@@ -986,7 +1035,9 @@ class ModelGrid(ModelDataFieldsMixIn, EventLayersMixIn, MaterialLayersMixIn):
 
         LLCATS: NINF BC
         """
-        return numpy.where(self._node_status == FIXED_VALUE_BOUNDARY)[0]
+        (fixed_value_nodes, ) = numpy.where(
+            self._node_status == FIXED_VALUE_BOUNDARY)
+        return fixed_value_nodes.astype(self.index_dtype, copy=False)
 
     @property
     @return_readonly_id_array
@@ -1025,7 +1076,8 @@ class ModelGrid(ModelDataFieldsMixIn, EventLayersMixIn, MaterialLayersMixIn):
 
         LLCATS: LINF BC
         """
-        return np.where(self.status_at_link == ACTIVE_LINK)[0]
+        return np.where(self.status_at_link == ACTIVE_LINK)[0].astype(
+            self.index_dtype, copy=False)
 
     @property
     @return_readonly_id_array
@@ -1054,7 +1106,8 @@ class ModelGrid(ModelDataFieldsMixIn, EventLayersMixIn, MaterialLayersMixIn):
 
         LLCATS: LINF BC
         """
-        return np.where(self.status_at_link == FIXED_LINK)[0]
+        return np.where(self.status_at_link == FIXED_LINK)[0].astype(
+            self.index_dtype, copy=False)
 
     @property
     @cache_result_in_object()
@@ -1429,6 +1482,58 @@ class ModelGrid(ModelDataFieldsMixIn, EventLayersMixIn, MaterialLayersMixIn):
             raise TypeError(
                 '{name}: element name not understood'.format(name=name))
 
+    def memory_usage(self):
+        """Memory used by the arrays of a grid.
+
+        Report the number of bytes used by each array that the grid
+        currently holds. This includes the arrays it stores as attributes,
+        the arrays in its connectivity cache (if it has one), and its
+        fields, which are named by their group and field name (for example,
+        ``'at_node:topographic__elevation'``).
+
+        Returns
+        -------
+        dict
+            Number of bytes used by each array, keyed by name.
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid
+        >>> grid = RasterModelGrid((3, 4))
+        >>> usage = grid.memory_usage()
+        >>> usage['_xy_of_node']
+        192
+        >>> _ = grid.add_zeros('node', 'topographic__elevation')
+        >>> grid.memory_usage()['at_node:topographic__elevation']
+        96
+
+        Arrays in a memory-bounded connectivity cache are only reported
+        while they are in the cache.
+
+        >>> grid = RasterModelGrid((3, 4), max_connectivity_memory=512)
+        >>> _ = grid.links_at_node
+        >>> grid.memory_usage()['_links_at_node']
+        384
+        >>> _ = grid.patches_at_node
+        >>> usage = grid.memory_usage()
+        >>> '_links_at_node' in usage, usage['_patches_at_node']
+        (False, 384)
+
+        LLCATS: GINF
+        """
+        usage = dict()
+        for name, value in self.__dict__.items():
+            if isinstance(value, np.ndarray):
+                usage[name] = value.nbytes
+        if self._connectivity_cache is not None:
+            for name, value in self._connectivity_cache.items():
+                usage[name] = value.nbytes
+        for group in self.groups:
+            for name, value in self[group].items():
+                usage['at_{group}:{name}'.format(group=group,
+                                                 name=name)] = value.nbytes
+        return usage
+
     @property
     @make_return_array_immutable
     def node_x(self):
@@ -2397,8 +2502,8 @@ class ModelGrid(ModelDataFieldsMixIn, EventLayersMixIn, MaterialLayersMixIn):
                [ 6, 10,  9,  5,  2,  3]])
         """
         num_faces = self.number_of_faces_at_cell()
-        self._faces_at_cell = np.zeros((self.number_of_cells,
-                                        np.amax(num_faces)), dtype=int)
+        self._faces_at_cell = np.zeros(
+            (self.number_of_cells, np.amax(num_faces)), dtype=self.index_dtype)
         num_faces[:] = 0  # Zero out and count again, to use as index
         node_at_link_tail = self.node_at_link_tail
         node_at_link_head = self.node_at_link_head
@@ -2788,7 +2893,7 @@ class ModelGrid(ModelDataFieldsMixIn, EventLayersMixIn, MaterialLayersMixIn):
                -1, -1, -1])
         """
         self._face_at_link = numpy.full(self.number_of_links, BAD_INDEX_VALUE,
-                                        dtype=int)
+                                        dtype=self.index_dtype)
         face_id = 0
         node_at_link_tail = self.node_at_link_tail
         node_at_link_head = self.node_at_link_head
@@ -2812,7 +2917,7 @@ class ModelGrid(ModelDataFieldsMixIn, EventLayersMixIn, MaterialLayersMixIn):
         array([ 3,  4,  5,  6,  8,  9, 10, 12, 13, 14, 15])
         """
         num_faces = len(self.width_of_face)
-        self._link_at_face = numpy.empty(num_faces, dtype=int)
+        self._link_at_face = numpy.empty(num_faces, dtype=self.index_dtype)
         face_id = 0
         node_at_link_tail = self.node_at_link_tail
         node_at_link_head = self.node_at_link_head
@@ -3012,7 +3117,48 @@ class ModelGrid(ModelDataFieldsMixIn, EventLayersMixIn, MaterialLayersMixIn):
         self._activelink_fromnode = self.node_at_link_tail[self.active_links]
         self._activelink_tonode = self.node_at_link_head[self.active_links]
 
-    def reset_status_at_node(self):
+    def reset_status_at_node(self, nodes=None):
+        """Update the grid after the status of nodes has changed.
+
+        Links and lists of nodes, links, faces and cells that depend on the
+        status of nodes are recalculated. If the IDs of the changed *nodes*
+        are given, only the links of these nodes are updated, and the cached
+        lists of IDs are patched rather than rebuilt. Setting values of
+        ``status_at_node`` with integer IDs does this automatically.
+
+        Parameters
+        ----------
+        nodes : array_like of int, optional
+            IDs of the nodes whose status has changed. If not given, update
+            everything.
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid, CLOSED_BOUNDARY
+        >>> grid = RasterModelGrid((4, 5))
+        >>> grid.active_links
+        array([ 5,  6,  7,  9, 10, 11, 12, 14, 15, 16, 18, 19, 20, 21, 23, 24,
+               25])
+        >>> grid.status_at_node[7] = CLOSED_BOUNDARY
+        >>> grid.active_links
+        array([ 5,  7,  9, 12, 14, 16, 18, 19, 20, 21, 23, 24, 25])
+        >>> grid.core_nodes
+        array([ 6,  8, 11, 12, 13])
+
+        LLCATS: NINF LINF BC
+        """
+        if nodes is not None:
+            nodes = np.asarray(nodes, dtype=int).reshape((-1, ))
+            nodes = np.unique(np.where(nodes < 0, nodes + self.number_of_nodes,
+                                       nodes))
+            if nodes.size * 8 < self.number_of_nodes:
+                self._update_status_at_nodes(nodes)
+                return
+
+        self._reset_status_at_all_nodes()
+
+    def _reset_status_at_all_nodes(self):
+        """Drop all cached arrays that depend on the status of nodes."""
         attrs = ['_active_link_dirs_at_node', '_status_at_link',
                  '_active_links', '_fixed_links', '_activelink_fromnode',
                  '_activelink_tonode', '_active_faces', '_core_nodes',
@@ -3026,6 +3172,10 @@ class ModelGrid(ModelDataFieldsMixIn, EventLayersMixIn, MaterialLayersMixIn):
                 del self.__dict__[attr]
             except KeyError:
                 pass
+        self._reset_bc_set_code()
+
+    def _reset_bc_set_code(self):
+        """Mark boundary conditions as changed, and drop the link matrices."""
         try:
             self.bc_set_code += 1
         except AttributeError:
@@ -3039,6 +3189,69 @@ class ModelGrid(ModelDataFieldsMixIn, EventLayersMixIn, MaterialLayersMixIn):
         except KeyError:
             pass
 
+    def _update_status_at_nodes(self, nodes):
+        """Patch cached status arrays after the status of *nodes* changed.
+
+        Only the links of *nodes*, and the nodes at either end of those
+        links, are visited. Cached, sorted lists of IDs have IDs removed and
+        inserted as needed (see :func:`_patch_sorted_ids`).
+
+        Parameters
+        ----------
+        nodes : ndarray of int
+            Sorted, unique IDs of nodes whose status has changed.
+        """
+        cache = self.__dict__
+        status_at_node = self._node_status
+
+        for attr in ('_activelink_fromnode', '_activelink_tonode',
+                     '_active_faces', '_core_cells',
+                     '_active_adjacent_nodes_at_node'):
+            cache.pop(attr, None)
+
+        for attr, status in (('_core_nodes', CORE_NODE),
+                             ('_node_at_core_cell', CORE_NODE),
+                             ('_fixed_value_boundary_nodes',
+                              FIXED_VALUE_BOUNDARY)):
+            if attr in cache:
+                cache[attr] = _patch_sorted_ids(
+                    cache[attr], nodes, status_at_node[nodes] == status)
+
+        if '_status_at_link' in cache:
+            links = np.unique(self.links_at_node[nodes])
+            links = links[links != -1]
+
+            status_at_link = cache['_status_at_link']
+            status_at_link[links] = set_status_at_link(
+                status_at_node[self.nodes_at_link[links]])
+
+            for attr, status in (('_active_links', ACTIVE_LINK),
+                                 ('_fixed_links', FIXED_LINK)):
+                if attr in cache:
+                    cache[attr] = _patch_sorted_ids(
+                        cache[attr], links, status_at_link[links] == status)
+
+            if links.size and links[-1] == self.number_of_links - 1:
+                # Missing links (-1) take the status of the last link
+                for attr in ('_link_status_at_node',
+                             '_active_link_dirs_at_node'):
+                    cache.pop(attr, None)
+
+            rows = np.unique(self.nodes_at_link[links])
+            if '_link_status_at_node' in cache:
+                cache['_link_status_at_node'][rows] = status_at_link[
+                    self.links_at_node[rows]]
+            if '_active_link_dirs_at_node' in cache:
+                cache['_active_link_dirs_at_node'][rows] = np.choose(
+                    self.link_status_at_node[rows] == ACTIVE_LINK,
+                    (0, self.link_dirs_at_node[rows]))
+        else:
+            for attr in ('_active_links', '_fixed_links',
+                         '_link_status_at_node', '_active_link_dirs_at_node'):
+                cache.pop(attr, None)
+
+        self._reset_bc_set_code()
+
     @deprecated(use='set_nodata_nodes_to_closed', version='0.2')
     def set_nodata_nodes_to_inactive(self, node_data, nodata_value):
         """Make no-data nodes inactive.
@@ -4126,6 +4339,51 @@ class ModelGrid(ModelDataFieldsMixIn, EventLayersMixIn, MaterialLayersMixIn):
         self._xy_of_node += origin
 
 
+def _patch_sorted_ids(ids, candidates, is_member):
+    """Add and remove IDs from a sorted array of IDs.
+
+    Finding which IDs to add or remove takes time in proportion to the
+    number of *candidates*. If there are none, *ids* is returned as it is;
+    otherwise the IDs are copied to a new array, which still takes time in
+    proportion to the length of *ids* (though much less than finding them
+    all anew).
+
+    Parameters
+    ----------
+    ids : ndarray of int
+        Sorted IDs.
+    candidates : ndarray of int
+        Sorted IDs that may need to be added or removed.
+    is_member : ndarray of bool
+        Whether each of *candidates* belongs in *ids*.
+
+    Returns
+    -------
+    ndarray of int
+        The updated IDs.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.grid.base import _patch_sorted_ids
+    >>> _patch_sorted_ids(np.array([1, 3, 5, 7]), np.array([2, 3, 9]),
+    ...                   np.array([True, False, True]))
+    array([1, 2, 5, 7, 9])
+    """
+    at = np.searchsorted(ids, candidates)
+    is_present = np.zeros(len(candidates), dtype=bool)
+    in_range = at < len(ids)
+    is_present[in_range] = ids[at[in_range]] == candidates[in_range]
+    to_remove = at[is_present & ~is_member]
+    to_add = candidates[~is_present & is_member]
+
+    if len(to_remove) > 0:
+        ids = np.delete(ids, to_remove)
+    if len(to_add) > 0:
+        ids = np.insert(ids, np.searchsorted(ids, to_add), to_add)
+    return ids
+
+
 add_module_functions_to_class(ModelGrid, 'mappers.py', pattern='map_*')
 # add_module_functions_to_class(ModelGrid, 'gradients.py',
 #                               pattern='calculate_*')
@@ -0,0 +1,129 @@
+"""Benchmark the flow accumulation engines.
+
+Run from the command line to print, for each grid size, the time taken to
+build the drainage stack and accumulate drainage area with the 'python'
+and 'compiled' engines, followed by the time taken by the accumulation
+step of FlowAccumulator for route-to-one (D8) and route-to-many (MFD)
+flow directors::
+
+    $ python benchmark_flow_accum.py
+"""
+import time
+
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.components import FlowAccumulator
+from landlab.components.flow_accum import (
+    find_drainage_area_and_discharge,
+    find_drainage_area_and_discharge_compiled,
+    make_ordered_node_array,
+    make_stack_and_donor_arrays,
+)
+from landlab.components.flow_accum.flow_accum_bw import (
+    _make_array_of_donors,
+    _make_delta_array,
+    _make_number_of_donors_array,
+)
+
+
+def make_receivers(shape):
+    """Steepest-descent (D4) receivers on a random surface of a raster."""
+    n_rows, n_cols = shape
+    z = np.random.rand(n_rows, n_cols) + np.arange(n_rows).reshape((-1, 1))
+    z[0, :] = -1.
+
+    ids = np.arange(n_rows * n_cols).reshape(shape)
+    receiver = ids.copy()
+    lowest = z.copy()
+
+    for shifted_z, shifted_ids, interior in (
+        (z[:-1, :], ids[:-1, :], np.s_[1:, :]),
+        (z[1:, :], ids[1:, :], np.s_[:-1, :]),
+        (z[:, :-1], ids[:, :-1], np.s_[:, 1:]),
+        (z[:, 1:], ids[:, 1:], np.s_[:, :-1]),
+    ):
+        is_lower = shifted_z < lowest[interior]
+        lowest[interior][is_lower] = shifted_z[is_lower]
+        receiver[interior][is_lower] = shifted_ids[is_lower]
+
+    receiver[0, :] = ids[0, :]
+    return receiver.reshape((-1,))
+
+
+def bench_python_engine(r):
+    nd = _make_number_of_donors_array(r)
+    delta = _make_delta_array(nd)
+    _make_array_of_donors(r, delta)
+    s = make_ordered_node_array(r)
+    find_drainage_area_and_discharge(s, r)
+
+
+def bench_compiled_engine(r):
+    delta, D, s = make_stack_and_donor_arrays(r)
+    find_drainage_area_and_discharge_compiled(s, r)
+
+
+def bench_flow_accumulator(shape, flow_director, engine):
+    """Time the accumulation step (not flow direction) of FlowAccumulator."""
+    grid = RasterModelGrid(shape)
+    grid.add_field(
+        "topographic__elevation",
+        np.random.rand(grid.number_of_nodes) + grid.y_of_node,
+        at="node",
+    )
+    fa = FlowAccumulator(
+        grid, flow_director=flow_director, accumulation_engine=engine
+    )
+    fa.flow_director.run_one_step()
+
+    start = time.time()
+    fa.accumulate_flow(update_flow_director=False)
+    return time.time() - start
+
+
+def main_accumulator(sizes=(100, 300, 1000), max_python_size=300):
+    print(
+        "{0:>12s} {1:>12s} {2:>12s} {3:>12s}".format(
+            "n_nodes", "D8 (s)", "MFD (s)", "MFD python"
+        )
+    )
+    for size in sizes:
+        d8_time = bench_flow_accumulator((size, size), "D8", "compiled")
+        mfd_time = bench_flow_accumulator((size, size), "MFD", "compiled")
+        if size <= max_python_size:
+            mfd_python_time = "{0:12.3f}".format(
+                bench_flow_accumulator((size, size), "MFD", "python")
+            )
+        else:
+            mfd_python_time = "{0:>12s}".format("-")
+
+        print(
+            "{0:12d} {1:12.3f} {2:12.3f} {3}".format(
+                size * size, d8_time, mfd_time, mfd_python_time
+            )
+        )
+
+
+def main(sizes=(100, 300, 1000, 3163), max_python_size=1000):
+    print("{0:>12s} {1:>12s} {2:>12s}".format("n_nodes", "python (s)", "compiled (s)"))
+    for size in sizes:
+        r = make_receivers((size, size))
+
+        if size <= max_python_size:
+            start = time.time()
+            bench_python_engine(r)
+            python_time = "{0:12.3f}".format(time.time() - start)
+        else:
+            python_time = "{0:>12s}".format("-")
+
+        start = time.time()
+        bench_compiled_engine(r)
+        compiled_time = time.time() - start
+
+        print("{0:12d} {1} {2:12.3f}".format(r.size, python_time, compiled_time))
+
+
+if __name__ == "__main__":
+    main()
+    main_accumulator()
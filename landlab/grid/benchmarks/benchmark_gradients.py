@@ -21,3 +21,17 @@ def bench_max_gradients():
     node_values = rmg.zeros()
     (grads, nodes) = rmg.calculate_max_gradient_across_adjacent_cells(
         node_values, method='d8', return_node=True)
+
+
+def bench_grad_at_link():
+    rmg = RasterModelGrid(1000, 1000)
+    node_values = rmg.zeros()
+    grads = rmg.empty(at='link')
+    rmg.calc_grad_at_link(node_values, out=grads)
+
+
+def bench_flux_div_at_node():
+    rmg = RasterModelGrid(1000, 1000)
+    flux = rmg.zeros(at='link')
+    div = rmg.zeros(at='node')
+    rmg.calc_flux_div_at_node(flux, out=div)
@@ -0,0 +1,95 @@
+"""Benchmark grids with 32-bit and 64-bit element ids.
+
+Run from the command line to print, for each index dtype, the memory used
+by a grid's connectivity arrays and the number of calls per second of some
+operations that gather values through them::
+
+    $ python benchmark_index_dtype.py
+
+Note that numpy converts 32-bit indices to its native index type before
+fancy indexing, so it is the compiled kernels (the grid mappers, for
+instance) that gather faster with 32-bit ids.
+"""
+import time
+
+import numpy as np
+
+from landlab import RasterModelGrid
+
+
+CONNECTIVITY = ('nodes_at_link', 'links_at_node', 'link_dirs_at_node',
+                'patches_at_node', 'nodes_at_patch', 'links_at_patch',
+                'adjacent_nodes_at_node', 'node_at_cell', 'cell_at_node',
+                'face_at_link', 'core_nodes', 'active_links', 'd8s_at_node',
+                'nodes_at_d8')
+
+
+def gather_at_link(grid, values):
+    return values[grid.nodes_at_link]
+
+
+def gather_at_node(grid, values):
+    return values[grid.links_at_node]
+
+
+def gather_at_patch(grid, values):
+    return values[grid.nodes_at_patch]
+
+
+def mean_of_link_nodes(grid, values):
+    return grid.map_mean_of_link_nodes_to_link(values)
+
+
+def grad_at_active_links(grid, values):
+    return (values[grid.node_at_link_head[grid.active_links]] -
+            values[grid.node_at_link_tail[grid.active_links]])
+
+
+GATHERS = (
+    (gather_at_link, 'node'),
+    (gather_at_node, 'link'),
+    (gather_at_patch, 'node'),
+    (mean_of_link_nodes, 'node'),
+    (grad_at_active_links, 'node'),
+)
+
+
+def connectivity_nbytes(grid):
+    """Bytes used by the grid's id arrays."""
+    for name in CONNECTIVITY:
+        getattr(grid, name)
+    usage = grid.memory_usage()
+    return sum(nbytes for name, nbytes in usage.items()
+               if not name.startswith('at_') and name != '_xy_of_node')
+
+
+def bench_gather(func, grid, values, n_calls=10):
+    """Calls per second of a gather."""
+    func(grid, values)
+    start = time.time()
+    for _ in range(n_calls):
+        func(grid, values)
+    elapsed = time.time() - start
+    return n_calls / elapsed
+
+
+def main(shape=(1000, 1000)):
+    grids = [RasterModelGrid(shape, index_dtype=dtype)
+             for dtype in (np.int64, np.int32)]
+    values_at = {
+        'node': np.random.rand(grids[0].number_of_nodes),
+        'link': np.random.rand(grids[0].number_of_links),
+    }
+
+    print("{0:>24s} {1:>12s} {2:>12s}".format("", "int64", "int32"))
+    print("{0:>24s} {1:12.1f} {2:12.1f}".format(
+        "connectivity (MB)", *[connectivity_nbytes(grid) / 2. ** 20
+                               for grid in grids]))
+    print("{0:>24s}".format("calls/s"))
+    for func, at in GATHERS:
+        rates = [bench_gather(func, grid, values_at[at]) for grid in grids]
+        print("{0:>24s} {1:12.1f} {2:12.1f}".format(func.__name__, *rates))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark local time steps and wet links of the OverlandFlow component.
+
+A synthetic flash flood: a pulse of water is released at the head of a
+narrow channel cut into a large, dry hillslope, and drains out of the bottom
+of the grid. The deep water in the channel sets a short global time step,
+which with local time steps is used only near the channel. With a
+*wet_threshold*, flow is calculated only near the channel.
+
+Run from the command line to print, for each *time_step_levels* and for a
+*wet_threshold*, the time taken to simulate the flood, and the largest
+difference in water depth from the run with global time steps over the whole
+grid::
+
+    $ python benchmark_local_time_steps.py
+"""
+import time
+
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.components import OverlandFlow
+
+
+def make_flash_flood(shape, **kwds):
+    """OverlandFlow of a pulse of water down a channel on a dry hillslope."""
+    grid = RasterModelGrid(shape, spacing=10.)
+    z = grid.add_field(
+        "topographic__elevation",
+        0.001 * grid.y_of_node + 0.001 * np.abs(grid.x_of_node -
+                                               grid.x_of_node.mean()),
+        at="node",
+    )
+    h = grid.add_zeros("surface_water__depth", at="node")
+
+    channel = np.abs(grid.x_of_node - grid.x_of_node.mean()) < 15.
+    z[channel] -= 2.
+    h[channel & (grid.y_of_node > 0.8 * grid.y_of_node.max())] = 2.
+
+    grid.set_closed_boundaries_at_grid_edges(True, True, True, False)
+    return OverlandFlow(grid, steep_slopes=True, **kwds)
+
+
+def bench_flash_flood(shape, duration=600., **kwds):
+    """Seconds to simulate *duration* seconds of the flood, and the depths."""
+    of = make_flash_flood(shape, **kwds)
+    of.set_up_neighbor_arrays()
+    start = time.time()
+    of.run_one_step(dt=duration)
+    return time.time() - start, of.grid.at_node["surface_water__depth"]
+
+
+def main(shape=(500, 500), levels=(1, 2, 3, 4), wet_threshold=1.e-4):
+    print(
+        "{0:>12s} {1:>12s} {2:>12s}".format("levels", "seconds", "max |dh|")
+    )
+    elapsed, expected = bench_flash_flood(shape, preallocate=True)
+    print("{0:>12s} {1:12.2f} {2:12.2g}".format("global", elapsed, 0.))
+    for n_levels in levels:
+        elapsed, actual = bench_flash_flood(shape, time_step_levels=n_levels)
+        print(
+            "{0:12d} {1:12.2f} {2:12.2g}".format(
+                n_levels, elapsed, np.abs(actual - expected).max()
+            )
+        )
+    elapsed, actual = bench_flash_flood(shape, wet_threshold=wet_threshold)
+    print(
+        "{0:>12s} {1:12.2f} {2:12.2g}".format(
+            "wet", elapsed, np.abs(actual - expected).max()
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark the grid mapping functions.
+
+Run from the command line to print, for each mapper, the number of calls
+per second with numpy, with the compiled kernels, and with the compiled
+kernels on *num_threads* threads::
+
+    $ python benchmark_mappers.py
+"""
+import time
+
+import numpy as np
+
+from landlab import RasterModelGrid
+import landlab.grid.mappers as maps
+import landlab.grid.raster_mappers as raster_maps
+
+
+AT_NODE = (
+    (maps, 'map_link_head_node_to_link', 'link'),
+    (maps, 'map_min_of_link_nodes_to_link', 'link'),
+    (maps, 'map_max_of_link_nodes_to_link', 'link'),
+    (maps, 'map_mean_of_link_nodes_to_link', 'link'),
+    (maps, 'map_node_to_cell', 'cell'),
+    (maps, 'map_mean_of_patch_nodes_to_patch', 'patch'),
+    (maps, 'map_max_of_patch_nodes_to_patch', 'patch'),
+)
+AT_LINK = (
+    (maps, 'map_max_of_node_links_to_node', 'node'),
+    (maps, 'map_upwind_node_link_max_to_node', 'node'),
+    (maps, 'map_downwind_node_link_mean_to_node', 'node'),
+    (raster_maps, 'map_sum_of_inlinks_to_node', 'node'),
+    (raster_maps, 'map_mean_of_links_to_node', 'node'),
+    (raster_maps, 'map_mean_of_horizontal_active_links_to_node', 'node'),
+)
+
+
+def bench_mapper(module, name, grid, values, out, n_calls=10,
+                 use_kernels=True):
+    """Calls per second of a mapper."""
+    func = getattr(module, name)
+    can_use_kernel = module._can_use_kernel
+    if not use_kernels:
+        module._can_use_kernel = lambda *args: False
+    try:
+        func(grid, values, out=out)
+        start = time.time()
+        for _ in range(n_calls):
+            func(grid, values, out=out)
+        elapsed = time.time() - start
+    finally:
+        module._can_use_kernel = can_use_kernel
+    return n_calls / elapsed
+
+
+def main(shape=(1000, 1000), num_threads=4):
+    grid = RasterModelGrid(shape)
+    values_at = {
+        'node': np.random.rand(grid.number_of_nodes),
+        'link': np.random.rand(grid.number_of_links) - 0.5,
+    }
+
+    print(
+        "{0:>44s} {1:>12s} {2:>12s} {3:>12s}".format(
+            "calls/s", "numpy", "compiled",
+            "{0} threads".format(num_threads)
+        )
+    )
+    for at, mappers in (('node', AT_NODE), ('link', AT_LINK)):
+        for module, name, to in mappers:
+            out = np.empty(grid.number_of_elements(to))
+            rates = [
+                bench_mapper(module, name, grid, values_at[at], out,
+                             use_kernels=False),
+                bench_mapper(module, name, grid, values_at[at], out),
+            ]
+            maps.set_num_threads(num_threads)
+            try:
+                rates.append(
+                    bench_mapper(module, name, grid, values_at[at], out))
+            finally:
+                maps.set_num_threads(1)
+            print("{0:>44s} {1:12.1f} {2:12.1f} {3:12.1f}".format(
+                name, *rates))
+
+
+if __name__ == "__main__":
+    main()
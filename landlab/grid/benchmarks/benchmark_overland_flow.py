@@ -0,0 +1,77 @@
+"""Benchmark the time step loop of the OverlandFlow component.
+
+Run from the command line to print, for each grid size, the number of
+de Almeida sub-steps run per second by OverlandFlow with and without
+*preallocate*, and with compiled kernels on *num_threads* threads, and the
+peak memory allocated by numpy during a sub-step::
+
+    $ python benchmark_overland_flow.py
+
+Pass larger sizes to *main* (a 2000 x 2000 grid needs several GB of memory
+for the grid itself).
+"""
+import time
+import tracemalloc
+
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.components import OverlandFlow
+
+
+def make_overland_flow(shape, **kwds):
+    """OverlandFlow over a gently sloping, slightly bumpy plane."""
+    grid = RasterModelGrid(shape, spacing=10.)
+    grid.add_field(
+        "topographic__elevation",
+        0.001 * grid.y_of_node + 0.001 * np.random.rand(grid.number_of_nodes),
+        at="node",
+    )
+    grid.add_field(
+        "surface_water__depth", np.full(grid.number_of_nodes, 0.01), at="node"
+    )
+    grid.set_closed_boundaries_at_grid_edges(True, True, True, False)
+    return OverlandFlow(grid, rainfall_intensity=1.e-5, **kwds)
+
+
+def bench_sub_steps(shape, n_steps=10, **kwds):
+    """Sub-steps per second, and peak MB allocated in one sub-step."""
+    of = make_overland_flow(shape, **kwds)
+    of.overland_flow()
+
+    tracemalloc.start()
+    of.overland_flow()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.time()
+    for _ in range(n_steps):
+        of.overland_flow()
+    return n_steps / (time.time() - start), peak / 2. ** 20
+
+
+def main(sizes=(250, 500, 1000), num_threads=4):
+    print(
+        "{0:>12s} {1:>12s} {2:>12s} {3:>12s} {4:>12s} {5:>12s}".format(
+            "n_nodes", "steps/s", "MB/step", "prealloc", "MB/step",
+            "{0} threads".format(num_threads)
+        )
+    )
+    for size in sizes:
+        n_steps = max(2, 2000000 // (size * size))
+        rate, peak = bench_sub_steps((size, size), n_steps=n_steps)
+        fast_rate, fast_peak = bench_sub_steps(
+            (size, size), n_steps=n_steps, preallocate=True
+        )
+        threaded_rate, _ = bench_sub_steps(
+            (size, size), n_steps=n_steps, num_threads=num_threads
+        )
+        print(
+            "{0:12d} {1:12.2f} {2:12.1f} {3:12.2f} {4:12.1f} {5:12.2f}".format(
+                size * size, rate, peak, fast_rate, fast_peak, threaded_rate
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -10,10 +10,14 @@ ctypedef np.intp_t DTYPE_INTP_t
 DTYPE_FLOAT = np.double
 ctypedef np.double_t DTYPE_FLOAT_t
 
+ctypedef fused id_t:
+    int
+    long
+
 
 @cython.boundscheck(False)
-def find_rows_containing_ID(np.ndarray[DTYPE_INT_t, ndim=2] input_array,
-                            np.ndarray[DTYPE_INT_t, ndim=2] out):
+def find_rows_containing_ID(np.ndarray[id_t, ndim=2] input_array,
+                            np.ndarray[id_t, ndim=2] out):
     """
     Record the row in which ID appears in in_array, indexed by ID.
 
@@ -28,23 +32,23 @@ def find_rows_containing_ID(np.ndarray[DTYPE_INT_t, ndim=2] input_array,
     """
     cdef int nrows = out.shape[0]
     cdef int i
-    cdef np.ndarray[DTYPE_INT_t, ndim=2] contains_ID = np.empty_like(
+    cdef np.ndarray[id_t, ndim=2] contains_ID = np.empty_like(
         input_array)
 
     for i in range(nrows):
-        contains_ID = np.equal(input_array, i).astype(int)
+        contains_ID = np.equal(input_array, i).astype(input_array.dtype)
         out[i, :] = contains_ID.sum(axis=1)
 
 
 @cython.boundscheck(False)
 def create_patches_at_element(
-        np.ndarray[DTYPE_INT_t, ndim=2] elements_at_patch,
-        int number_of_elements, np.ndarray[DTYPE_INT_t, ndim=2] out):
+        np.ndarray[id_t, ndim=2] elements_at_patch,
+        int number_of_elements, np.ndarray[id_t, ndim=2] out):
     """
     """
     cdef int i
-    cdef np.ndarray[DTYPE_INT_t, ndim=2] element_with_value = np.empty_like(
-        (elements_at_patch), dtype=int)
+    cdef np.ndarray[id_t, ndim=2] element_with_value = np.empty_like(
+        elements_at_patch)
     cdef np.ndarray[DTYPE_INTP_t, ndim=1] patches_with_element
     cdef int num_elements_here
 
@@ -56,19 +60,20 @@ def create_patches_at_element(
 
 
 @cython.boundscheck(False)
-def create_links_at_patch(np.ndarray[DTYPE_INT_t, ndim=2] nodes_at_patch,
-                          np.ndarray[DTYPE_INT_t, ndim=2] links_at_node,
+def create_links_at_patch(np.ndarray[id_t, ndim=2] nodes_at_patch,
+                          np.ndarray[id_t, ndim=2] links_at_node,
                           int number_of_patches,
-                          np.ndarray[DTYPE_INT_t, ndim=2] out):
+                          np.ndarray[id_t, ndim=2] out):
 
     cdef int i
-    cdef np.ndarray[DTYPE_INT_t, ndim=1] nodes_on_patch = np.empty(
-        nodes_at_patch.shape[1], dtype=int)
-    cdef np.ndarray[DTYPE_INT_t, ndim=2] links_at_patch_nodes = np.empty(
-        (nodes_at_patch.shape[1], links_at_node.shape[1]), dtype=int)
-    cdef np.ndarray[DTYPE_INT_t, ndim=1] vals
+    cdef np.ndarray[id_t, ndim=1] nodes_on_patch = np.empty(
+        nodes_at_patch.shape[1], dtype=nodes_at_patch.dtype)
+    cdef np.ndarray[id_t, ndim=2] links_at_patch_nodes = np.empty(
+        (nodes_at_patch.shape[1], links_at_node.shape[1]),
+        dtype=links_at_node.dtype)
+    cdef np.ndarray[id_t, ndim=1] vals
     cdef np.ndarray[DTYPE_INTP_t, ndim=1] counts
-    cdef np.ndarray[DTYPE_INT_t, ndim=1] duplicated_vals
+    cdef np.ndarray[id_t, ndim=1] duplicated_vals
 
     for i in range(number_of_patches):
         nodes_on_patch = nodes_at_patch[i, :]
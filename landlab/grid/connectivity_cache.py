@@ -0,0 +1,118 @@
+"""Memory-bounded cache for grid connectivity arrays.
+
+Connectivity cache
+++++++++++++++++++
+
+.. autosummary::
+    :toctree: generated/
+
+    ~landlab.grid.connectivity_cache.ConnectivityCache
+"""
+from collections import OrderedDict
+
+
+class ConnectivityCache(object):
+
+    """Hold connectivity arrays, evicting the least recently used.
+
+    Arrays are kept until the memory they use exceeds *max_bytes*, at
+    which point the arrays that have gone unused the longest are dropped.
+    A dropped array is simply recalculated the next time it is needed.
+
+    Parameters
+    ----------
+    max_bytes : int, optional
+        Memory limit, in bytes, of the cached arrays. If ``None``, there
+        is no limit.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.grid.connectivity_cache import ConnectivityCache
+    >>> cache = ConnectivityCache(max_bytes=200)
+    >>> cache.add('a', np.zeros(10))
+    >>> cache.add('b', np.zeros(10))
+    >>> sorted(cache.keys()), cache.nbytes
+    (['a', 'b'], 160)
+
+    Using *a* makes *b* the least recently used array, and so *b* is
+    evicted to make room for *c*.
+
+    >>> _ = cache['a']
+    >>> cache.add('c', np.zeros(10))
+    >>> sorted(cache.keys()), cache.nbytes
+    (['a', 'c'], 160)
+
+    Arrays larger than the limit are never kept.
+
+    >>> cache.add('d', np.zeros(100))
+    >>> 'd' in cache
+    False
+    """
+
+    def __init__(self, max_bytes=None):
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError('max_bytes must be non-negative')
+        self._max_bytes = max_bytes
+        self._arrays = OrderedDict()
+        self._nbytes = 0
+
+    @property
+    def max_bytes(self):
+        """Memory limit of the cache, in bytes."""
+        return self._max_bytes
+
+    @property
+    def nbytes(self):
+        """Memory used by the cached arrays, in bytes."""
+        return self._nbytes
+
+    def keys(self):
+        """Names of the cached arrays, from least to most recently used."""
+        return list(self._arrays.keys())
+
+    def items(self):
+        """Names and cached arrays, from least to most recently used."""
+        return list(self._arrays.items())
+
+    def __len__(self):
+        return len(self._arrays)
+
+    def __contains__(self, name):
+        return name in self._arrays
+
+    def __getitem__(self, name):
+        array = self._arrays.pop(name)
+        self._arrays[name] = array
+        return array
+
+    def add(self, name, array):
+        """Add an array to the cache, evicting others to make room.
+
+        Parameters
+        ----------
+        name : str
+            Name of the array.
+        array : ndarray
+            The array to cache.
+        """
+        self.remove(name)
+        if self._max_bytes is not None:
+            if array.nbytes > self._max_bytes:
+                return
+            while self._nbytes + array.nbytes > self._max_bytes:
+                self._nbytes -= self._arrays.popitem(last=False)[1].nbytes
+        self._arrays[name] = array
+        self._nbytes += array.nbytes
+
+    def remove(self, name):
+        """Remove an array from the cache, if it is there."""
+        try:
+            self._nbytes -= self._arrays.pop(name).nbytes
+        except KeyError:
+            pass
+
+    def clear(self):
+        """Remove all arrays from the cache."""
+        self._arrays.clear()
+        self._nbytes = 0
@@ -6,6 +6,7 @@ Grid decorators
 .. autosummary::
     :toctree: generated/
 
+    ~landlab.grid.decorators.cache_connectivity
     ~landlab.grid.decorators.override_array_setitem_and_reset
     ~landlab.grid.decorators.return_id_array
     ~landlab.grid.decorators.return_readonly_id_array
@@ -17,6 +18,30 @@ import numpy as np
 from ..core.utils import as_id_array
 
 
+def _ids_of_index(ind):
+    """Get the IDs of an integer index, or None for any other index.
+
+    Examples
+    --------
+    >>> from landlab.grid.decorators import _ids_of_index
+    >>> _ids_of_index(3)
+    array([3])
+    >>> _ids_of_index([4, 1])
+    array([4, 1])
+    >>> _ids_of_index(slice(2, 4)) is None
+    True
+    >>> _ids_of_index([True, False]) is None
+    True
+    """
+    if isinstance(ind, (int, np.integer)) and not isinstance(ind, bool):
+        return np.array([ind])
+    elif isinstance(ind, (list, np.ndarray)):
+        ind = np.asarray(ind)
+        if ind.dtype.kind in 'iu':
+            return ind
+    return None
+
+
 class override_array_setitem_and_reset(object):
 
     """Decorator that calls a grid method after setting array values.
@@ -31,7 +56,8 @@ class override_array_setitem_and_reset(object):
     ----------
     reset : str
         The name of the grid method to call after setting values. The
-        corresponding method must take no arguments.
+        corresponding method must take one optional argument; if values are
+        set with integer IDs, these are passed to it.
     """
 
     def __init__(self, reset):
@@ -41,7 +67,8 @@ class override_array_setitem_and_reset(object):
         ----------
         reset : str
             The name of the grid method to call after setting values. The
-            corresponding method must take no arguments.
+            corresponding method must take one optional argument; if values
+            are set with integer IDs, these are passed to it.
         """
         self._reset = reset
 
@@ -84,7 +111,11 @@ class override_array_setitem_and_reset(object):
                 def __setitem__(self, ind, value):
                     """Set value of array, then call reset function."""
                     np.ndarray.__setitem__(self, ind, value)
-                    getattr(self.grid, reset)()
+                    ids = _ids_of_index(ind)
+                    if ids is None:
+                        getattr(self.grid, reset)()
+                    else:
+                        getattr(self.grid, reset)(ids)
 
                 def __setslice__(self, start, stop, value):
                     """Set values of array, then call reset function."""
@@ -99,6 +130,14 @@ class override_array_setitem_and_reset(object):
         return _wrapped
 
 
+def _as_index_array(grid, array):
+    """Convert an array to an array of ids of the grid's index dtype."""
+    if grid.index_dtype == np.int:
+        return as_id_array(array)
+    else:
+        return np.asarray(array).astype(grid.index_dtype, copy=False)
+
+
 def return_id_array(func):
     """Decorate a function to return an array of ids.
 
@@ -110,12 +149,13 @@ def return_id_array(func):
     Returns
     -------
     func
-        A wrapped function that returns an id array.
+        A wrapped function that returns an id array of the grid's
+        index dtype.
     """
     @wraps(func)
     def _wrapped(self, *args, **kwds):
         """Create a function that returns an id array."""
-        return as_id_array(func(self, *args, **kwds))
+        return _as_index_array(self, func(self, *args, **kwds))
     return _wrapped
 
 
@@ -130,12 +170,13 @@ def return_readonly_id_array(func):
     Returns
     -------
     func
-        A wrapped function that returns an id array.
+        A wrapped function that returns a read-only id array of the
+        grid's index dtype.
     """
     @wraps(func)
     def _wrapped(self, *args, **kwds):
         """Create a function that returns an id array."""
-        id_array = as_id_array(func(self, *args, **kwds))
+        id_array = _as_index_array(self, func(self, *args, **kwds))
         try:
             immutable_array = id_array.view()
             immutable_array.flags.writeable = False
@@ -144,3 +185,64 @@ def return_readonly_id_array(func):
         else:
             return immutable_array
     return _wrapped
+
+
+def cache_connectivity(func):
+    """Decorate a grid method to cache the connectivity array it returns.
+
+    If the grid has a :class:`~landlab.grid.connectivity_cache.ConnectivityCache`
+    (its *_connectivity_cache* attribute), the array is kept there and
+    is recalculated if it has since been evicted. Otherwise the array is
+    stored as an attribute of the grid, with the name of the method
+    prefixed with an underscore.
+
+    Parameters
+    ----------
+    func : function
+        A grid method that returns a connectivity array.
+
+    Returns
+    -------
+    func
+        A wrapped function that caches its result.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.grid.connectivity_cache import ConnectivityCache
+    >>> from landlab.grid.decorators import cache_connectivity
+
+    >>> class Grid(object):
+    ...     _connectivity_cache = None
+    ...     @cache_connectivity
+    ...     def ids(self):
+    ...         return np.arange(4)
+    >>> grid = Grid()
+    >>> grid.ids() is grid._ids
+    True
+
+    >>> grid = Grid()
+    >>> grid._connectivity_cache = ConnectivityCache(max_bytes=1024)
+    >>> grid.ids() is grid._connectivity_cache['_ids']
+    True
+    >>> hasattr(grid, '_ids')
+    False
+    """
+    name = '_' + func.__name__
+
+    @wraps(func)
+    def _wrapped(self):
+        cache = self._connectivity_cache
+        if cache is None:
+            try:
+                return self.__dict__[name]
+            except KeyError:
+                array = self.__dict__[name] = func(self)
+                return array
+        try:
+            return cache[name]
+        except KeyError:
+            array = func(self)
+            cache.add(name, array)
+            return array
+    return _wrapped
@@ -9,7 +9,8 @@ from .linkstatus import (is_fixed_link, is_inactive_link, is_active_link,
                          set_status_at_link)
 from ..utils.decorators import (cache_result_in_object,
                                 make_return_array_immutable)
-from .decorators import return_readonly_id_array
+from .decorators import cache_connectivity, return_readonly_id_array
+from .base import _patch_sorted_ids
 
 
 def create_nodes_at_diagonal(shape, out=None):
@@ -156,6 +157,13 @@ def create_diagonal_dirs_at_node(shape, out=None):
     return out
 
 
+def _read_only(array):
+    """A read-only view of an array."""
+    array = array.view()
+    array.flags.writeable = False
+    return array
+
+
 class DiagonalsMixIn(object):
 
     """Add diagonals to a structured quad grid."""
@@ -175,7 +183,7 @@ class DiagonalsMixIn(object):
         return 2 * np.prod(np.asarray(self.shape) - 1)
 
     @property
-    @cache_result_in_object()
+    @cache_connectivity
     @make_return_array_immutable
     def diagonals_at_node(self):
         """Diagonals attached to nodes.
@@ -199,10 +207,12 @@ class DiagonalsMixIn(object):
 
         LLCATS: NINF LINF CONN
         """
-        return create_diagonals_at_node(self.shape)
+        return create_diagonals_at_node(
+            self.shape, out=np.empty((self.number_of_nodes, 4),
+                                     dtype=self.index_dtype))
 
     @property
-    @cache_result_in_object()
+    @cache_connectivity
     @make_return_array_immutable
     def diagonal_dirs_at_node(self):
         """Directions of diagonals attached to nodes.
@@ -246,7 +256,7 @@ class DiagonalsMixIn(object):
         return dirs_at_node
 
     @property
-    @cache_result_in_object()
+    @cache_connectivity
     @make_return_array_immutable
     def diagonal_adjacent_nodes_at_node(self):
         """Get adjacent nodes along diagonals.
@@ -274,14 +284,14 @@ class DiagonalsMixIn(object):
         return out
 
     @property
-    @cache_result_in_object()
+    @cache_connectivity
     @make_return_array_immutable
     def d8_adjacent_nodes_at_node(self):
         return np.vstack((super(DiagonalsMixIn, self).adjacent_nodes_at_node,
                           self.diagonal_adjacent_nodes_at_node))
 
     @property
-    @cache_result_in_object()
+    @cache_connectivity
     @make_return_array_immutable
     def nodes_at_diagonal(self):
         """Nodes at diagonal tail and head.
@@ -307,7 +317,9 @@ class DiagonalsMixIn(object):
         >>> grid.diagonal_dirs_at_node[3]
         array([-1,  0,  0,  1], dtype=int8)
         """
-        return create_nodes_at_diagonal(self.shape)
+        return create_nodes_at_diagonal(
+            self.shape, out=np.empty((self.number_of_diagonals, 2),
+                                     dtype=self.index_dtype))
 
     @property
     @cache_result_in_object()
@@ -325,13 +337,13 @@ class DiagonalsMixIn(object):
                 self.number_of_diagonals)
 
     @property
-    @cache_result_in_object()
+    @cache_connectivity
     @make_return_array_immutable
     def nodes_at_d8(self):
         return np.vstack((self.nodes_at_link, self.nodes_at_diagonal))
 
     @property
-    @cache_result_in_object()
+    @cache_connectivity
     @make_return_array_immutable
     def d8s_at_node(self):
         """Links and diagonals attached to nodes.
@@ -374,15 +386,15 @@ class DiagonalsMixIn(object):
         """
         diagonals_at_node = self.diagonals_at_node.copy()
         diagonals_at_node[diagonals_at_node >= 0] += self.number_of_links
-        return np.hstack((super(DiagonalsMixIn, self).links_at_node,
+        return np.hstack((self.links_at_node,
                           diagonals_at_node))
                           # self.diagonals_at_node + self.number_of_links))
 
     @property
-    @cache_result_in_object()
+    @cache_connectivity
     @make_return_array_immutable
     def d8_dirs_at_node(self):
-        return np.hstack((super(DiagonalsMixIn, self).link_dirs_at_node,
+        return np.hstack((self.link_dirs_at_node,
                           self.diagonal_dirs_at_node))
 
     @property
@@ -392,7 +404,7 @@ class DiagonalsMixIn(object):
         return self.status_at_d8[self.d8s_at_node]
 
     @property
-    @cache_result_in_object()
+    @cache_connectivity
     @make_return_array_immutable
     def length_of_diagonal(self):
         return np.sqrt(
@@ -400,7 +412,7 @@ class DiagonalsMixIn(object):
                      2.).sum(axis=2)).flatten()
 
     @property
-    @cache_result_in_object()
+    @cache_connectivity
     @make_return_array_immutable
     def length_of_d8(self):
         """Length of links and diagonals.
@@ -432,17 +444,78 @@ class DiagonalsMixIn(object):
         return np.hstack((super(DiagonalsMixIn, self).length_of_link,
                           self.length_of_diagonal))
 
-    def reset_status_at_node(self):
-        super(DiagonalsMixIn, self).reset_status_at_node()
-        attrs = ['_status_at_diagonal', '_diagonal_status_at_node',
-                 '_active_diagonals', '_active_diagonal_dirs_at_node',
-                 '_status_at_d8', '_active_d8', '_active_d8_dirs_at_node']
-
-        for attr in attrs:
-            try:
-                del self.__dict__[attr]
-            except KeyError:
-                pass
+    _DIAGONAL_STATUS_ATTRS = (
+        '_status_at_diagonal', '_diagonal_status_at_node',
+        '_active_diagonals', '_active_diagonal_dirs_at_node',
+        '_status_at_d8', '_active_d8', '_active_d8_dirs_at_node')
+
+    def _reset_status_at_all_nodes(self):
+        super(DiagonalsMixIn, self)._reset_status_at_all_nodes()
+        for attr in self._DIAGONAL_STATUS_ATTRS:
+            self.__dict__.pop(attr, None)
+
+    def _update_status_at_nodes(self, nodes):
+        """Patch cached status arrays after the status of *nodes* changed.
+
+        As for links, only the diagonals of *nodes*, and the nodes at
+        either end of them, are visited. The cached arrays are read-only
+        views, and are patched through the arrays they view.
+        """
+        super(DiagonalsMixIn, self)._update_status_at_nodes(nodes)
+
+        cache = self.__dict__
+        if '_status_at_diagonal' not in cache:
+            for attr in self._DIAGONAL_STATUS_ATTRS:
+                cache.pop(attr, None)
+            return
+
+        diagonals = np.unique(self.diagonals_at_node[nodes])
+        diagonals = diagonals[diagonals != -1]
+        links = np.unique(self.links_at_node[nodes])
+        links = links[links != -1]
+
+        status_at_diagonal = cache['_status_at_diagonal'].base
+        status_at_diagonal[diagonals] = set_status_at_link(
+            self.status_at_node[self.nodes_at_diagonal[diagonals]])
+
+        if '_active_diagonals' in cache:
+            cache['_active_diagonals'] = _read_only(_patch_sorted_ids(
+                cache['_active_diagonals'], diagonals,
+                status_at_diagonal[diagonals] == ACTIVE_LINK))
+
+        if '_status_at_d8' in cache:
+            d8s = np.concatenate((links, diagonals + self.number_of_links))
+            status_at_d8 = cache['_status_at_d8'].base
+            status_at_d8[links] = self.status_at_link[links]
+            status_at_d8[d8s[len(links):]] = status_at_diagonal[diagonals]
+            if '_active_d8' in cache:
+                cache['_active_d8'] = _read_only(_patch_sorted_ids(
+                    cache['_active_d8'], d8s,
+                    status_at_d8[d8s] == ACTIVE_LINK))
+        else:
+            for attr in ('_active_d8', '_active_d8_dirs_at_node'):
+                cache.pop(attr, None)
+
+        if diagonals.size and diagonals[-1] == self.number_of_diagonals - 1:
+            # Missing diagonals (-1) take the status of the last diagonal
+            for attr in ('_diagonal_status_at_node',
+                         '_active_diagonal_dirs_at_node',
+                         '_active_d8_dirs_at_node'):
+                cache.pop(attr, None)
+
+        rows = np.unique(self.nodes_at_diagonal[diagonals])
+        if '_diagonal_status_at_node' in cache:
+            cache['_diagonal_status_at_node'].base[rows] = status_at_diagonal[
+                self.diagonals_at_node[rows]]
+        if '_active_diagonal_dirs_at_node' in cache:
+            cache['_active_diagonal_dirs_at_node'].base[rows] = np.choose(
+                self.diagonal_status_at_node[rows] == ACTIVE_LINK,
+                (0, self.diagonal_dirs_at_node[rows]))
+        if '_active_d8_dirs_at_node' in cache:
+            rows = np.union1d(rows, self.nodes_at_link[links])
+            cache['_active_d8_dirs_at_node'].base[rows] = np.choose(
+                self.status_at_d8[self.d8s_at_node[rows]] == ACTIVE_LINK,
+                (0, self.d8_dirs_at_node[rows]))
 
     @property
     @cache_result_in_object()
@@ -0,0 +1,446 @@
+"""Compiled kernels for the grid mapping functions.
+
+Each kernel writes its result straight into *out*, without intermediate
+arrays, and loops over the elements of *out* on up to ``get_num_threads()``
+threads. IDs of -1 in the connectivity arrays index from the end of the
+value arrays, as they do with numpy fancy indexing, unless noted otherwise.
+"""
+import numpy as np
+cimport numpy as np
+cimport cython
+
+from cython.parallel cimport prange
+from libc.math cimport cos, sin, fabs
+from libc.float cimport DBL_MAX
+
+
+ctypedef fused id_t:
+    int
+    long
+
+
+cdef int _num_threads = 1
+
+
+def get_num_threads():
+    """Number of threads the mapper kernels run on."""
+    return _num_threads
+
+
+def set_num_threads(num_threads):
+    """Set the number of threads the mapper kernels run on.
+
+    Parameters
+    ----------
+    num_threads : int
+        Number of threads. Must be at least 1.
+    """
+    global _num_threads
+    if num_threads < 1:
+        raise ValueError('number of threads must be at least 1')
+    _num_threads = num_threads
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def map_gather(const double [:] values, const id_t [:] ids, double [:] out):
+    """Values at *ids*."""
+    cdef long n = out.shape[0]
+    cdef long n_values = values.shape[0]
+    cdef long i, id_
+
+    for i in prange(n, nogil=True, schedule='static', num_threads=_num_threads):
+        id_ = ids[i]
+        if id_ < 0:
+            id_ = id_ + n_values
+        out[i] = values[id_]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def map_min_of_link_nodes(const double [:] values, const id_t [:] head,
+                          const id_t [:] tail, double [:] out):
+    """Smaller of the values at the head and tail of each link."""
+    cdef long n_links = out.shape[0]
+    cdef long i
+    cdef double at_head, at_tail
+
+    for i in prange(n_links, nogil=True, schedule='static',
+                    num_threads=_num_threads):
+        at_head = values[head[i]]
+        at_tail = values[tail[i]]
+        if at_tail < at_head:
+            out[i] = at_tail
+        else:
+            out[i] = at_head
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def map_max_of_link_nodes(const double [:] values, const id_t [:] head,
+                          const id_t [:] tail, double [:] out):
+    """Larger of the values at the head and tail of each link."""
+    cdef long n_links = out.shape[0]
+    cdef long i
+    cdef double at_head, at_tail
+
+    for i in prange(n_links, nogil=True, schedule='static',
+                    num_threads=_num_threads):
+        at_head = values[head[i]]
+        at_tail = values[tail[i]]
+        if at_tail > at_head:
+            out[i] = at_tail
+        else:
+            out[i] = at_head
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def map_mean_of_link_nodes(const double [:] values, const id_t [:] head,
+                           const id_t [:] tail, double [:] out):
+    """Mean of the values at the head and tail of each link."""
+    cdef long n_links = out.shape[0]
+    cdef long i
+
+    for i in prange(n_links, nogil=True, schedule='static',
+                    num_threads=_num_threads):
+        out[i] = 0.5 * (values[head[i]] + values[tail[i]])
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def map_value_at_min_or_max_node(const double [:] control,
+                                 const double [:] values,
+                                 const id_t [:] head, const id_t [:] tail,
+                                 int use_max, double [:] out):
+    """Value at the node of each link with the smaller (or larger) control.
+
+    The head node is used where the controls are equal.
+    """
+    cdef long n_links = out.shape[0]
+    cdef long i
+    cdef double at_head, at_tail
+    cdef int use_tail
+
+    for i in prange(n_links, nogil=True, schedule='static',
+                    num_threads=_num_threads):
+        at_head = control[head[i]]
+        at_tail = control[tail[i]]
+        if use_max:
+            use_tail = at_tail > at_head
+        else:
+            use_tail = at_tail < at_head
+        if use_tail:
+            out[i] = values[tail[i]]
+        else:
+            out[i] = values[head[i]]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def map_min_or_max_of_node_links(const double [:] values,
+                                 const id_t [:, :] links_at_node,
+                                 int use_max, double [:] out):
+    """Smallest (or largest) value of the links at each node.
+
+    Missing links, marked with -1, are ignored. Nodes without links are
+    given the largest (or most negative) float.
+    """
+    cdef long n_nodes = out.shape[0]
+    cdef long n_cols = links_at_node.shape[1]
+    cdef long node, col, link
+    cdef double extreme, value
+
+    for node in prange(n_nodes, nogil=True, schedule='static',
+                       num_threads=_num_threads):
+        if use_max:
+            extreme = -DBL_MAX
+        else:
+            extreme = DBL_MAX
+        for col in range(n_cols):
+            link = links_at_node[node, col]
+            if link == -1:
+                continue
+            value = values[link]
+            if use_max:
+                if value > extreme:
+                    extreme = value
+            else:
+                if value < extreme:
+                    extreme = value
+        out[node] = extreme
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def map_wind_node_link_max(const double [:] values,
+                           const id_t [:, :] links_at_node,
+                           const np.int8_t [:, :] link_dirs_at_node,
+                           int upwind, double [:] out):
+    """Largest magnitude of the links flowing into (or out of) each node.
+
+    Link values are multiplied by their direction at the node, which makes
+    flow into the node negative. For *upwind*, the result is the largest of
+    the negated products; otherwise the magnitude of the largest product.
+    """
+    cdef long n_nodes = out.shape[0]
+    cdef long n_links = values.shape[0]
+    cdef long n_cols = links_at_node.shape[1]
+    cdef long node, col, link
+    cdef double extreme, value
+
+    for node in prange(n_nodes, nogil=True, schedule='static',
+                       num_threads=_num_threads):
+        extreme = -DBL_MAX
+        for col in range(n_cols):
+            link = links_at_node[node, col]
+            if link < 0:
+                link = link + n_links
+            value = values[link] * link_dirs_at_node[node, col]
+            if upwind:
+                value = -value
+            if value > extreme:
+                extreme = value
+        if upwind:
+            out[node] = extreme
+        else:
+            out[node] = fabs(extreme)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def map_wind_node_link_mean(const double [:] values,
+                            const id_t [:, :] links_at_node,
+                            const np.int8_t [:, :] link_dirs_at_node,
+                            int upwind, double [:] out):
+    """Mean magnitude of the links flowing into (or out of) each node.
+
+    Nodes without such links are given zero.
+    """
+    cdef long n_nodes = out.shape[0]
+    cdef long n_links = values.shape[0]
+    cdef long n_cols = links_at_node.shape[1]
+    cdef long node, col, link, count
+    cdef double total, value
+
+    for node in prange(n_nodes, nogil=True, schedule='static',
+                       num_threads=_num_threads):
+        total = 0.
+        count = 0
+        for col in range(n_cols):
+            link = links_at_node[node, col]
+            if link < 0:
+                link = link + n_links
+            value = values[link] * link_dirs_at_node[node, col]
+            if upwind:
+                value = -value
+            if value > 0.:
+                total = total + value
+                count = count + 1
+        if count > 0:
+            out[node] = total / count
+        else:
+            out[node] = 0.
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def map_value_at_wind_node_link_max(const double [:] control,
+                                    const double [:] values,
+                                    const id_t [:, :] links_at_node,
+                                    const np.int8_t [:, :] link_dirs_at_node,
+                                    int upwind, double [:] out):
+    """Value at the link flowing most strongly into (or out of) each node.
+
+    Nodes without such links are given zero.
+    """
+    cdef long n_nodes = out.shape[0]
+    cdef long n_links = control.shape[0]
+    cdef long n_cols = links_at_node.shape[1]
+    cdef long node, col, link, best_link
+    cdef double extreme, value
+
+    for node in prange(n_nodes, nogil=True, schedule='static',
+                       num_threads=_num_threads):
+        extreme = -DBL_MAX
+        best_link = -1
+        for col in range(n_cols):
+            link = links_at_node[node, col]
+            if link < 0:
+                link = link + n_links
+            value = control[link] * link_dirs_at_node[node, col]
+            if upwind:
+                value = -value
+            if best_link == -1 or value > extreme:
+                extreme = value
+                best_link = link
+        if extreme > 0.:
+            out[node] = values[best_link]
+        else:
+            out[node] = 0.
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def map_patch_nodes(const double [:] values, const id_t [:, :] nodes_at_patch,
+                    const np.uint8_t [:] status_at_node, int skip_status,
+                    int method, double [:] out):
+    """Mean (*method* 0), max (1) or min (2) of the nodes of each patch.
+
+    Nodes with a status of *skip_status* are ignored; patches with only
+    such nodes keep their value in *out*. Pass a *skip_status* of -1 to use
+    every node.
+    """
+    cdef long n_patches = out.shape[0]
+    cdef long n_nodes = values.shape[0]
+    cdef long n_cols = nodes_at_patch.shape[1]
+    cdef long patch, col, node, count
+    cdef double result, value
+
+    for patch in prange(n_patches, nogil=True, schedule='static',
+                        num_threads=_num_threads):
+        count = 0
+        result = 0.
+        for col in range(n_cols):
+            node = nodes_at_patch[patch, col]
+            if node < 0:
+                node = node + n_nodes
+            if status_at_node[node] == skip_status:
+                continue
+            value = values[node]
+            if count == 0:
+                result = value
+            elif method == 0:
+                result = result + value
+            elif method == 1:
+                if value > result:
+                    result = value
+            elif value < result:
+                result = value
+            count = count + 1
+        if count > 0:
+            if method == 0:
+                out[patch] = result / count
+            else:
+                out[patch] = result
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def map_link_vector_sum_to_patch(const double [:] values,
+                                 const id_t [:, :] links_at_patch,
+                                 const double [:] angle_of_link,
+                                 const np.uint8_t [:] status_at_link,
+                                 int skip_status,
+                                 double [:] x_out, double [:] y_out):
+    """Sum of the link vectors around each patch.
+
+    Links with a status of *skip_status* are ignored; patches with only
+    such links keep their values in *x_out* and *y_out*. Pass a
+    *skip_status* of -1 to use every link.
+    """
+    cdef long n_patches = x_out.shape[0]
+    cdef long n_links = values.shape[0]
+    cdef long n_cols = links_at_patch.shape[1]
+    cdef long patch, col, link, count
+    cdef double x_sum, y_sum
+
+    for patch in prange(n_patches, nogil=True, schedule='static',
+                        num_threads=_num_threads):
+        count = 0
+        x_sum = 0.
+        y_sum = 0.
+        for col in range(n_cols):
+            link = links_at_patch[patch, col]
+            if link < 0:
+                link = link + n_links
+            if status_at_link[link] == skip_status:
+                continue
+            x_sum = x_sum + values[link] * cos(angle_of_link[link])
+            y_sum = y_sum + values[link] * sin(angle_of_link[link])
+            count = count + 1
+        if count > 0:
+            x_out[patch] = x_sum
+            y_out[patch] = y_sum
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def map_pair_of_links_to_node(const double [:] values,
+                              const id_t [:, :] links_at_node,
+                              long first, long second, int method,
+                              double [:] out):
+    """Sum (*method* 0), mean (1), max (2) or min (3) of two links at nodes.
+
+    *first* and *second* are the columns of *links_at_node* to use. Missing
+    links, marked with -1, have a value of zero.
+    """
+    cdef long n_nodes = out.shape[0]
+    cdef long node, link
+    cdef double a, b
+
+    for node in prange(n_nodes, nogil=True, schedule='static',
+                       num_threads=_num_threads):
+        link = links_at_node[node, first]
+        if link == -1:
+            a = 0.
+        else:
+            a = values[link]
+        link = links_at_node[node, second]
+        if link == -1:
+            b = 0.
+        else:
+            b = values[link]
+
+        if method == 0:
+            out[node] = a + b
+        elif method == 1:
+            out[node] = 0.5 * (a + b)
+        elif method == 2:
+            if a > b:
+                out[node] = a
+            else:
+                out[node] = b
+        else:
+            if a < b:
+                out[node] = a
+            else:
+                out[node] = b
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def map_mean_of_links_to_node(const double [:] values,
+                              const id_t [:, :] links_at_node,
+                              const np.int8_t [:, :] link_dirs_at_node,
+                              const long [:] columns, int zero_if_none,
+                              double [:] out):
+    """Mean of the links at each node in the given *columns*.
+
+    Only links with a nonzero direction at the node are used. Nodes without
+    links are given zero if *zero_if_none*, and NaN otherwise.
+    """
+    cdef long n_nodes = out.shape[0]
+    cdef long n_cols = columns.shape[0]
+    cdef long node, i, col, count
+    cdef double total
+
+    for node in prange(n_nodes, nogil=True, schedule='static',
+                       num_threads=_num_threads):
+        total = 0.
+        count = 0
+        for i in range(n_cols):
+            col = columns[i]
+            if link_dirs_at_node[node, col] == 0:
+                continue
+            total = total + values[links_at_node[node, col]]
+            count = count + 1
+        if count > 0:
+            out[node] = total / count
+        elif zero_if_none:
+            out[node] = 0.
+        else:
+            out[node] = total / count
@@ -23,8 +23,16 @@ Grid mapping functions
     ~landlab.grid.mappers.map_downwind_node_link_mean_to_node
     ~landlab.grid.mappers.map_value_at_upwind_node_link_max_to_node
     ~landlab.grid.mappers.map_value_at_downwind_node_link_max_to_node
+    ~landlab.grid.mappers.map_mean_of_patch_nodes_to_patch
+    ~landlab.grid.mappers.map_max_of_patch_nodes_to_patch
+    ~landlab.grid.mappers.map_min_of_patch_nodes_to_patch
+    ~landlab.grid.mappers.map_link_vector_sum_to_patch
     ~landlab.grid.mappers.dummy_func_to_demonstrate_docstring_modification
 
+Where the values and *out* are float arrays, the mappers run compiled
+kernels that write straight into *out*. These kernels can run on several
+threads; set the number with `set_num_threads` (one, by default).
+
 Each link has a *tail* and *head* node. The *tail* nodes are located at the
 start of a link, while the head nodes are located at end of a link.
 
@@ -57,6 +65,57 @@ from __future__ import division
 
 import numpy as np
 from landlab.grid.base import BAD_INDEX_VALUE, CLOSED_BOUNDARY, INACTIVE_LINK
+from landlab.grid.ext import mappers as _ext
+from landlab.grid.ext.mappers import get_num_threads, set_num_threads
+
+
+__all__ = [
+    'map_link_head_node_to_link',
+    'map_link_tail_node_to_link',
+    'map_min_of_link_nodes_to_link',
+    'map_max_of_link_nodes_to_link',
+    'map_mean_of_link_nodes_to_link',
+    'map_value_at_min_node_to_link',
+    'map_value_at_max_node_to_link',
+    'map_node_to_cell',
+    'map_min_of_node_links_to_node',
+    'map_max_of_node_links_to_node',
+    'map_upwind_node_link_max_to_node',
+    'map_downwind_node_link_max_to_node',
+    'map_upwind_node_link_mean_to_node',
+    'map_downwind_node_link_mean_to_node',
+    'map_value_at_upwind_node_link_max_to_node',
+    'map_value_at_downwind_node_link_max_to_node',
+    'map_mean_of_patch_nodes_to_patch',
+    'map_max_of_patch_nodes_to_patch',
+    'map_min_of_patch_nodes_to_patch',
+    'map_link_vector_sum_to_patch',
+    'get_num_threads',
+    'set_num_threads',
+]
+
+
+def _is_float_vector(array, size):
+    """Check if *array* is a 1D array of *size* floats."""
+    return (isinstance(array, np.ndarray) and array.dtype == np.float64 and
+            array.shape == (size, ))
+
+
+def _can_use_kernel(out, size, *values):
+    """Check if a compiled kernel can map values into *out*.
+
+    Kernels need arrays of floats of the right sizes, and an *out* that can
+    be written to and does not overlap the values. *values* are pairs of an
+    array and its expected size.
+    """
+    if not (_is_float_vector(out, size) and out.flags.writeable):
+        return False
+    for array, size_of_array in values:
+        if not _is_float_vector(array, size_of_array):
+            return False
+        if np.may_share_memory(array, out):
+            return False
+    return True
 
 
 def map_link_head_node_to_link(grid, var_name, out=None):
@@ -111,7 +170,11 @@ def map_link_head_node_to_link(grid, var_name, out=None):
         var_name = grid.at_node[var_name]
     if out is None:
         out = grid.empty(at='link')
-    out[:] = var_name[grid.node_at_link_head]
+    if _can_use_kernel(out, grid.number_of_links,
+                       (var_name, grid.number_of_nodes)):
+        _ext.map_gather(var_name, grid.node_at_link_head, out)
+    else:
+        out[:] = var_name[grid.node_at_link_head]
 
     return out
 
@@ -170,7 +233,11 @@ def map_link_tail_node_to_link(grid, var_name, out=None):
 
     if type(var_name) is str:
         var_name = grid.at_node[var_name]
-    out[:] = var_name[grid.node_at_link_tail]
+    if _can_use_kernel(out, grid.number_of_links,
+                       (var_name, grid.number_of_nodes)):
+        _ext.map_gather(var_name, grid.node_at_link_tail, out)
+    else:
+        out[:] = var_name[grid.node_at_link_tail]
 
     return out
 
@@ -228,8 +295,13 @@ def map_min_of_link_nodes_to_link(grid, var_name, out=None):
 
     if type(var_name) is str:
         var_name = grid.at_node[var_name]
-    np.minimum(var_name[grid.node_at_link_head],
-               var_name[grid.node_at_link_tail], out=out)
+    if _can_use_kernel(out, grid.number_of_links,
+                       (var_name, grid.number_of_nodes)):
+        _ext.map_min_of_link_nodes(var_name, grid.node_at_link_head,
+                                   grid.node_at_link_tail, out)
+    else:
+        np.minimum(var_name[grid.node_at_link_head],
+                   var_name[grid.node_at_link_tail], out=out)
 
     return out
 
@@ -287,8 +359,13 @@ def map_max_of_link_nodes_to_link(grid, var_name, out=None):
 
     if type(var_name) is str:
         var_name = grid.at_node[var_name]
-    np.maximum(var_name[grid.node_at_link_head],
-               var_name[grid.node_at_link_tail], out=out)
+    if _can_use_kernel(out, grid.number_of_links,
+                       (var_name, grid.number_of_nodes)):
+        _ext.map_max_of_link_nodes(var_name, grid.node_at_link_head,
+                                   grid.node_at_link_tail, out)
+    else:
+        np.maximum(var_name[grid.node_at_link_head],
+                   var_name[grid.node_at_link_tail], out=out)
 
     return out
 
@@ -345,8 +422,13 @@ def map_mean_of_link_nodes_to_link(grid, var_name, out=None):
 
     if type(var_name) is str:
         var_name = grid.at_node[var_name]
-    out[:] = 0.5 * (var_name[grid.node_at_link_head] +
-                    var_name[grid.node_at_link_tail])
+    if _can_use_kernel(out, grid.number_of_links,
+                       (var_name, grid.number_of_nodes)):
+        _ext.map_mean_of_link_nodes(var_name, grid.node_at_link_head,
+                                    grid.node_at_link_tail, out)
+    else:
+        out[:] = 0.5 * (var_name[grid.node_at_link_head] +
+                        var_name[grid.node_at_link_tail])
 
     return out
 
@@ -408,6 +490,14 @@ def map_value_at_min_node_to_link(grid, control_name, value_name, out=None):
         control_name = grid.at_node[control_name]
     if type(value_name) is str:
         value_name = grid.at_node[value_name]
+    if _can_use_kernel(out, grid.number_of_links,
+                       (control_name, grid.number_of_nodes),
+                       (value_name, grid.number_of_nodes)):
+        _ext.map_value_at_min_or_max_node(
+            control_name, value_name, grid.node_at_link_head,
+            grid.node_at_link_tail, 0, out)
+        return out
+
     head_control = control_name[grid.node_at_link_head]
     tail_control = control_name[grid.node_at_link_tail]
     head_vals = value_name[grid.node_at_link_head]
@@ -474,6 +564,14 @@ def map_value_at_max_node_to_link(grid, control_name, value_name, out=None):
         control_name = grid.at_node[control_name]
     if type(value_name) is str:
         value_name = grid.at_node[value_name]
+    if _can_use_kernel(out, grid.number_of_links,
+                       (control_name, grid.number_of_nodes),
+                       (value_name, grid.number_of_nodes)):
+        _ext.map_value_at_min_or_max_node(
+            control_name, value_name, grid.node_at_link_head,
+            grid.node_at_link_tail, 1, out)
+        return out
+
     head_control = control_name[grid.node_at_link_head]
     tail_control = control_name[grid.node_at_link_tail]
     head_vals = value_name[grid.node_at_link_head]
@@ -531,7 +629,11 @@ def map_node_to_cell(grid, var_name, out=None):
 
     if type(var_name) is str:
         var_name = grid.at_node[var_name]
-    out[:] = var_name[grid.node_at_cell]
+    if _can_use_kernel(out, grid.number_of_cells,
+                       (var_name, grid.number_of_nodes)):
+        _ext.map_gather(var_name, grid.node_at_cell, out)
+    else:
+        out[:] = var_name[grid.node_at_cell]
 
     return out
 
@@ -586,6 +688,14 @@ def map_min_of_node_links_to_node(grid, var_name, out=None):
     if out is None:
         out = grid.empty(at='node')
 
+    if type(var_name) is str:
+        var_name = grid.at_link[var_name]
+    if _can_use_kernel(out, grid.number_of_nodes,
+                       (var_name, grid.number_of_links)):
+        _ext.map_min_or_max_of_node_links(var_name, grid.links_at_node, 0,
+                                          out)
+        return out
+
     values_at_linksX = np.empty(grid.number_of_links+1, dtype=float)
     values_at_linksX[-1] = np.finfo(dtype=float).max
     if type(var_name) is str:
@@ -647,6 +757,14 @@ def map_max_of_node_links_to_node(grid, var_name, out=None):
     if out is None:
         out = grid.empty(at='node')
 
+    if type(var_name) is str:
+        var_name = grid.at_link[var_name]
+    if _can_use_kernel(out, grid.number_of_nodes,
+                       (var_name, grid.number_of_links)):
+        _ext.map_min_or_max_of_node_links(var_name, grid.links_at_node, 1,
+                                          out)
+        return out
+
     values_at_linksX = np.empty(grid.number_of_links+1, dtype=float)
     values_at_linksX[-1] = np.finfo(dtype=float).min
     if type(var_name) is str:
@@ -718,6 +836,12 @@ def map_upwind_node_link_max_to_node(grid, var_name, out=None):
 
     if type(var_name) is str:
         var_name = grid.at_link[var_name]
+    if _can_use_kernel(out, grid.number_of_nodes,
+                       (var_name, grid.number_of_links)):
+        _ext.map_wind_node_link_max(var_name, grid.links_at_node,
+                                    grid.link_dirs_at_node, 1, out)
+        return out
+
     values_at_links = var_name[grid.links_at_node] * grid.link_dirs_at_node
     # this procedure makes incoming links NEGATIVE
     np.amax(-values_at_links, axis=1, out=out)
@@ -785,6 +909,12 @@ def map_downwind_node_link_max_to_node(grid, var_name, out=None):
 
     if type(var_name) is str:
         var_name = grid.at_link[var_name]
+    if _can_use_kernel(out, grid.number_of_nodes,
+                       (var_name, grid.number_of_links)):
+        _ext.map_wind_node_link_max(var_name, grid.links_at_node,
+                                    grid.link_dirs_at_node, 0, out)
+        return out
+
     values_at_links = var_name[grid.links_at_node] * grid.link_dirs_at_node
     # this procedure makes incoming links NEGATIVE
     steepest_links_at_node = np.amax(values_at_links, axis=1)
@@ -853,6 +983,12 @@ def map_upwind_node_link_mean_to_node(grid, var_name, out=None):
 
     if type(var_name) is str:
         var_name = grid.at_link[var_name]
+    if _can_use_kernel(out, grid.number_of_nodes,
+                       (var_name, grid.number_of_links)):
+        _ext.map_wind_node_link_mean(var_name, grid.links_at_node,
+                                     grid.link_dirs_at_node, 1, out)
+        return out
+
     values_at_links = var_name[grid.links_at_node] * grid.link_dirs_at_node
     # this procedure makes incoming links NEGATIVE
     vals_in_positive = -values_at_links
@@ -925,6 +1061,12 @@ def map_downwind_node_link_mean_to_node(grid, var_name, out=None):
 
     if type(var_name) is str:
         var_name = grid.at_link[var_name]
+    if _can_use_kernel(out, grid.number_of_nodes,
+                       (var_name, grid.number_of_links)):
+        _ext.map_wind_node_link_mean(var_name, grid.links_at_node,
+                                     grid.link_dirs_at_node, 0, out)
+        return out
+
     values_at_links = var_name[grid.links_at_node] * grid.link_dirs_at_node
     # this procedure makes incoming links NEGATIVE
     vals_in_positive = values_at_links
@@ -1006,6 +1148,14 @@ def map_value_at_upwind_node_link_max_to_node(grid, control_name,
         control_name = grid.at_link[control_name]
     if type(value_name) is str:
         value_name = grid.at_link[value_name]
+    if _can_use_kernel(out, grid.number_of_nodes,
+                       (control_name, grid.number_of_links),
+                       (value_name, grid.number_of_links)):
+        _ext.map_value_at_wind_node_link_max(
+            control_name, value_name, grid.links_at_node,
+            grid.link_dirs_at_node, 1, out)
+        return out
+
     values_at_nodes = control_name[grid.links_at_node] * grid.link_dirs_at_node
     # this procedure makes incoming links NEGATIVE
     which_link = np.argmax(-values_at_nodes, axis=1)
@@ -1087,6 +1237,14 @@ def map_value_at_downwind_node_link_max_to_node(grid, control_name,
         control_name = grid.at_link[control_name]
     if type(value_name) is str:
         value_name = grid.at_link[value_name]
+    if _can_use_kernel(out, grid.number_of_nodes,
+                       (control_name, grid.number_of_links),
+                       (value_name, grid.number_of_links)):
+        _ext.map_value_at_wind_node_link_max(
+            control_name, value_name, grid.links_at_node,
+            grid.link_dirs_at_node, 0, out)
+        return out
+
     values_at_nodes = control_name[grid.links_at_node] * grid.link_dirs_at_node
     # this procedure makes incoming links NEGATIVE
     which_link = np.argmax(values_at_nodes, axis=1)
@@ -1152,6 +1310,13 @@ def map_mean_of_patch_nodes_to_patch(grid, var_name, ignore_closed_nodes=True,
 
     if type(var_name) is str:
         var_name = grid.at_node[var_name]
+    if _can_use_kernel(out, grid.number_of_patches,
+                       (var_name, grid.number_of_nodes)):
+        _ext.map_patch_nodes(
+            var_name, grid.nodes_at_patch, grid.status_at_node,
+            CLOSED_BOUNDARY if ignore_closed_nodes else -1, 0, out)
+        return out
+
     values_at_nodes = var_name[grid.nodes_at_patch]
     if ignore_closed_nodes:
         values_at_nodes = np.ma.masked_where(grid.status_at_node[
@@ -1223,6 +1388,13 @@ def map_max_of_patch_nodes_to_patch(grid, var_name, ignore_closed_nodes=True,
 
     if type(var_name) is str:
         var_name = grid.at_node[var_name]
+    if _can_use_kernel(out, grid.number_of_patches,
+                       (var_name, grid.number_of_nodes)):
+        _ext.map_patch_nodes(
+            var_name, grid.nodes_at_patch, grid.status_at_node,
+            CLOSED_BOUNDARY if ignore_closed_nodes else -1, 1, out)
+        return out
+
     values_at_nodes = var_name[grid.nodes_at_patch]
     if ignore_closed_nodes:
         values_at_nodes = np.ma.masked_where(grid.status_at_node[
@@ -1294,6 +1466,13 @@ def map_min_of_patch_nodes_to_patch(grid, var_name, ignore_closed_nodes=True,
 
     if type(var_name) is str:
         var_name = grid.at_node[var_name]
+    if _can_use_kernel(out, grid.number_of_patches,
+                       (var_name, grid.number_of_nodes)):
+        _ext.map_patch_nodes(
+            var_name, grid.nodes_at_patch, grid.status_at_node,
+            CLOSED_BOUNDARY if ignore_closed_nodes else -1, 2, out)
+        return out
+
     values_at_nodes = var_name[grid.nodes_at_patch]
     if ignore_closed_nodes:
         values_at_nodes = np.ma.masked_where(grid.status_at_node[
@@ -1399,6 +1578,17 @@ def map_link_vector_sum_to_patch(grid, var_name, ignore_inactive_links=True,
 
     if type(var_name) is str:
         var_name = grid.at_link[var_name]
+    if (_can_use_kernel(out[0], grid.number_of_patches,
+                        (var_name, grid.number_of_links)) and
+            _can_use_kernel(out[1], grid.number_of_patches,
+                            (var_name, grid.number_of_links),
+                            (out[0], grid.number_of_patches))):
+        _ext.map_link_vector_sum_to_patch(
+            var_name, grid.links_at_patch, grid.angle_of_link,
+            grid.status_at_link,
+            INACTIVE_LINK if ignore_inactive_links else -1, out[0], out[1])
+        return out
+
     angles_at_links = grid.angle_of_link  # CCW round tail
     hoz_cpt = np.cos(angles_at_links)
     vert_cpt = np.sin(angles_at_links)
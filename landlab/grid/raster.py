@@ -31,7 +31,14 @@ from landlab.grid.structured_quad import faces as squad_faces
 from landlab.grid.structured_quad import cells as squad_cells
 from ..core.utils import as_id_array
 from ..core.utils import add_module_functions_to_class
-from .decorators import return_id_array, return_readonly_id_array
+from .decorators import (cache_connectivity, return_id_array,
+                         return_readonly_id_array)
+from .connectivity_cache import ConnectivityCache
+from ..graph.structured_quad.structured_quad import (setup_links_at_node,
+                                                     setup_links_at_patch,
+                                                     setup_nodes_at_link,
+                                                     setup_patches_at_node)
+from ..graph.structured_quad.dual_structured_quad import get_node_at_cell
 from ..utils.decorators import cache_result_in_object
 from . import gradients
 
@@ -360,6 +367,16 @@ class RasterModelGrid(DiagonalsMixIn, ModelGrid, RasterModelGridPlotter):
             Provides the values (x, y) of the
             lower left corner of the grid. Default
             value is (0.0, 0.0)
+        max_connectivity_memory : int, optional
+            Limit, in bytes, on the memory used by cached connectivity
+            arrays (*links_at_node*, *patches_at_node*, diagonals, etc.).
+            If given, the least recently used arrays are dropped once the
+            limit is reached and recalculated from the grid shape when next
+            needed. If ``None``, connectivity arrays are kept once created.
+        index_dtype : {int, numpy.int32, numpy.int64}, optional
+            Data type of the grid's arrays of element ids. Using
+            ``numpy.int32`` halves the memory used by connectivity arrays
+            for grids with fewer than 2**31 links and diagonals.
 
         Returns
         -------
@@ -390,6 +407,17 @@ class RasterModelGrid(DiagonalsMixIn, ModelGrid, RasterModelGridPlotter):
         if num_rows <= 0 or num_cols <= 0:
             raise ValueError('number of rows and columns must be positive')
 
+        max_connectivity_memory = kwds.pop('max_connectivity_memory', None)
+        if max_connectivity_memory is not None:
+            self._connectivity_cache = ConnectivityCache(
+                max_bytes=max_connectivity_memory)
+
+        index_dtype = kwds.pop('index_dtype', None)
+        if index_dtype is not None:
+            self._set_index_dtype(
+                index_dtype, squad_links.number_of_links((num_rows, num_cols)) +
+                2 * (num_rows - 1) * (num_cols - 1))
+
         self._node_status = np.empty(num_rows * num_cols, dtype=np.uint8)
 
         # Set number of nodes, and initialize if caller has given dimensions
@@ -409,6 +437,7 @@ class RasterModelGrid(DiagonalsMixIn, ModelGrid, RasterModelGridPlotter):
                              'RasterModelGrid type.')
 
         dx = state_dict['dx']
+        dy = state_dict.get('dy', dx)
         shape = state_dict['shape']
         origin = state_dict['origin']
         num_rows = shape[0]
@@ -417,7 +446,7 @@ class RasterModelGrid(DiagonalsMixIn, ModelGrid, RasterModelGridPlotter):
         self._node_status = np.empty(num_rows * num_cols, dtype=np.uint8)
 
         # Set number of nodes, and initialize if caller has given dimensions
-        self._initialize(num_rows, num_cols, dx, origin)
+        self._initialize(num_rows, num_cols, (dy, dx), origin)
 
         super(RasterModelGrid, self).__init__()
 
@@ -471,7 +500,7 @@ class RasterModelGrid(DiagonalsMixIn, ModelGrid, RasterModelGridPlotter):
         state_dict['dx'] = self.dx
         state_dict['dy'] = self.dy
         state_dict['shape'] = self.shape
-        state_dict['origin'] = (self.node_x[0], self.node_y[0])
+        state_dict['origin'] = (self.node_y[0], self.node_x[0])
         state_dict['_axis_name'] = self._axis_name
         state_dict['_axis_units'] = self._axis_units
         state_dict['_default_group'] = self._default_group
@@ -551,8 +580,9 @@ class RasterModelGrid(DiagonalsMixIn, ModelGrid, RasterModelGridPlotter):
         (by default) regular boundaries (that is, all perimeter cells are
         boundaries and all interior cells are active).
 
-        The lower left corner is set through *origin*, which is a
-        (lower left corner x, lower left corner y) tuple.
+        The lower left corner is set through *origin*, which, like
+        *spacing*, is given in row-major order as a (lower left corner y,
+        lower left corner x) tuple.
 
         To be consistent with unstructured grids, the raster grid is
         managed not as a 2D array but rather as a set of vectors that
@@ -613,9 +643,10 @@ class RasterModelGrid(DiagonalsMixIn, ModelGrid, RasterModelGridPlotter):
         self._dy, self._dx = float(spacing[0]), float(spacing[1])
         self.cellarea = self._dy * self._dx
 
-        self._node_at_cell = sgrid.node_at_cell(self.shape)
+        self._node_at_cell = get_node_at_cell(self.shape,
+                                              dtype=self._index_dtype)
         self._cell_at_node = squad_cells.cell_id_at_nodes(
-            self.shape).reshape((-1, ))
+            self.shape).reshape((-1, )).astype(self._index_dtype, copy=False)
 
         # We need at least one row or column of boundary cells on each
         # side, so the grid has to be at least 3x3
@@ -674,8 +705,6 @@ class RasterModelGrid(DiagonalsMixIn, ModelGrid, RasterModelGridPlotter):
         # |-------|-------|-------|
         #
 
-        self._links_at_node = squad_links.links_at_node(self.shape)
-
         # Link lists:
         # For all links, we encode the "tail" and "head" nodes, and the face
         # (if any) associated with the link. If the link does not intersect a
@@ -702,10 +731,8 @@ class RasterModelGrid(DiagonalsMixIn, ModelGrid, RasterModelGridPlotter):
         #  *---0-->*---1-->*---2-->*---3-->*
         #
         #   create the tail-node and head-node lists
-        (node_at_link_tail,
-         node_at_link_head) = sgrid.node_index_at_link_ends(self.shape)
-        self._nodes_at_link = np.hstack((node_at_link_tail.reshape((-1, 1)),
-                                         node_at_link_head.reshape((-1, 1))))
+        self._nodes_at_link = setup_nodes_at_link(self.shape,
+                                                  dtype=self._index_dtype)
 
         # Sort them by midpoint coordinates
         self._sort_links_by_midpoint()
@@ -719,11 +746,6 @@ class RasterModelGrid(DiagonalsMixIn, ModelGrid, RasterModelGridPlotter):
         # set up the list of active links
         self._reset_link_status_list()
 
-        # Create 2D array containing, for each node, direction of connected
-        # link (1=incoming, -1=outgoing, 0=no link present at this position)
-        # needs to come after BC setting
-        self._create_link_dirs_at_node()
-
         #   set up link unit vectors and node unit-vector sums
         self._create_link_unit_vectors()
 
@@ -737,8 +759,9 @@ class RasterModelGrid(DiagonalsMixIn, ModelGrid, RasterModelGridPlotter):
         # active links. We start off creating a list of all None values. Only
         # those links that cross a face will have this None value replaced with
         # a face ID.
-        self._face_at_link = sgrid.face_at_link(self.shape,
-                                                actives=self.active_links)
+        self._face_at_link = sgrid.face_at_link(
+            self.shape, actives=self.active_links).astype(self._index_dtype,
+                                                          copy=False)
         self._create_cell_areas_array()
 
         # List of neighbors for each cell: we will start off with no
@@ -757,7 +780,7 @@ class RasterModelGrid(DiagonalsMixIn, ModelGrid, RasterModelGridPlotter):
 
     def _setup_nodes(self):
         self._nodes = np.arange(self.number_of_nodes,
-                                dtype=int).reshape(self.shape)
+                                dtype=self._index_dtype).reshape(self.shape)
         return self._nodes
 
     @property
@@ -1077,7 +1100,7 @@ class RasterModelGrid(DiagonalsMixIn, ModelGrid, RasterModelGridPlotter):
             return self._horizontal_links
         except AttributeError:
             self._horizontal_links = squad_links.horizontal_link_ids(
-                self.shape)
+                self.shape).astype(self._index_dtype, copy=False)
             return self._horizontal_links
 
     @property
@@ -1090,10 +1113,11 @@ class RasterModelGrid(DiagonalsMixIn, ModelGrid, RasterModelGridPlotter):
             return self._vertical_links
         except AttributeError:
             self._vertical_links = squad_links.vertical_link_ids(
-                self.shape)
+                self.shape).astype(self._index_dtype, copy=False)
             return self._vertical_links
 
     @property
+    @cache_connectivity
     @return_readonly_id_array
     def patches_at_node(self):
         """Get array of patches attached to nodes.
@@ -1122,36 +1146,8 @@ class RasterModelGrid(DiagonalsMixIn, ModelGrid, RasterModelGridPlotter):
 
         LLCATS: PINF NINF CONN
         """
-        try:
-            return self.node_patch_matrix
-        except AttributeError:
-            self.node_patch_matrix = np.full((self.number_of_nodes, 4),
-                                             -1, dtype=int)
-            self.node_patch_matrix[:, 2][
-                np.setdiff1d(np.arange(self.number_of_nodes),
-                             np.union1d(self.nodes_at_left_edge,
-                                        self.nodes_at_bottom_edge))] = \
-                np.arange(self.number_of_patches)
-            self.node_patch_matrix[:, 3][
-                np.setdiff1d(np.arange(self.number_of_nodes),
-                             np.union1d(self.nodes_at_right_edge,
-                                        self.nodes_at_bottom_edge))] = \
-                np.arange(self.number_of_patches)
-            self.node_patch_matrix[:, 1][
-                np.setdiff1d(np.arange(self.number_of_nodes),
-                             np.union1d(self.nodes_at_left_edge,
-                                        self.nodes_at_top_edge))] = \
-                np.arange(self.number_of_patches)
-            self.node_patch_matrix[:, 0][
-                np.setdiff1d(np.arange(self.number_of_nodes),
-                             np.union1d(self.nodes_at_right_edge,
-                                        self.nodes_at_top_edge))] = \
-                np.arange(self.number_of_patches)
-            # we no longer blank out any patches that have a closed node as any
-            # vertex, per modern LL style. Instead, we will make a closed/open
-            # mask
-            self._patches_created = True
-            return self.node_patch_matrix
+        self._patches_created = True
+        return setup_patches_at_node(self.shape, dtype=self._index_dtype)
 
     @property
     @return_readonly_id_array
@@ -1201,12 +1197,7 @@ class RasterModelGrid(DiagonalsMixIn, ModelGrid, RasterModelGridPlotter):
         LLCATS: PINF LINF CONN
         """
         self._patches_created = True
-        base = np.arange(self.number_of_patches)
-        bottom_edge = base + (base // (self._ncols - 1)) * self._ncols
-        return np.column_stack((bottom_edge + self._ncols,
-                                bottom_edge + 2 * self._ncols - 1,
-                                bottom_edge + self._ncols - 1,
-                                bottom_edge))
+        return setup_links_at_patch(self.shape, dtype=self._index_dtype)
 
     @property
     @return_readonly_id_array
@@ -1249,20 +1240,33 @@ class RasterModelGrid(DiagonalsMixIn, ModelGrid, RasterModelGridPlotter):
         from .cfuncs import create_patches_at_element
         self._patches_created = True
         self._patches_at_link = np.empty((self.number_of_links, 2),
-                                         dtype=int)
+                                         dtype=self._index_dtype)
         self._patches_at_link.fill(-1)
         create_patches_at_element(self.links_at_patch, self.number_of_links,
                                   self._patches_at_link)
 # a sort of the links will be performed here once we have corners
 
-    def _create_link_dirs_at_node(self):
-        """Make array with link directions at each node
+    @property
+    @cache_connectivity
+    @make_return_array_immutable
+    def links_at_node(self):
+        """Get links of nodes.
+
+        Links are numbered from (row, column) arithmetic on the grid shape
+        the first time they are needed.
+
+        Returns
+        -------
+        (NODES, LINKS) ndarray of int
+            Link for the nodes of a grid. The shape of the matrix will be
+            number of nodes rows by max number of links per node. Order is
+            anticlockwise from east.
 
         Examples
         --------
         >>> from landlab import RasterModelGrid
         >>> rmg = RasterModelGrid((3, 4))
-        >>> rmg._links_at_node
+        >>> rmg.links_at_node
         array([[ 0,  3, -1, -1],
                [ 1,  4,  0, -1],
                [ 2,  5,  1, -1],
@@ -1275,7 +1279,22 @@ class RasterModelGrid(DiagonalsMixIn, ModelGrid, RasterModelGridPlotter):
                [15, -1, 14, 11],
                [16, -1, 15, 12],
                [-1, -1, 16, 13]])
-        >>> rmg._link_dirs_at_node
+
+        LLCATS: NINF LINF CONN
+        """
+        return setup_links_at_node(self.shape, dtype=self._index_dtype)
+
+    @property
+    @cache_connectivity
+    @make_return_array_immutable
+    def link_dirs_at_node(self):
+        """Link directions at each node: 1=incoming, -1=outgoing, 0=none.
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid
+        >>> rmg = RasterModelGrid((3, 4))
+        >>> rmg.link_dirs_at_node
         array([[-1, -1,  0,  0],
                [-1, -1,  1,  0],
                [-1, -1,  1,  0],
@@ -1288,46 +1307,10 @@ class RasterModelGrid(DiagonalsMixIn, ModelGrid, RasterModelGridPlotter):
                [-1,  0,  1,  1],
                [-1,  0,  1,  1],
                [ 0,  0,  1,  1]], dtype=int8)
+
+        LLCATS: NINF LINF CONN
         """
-        # Create arrays for link-at-node information
-        self._link_dirs_at_node = np.zeros((self.number_of_nodes, 4),
-                                           dtype=np.int8)
-        num_links_per_row = (self.number_of_node_columns * 2) - 1
-        # Sweep over all links
-        node_at_link_tail = self.node_at_link_tail
-        node_at_link_head = self.node_at_link_head
-        for lk in range(self.number_of_links):
-            # Find the orientation
-            is_horiz = ((lk % num_links_per_row) <
-                        (self.number_of_node_columns - 1))
-            # Find the IDs of the tail and head nodes
-            t = node_at_link_tail[lk]
-            h = node_at_link_head[lk]
-
-            # If the link is horizontal, the index (row) in the links_at_node
-            # array should be 0 (east) for the tail node, and 2 (west) for the
-            # head node.
-            # If vertical, the index should be 1 (north) for the tail node and
-            # 3 (south) for the head node.
-            if is_horiz:
-                tail_index = 0
-                head_index = 2
-            else:
-                tail_index = 1
-                head_index = 3
-
-            # Add this link to the list for this node, set the direction
-            # (outgoing, indicated by -1), and increment the number found so
-            # far
-            self._link_dirs_at_node[t][tail_index] = -1
-            self._link_dirs_at_node[h][head_index] = 1
-
-        # setup the active link equivalent
-        # self._active_link_dirs_at_node = self._link_dirs_at_node.copy()
-        # inactive_links = (self.status_at_link[self.links_at_node] ==
-        #                   INACTIVE_LINK)
-        # inactive_links[self.link_dirs_at_node == 0] = False
-        # self._active_link_dirs_at_node[inactive_links] = 0
+        return squad_links.link_dirs_at_node(self.shape).astype(np.int8)
 
     def _create_link_unit_vectors(self):
         """Make arrays to store the unit vectors associated with each link.
@@ -1416,7 +1399,8 @@ class RasterModelGrid(DiagonalsMixIn, ModelGrid, RasterModelGridPlotter):
         >>> mg.link_at_face[(0, 4, 13), ]
         array([ 5, 10, 21])
         """
-        self._link_at_face = squad_faces.link_at_face(self.shape)
+        self._link_at_face = squad_faces.link_at_face(self.shape).astype(
+            self._index_dtype, copy=False)
         return self._link_at_face
 
     def _create_face_at_link(self):
@@ -1700,7 +1684,8 @@ class RasterModelGrid(DiagonalsMixIn, ModelGrid, RasterModelGridPlotter):
 
         LLCATS: GINF NINF SUBSET
         """
-        return sgrid.corners((self._nrows, self._ncols))
+        return sgrid.corners((self._nrows, self._ncols)).astype(
+            self._index_dtype, copy=False)
 
     @property
     @deprecated(use='cells_at_corners_of_grid', version=1.0)
@@ -1730,7 +1715,8 @@ class RasterModelGrid(DiagonalsMixIn, ModelGrid, RasterModelGridPlotter):
 
         LLCATS: GINF CINF SUBSET
         """
-        return sgrid.corners(self.cell_grid_shape)
+        return sgrid.corners(self.cell_grid_shape).astype(
+            self._index_dtype, copy=False)
 
     def is_point_on_grid(self, xcoord, ycoord):
         """Check if a point is on the grid.
@@ -4353,5 +4339,7 @@ add_module_functions_to_class(RasterModelGrid, 'raster_mappers.py',
                               pattern='map_*')
 add_module_functions_to_class(RasterModelGrid, 'raster_gradients.py',
                               pattern='calc_*')
+add_module_functions_to_class(RasterModelGrid, 'raster_divergence.py',
+                              pattern='calc_*')
 add_module_functions_to_class(RasterModelGrid, 'raster_set_status.py',
                               pattern='set_status_at_node*')
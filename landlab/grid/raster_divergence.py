@@ -0,0 +1,84 @@
+#! /usr/bin/env python
+"""Calculate vector divergence on a raster grid.
+
+Divergence calculators for raster grids
++++++++++++++++++++++++++++++++++++++++
+
+.. autosummary::
+    :toctree: generated/
+
+    ~landlab.grid.raster_divergence.calc_flux_div_at_node
+
+"""
+import numpy as np
+
+from landlab.grid import divergence
+from landlab.grid.structured_quad import links
+from landlab.utils.decorators import use_field_name_or_array
+
+
+@use_field_name_or_array('link')
+def calc_flux_div_at_node(grid, unit_flux, out=None):
+    """Calculate divergence of link-based fluxes at nodes.
+
+    Given a flux per unit width along each link, calculate the net outflux
+    (or influx, if negative) divided by cell area, at each node (zero or
+    "out" value for nodes without cells). Fluxes are differenced across
+    each cell of the raster, rather than summed over its faces.
+
+    Parameters
+    ----------
+    grid : RasterModelGrid
+        A grid.
+    unit_flux : ndarray or field name
+        Flux per unit width along links (x number of links).
+    out : ndarray, optional
+        Buffer to hold result. If `None`, create a new array.
+
+    Returns
+    -------
+    ndarray (x number of nodes)
+        Flux divergence at nodes.
+
+    Examples
+    --------
+    >>> from landlab import RasterModelGrid
+    >>> rg = RasterModelGrid((3, 4), spacing=10.)
+    >>> z = rg.add_zeros('node', 'topographic__elevation')
+    >>> z[5] = 50.0
+    >>> z[6] = 36.0
+    >>> lg = rg.calc_grad_at_link(z)
+    >>> rg.calc_flux_div_at_node(-lg)
+    array([ 0.  ,  0.  ,  0.  ,  0.  ,  0.  ,  1.64,  0.94,  0.  ,  0.  ,
+            0.  ,  0.  ,  0.  ])
+
+    >>> out = rg.ones(at='node')
+    >>> rtn = rg.calc_flux_div_at_node(-lg, out=out)
+    >>> rtn is out
+    True
+    >>> out
+    array([ 1.  ,  1.  ,  1.  ,  1.  ,  1.  ,  1.64,  0.94,  1.  ,  1.  ,
+            1.  ,  1.  ,  1.  ])
+
+    LLCATS: NINF GRAD
+    """
+    if unit_flux.size != grid.number_of_links:
+        raise ValueError('Parameter unit_flux must be num links '
+                         'long')
+    if out is None:
+        out = grid.zeros(at='node')
+    elif out.size != grid.number_of_nodes:
+        raise ValueError('output buffer length mismatch with number of nodes')
+
+    if not (isinstance(out, np.ndarray) and out.flags.c_contiguous):
+        return divergence.calc_flux_div_at_node(grid, unit_flux, out=out)
+
+    flux = links.horizontal_links_view(grid.shape, unit_flux)
+    div = out.reshape(grid.shape)[1:-1, 1:-1]
+    np.subtract(flux[1:-1, 1:], flux[1:-1, :-1], out=div)
+    div /= grid.dx
+
+    flux = links.vertical_links_view(grid.shape, unit_flux)
+    div += (flux[1:, 1:-1] - flux[:-1, 1:-1]) / grid.dy
+
+    return out
@@ -21,6 +21,7 @@ from landlab.core.utils import make_optional_arg_into_id_array, \
 
 from landlab.grid import gradients
 from landlab.grid.base import BAD_INDEX_VALUE, CLOSED_BOUNDARY
+from landlab.grid.structured_quad import links
 from landlab.utils.decorators import use_field_name_or_array
 from collections import deque
 
@@ -69,13 +70,26 @@ def calc_grad_at_link(grid, node_values, out=None):
 
     LLCATS: LINF GRAD
     """
+    if out is None:
+        out = grid.empty(at='link')
+
+    if (node_values.size == grid.number_of_nodes and
+            out.shape == (grid.number_of_links, )):
+        values = node_values.reshape(grid.shape)
+
+        grads = links.horizontal_links_view(grid.shape, out)
+        np.subtract(values[:, 1:], values[:, :-1], out=grads)
+        grads /= grid.dx
+
+        grads = links.vertical_links_view(grid.shape, out)
+        np.subtract(values[1:, :], values[:-1, :], out=grads)
+        grads /= grid.dy
+
+        return out
+
     grads = gradients.calc_diff_at_link(grid, node_values, out=out)
     grads /= grid.length_of_link[:grid.number_of_links]
 
-#    n_vertical_links = (grid.shape[0] - 1) * grid.shape[1]
-#    diffs[:n_vertical_links] /= grid.dy
-#    diffs[n_vertical_links:] /= grid.dx
-
     return grads
 
 
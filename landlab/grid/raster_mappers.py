@@ -21,14 +21,21 @@ Mapping functions unique to raster grids
     ~landlab.grid.raster_mappers.map_mean_of_vertical_links_to_node
     ~landlab.grid.raster_mappers.map_mean_of_vertical_active_links_to_node
 
+As with the mappers in `landlab.grid.mappers`, compiled kernels write
+straight into *out* where the values and *out* are float arrays.
 """
 
 from __future__ import division
 
 import numpy as np
 
+from landlab.grid.ext import mappers as _ext
+from landlab.grid.mappers import _can_use_kernel
 from landlab.grid.structured_quad import links
 
+# Columns of links_at_node of a raster grid.
+_EAST, _NORTH, _WEST, _SOUTH = 0, 1, 2, 3
+
 
 def map_sum_of_inlinks_to_node(grid, var_name, out=None):
     """Map the sum of links entering a node to the node.
@@ -76,6 +83,12 @@ def map_sum_of_inlinks_to_node(grid, var_name, out=None):
         values_at_links = grid.at_link[var_name]
     else:
         values_at_links = var_name
+    if _can_use_kernel(out, grid.number_of_nodes,
+                       (values_at_links, grid.number_of_links)):
+        _ext.map_pair_of_links_to_node(values_at_links, grid.links_at_node,
+                                       _SOUTH, _WEST, 0, out)
+        return out
+
     values_at_links = np.append(values_at_links, 0)
 
     south, west = links._node_in_link_ids(grid.shape)
@@ -129,6 +142,12 @@ def map_mean_of_inlinks_to_node(grid, var_name, out=None):
         values_at_links = grid.at_link[var_name]
     else:
         values_at_links = var_name
+    if _can_use_kernel(out, grid.number_of_nodes,
+                       (values_at_links, grid.number_of_links)):
+        _ext.map_pair_of_links_to_node(values_at_links, grid.links_at_node,
+                                       _SOUTH, _WEST, 1, out)
+        return out
+
     values_at_links = np.append(values_at_links, 0)
     south, west = links._node_in_link_ids(grid.shape)
     south, west = south.reshape(south.size), west.reshape(west.size)
@@ -184,6 +203,12 @@ def map_max_of_inlinks_to_node(grid, var_name, out=None):
         values_at_links = grid.at_link[var_name]
     else:
         values_at_links = var_name
+    if _can_use_kernel(out, grid.number_of_nodes,
+                       (values_at_links, grid.number_of_links)):
+        _ext.map_pair_of_links_to_node(values_at_links, grid.links_at_node,
+                                       _SOUTH, _WEST, 2, out)
+        return out
+
     values_at_links = np.append(values_at_links, 0)
     south, west = links._node_in_link_ids(grid.shape)
     south, west = south.reshape(south.size), west.reshape(west.size)
@@ -238,6 +263,12 @@ def map_min_of_inlinks_to_node(grid, var_name, out=None):
         values_at_links = grid.at_link[var_name]
     else:
         values_at_links = var_name
+    if _can_use_kernel(out, grid.number_of_nodes,
+                       (values_at_links, grid.number_of_links)):
+        _ext.map_pair_of_links_to_node(values_at_links, grid.links_at_node,
+                                       _SOUTH, _WEST, 3, out)
+        return out
+
     values_at_links = np.append(values_at_links, 0)
     south, west = links._node_in_link_ids(grid.shape)
     south, west = south.reshape(south.size), west.reshape(west.size)
@@ -292,6 +323,12 @@ def map_sum_of_outlinks_to_node(grid, var_name, out=None):
         values_at_links = grid.at_link[var_name]
     else:
         values_at_links = var_name
+    if _can_use_kernel(out, grid.number_of_nodes,
+                       (values_at_links, grid.number_of_links)):
+        _ext.map_pair_of_links_to_node(values_at_links, grid.links_at_node,
+                                       _NORTH, _EAST, 0, out)
+        return out
+
     values_at_links = np.append(values_at_links, 0)
     north, east = links._node_out_link_ids(grid.shape)
     north, east = north.reshape(north.size), east.reshape(east.size)
@@ -346,6 +383,12 @@ def map_mean_of_outlinks_to_node(grid, var_name, out=None):
         values_at_links = grid.at_link[var_name]
     else:
         values_at_links = var_name
+    if _can_use_kernel(out, grid.number_of_nodes,
+                       (values_at_links, grid.number_of_links)):
+        _ext.map_pair_of_links_to_node(values_at_links, grid.links_at_node,
+                                       _NORTH, _EAST, 1, out)
+        return out
+
     values_at_links = np.append(values_at_links, 0)
     north, east = links._node_out_link_ids(grid.shape)
     north, east = north.reshape(north.size), east.reshape(east.size)
@@ -400,6 +443,12 @@ def map_max_of_outlinks_to_node(grid, var_name, out=None):
         values_at_links = grid.at_link[var_name]
     else:
         values_at_links = var_name
+    if _can_use_kernel(out, grid.number_of_nodes,
+                       (values_at_links, grid.number_of_links)):
+        _ext.map_pair_of_links_to_node(values_at_links, grid.links_at_node,
+                                       _NORTH, _EAST, 2, out)
+        return out
+
     values_at_links = np.append(values_at_links, 0)
     north, east = links._node_out_link_ids(grid.shape)
     north, east = north.reshape(north.size), east.reshape(east.size)
@@ -453,6 +502,12 @@ def map_min_of_outlinks_to_node(grid, var_name, out=None):
         values_at_links = grid.at_link[var_name]
     else:
         values_at_links = var_name
+    if _can_use_kernel(out, grid.number_of_nodes,
+                       (values_at_links, grid.number_of_links)):
+        _ext.map_pair_of_links_to_node(values_at_links, grid.links_at_node,
+                                       _NORTH, _EAST, 3, out)
+        return out
+
     values_at_links = np.append(values_at_links, 0)
     north, east = links._node_out_link_ids(grid.shape)
     north, east = north.reshape(north.size), east.reshape(east.size)
@@ -508,6 +563,13 @@ def map_mean_of_links_to_node(grid, var_name, out=None):
         values_at_links = grid.at_link[var_name]
     else:
         values_at_links = var_name
+    if _can_use_kernel(out, grid.number_of_nodes,
+                       (values_at_links, grid.number_of_links)):
+        _ext.map_mean_of_links_to_node(
+            values_at_links, grid.links_at_node, grid.link_dirs_at_node,
+            np.array([_NORTH, _EAST, _SOUTH, _WEST]), 0, out)
+        return out
+
     values_at_links = np.append(values_at_links, 0)
 
     north, east = links._node_out_link_ids(grid.shape)
@@ -571,6 +633,12 @@ def map_mean_of_horizontal_links_to_node(grid, var_name, out=None):
         values_at_links = grid.at_link[var_name]
     else:
         values_at_links = var_name
+    if _can_use_kernel(out, grid.number_of_nodes,
+                       (values_at_links, grid.number_of_links)):
+        _ext.map_mean_of_links_to_node(
+            values_at_links, grid.links_at_node, grid.link_dirs_at_node,
+            np.array([_EAST, _WEST]), 0, out)
+        return out
     hoz_links = grid.links_at_node[:, [0, 2]]
     hoz_link_dirs = np.fabs(grid.link_dirs_at_node[:, [0, 2]])
     # ^retain "true" directions of links
@@ -630,6 +698,12 @@ def map_mean_of_horizontal_active_links_to_node(grid, var_name, out=None):
         values_at_links = grid.at_link[var_name]
     else:
         values_at_links = var_name
+    if _can_use_kernel(out, grid.number_of_nodes,
+                       (values_at_links, grid.number_of_links)):
+        _ext.map_mean_of_links_to_node(
+            values_at_links, grid.links_at_node, grid.active_link_dirs_at_node,
+            np.array([_EAST, _WEST]), 1, out)
+        return out
     hoz_links = grid.links_at_node[:, [0, 2]]
     hoz_link_dirs = np.fabs(grid.active_link_dirs_at_node[:, [0, 2]])
     # ^retain "true" directions of links; no inactives now
@@ -688,6 +762,12 @@ def map_mean_of_vertical_links_to_node(grid, var_name, out=None):
         values_at_links = grid.at_link[var_name]
     else:
         values_at_links = var_name
+    if _can_use_kernel(out, grid.number_of_nodes,
+                       (values_at_links, grid.number_of_links)):
+        _ext.map_mean_of_links_to_node(
+            values_at_links, grid.links_at_node, grid.link_dirs_at_node,
+            np.array([_NORTH, _SOUTH]), 0, out)
+        return out
     vert_links = grid.links_at_node[:, [1, 3]]
     vert_link_dirs = np.fabs(grid.link_dirs_at_node[:, [1, 3]])
     # ^retain "true" directions of links
@@ -747,6 +827,12 @@ def map_mean_of_vertical_active_links_to_node(grid, var_name, out=None):
         values_at_links = grid.at_link[var_name]
     else:
         values_at_links = var_name
+    if _can_use_kernel(out, grid.number_of_nodes,
+                       (values_at_links, grid.number_of_links)):
+        _ext.map_mean_of_links_to_node(
+            values_at_links, grid.links_at_node, grid.active_link_dirs_at_node,
+            np.array([_NORTH, _SOUTH]), 1, out)
+        return out
     vert_links = grid.links_at_node[:, [1, 3]]
     vert_link_dirs = np.fabs(grid.active_link_dirs_at_node[:, [1, 3]])
     # ^retain "true" directions of links; no inactives now
@@ -204,6 +204,71 @@ def horizontal_link_ids(shape):
     return link_ids
 
 
+def vertical_links_view(shape, values):
+    """View of the values at the vertical links of a structured quad grid.
+
+    Parameters
+    ----------
+    shape : tuple of int
+        Shape of grid of nodes.
+    values : ndarray
+        Values at every link of the grid.
+
+    Returns
+    -------
+    (M, N) ndarray :
+        View of the values at vertical links; writing to it changes
+        *values*.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.grid.structured_quad.links import vertical_links_view
+    >>> values = np.arange(17)
+    >>> vertical_links_view((3, 4), values)
+    array([[ 3,  4,  5,  6],
+           [10, 11, 12, 13]])
+    >>> vertical_links_view((3, 4), values)[0] = -1
+    >>> values[:7]
+    array([ 0,  1,  2, -1, -1, -1, -1])
+    """
+    stride = values.strides[0]
+    return np.lib.stride_tricks.as_strided(
+        values[shape[1] - 1:], shape=shape_of_vertical_links(shape),
+        strides=((2 * shape[1] - 1) * stride, stride))
+
+
+def horizontal_links_view(shape, values):
+    """View of the values at the horizontal links of a structured quad grid.
+
+    Parameters
+    ----------
+    shape : tuple of int
+        Shape of grid of nodes.
+    values : ndarray
+        Values at every link of the grid.
+
+    Returns
+    -------
+    (M, N) ndarray :
+        View of the values at horizontal links; writing to it changes
+        *values*.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.grid.structured_quad.links import horizontal_links_view
+    >>> horizontal_links_view((3, 4), np.arange(17))
+    array([[ 0,  1,  2],
+           [ 7,  8,  9],
+           [14, 15, 16]])
+    """
+    stride = values.strides[0]
+    return np.lib.stride_tricks.as_strided(
+        values, shape=shape_of_horizontal_links(shape),
+        strides=((2 * shape[1] - 1) * stride, stride))
+
+
 def number_of_links_per_node(shape):
     """Number of links touching each node.
 
@@ -0,0 +1,74 @@
+import pytest
+from numpy.testing import assert_array_equal
+
+from landlab import RasterModelGrid
+
+
+CONNECTIVITY = ('links_at_node', 'link_dirs_at_node', 'patches_at_node',
+                'adjacent_nodes_at_node', 'diagonals_at_node',
+                'diagonal_dirs_at_node', 'diagonal_adjacent_nodes_at_node',
+                'nodes_at_diagonal', 'nodes_at_d8', 'd8s_at_node',
+                'd8_dirs_at_node', 'length_of_diagonal', 'length_of_d8')
+
+
+@pytest.mark.parametrize('max_bytes', [0, 2048, 100000])
+def test_bounded_same_as_unbounded(max_bytes):
+    grid = RasterModelGrid((5, 6), max_connectivity_memory=max_bytes)
+    expected = RasterModelGrid((5, 6))
+
+    for _ in range(2):
+        for name in CONNECTIVITY:
+            assert_array_equal(getattr(grid, name), getattr(expected, name))
+            assert grid._connectivity_cache.nbytes <= max_bytes
+
+
+def test_bounded_arrays_not_attributes():
+    grid = RasterModelGrid((5, 6), max_connectivity_memory=100000)
+    for name in CONNECTIVITY:
+        getattr(grid, name)
+        assert '_' + name not in grid.__dict__
+        assert '_' + name in grid._connectivity_cache
+
+
+def test_least_recently_used_evicted():
+    grid = RasterModelGrid((5, 6), max_connectivity_memory=2048)
+    grid._connectivity_cache.clear()
+
+    links = grid.links_at_node
+    grid.patches_at_node
+    assert grid.links_at_node is links
+    grid.diagonals_at_node
+
+    assert grid._connectivity_cache.keys() == ['_links_at_node',
+                                               '_diagonals_at_node']
+
+
+def test_cached_arrays_are_readonly():
+    grid = RasterModelGrid((5, 6), max_connectivity_memory=0)
+    for name in CONNECTIVITY:
+        with pytest.raises(ValueError):
+            getattr(grid, name)[0] = 0
+
+
+def test_memory_usage():
+    grid = RasterModelGrid((5, 6))
+    grid.add_zeros('link', 'water__discharge')
+    grid.d8s_at_node
+    usage = grid.memory_usage()
+
+    assert usage['at_link:water__discharge'] == grid.number_of_links * 8
+    assert usage['_d8s_at_node'] == grid.number_of_nodes * 8 * 8
+    assert usage['_xy_of_node'] == grid.number_of_nodes * 2 * 8
+    assert all(isinstance(nbytes, int) for nbytes in usage.values())
+
+
+def test_memory_usage_is_bounded():
+    shape = (100, 100)
+    bounded = RasterModelGrid(shape, max_connectivity_memory=2 ** 20)
+    unbounded = RasterModelGrid(shape)
+    for grid in (bounded, unbounded):
+        for name in CONNECTIVITY:
+            getattr(grid, name)
+
+    assert (sum(bounded.memory_usage().values()) <
+            sum(unbounded.memory_usage().values()) - 2 ** 20)
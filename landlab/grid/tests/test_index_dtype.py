@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from landlab import CLOSED_BOUNDARY, FIXED_VALUE_BOUNDARY, RasterModelGrid
+from landlab.graph.structured_quad.structured_quad import (
+    setup_links_at_node, setup_nodes_at_link)
+
+
+IDS = ('nodes_at_link', 'links_at_node', 'patches_at_node',
+       'nodes_at_patch', 'links_at_patch', 'patches_at_link',
+       'node_at_cell', 'cell_at_node', 'face_at_link',
+       'link_at_face', 'faces_at_cell', 'adjacent_nodes_at_node',
+       'horizontal_links', 'vertical_links', 'core_nodes', 'active_links',
+       'fixed_links', 'fixed_value_boundary_nodes', 'node_at_core_cell',
+       'active_faces', 'diagonals_at_node', 'nodes_at_diagonal',
+       'd8s_at_node', 'nodes_at_d8', 'diagonal_adjacent_nodes_at_node',
+       'nodes_at_corners_of_grid')
+
+
+def _set_status(grid):
+    grid.status_at_node[7] = CLOSED_BOUNDARY
+    grid.status_at_node[[0, 1]] = FIXED_VALUE_BOUNDARY
+    grid.status_at_node[13] = CLOSED_BOUNDARY
+
+
+def test_default_index_dtype():
+    grid = RasterModelGrid((4, 5))
+    assert grid.index_dtype == np.int
+    for name in IDS:
+        assert getattr(grid, name).dtype == np.int
+
+
+@pytest.mark.parametrize('name', IDS)
+def test_int32_same_as_default(name):
+    grid = RasterModelGrid((5, 6), index_dtype=np.int32)
+    expected = RasterModelGrid((5, 6))
+    for g in (grid, expected):
+        _set_status(g)
+
+    ids = getattr(grid, name)
+    assert ids.dtype == np.int32
+    assert_array_equal(ids, getattr(expected, name))
+
+
+def test_int32_status_change():
+    grid = RasterModelGrid((5, 6), index_dtype=np.int32)
+    expected = RasterModelGrid((5, 6))
+    for g in (grid, expected):
+        g.core_nodes, g.active_links
+        _set_status(g)
+
+    for name in ('core_nodes', 'active_links', 'fixed_links'):
+        assert getattr(grid, name).dtype == np.int32
+        assert_array_equal(getattr(grid, name), getattr(expected, name))
+
+
+def test_int32_cached_ids_not_copied():
+    grid = RasterModelGrid((5, 6), index_dtype=np.int32)
+    assert np.may_share_memory(grid.core_nodes, grid.core_nodes)
+    assert np.may_share_memory(grid.active_links, grid.active_links)
+
+
+def test_int32_mappers():
+    grid = RasterModelGrid((5, 6), index_dtype=np.int32)
+    expected = RasterModelGrid((5, 6))
+    values = np.random.rand(grid.number_of_nodes)
+
+    assert_array_equal(grid.map_mean_of_link_nodes_to_link(values),
+                       expected.map_mean_of_link_nodes_to_link(values))
+    assert_array_equal(grid.map_max_of_patch_nodes_to_patch(values),
+                       expected.map_max_of_patch_nodes_to_patch(values))
+    assert_array_equal(grid.calc_grad_at_link(values),
+                       expected.calc_grad_at_link(values))
+
+
+@pytest.mark.parametrize('dtype', [np.float64, np.int8, np.uint32])
+def test_bad_index_dtype(dtype):
+    with pytest.raises(ValueError):
+        RasterModelGrid((3, 4), index_dtype=dtype)
+
+
+def test_setup_with_int32():
+    links = setup_links_at_node((3, 4), dtype=np.int32)
+    assert links.dtype == np.int32
+    assert_array_equal(links, setup_links_at_node((3, 4)))
+
+    nodes = setup_nodes_at_link((3, 4), dtype=np.int32)
+    assert nodes.dtype == np.int32
+    assert_array_equal(nodes, setup_nodes_at_link((3, 4)))
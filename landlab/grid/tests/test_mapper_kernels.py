@@ -0,0 +1,156 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_array_almost_equal, assert_array_equal
+
+from landlab import CLOSED_BOUNDARY, HexModelGrid, RasterModelGrid
+import landlab.grid.mappers as maps
+import landlab.grid.raster_mappers as raster_maps
+
+
+AT_NODE = (
+    'map_link_head_node_to_link',
+    'map_link_tail_node_to_link',
+    'map_min_of_link_nodes_to_link',
+    'map_max_of_link_nodes_to_link',
+    'map_mean_of_link_nodes_to_link',
+    'map_node_to_cell',
+    'map_mean_of_patch_nodes_to_patch',
+    'map_max_of_patch_nodes_to_patch',
+    'map_min_of_patch_nodes_to_patch',
+)
+AT_LINK = (
+    'map_min_of_node_links_to_node',
+    'map_max_of_node_links_to_node',
+    'map_upwind_node_link_max_to_node',
+    'map_downwind_node_link_max_to_node',
+    'map_upwind_node_link_mean_to_node',
+    'map_downwind_node_link_mean_to_node',
+)
+CONTROLLED_AT_NODE = (
+    'map_value_at_min_node_to_link',
+    'map_value_at_max_node_to_link',
+)
+CONTROLLED_AT_LINK = (
+    'map_value_at_upwind_node_link_max_to_node',
+    'map_value_at_downwind_node_link_max_to_node',
+)
+RASTER_AT_LINK = (
+    'map_sum_of_inlinks_to_node',
+    'map_mean_of_inlinks_to_node',
+    'map_max_of_inlinks_to_node',
+    'map_min_of_inlinks_to_node',
+    'map_sum_of_outlinks_to_node',
+    'map_mean_of_outlinks_to_node',
+    'map_max_of_outlinks_to_node',
+    'map_min_of_outlinks_to_node',
+    'map_mean_of_links_to_node',
+    'map_mean_of_horizontal_links_to_node',
+    'map_mean_of_horizontal_active_links_to_node',
+    'map_mean_of_vertical_links_to_node',
+    'map_mean_of_vertical_active_links_to_node',
+)
+
+
+def _make_grids():
+    raster = RasterModelGrid((5, 6))
+    raster.status_at_node[[7, 8, 15]] = CLOSED_BOUNDARY
+    hexgrid = HexModelGrid(5, 4)
+    hexgrid.status_at_node[[5, 6]] = CLOSED_BOUNDARY
+    return raster, hexgrid
+
+
+def _map_with_and_without_kernels(monkeypatch, module, name, grid, *args):
+    """Map with the compiled kernels, and with numpy."""
+    func = getattr(module, name)
+    with_kernels = func(grid, *args)
+    with monkeypatch.context() as patch:
+        patch.setattr(module, '_can_use_kernel', lambda *args: False)
+        without_kernels = func(grid, *args)
+    return with_kernels, without_kernels
+
+
+@pytest.fixture(params=[1, 2])
+def num_threads(request):
+    maps.set_num_threads(request.param)
+    yield request.param
+    maps.set_num_threads(1)
+
+
+@pytest.mark.parametrize('name', AT_NODE)
+def test_at_node(monkeypatch, num_threads, name):
+    for grid in _make_grids():
+        values = np.random.randn(grid.number_of_nodes)
+        actual, expected = _map_with_and_without_kernels(
+            monkeypatch, maps, name, grid, values)
+        assert_array_almost_equal(actual, expected)
+
+
+@pytest.mark.parametrize('name', AT_LINK)
+def test_at_link(monkeypatch, num_threads, name):
+    for grid in _make_grids():
+        values = np.random.randn(grid.number_of_links)
+        actual, expected = _map_with_and_without_kernels(
+            monkeypatch, maps, name, grid, values)
+        assert_array_almost_equal(actual, expected)
+
+
+@pytest.mark.parametrize('name', CONTROLLED_AT_NODE)
+def test_controlled_at_node(monkeypatch, num_threads, name):
+    for grid in _make_grids():
+        control = np.random.randint(3, size=grid.number_of_nodes) * 1.
+        values = np.random.randn(grid.number_of_nodes)
+        actual, expected = _map_with_and_without_kernels(
+            monkeypatch, maps, name, grid, control, values)
+        assert_array_equal(actual, expected)
+
+
+@pytest.mark.parametrize('name', CONTROLLED_AT_LINK)
+def test_controlled_at_link(monkeypatch, num_threads, name):
+    for grid in _make_grids():
+        control = np.random.randint(-2, 3, size=grid.number_of_links) * 1.
+        values = np.random.randn(grid.number_of_links)
+        actual, expected = _map_with_and_without_kernels(
+            monkeypatch, maps, name, grid, control, values)
+        assert_array_equal(actual, expected)
+
+
+@pytest.mark.parametrize('ignore_inactive_links', [True, False])
+def test_link_vector_sum_to_patch(monkeypatch, num_threads,
+                                  ignore_inactive_links):
+    for grid in _make_grids():
+        values = np.random.randn(grid.number_of_links)
+        actual, expected = _map_with_and_without_kernels(
+            monkeypatch, maps, 'map_link_vector_sum_to_patch', grid, values,
+            ignore_inactive_links)
+        assert_array_almost_equal(actual, expected)
+
+
+@pytest.mark.parametrize('name', RASTER_AT_LINK)
+def test_raster_at_link(monkeypatch, num_threads, name):
+    grid = _make_grids()[0]
+    values = np.random.randn(grid.number_of_links)
+    actual, expected = _map_with_and_without_kernels(
+        monkeypatch, raster_maps, name, grid, values)
+    assert_array_almost_equal(actual, expected)
+
+
+def test_patches_with_only_closed_nodes_keep_out():
+    grid = RasterModelGrid((3, 3))
+    grid.status_at_node[[0, 1, 3, 4]] = CLOSED_BOUNDARY
+    out = np.full(grid.number_of_patches, -1.)
+    maps.map_mean_of_patch_nodes_to_patch(grid, np.arange(9.), out=out)
+    assert_array_almost_equal(out, [-1., 3.5, 6.5, 20. / 3.])
+
+
+def test_int_values_use_numpy():
+    grid = RasterModelGrid((3, 4))
+    values = maps.map_max_of_link_nodes_to_link(grid, np.arange(12))
+    assert_array_equal(values, grid.node_at_link_head)
+
+
+def test_set_num_threads():
+    with pytest.raises(ValueError):
+        maps.set_num_threads(0)
+    maps.set_num_threads(3)
+    assert maps.get_num_threads() == 3
+    maps.set_num_threads(1)
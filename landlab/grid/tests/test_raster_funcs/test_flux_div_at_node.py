@@ -0,0 +1,35 @@
+import numpy as np
+from numpy.testing import assert_array_almost_equal, assert_array_equal
+
+from landlab import RasterModelGrid
+from landlab.grid.divergence import calc_flux_div_at_node
+
+
+def test_same_as_generic():
+    """Test the raster divergence matches that of the generic grid."""
+    grid = RasterModelGrid((6, 7), spacing=2.)
+    flux = np.random.rand(grid.number_of_links)
+    assert_array_almost_equal(grid.calc_flux_div_at_node(flux),
+                              calc_flux_div_at_node(grid, flux))
+
+
+def test_non_square_cells():
+    """Test divergence of a linear flux field on non-square cells."""
+    grid = RasterModelGrid((5, 6), spacing=(2., 3.))
+    flux = np.where(grid.x_of_node[grid.node_at_link_head] ==
+                    grid.x_of_node[grid.node_at_link_tail],
+                    2. * grid.y_of_node[grid.node_at_link_head],
+                    grid.x_of_node[grid.node_at_link_head])
+    div = grid.calc_flux_div_at_node(flux)
+    assert_array_almost_equal(div[grid.node_at_cell], 3.)
+    assert_array_equal(div[grid.boundary_nodes], 0.)
+
+
+def test_out_keeps_boundary_values():
+    """Test nodes without cells keep their value in out."""
+    grid = RasterModelGrid((4, 5))
+    out = grid.ones(at='node')
+    rtn = grid.calc_flux_div_at_node(np.zeros(grid.number_of_links), out=out)
+    assert rtn is out
+    assert_array_equal(out[grid.node_at_cell], 0.)
+    assert_array_equal(out[grid.boundary_nodes], 1.)
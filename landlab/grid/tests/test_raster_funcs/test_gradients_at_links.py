@@ -77,3 +77,13 @@ def test_diff_out_array():
                   5, 5, 5, 1, 1, 1, 1, 5, 5, 5, 5, 5, 1, 1, 1, 1],
                  dtype=float))
     assert rtn_diff is diff
+
+
+def test_same_as_generic():
+    """Test the raster gradients match those of the generic grid."""
+    from landlab.grid.gradients import calc_grad_at_link
+
+    grid = RasterModelGrid((6, 7), spacing=(2., 3.))
+    values_at_nodes = np.random.rand(grid.number_of_nodes)
+    assert_array_equal(grid.calc_grad_at_link(values_at_nodes),
+                       calc_grad_at_link(grid, values_at_nodes))
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from landlab import (CLOSED_BOUNDARY, CORE_NODE, FIXED_GRADIENT_BOUNDARY,
+                     FIXED_VALUE_BOUNDARY, HexModelGrid, RasterModelGrid)
+
+
+CACHED = ('status_at_link', 'active_links', 'fixed_links', 'core_nodes',
+          'core_cells', 'node_at_core_cell', 'fixed_value_boundary_nodes',
+          'link_status_at_node', 'active_link_dirs_at_node', 'active_faces',
+          'active_adjacent_nodes_at_node')
+
+
+def _load_cache(grid):
+    for name in CACHED:
+        getattr(grid, name)
+
+
+@pytest.mark.parametrize('make_grid', [
+    lambda: RasterModelGrid((20, 30)),
+    lambda: HexModelGrid(20, 15),
+])
+def test_incremental_same_as_full(make_grid):
+    """Patched caches match those rebuilt from scratch."""
+    np.random.seed(7)
+    grid, expected = make_grid(), make_grid()
+    statuses = [CORE_NODE, FIXED_VALUE_BOUNDARY, FIXED_GRADIENT_BOUNDARY,
+                CLOSED_BOUNDARY]
+
+    for _ in range(20):
+        _load_cache(grid)
+        nodes = np.random.randint(grid.number_of_nodes, size=3)
+        status = np.random.choice(statuses, size=3)
+        bc_set_code = grid.bc_set_code
+
+        grid.status_at_node[nodes] = status
+        expected._node_status[:] = grid.status_at_node
+        expected.reset_status_at_node()
+
+        assert grid.bc_set_code == bc_set_code + 1
+        for name in CACHED:
+            assert_array_equal(getattr(grid, name), getattr(expected, name))
+
+
+def test_last_link():
+    """Missing links take the status of the last link, as before."""
+    grid, expected = RasterModelGrid((4, 5)), RasterModelGrid((4, 5))
+    _load_cache(grid)
+
+    grid.status_at_node[-2] = CLOSED_BOUNDARY
+    expected._node_status[-2] = CLOSED_BOUNDARY
+    expected.reset_status_at_node()
+
+    for name in CACHED:
+        assert_array_equal(getattr(grid, name), getattr(expected, name))
+
+
+def test_with_node_ids():
+    grid = RasterModelGrid((4, 5))
+    _load_cache(grid)
+    grid._node_status[[6, 12]] = CLOSED_BOUNDARY
+    grid.reset_status_at_node(nodes=[6, 12])
+
+    assert_array_equal(grid.core_nodes, [7, 8, 11, 13])
+    assert_array_equal(grid.active_links, [6, 7, 11, 12, 16, 18, 21, 23, 25])
+
+
+DIAGONAL_CACHED = ('status_at_diagonal', 'diagonal_status_at_node',
+                   'active_diagonals', 'active_diagonal_dirs_at_node',
+                   'status_at_d8', 'active_d8', 'active_d8_dirs_at_node')
+
+
+def test_diagonals_same_as_full():
+    """Patched diagonal caches match those rebuilt from scratch."""
+    np.random.seed(11)
+    grid, expected = RasterModelGrid((20, 30)), RasterModelGrid((20, 30))
+    statuses = [CORE_NODE, FIXED_VALUE_BOUNDARY, FIXED_GRADIENT_BOUNDARY,
+                CLOSED_BOUNDARY]
+
+    for _ in range(20):
+        for name in DIAGONAL_CACHED:
+            getattr(grid, name)
+        status_at_diagonal = grid.__dict__['_status_at_diagonal']
+        nodes = np.random.randint(grid.number_of_nodes, size=3)
+        nodes[0] = grid.number_of_nodes - 1
+        grid.status_at_node[nodes] = np.random.choice(statuses, size=3)
+        expected._node_status[:] = grid.status_at_node
+        expected.reset_status_at_node()
+
+        assert grid.__dict__['_status_at_diagonal'] is status_at_diagonal
+        for name in DIAGONAL_CACHED:
+            assert_array_equal(getattr(grid, name), getattr(expected, name))
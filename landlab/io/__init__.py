@@ -5,7 +5,9 @@ from .esri_ascii import (read_esri_ascii, read_asc_header, write_esri_ascii)
 from .esri_ascii import (MissingRequiredKeyError, KeyTypeError, KeyValueError,
                          DataSizeError, BadHeaderLineError, 
                          MismatchGridDataSizeError)
+from .background_writer import BackgroundWriter
 
 __all__ = ['read_esri_ascii', 'read_asc_header', 'write_esri_ascii',
            'MissingRequiredKeyError', 'KeyTypeError', 'DataSizeError',
-           'BadHeaderLineError', 'KeyValueError', 'MismatchGridDataSizeError']
+           'BadHeaderLineError', 'KeyValueError', 'MismatchGridDataSizeError',
+           'BackgroundWriter']
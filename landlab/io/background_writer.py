@@ -0,0 +1,249 @@
+#! /usr/bin/env python
+"""Write grid output on a background thread.
+
+Background writer
++++++++++++++++++
+
+.. autosummary::
+    :toctree: generated/
+
+    ~landlab.io.background_writer.BackgroundWriter
+"""
+import sys
+import threading
+
+import numpy as np
+import six
+from six.moves import queue
+
+from landlab.field import ScalarDataFields
+from landlab.grid.connectivity_cache import ConnectivityCache
+
+
+_STOP = object()
+
+
+class BackgroundWriter(object):
+
+    """Write snapshots of a grid on a background thread.
+
+    Each call to one of the write methods takes a snapshot of the grid, by
+    copying the fields to be written, and queues it to be written by a
+    background thread. The model can then continue to change its fields
+    while the snapshot is written. Arrays that hold snapshots are reused
+    once they have been written, so that output does not allocate new
+    memory at each step.
+
+    At most *max_queued* snapshots wait to be written. If the queue is
+    full, a write waits for space, which keeps the memory held by
+    snapshots bounded if output can not keep up with the model.
+
+    An error raised while writing a snapshot is raised again by the next
+    call to a write method, :meth:`flush`, or :meth:`close`.
+
+    Parameters
+    ----------
+    grid : ModelGrid
+        The grid to write.
+    max_queued : int, optional
+        Maximum number of snapshots waiting to be written.
+
+    Examples
+    --------
+    >>> import os, tempfile
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.io import BackgroundWriter
+    >>> from landlab.io.netcdf import read_netcdf
+
+    >>> grid = RasterModelGrid((4, 5))
+    >>> z = grid.add_zeros('node', 'topographic__elevation')
+    >>> temp_dir = tempfile.mkdtemp()
+
+    >>> with BackgroundWriter(grid) as writer:
+    ...     for step in range(3):
+    ...         z += 1.
+    ...         writer.write_netcdf(
+    ...             os.path.join(temp_dir, 'out{0}.nc'.format(step)))
+
+    Each file holds the values as they were when it was queued.
+
+    >>> grid = read_netcdf(os.path.join(temp_dir, 'out1.nc'))
+    >>> grid.at_node['topographic__elevation'][:5]
+    array([ 2.,  2.,  2.,  2.,  2.])
+    """
+
+    def __init__(self, grid, max_queued=2):
+        if max_queued < 1:
+            raise ValueError('max_queued must be at least 1')
+
+        self._grid = grid
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._spare = {}
+        self._lock = threading.Lock()
+        self._error = None
+
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            task = self._queue.get()
+            try:
+                if task is _STOP:
+                    return
+                call, snapshot = task
+                if self._error is None:
+                    try:
+                        call(snapshot)
+                    except Exception:
+                        self._error = sys.exc_info()
+                self._release(snapshot)
+            finally:
+                self._queue.task_done()
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            six.reraise(*error)
+
+    def _copy(self, key, array):
+        """Copy an array into a spare buffer, if there is one."""
+        with self._lock:
+            spares = self._spare.get(key, [])
+            buffer = spares.pop() if spares else None
+        if (buffer is None or buffer.shape != array.shape or
+                buffer.dtype != array.dtype):
+            buffer = np.empty_like(array)
+        buffer[...] = array
+        return buffer
+
+    def _release(self, snapshot):
+        """Keep the arrays of a written snapshot for reuse."""
+        with self._lock:
+            for key, array in snapshot._snapshot_arrays:
+                self._spare.setdefault(key, []).append(array)
+
+    def snapshot(self, names=None):
+        """Copy the grid and the current values of its fields.
+
+        The copy shares its connectivity arrays with the grid, but holds its
+        own copies of the fields and of the status of nodes. Arrays that
+        depend on the status of nodes, such as the status of links and the
+        active links, are not shared, since the grid may patch them in
+        place. They are recalculated by the copy if they are needed.
+
+        Parameters
+        ----------
+        names : str or iterable of str, optional
+            Names of the fields to copy. If not given, copy all fields.
+
+        Returns
+        -------
+        ModelGrid
+            A copy of the grid.
+        """
+        if isinstance(names, six.string_types):
+            names = (names, )
+
+        grid = self._grid
+        snapshot = object.__new__(type(grid))
+        snapshot.__dict__.update(grid.__dict__)
+        snapshot._node_status = np.array(grid._node_status)
+        snapshot.reset_status_at_node()
+        snapshot.bc_set_code = grid.bc_set_code
+        if grid._connectivity_cache is not None:
+            # The cache is not thread-safe, so the copy gets its own.
+            cache = ConnectivityCache(
+                max_bytes=grid._connectivity_cache.max_bytes)
+            for name, array in grid._connectivity_cache.items():
+                cache.add(name, array)
+            snapshot._connectivity_cache = cache
+
+        arrays = [('_node_status', snapshot._node_status)]
+        snapshot._groups = {}
+        for group in grid.groups:
+            fields = ScalarDataFields(grid[group].size)
+            for name in grid[group]:
+                if names is None or name in names:
+                    copy = self._copy((group, name), grid[group][name])
+                    fields.add_field(name, copy,
+                                     units=grid[group].units[name])
+                    arrays.append(((group, name), copy))
+            snapshot._groups[group] = fields
+            setattr(snapshot, 'at_' + group, fields)
+        snapshot._snapshot_arrays = arrays
+
+        return snapshot
+
+    def _submit(self, call, names=None):
+        self._raise_error()
+        if not self._thread.is_alive():
+            raise ValueError('writer is closed')
+
+        snapshot = self.snapshot(names=names)
+        self._queue.put((call, snapshot))
+
+    def submit(self, func, *args, **kwds):
+        """Queue a function that writes a snapshot of the grid.
+
+        The function is called, on the background thread, as
+        ``func(snapshot, *args, **kwds)``.
+
+        Parameters
+        ----------
+        func : callable
+            A function that writes a grid.
+        names : str or iterable of str, optional
+            Names of the fields to copy into the snapshot. If not given,
+            copy all fields. This keyword is also passed to *func*.
+        """
+        self._submit(lambda grid: func(grid, *args, **kwds),
+                     names=kwds.get('names', None))
+
+    def write_netcdf(self, path, **kwds):
+        """Write a snapshot with :func:`~landlab.io.netcdf.write_netcdf`."""
+        from .netcdf import write_netcdf
+        self._submit(lambda grid: write_netcdf(path, grid, **kwds),
+                     names=kwds.get('names', None))
+
+    def write_raster_netcdf(self, path, **kwds):
+        """Write a snapshot with
+        :func:`~landlab.io.netcdf.write_raster_netcdf`."""
+        from .netcdf import write_raster_netcdf
+        self._submit(lambda grid: write_raster_netcdf(path, grid, **kwds),
+                     names=kwds.get('names', None))
+
+    def write_esri_ascii(self, path, **kwds):
+        """Write a snapshot with :func:`~landlab.io.write_esri_ascii`."""
+        from .esri_ascii import write_esri_ascii
+        self._submit(lambda grid: write_esri_ascii(path, grid, **kwds),
+                     names=kwds.get('names', None))
+
+    def save_grid(self, path, names=None, **kwds):
+        """Write a snapshot with
+        :func:`~landlab.io.native_landlab.save_grid`.
+
+        Only the fields given by *names* (all fields, if not given) are
+        saved with the grid.
+        """
+        from .native_landlab import save_grid
+        self._submit(lambda grid: save_grid(grid, path, **kwds), names=names)
+
+    def flush(self):
+        """Wait until all queued snapshots have been written."""
+        self._queue.join()
+        self._raise_error()
+
+    def close(self):
+        """Write all queued snapshots and stop the background thread."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        self._raise_error()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
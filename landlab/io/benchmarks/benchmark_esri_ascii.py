@@ -0,0 +1,86 @@
+"""Benchmark reading and writing ESRI ASCII files.
+
+Run from the command line to print the time taken to write and then read
+a grid of 10**8 cells, as ESRI ASCII, with the block-wise reader and
+writer of :mod:`landlab.io.esri_ascii`, and with the
+:func:`numpy.savetxt` and :func:`numpy.loadtxt` they replace::
+
+    $ python benchmark_esri_ascii.py
+
+Pass the number of rows and columns to use a different size of grid (the
+numpy functions are only timed for grids of fewer than 10**7 cells; they
+would take many minutes for larger grids)::
+
+    $ python benchmark_esri_ascii.py 1000 1000
+
+The reader holds only the final array, and a block of a few MB of text, in
+memory, whereas :func:`numpy.loadtxt` holds a list of Python floats for
+every value in the file. Data are read into an existing grid so that the
+time to create a grid is not included.
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.io import read_esri_ascii, write_esri_ascii
+
+
+def bench_write_esri_ascii(grid, path):
+    write_esri_ascii(path, grid, names='topographic__elevation',
+                     clobber=True)
+
+
+def bench_read_esri_ascii(grid, path):
+    read_esri_ascii(path, grid=grid)
+
+
+def bench_savetxt(grid, path):
+    np.savetxt(path, grid.at_node['topographic__elevation'].reshape(
+        grid.shape)[::-1])
+
+
+def bench_loadtxt(grid, path):
+    np.loadtxt(path)
+
+
+def _time(func, *args):
+    start = time.time()
+    func(*args)
+    return time.time() - start
+
+
+def main(shape=(10000, 10000)):
+    grid = RasterModelGrid(shape)
+    grid.add_field('node', 'topographic__elevation',
+                   np.random.rand(grid.number_of_nodes))
+    benches = [('landlab', bench_write_esri_ascii, bench_read_esri_ascii)]
+    if grid.number_of_nodes < 10 ** 7:
+        benches.append(('numpy', bench_savetxt, bench_loadtxt))
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        print("{0:>24s} {1:>12s} {2:>12s} {3:>12s}".format(
+            "{0}".format(shape), "write (s)", "read (s)", "size (MB)"))
+        for name, write, read in benches:
+            path = os.path.join(temp_dir, 'bench.asc')
+            write_time = _time(write, grid, path)
+            size = os.path.getsize(path)
+            read_time = _time(read, grid, path)
+
+            print("{0:>24s} {1:12.2f} {2:12.2f} {3:12.1f}".format(
+                name, write_time, read_time, size / 2. ** 20))
+            os.remove(path)
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        main(shape=(int(sys.argv[1]), int(sys.argv[2])))
+    else:
+        main()
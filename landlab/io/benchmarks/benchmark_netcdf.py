@@ -0,0 +1,81 @@
+"""Benchmark writing time series of fields to netCDF.
+
+Run from the command line to print, for each way of writing, the
+throughput (in MB of field values per second) and the size of the file
+produced when writing time slices of a field. Times are given for a large
+grid written a few times, and a small grid written many times (where the
+cost of reopening a file at each step dominates)::
+
+    $ python benchmark_netcdf.py
+"""
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.io.netcdf import NetcdfWriter, write_raster_netcdf
+
+
+WRITERS = (
+    ('write_raster_netcdf', None),
+    ('NetcdfWriter', dict(zlib=False)),
+    ('NetcdfWriter, zlib', dict()),
+    ('NetcdfWriter, zlib, float32', dict(dtype=np.float32)),
+    ('NetcdfWriter, zlib, 10 steps', dict(buffer_steps=10)),
+)
+
+
+def _update(grid, step):
+    z = grid.at_node['topographic__elevation']
+    z[:] = np.sin(grid.x_of_node / 50. + step) * np.cos(grid.y_of_node / 50.)
+
+
+def bench_write_raster_netcdf(grid, path, n_steps):
+    for step in range(n_steps):
+        _update(grid, step)
+        write_raster_netcdf(path, grid, append=True, time=float(step),
+                            names='topographic__elevation')
+
+
+def bench_netcdf_writer(grid, path, n_steps, **kwds):
+    with NetcdfWriter(path, grid, names='topographic__elevation',
+                      **kwds) as writer:
+        for step in range(n_steps):
+            _update(grid, step)
+            writer.write(time=float(step))
+
+
+def main(shape=(1000, 1000), n_steps=20):
+    grid = RasterModelGrid(shape)
+    grid.add_zeros('node', 'topographic__elevation')
+    n_bytes = grid.number_of_nodes * 8 * n_steps
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        print("{0:>32s} {1:>12s} {2:>12s}".format(
+            "{0} x {1} steps".format(shape, n_steps), "MB/s", "size (MB)"))
+        for name, kwds in WRITERS:
+            path = os.path.join(temp_dir, 'bench.nc')
+            if os.path.isfile(path):
+                os.remove(path)
+
+            start = time.time()
+            if kwds is None:
+                bench_write_raster_netcdf(grid, path, n_steps)
+            else:
+                bench_netcdf_writer(grid, path, n_steps, **kwds)
+            elapsed = time.time() - start
+
+            print("{0:>32s} {1:12.1f} {2:12.1f}".format(
+                name, n_bytes / elapsed / 2. ** 20,
+                os.path.getsize(path) / 2. ** 20))
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    main(shape=(1000, 1000), n_steps=20)
+    main(shape=(100, 100), n_steps=500)
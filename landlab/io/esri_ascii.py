@@ -41,6 +41,7 @@ _HEADER_VALUE_TESTS = {
     'yllcenter': (float, lambda x: True),
     'nodata_value': (float, lambda x: True),
 }
+_BLOCK_SIZE = 2 ** 22
 
 
 class Error(Exception):
@@ -310,19 +311,96 @@ def read_asc_header(asc_file):
     return header
 
 
-def _read_asc_data(asc_file):
+def _fill_rows(out, start, values):
+    """Copy values into the rows of *out*, starting at flat index *start*."""
+    n_cols = out.shape[1]
+    (row, col) = divmod(start, n_cols)
+
+    if col > 0:
+        n_values = min(n_cols - col, len(values))
+        out[row, col:col + n_values] = values[:n_values]
+        values = values[n_values:]
+        row += 1
+
+    n_rows = len(values) // n_cols
+    out[row:row + n_rows] = values[:n_rows * n_cols].reshape((n_rows, n_cols))
+    values = values[n_rows * n_cols:]
+
+    if len(values) > 0:
+        out[row + n_rows, :len(values)] = values
+
+
+def _read_asc_data(asc_file, out, block_size=_BLOCK_SIZE):
     """Read gridded data from an ESRI ASCII data file.
 
+    The data are read in blocks of lines, each of which is parsed at
+    once, so that only *out* and the current block are held in memory.
+
     Parameters
     ----------
     asc_file : file-like
         File-like object of the data file pointing to the start of the data.
+    out : ndarray of float
+        Array, of shape (*nrows*, *ncols*), into which to read the data.
+    block_size : int, optional
+        Approximate number of characters to read at a time.
+
+    Returns
+    -------
+    ndarray of float
+        The array of data, *out*.
+
+    Raises
+    ------
+    DataSizeError
+        The file does not contain as many values as *out*.
 
     .. note::
         First row of the data is at the top of the raster grid, the second
         row is the second from the top, and so on.
     """
-    return np.loadtxt(asc_file)
+    n_read = 0
+    lines = asc_file.readlines(block_size)
+    while len(lines) > 0:
+        text = ''.join(lines)
+        if len(text.strip()) > 0:
+            values = np.fromstring(text, sep=' ')
+            if n_read < out.size:
+                _fill_rows(out, n_read, values[:out.size - n_read])
+            n_read += len(values)
+        lines = asc_file.readlines(block_size)
+
+    if n_read != out.size:
+        raise DataSizeError(n_read, out.size)
+
+    return out
+
+
+def _write_asc_data(asc_file, data, fmt='%.18e', block_size=_BLOCK_SIZE):
+    """Write gridded data to an ESRI ASCII data file.
+
+    Rows are formatted a block at a time, which is much faster than
+    formatting them one by one.
+
+    Parameters
+    ----------
+    asc_file : file-like
+        File-like object of the data file.
+    data : ndarray
+        Data to write, of shape (*nrows*, *ncols*). The first row is written
+        first.
+    fmt : str, optional
+        Format of each value.
+    block_size : int, optional
+        Approximate number of characters to format at a time.
+    """
+    n_cols = data.shape[1]
+    row_fmt = ' '.join([fmt] * n_cols) + '\n'
+    rows_per_block = max(block_size // (len(fmt % 0.) * n_cols), 1)
+
+    for start in range(0, data.shape[0], rows_per_block):
+        block = data[start:start + rows_per_block]
+        asc_file.write((row_fmt * len(block)) % tuple(block.ravel().tolist()))
 
 
 def read_esri_ascii(asc_file, grid=None, reshape=False, name=None, halo=0):
@@ -401,63 +479,36 @@ def read_esri_ascii(asc_file, grid=None, reshape=False, name=None, halo=0):
     # _read_asc_header, and _read_asc_data
     if isinstance(asc_file, six.string_types):
         with open(asc_file, 'r') as f:
-            header = read_asc_header(f)
-            data = _read_asc_data(f)
+            return read_esri_ascii(f, grid=grid, reshape=reshape, name=name,
+                                   halo=halo)
 
-        file_name = asc_file
-
-    # otherwise, pass asc_file directly.
-    else:
-        header = read_asc_header(asc_file)
-        data = _read_asc_data(asc_file)
-        try:
-            file_name = asc_file.name
-        except AttributeError: # StringIO objects will not have this attribute
-            file_name = None
+    header = read_asc_header(asc_file)
 
     #There is no reason for halo to be negative.
     #Assume that if a negative value is given it should be 0.
-    if halo <= 0:
-        shape = (header['nrows'], header['ncols'])
-        if data.size != shape[0] * shape[1]:
-            raise DataSizeError(shape[0] * shape[1], data.size)
-    else:
-        shape = (header['nrows'] + 2 * halo, header['ncols'] + 2 * halo)
+    halo = max(halo, 0)
+    shape = (header['nrows'] + 2 * halo, header['ncols'] + 2 * halo)
+    if halo > 0:
         #check to see if a nodata_value was given.  If not, assign -9999.
-        if 'nodata_value' in header.keys():
-            nodata_value = header['nodata_value']
-        else:
-            header['nodata_value'] = -9999.
-            nodata_value = header['nodata_value']
-        if data.size != (shape[0] - 2 * halo) * (shape[1] - 2 * halo):
-            raise DataSizeError(shape[0] * shape[1], data.size)
+        header.setdefault('nodata_value', -9999.)
+
     spacing = (header['cellsize'], header['cellsize'])
     origin = (header['yllcorner'] - halo * header['cellsize'], header['xllcorner'] - halo * header['cellsize'])
 
-    data = np.flipud(data)
-
     #REMEMBER, shape contains the size with halo in place
     #header contains the shape of the original data
-    #Add halo below
+    #Fill the halo, then read the data, top row first, into the rest
+    data = np.empty(shape, dtype=float)
     if halo > 0:
-        helper_row = np.ones(shape[1]) * nodata_value
-        #for the first halo row(s), add num cols worth of nodata vals to data
-        for i in range(0, halo):
-            data = np.insert(data,0,helper_row)
-        #then for header['nrows'] add halo number nodata vals, header['ncols']
-        #of data, then halo number of nodata vals
-        helper_row_ends = np.ones(halo) * nodata_value
-        for i in range(halo, header['nrows']+halo):
-            #this adds at the beginning of the row
-            data = np.insert(data,i * shape[1],helper_row_ends)
-            #this adds at the end of the row
-            data = np.insert(data,(i + 1) * shape[1] - halo,helper_row_ends)
-        #for the last halo row(s), add num cols worth of nodata vals to data
-        for i in range(header['nrows']+halo,shape[0]):
-            data = np.insert(data,data.size,helper_row)
+        data[:halo] = header['nodata_value']
+        data[-halo:] = header['nodata_value']
+        data[:, :halo] = header['nodata_value']
+        data[:, -halo:] = header['nodata_value']
+    _read_asc_data(asc_file,
+                   data[halo:shape[0] - halo, halo:shape[1] - halo][::-1])
 
     if not reshape:
-        data = data.flatten()
+        data = data.reshape((-1, ))
 
     if grid is not None:
         if (grid.number_of_node_rows != shape[0]) or \
@@ -545,7 +596,8 @@ def write_esri_ascii(path, fields, names=None, clobber=False):
         header_lines = ['%s %s' % (key, str(val))
                         for key, val in list(header.items())]
         data = fields.at_node[name].reshape(header['nrows'], header['ncols'])
-        np.savetxt(path, np.flipud(data), header=os.linesep.join(header_lines),
-                   comments='')
+        with open(path, 'w') as asc_file:
+            asc_file.write(os.linesep.join(header_lines) + '\n')
+            _write_asc_data(asc_file, np.flipud(data))
 
     return paths
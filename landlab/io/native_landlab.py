@@ -1,5 +1,17 @@
 #! /usr/bin/env python
-"""Read data from a pickled Landlab grid file into a RasterModelGrid.
+"""Read and write Landlab grids in Landlab's native format.
+
+Landlab native files hold a grid, along with its boundary conditions and
+fields, in a single binary file. The file starts with a header, written
+as JSON, that describes the grid and lists the arrays that follow it.
+Each array is written as raw data, aligned to 64 bytes, so that, when a
+grid is loaded, its fields can be memory-mapped rather than read. Large
+files then open almost at once, and only the parts of fields that are
+used are read from disk.
+
+Raster and Voronoi-Delaunay grids are saved this way. Other grids are
+pickled, as were all grids in older versions of Landlab. Pickled files
+can still be loaded.
 
 Read Landlab native
 +++++++++++++++++++
@@ -11,24 +23,204 @@ Read Landlab native
     ~landlab.io.native_landlab.save_grid
 """
 
+import json
 import os
+import tempfile
+
+import numpy as np
 from six.moves import cPickle
-from landlab import ModelGrid
 
+from landlab import ModelGrid, RasterModelGrid, VoronoiDelaunayGrid
+
+
+_MAGIC = b'\x93LANDLAB'
+_VERSION = 1
+_ALIGN = 64
+
+try:
+    _replace = os.replace
+except AttributeError:  # Python 2
+    _replace = os.rename
+
+
+def _add_grid_extension(path):
+    (base, ext) = os.path.splitext(path)
+    if ext != '.grid':
+        ext = ext + '.grid'
+    return base + ext
+
+
+def _aligned(offset):
+    return offset + (- offset) % _ALIGN
+
+
+def _can_save_native(grid):
+    """Check if a grid can be saved in the native binary format."""
+    if type(grid) not in (RasterModelGrid, VoronoiDelaunayGrid):
+        return False
+    for group in grid.groups:
+        for name in grid[group]:
+            if grid.field_values(group, name).dtype.hasobject:
+                return False
+    return True
+
+
+def _grid_description(grid):
+    """Describe a grid, and list the arrays needed to recreate it."""
+    desc = {
+        'type': type(grid).__name__,
+        'axis_name': list(grid.axis_name),
+        'axis_units': list(grid.axis_units),
+    }
+    arrays = [('status_at_node', np.asarray(grid.status_at_node))]
+
+    if isinstance(grid, RasterModelGrid):
+        desc['shape'] = [int(n) for n in grid.shape]
+        desc['spacing'] = [float(grid.dy), float(grid.dx)]
+        desc['origin'] = [float(grid.node_y[0]), float(grid.node_x[0])]
+        desc['index_dtype'] = grid.index_dtype.str
+    else:
+        arrays.append(('xy_of_node', grid.xy_of_node))
+
+    return desc, arrays
+
+
+def _create_grid(desc, arrays):
+    """Create a grid from its description."""
+    if desc['type'] == 'RasterModelGrid':
+        kwds = dict(spacing=tuple(desc['spacing']),
+                    origin=tuple(desc['origin']))
+        if np.dtype(desc['index_dtype']) != np.dtype(int):
+            kwds['index_dtype'] = np.dtype(desc['index_dtype'])
+        grid = RasterModelGrid(tuple(desc['shape']), **kwds)
+    elif desc['type'] == 'VoronoiDelaunayGrid':
+        xy_of_node = np.asarray(arrays['xy_of_node'])
+        grid = VoronoiDelaunayGrid(xy_of_node[:, 0], xy_of_node[:, 1])
+    else:
+        raise ValueError(
+            '{type}: grid type not understood'.format(type=desc['type']))
+
+    grid.axis_name = desc['axis_name']
+    grid.axis_units = desc['axis_units']
+    grid.status_at_node[:] = arrays['status_at_node']
+
+    return grid
+
+
+def _save_native(grid, path):
+    """Write a grid, and its fields, as a native binary file."""
+    desc, arrays = _grid_description(grid)
+
+    fields = []
+    for group in sorted(grid.groups):
+        for name in sorted(grid[group]):
+            fields.append({'at': group, 'name': name,
+                           'units': grid.field_units(group, name)})
+            arrays.append(('at_{group}:{name}'.format(group=group, name=name),
+                           np.ascontiguousarray(
+                               grid.field_values(group, name))))
 
-def save_grid(grid, path, clobber=False):
+    offsets, offset = [], 0
+    for _, array in arrays:
+        offsets.append(offset)
+        offset = _aligned(offset + array.nbytes)
+
+    header = json.dumps({
+        'version': _VERSION, 'grid': desc, 'fields': fields,
+        'arrays': [{'name': name, 'dtype': array.dtype.str,
+                    'shape': [int(n) for n in array.shape],
+                    'offset': offset}
+                   for (name, array), offset in zip(arrays, offsets)],
+    }).encode('utf-8')
+
+    # The fields of a loaded grid may be mapped to the file at *path*, so
+    # write to a new file and then move it into place rather than
+    # truncating the file under them.
+    fd, temp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(path)),
+        prefix='.' + os.path.basename(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as fp:
+            fp.write(_MAGIC)
+            fp.write(np.array(len(header), dtype='<u8').tobytes())
+            fp.write(header)
+            data_start = _aligned(fp.tell())
+            for (_, array), offset in zip(arrays, offsets):
+                fp.write(b'\0' * (data_start + offset - fp.tell()))
+                array.tofile(fp)
+        # mkstemp makes files that only the owner can read.
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(temp_path, 0o666 & ~umask)
+        _replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def _read_header(fp):
+    """Read the header of a native binary file.
+
+    Returns
+    -------
+    (dict, int)
+        The header and the position in the file at which its data start.
+    """
+    fp.seek(len(_MAGIC))
+    header_size = int(np.frombuffer(fp.read(8), dtype='<u8')[0])
+    header = json.loads(fp.read(header_size).decode('utf-8'))
+    if header['version'] > _VERSION:
+        raise ValueError(
+            'native file version {version} is newer than this version of '
+            'Landlab can read'.format(version=header['version']))
+    return header, _aligned(len(_MAGIC) + 8 + header_size)
+
+
+def _load_native(path, mmap_mode='c'):
+    """Read a grid, and its fields, from a native binary file."""
+    with open(path, 'rb') as fp:
+        header, data_start = _read_header(fp)
+
+        arrays = {}
+        for info in header['arrays']:
+            dtype, shape = np.dtype(info['dtype']), tuple(info['shape'])
+            offset = data_start + info['offset']
+            if mmap_mode is None or np.prod(shape) == 0 or len(shape) == 0:
+                fp.seek(offset)
+                array = np.fromfile(fp, dtype=dtype,
+                                    count=int(np.prod(shape)))
+                arrays[info['name']] = array.reshape(shape)
+            else:
+                arrays[info['name']] = np.memmap(
+                    path, dtype=dtype, mode=mmap_mode, offset=offset,
+                    shape=shape)
+
+    grid = _create_grid(header['grid'], arrays)
+    for field in header['fields']:
+        name = 'at_{group}:{name}'.format(group=field['at'],
+                                          name=field['name'])
+        grid.add_field(field['at'], field['name'], arrays[name],
+                       units=field['units'], noclobber=False)
+
+    return grid
+
+
+def _is_native_file(path):
+    with open(path, 'rb') as fp:
+        return fp.read(len(_MAGIC)) == _MAGIC
+
+
+def save_grid(grid, path, clobber=False, format=None):
     """Save a grid and fields to a Landlab "native" format.
 
-    This method uses cPickle to save a grid as a cPickle file.
-    All fields will be saved, along with the grid.
+    Raster and Voronoi-Delaunay grids are written to a binary file that
+    holds a description of the grid, the status of its nodes, and all of
+    its fields. Other grids, and grids with fields of Python objects, are
+    pickled with cPickle.
 
     The recommended suffix for the save file is '.grid'. This will
     be added to your save if you don't include it.
 
-    Caution: Pickling can be slow, and can produce very large files.
-    Caution 2: Future updates to Landlab could potentially render old
-    saves unloadable.
-
     Parameters
     ----------
     grid : object of subclass ModelGrid
@@ -37,6 +229,9 @@ def save_grid(grid, path, clobber=False):
         Path to output file, either without suffix, or '.grid'
     clobber : bool (default False)
         Set to True to allow overwrites of existing files
+    format : {'native', 'pickle'}, optional
+        Format of the file. If not given, use the binary format if the
+        grid can be saved in it, otherwise pickle the grid.
 
     Examples
     --------
@@ -53,30 +248,40 @@ def save_grid(grid, path, clobber=False):
     # test it's a grid
     assert issubclass(type(grid), ModelGrid)
 
-    (base, ext) = os.path.splitext(path)
-    if ext != '.grid':
-        ext = ext + '.grid'
-    path = base + ext
+    if format is None:
+        format = 'native' if _can_save_native(grid) else 'pickle'
 
-    with open(path, 'wb') as file_like:
-        cPickle.dump(grid, file_like)
+    path = _add_grid_extension(path)
 
+    if format == 'native':
+        if not _can_save_native(grid):
+            raise ValueError('grid can not be saved in the native format')
+        _save_native(grid, path)
+    elif format == 'pickle':
+        with open(path, 'wb') as file_like:
+            cPickle.dump(grid, file_like)
+    else:
+        raise ValueError('format not understood')
 
-def load_grid(path):
+
+def load_grid(path, mmap_mode='c'):
     """Load a grid and its fields from a Landlab "native" format.
 
-    This method uses cPickle to load a saved grid.
     It assumes you saved using vmg.save() or save_grid, i.e., that the
-    pickle file is a .grid file.
+    file is a .grid file. Both binary and pickled files can be loaded.
 
-    Caution: Pickling can be slow, and can produce very large files.
-    Caution 2: Future updates to Landlab could potentially render old
-    saves unloadable.
+    Fields of binary files are memory-mapped, unless *mmap_mode* is
+    ``None``, so that they are read from the file only as they are used.
+    By default, fields are mapped copy-on-write: they can be changed, but
+    the changes are not written to the file.
 
     Parameters
     ----------
     path : str
         Path to output file, either without suffix, or '.grid'
+    mmap_mode : {'c', 'r', 'r+', None}, optional
+        Mode with which to memory-map fields (see :class:`numpy.memmap`).
+        If ``None``, read fields into memory.
 
     Examples
     --------
@@ -91,10 +296,11 @@ def load_grid(path):
     >>> grid_in = load_grid('testsavedgrid.grid')
     >>> os.remove('testsavedgrid.grid') #to remove traces of this test
     """
-    (base, ext) = os.path.splitext(path)
-    if ext != '.grid':
-        ext = ext + '.grid'
-    path = base + ext
+    path = _add_grid_extension(path)
+
+    if _is_native_file(path):
+        return _load_native(path, mmap_mode=mmap_mode)
+
     with open(path, 'rb') as file_like:
         loaded_grid = cPickle.load(file_like)
     assert issubclass(type(loaded_grid), ModelGrid)
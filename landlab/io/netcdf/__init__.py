@@ -3,6 +3,7 @@ import os
 from .read import read_netcdf
 from .write import write_netcdf
 from .write import write_raster_netcdf
+from .write import NetcdfWriter
 
 from .errors import NotRasterGridError
 
@@ -20,6 +21,6 @@ NETCDF4_EXAMPLE_FILE = os.path.join(os.path.dirname(__file__), 'tests', 'data',
 NETCDF3_64BIT_EXAMPLE_FILE = os.path.join(os.path.dirname(__file__), 'tests',
                                           'data', 'test-netcdf3-64bit.nc')
 
-__all__ = ('read_netcdf', 'write_netcdf', 'NotRasterGridError',
-           'WITH_NETCDF4', 'NETCDF4_EXAMPLE_FILE',
+__all__ = ('read_netcdf', 'write_netcdf', 'NetcdfWriter',
+           'NotRasterGridError', 'WITH_NETCDF4', 'NETCDF4_EXAMPLE_FILE',
            'NETCDF3_64BIT_EXAMPLE_FILE')
@@ -0,0 +1,143 @@
+#! /usr/bin/env python
+"""Unit tests for landlab.io.netcdf.NetcdfWriter."""
+import pytest
+
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from landlab import RasterModelGrid
+from landlab.io.netcdf import NetcdfWriter, WITH_NETCDF4
+
+try:
+    import netCDF4 as nc
+except ImportError:
+    pass
+
+
+pytestmark = pytest.mark.skipif(not WITH_NETCDF4,
+                                reason='netCDF4 package not installed')
+
+
+def _run(writer, grid, n_steps):
+    z = grid.at_node['topographic__elevation']
+    for step in range(n_steps):
+        z += 1.
+        grid.at_node['water__depth'][:] = step
+        writer.write(time=step * .5)
+
+
+def _grid():
+    grid = RasterModelGrid((4, 5))
+    grid.add_zeros('node', 'topographic__elevation', units='m')
+    grid.add_zeros('node', 'water__depth', dtype=int)
+    return grid
+
+
+@pytest.mark.parametrize('buffer_steps', [1, 2, 5])
+def test_write_time_series(tmpdir, buffer_steps):
+    grid = _grid()
+    with tmpdir.as_cwd():
+        with NetcdfWriter('test.nc', grid,
+                          buffer_steps=buffer_steps) as writer:
+            _run(writer, grid, 7)
+            assert writer.number_of_times == 7
+
+        root = nc.Dataset('test.nc')
+        root.set_auto_mask(False)
+        assert_array_equal(root.variables['t'][:], np.arange(7) * .5)
+        z = root.variables['topographic__elevation']
+        assert z.shape == (7, 4, 5)
+        assert z.units == 'm'
+        assert_array_equal(z[:, 2, 3], np.arange(1, 8))
+        assert_array_equal(root.variables['water__depth'][:, 0, 0],
+                           np.arange(7))
+        assert root.variables['water__depth'].dtype == np.int64
+        assert_array_equal(root.variables['x'][:], np.arange(5.))
+        root.close()
+
+
+def test_chunking_and_compression(tmpdir):
+    grid = _grid()
+    with tmpdir.as_cwd():
+        with NetcdfWriter('test.nc', grid, complevel=6) as writer:
+            _run(writer, grid, 2)
+
+        root = nc.Dataset('test.nc')
+        var = root.variables['topographic__elevation']
+        assert var.chunking() == [1, 4, 5]
+        filters = var.filters()
+        assert filters['zlib'] and filters['shuffle']
+        assert filters['complevel'] == 6
+        root.close()
+
+
+def test_custom_chunksizes(tmpdir):
+    grid = _grid()
+    with tmpdir.as_cwd():
+        with NetcdfWriter('test.nc', grid, chunksizes=(4, 2, 5)) as writer:
+            _run(writer, grid, 2)
+
+        root = nc.Dataset('test.nc')
+        assert root.variables['topographic__elevation'].chunking() == [4, 2, 5]
+        root.close()
+
+
+def test_float32(tmpdir):
+    grid = _grid()
+    with tmpdir.as_cwd():
+        with NetcdfWriter('test.nc', grid, dtype=np.float32) as writer:
+            _run(writer, grid, 3)
+
+        root = nc.Dataset('test.nc')
+        assert root.variables['topographic__elevation'].dtype == np.float32
+        assert root.variables['water__depth'].dtype == np.int64
+        root.close()
+
+
+def test_append(tmpdir):
+    grid = _grid()
+    with tmpdir.as_cwd():
+        with NetcdfWriter('test.nc', grid,
+                          names='topographic__elevation') as writer:
+            _run(writer, grid, 2)
+        with NetcdfWriter('test.nc', grid, names='topographic__elevation',
+                          append=True) as writer:
+            assert writer.number_of_times == 2
+            writer.write()
+
+        root = nc.Dataset('test.nc')
+        root.set_auto_mask(False)
+        assert_array_equal(root.variables['t'][:], [0., .5, 2.])
+        assert_array_equal(
+            root.variables['topographic__elevation'][:, 0, 0], [1., 2., 2.])
+        assert 'water__depth' not in root.variables
+        root.close()
+
+
+def test_at_cell(tmpdir):
+    grid = RasterModelGrid((4, 5))
+    grid.add_field('cell', 'air__temperature', np.arange(6.))
+    with tmpdir.as_cwd():
+        with NetcdfWriter('test.nc', grid, at='cell') as writer:
+            writer.write()
+
+        root = nc.Dataset('test.nc')
+        root.set_auto_mask(False)
+        assert_array_equal(root.variables['air__temperature'][0],
+                           [[0., 1., 2.], [3., 4., 5.]])
+        root.close()
+
+
+def test_unknown_field_names(tmpdir):
+    with tmpdir.as_cwd():
+        with pytest.raises(ValueError) as err:
+            NetcdfWriter('test.nc', _grid(),
+                         names=['topographic__elevation', 'not_a_field',
+                                'air__temperature'])
+    assert 'not_a_field, air__temperature' in str(err.value)
+
+
+def test_netcdf3_not_supported(tmpdir):
+    with tmpdir.as_cwd():
+        with pytest.raises(ValueError):
+            NetcdfWriter('test.nc', _grid(), format='NETCDF3_64BIT')
@@ -210,6 +210,17 @@ def test_netcdf_write_names_keyword_as_none(tmpdir):
         root.close()
 
 
+def test_netcdf_write_unknown_names(tmpdir):
+    """Test write_netcdf with names that are not fields."""
+    field = RasterModelGrid(4, 3)
+    field.add_field('node', 'topographic__elevation', np.arange(12.))
+
+    with tmpdir.as_cwd():
+        with pytest.raises(ValueError) as err:
+            write_netcdf('test.nc', field, names=['not_a_field'])
+    assert 'not_a_field' in str(err.value)
+
+
 def test_2d_unit_spacing():
     """Test write_netcdf with a 2D grid with unit spacing."""
     (x, y) = np.meshgrid(np.arange(5.), np.arange(4.))
@@ -8,6 +8,7 @@ Write netcdf
     :toctree: generated/
 
     ~landlab.io.netcdf.write.write_netcdf
+    ~landlab.io.netcdf.write.NetcdfWriter
 """
 
 
@@ -555,6 +556,15 @@ def _guess_at_location(fields, names):
             at = None
     return at
 
+
+def _check_field_names(fields, names, at):
+    """Check that the named fields are all defined at a location."""
+    missing = [name for name in names if name not in fields[at]]
+    if missing:
+        raise ValueError('no field(s) at {at} named {names}'.format(
+            at=at, names=', '.join(missing)))
+
+
 def write_netcdf(path, fields, attrs=None, append=False,
                  format='NETCDF3_64BIT', names=None, at=None):
     """Write landlab fields to netcdf.
@@ -633,8 +643,7 @@ def write_netcdf(path, fields, attrs=None, append=False,
     at = at or _guess_at_location(fields, names) or 'node'
     names = names or fields[at].keys()
 
-    if not set(fields[at].keys()).issuperset(names):
-        raise ValueError('values must be on either cells or nodes, not both')
+    _check_field_names(fields, names, at)
 
     attrs = attrs or {}
 
@@ -757,8 +766,7 @@ def write_raster_netcdf(path, fields, attrs=None, append=False,
 
     names = names or fields[at].keys()
 
-    if not set(fields[at].keys()).issuperset(names):
-        raise ValueError('values must be on either cells or nodes, not both')
+    _check_field_names(fields, names, at)
 
     attrs = attrs or {}
 
@@ -814,3 +822,218 @@ def write_raster_netcdf(path, fields, attrs=None, append=False,
         # print(warning_message(message))
 
     root.close()
+
+
+class NetcdfWriter(object):
+
+    """Write a time series of grid fields to a netCDF4 file.
+
+    Unlike :func:`write_netcdf`, which opens, writes, and closes its file
+    each time it is called, a *NetcdfWriter* keeps its file open while a
+    model runs. The values of the fields at each time are copied to a
+    buffer and written to the file, *buffer_steps* times at once. Variables
+    are compressed with zlib and are chunked so that a chunk holds a single
+    time slice (or *chunksizes*, if given), which is the amount of data
+    written at each step.
+
+    Parameters
+    ----------
+    path : str
+        Path to output file.
+    grid : RasterModelGrid
+        The grid that holds the fields.
+    names : iterable of str, optional
+        Names of the fields to write. If not provided, write all fields at
+        *at*.
+    at : {'node', 'cell'}, optional
+        The location where values are defined.
+    format : {'NETCDF4', 'NETCDF4_CLASSIC'}, optional
+        Format of output netcdf file.
+    attrs : dict, optional
+        Attributes to add to netcdf file.
+    append : boolean, optional
+        Append time slices to an existing file, otherwise clobber the file.
+    zlib : boolean, optional
+        Compress variables with zlib.
+    complevel : int, optional
+        Compression level, from 1 (fastest) to 9 (smallest).
+    shuffle : boolean, optional
+        Apply the HDF5 shuffle filter before compressing.
+    dtype : data-type, optional
+        Data type with which to write floating-point fields (*float32*, for
+        instance, to halve the size of the file). If not provided, fields
+        are written with their own data type.
+    chunksizes : tuple of int, optional
+        Chunk shape of field variables, as *(time, rows, columns)*. The
+        default is a single, complete time slice.
+    buffer_steps : int, optional
+        Number of time slices to hold in memory before writing them to
+        the file.
+    time_units : str, optional
+        Units of time.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.io.netcdf import NetcdfWriter
+
+    >>> grid = RasterModelGrid((4, 3))
+    >>> z = grid.add_zeros('node', 'topographic__elevation')
+
+    >>> import tempfile, os
+    >>> temp_dir = tempfile.mkdtemp()
+    >>> os.chdir(temp_dir)
+
+    >>> with NetcdfWriter('test.nc', grid, buffer_steps=2) as writer:
+    ...     for time in range(3):
+    ...         z += 1.
+    ...         writer.write(time=time * 10.)
+
+    >>> import netCDF4 as nc4
+    >>> root = nc4.Dataset('test.nc')
+    >>> root.set_auto_mask(False)
+    >>> root.variables['t'][:]
+    array([  0.,  10.,  20.])
+    >>> root.variables['topographic__elevation'][:, 0, 0]
+    array([ 1.,  2.,  3.])
+    >>> root.close()
+    """
+
+    def __init__(self, path, grid, names=None, at='node', format='NETCDF4',
+                 attrs=None, append=False, zlib=True, complevel=4,
+                 shuffle=True, dtype=None, chunksizes=None, buffer_steps=1,
+                 time_units='days'):
+        if format not in ('NETCDF4', 'NETCDF4_CLASSIC'):
+            raise ValueError('format must be NETCDF4 or NETCDF4_CLASSIC')
+        if at not in ('cell', 'node'):
+            raise ValueError('value location not understood')
+        if buffer_steps < 1:
+            raise ValueError('buffer_steps must be at least 1')
+
+        if isinstance(names, six.string_types):
+            names = (names, )
+        names = list(names or grid[at].keys())
+        _check_field_names(grid, names, at)
+
+        self._grid = grid
+        self._names = names
+        self._at = at
+
+        if at == 'node':
+            shape = tuple(grid.shape)
+        else:
+            shape = tuple(dim - 2 for dim in grid.shape)
+        self._shape = shape
+
+        if os.path.isfile(path) and append:
+            self._root = nc4.Dataset(path, 'a', format=format)
+        else:
+            self._root = nc4.Dataset(path, 'w', format=format)
+        root = self._root
+
+        _set_netcdf_attributes(root, attrs or {})
+        if at == 'node':
+            _set_netcdf_structured_dimensions(root, grid.shape)
+            _add_raster_spatial_variables(root, grid)
+        elif 'nv' not in root.dimensions:
+            _set_netcdf_cell_structured_dimensions(root, grid.shape)
+            _add_cell_spatial_variables(root, grid)
+
+        if 't' not in root.variables:
+            time_var = root.createVariable('t', 'f8', ('nt', ))
+            time_var.units = ' '.join([time_units, 'since', '00:00:00 UTC'])
+            time_var.long_name = 'time'
+
+        dims = ['nt'] + _get_dimension_names(shape)
+        if chunksizes is None:
+            chunksizes = (1, ) + shape
+
+        fields = grid[at]
+        self._buffers = {}
+        for name in names:
+            values = fields[name]
+            if dtype is not None and values.dtype.kind == 'f':
+                var_dtype = np.dtype(dtype)
+            else:
+                var_dtype = values.dtype
+
+            if name not in root.variables:
+                var = root.createVariable(
+                    name, _NP_TO_NC_TYPE[str(var_dtype)], dims, zlib=zlib,
+                    complevel=complevel, shuffle=shuffle,
+                    chunksizes=chunksizes)
+                var.units = fields.units[name] or '?'
+                var.long_name = name
+                if hasattr(grid, 'grid_mapping'):
+                    var.grid_mapping = grid.grid_mapping['name']
+            else:
+                var_dtype = root.variables[name].dtype
+
+            self._buffers[name] = np.empty((buffer_steps, ) + shape,
+                                           dtype=var_dtype)
+        self._times = np.empty(buffer_steps, dtype=float)
+
+        self._n_buffered = 0
+        self._n_written = len(root.dimensions['nt'])
+
+    @property
+    def names(self):
+        """Names of the fields that are written."""
+        return tuple(self._names)
+
+    @property
+    def number_of_times(self):
+        """Number of time slices written, including those buffered."""
+        return self._n_written + self._n_buffered
+
+    def write(self, time=None):
+        """Add the current values of the fields as a new time slice.
+
+        Parameters
+        ----------
+        time : float, optional
+            The time of the slice. If not provided, use the index of the
+            slice.
+        """
+        step = self._n_buffered
+        fields = self._grid[self._at]
+        for name in self._names:
+            self._buffers[name][step] = fields[name].reshape(self._shape)
+
+        if time is None:
+            time = self.number_of_times
+        self._times[step] = time
+
+        self._n_buffered += 1
+        if self._n_buffered == len(self._times):
+            self.flush()
+
+    def flush(self):
+        """Write buffered time slices to the file."""
+        n_steps = self._n_buffered
+        if n_steps == 0:
+            return
+
+        start, stop = self._n_written, self._n_written + n_steps
+        variables = self._root.variables
+        variables['t'][start:stop] = self._times[:n_steps]
+        for name in self._names:
+            variables[name][start:stop] = self._buffers[name][:n_steps]
+        self._root.sync()
+
+        self._n_written = stop
+        self._n_buffered = 0
+
+    def close(self):
+        """Write buffered time slices and close the file."""
+        if self._root is not None:
+            self.flush()
+            self._root.close()
+            self._root = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
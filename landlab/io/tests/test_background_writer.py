@@ -0,0 +1,145 @@
+#! /usr/bin/env python
+import threading
+
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from landlab import RasterModelGrid, CLOSED_BOUNDARY
+from landlab.io import BackgroundWriter, read_esri_ascii
+from landlab.io.native_landlab import load_grid
+
+
+def test_snapshot_is_a_copy():
+    grid = RasterModelGrid((4, 5))
+    z = grid.add_ones('node', 'topographic__elevation')
+    grid.add_zeros('link', 'water__discharge')
+
+    with BackgroundWriter(grid) as writer:
+        snapshot = writer.snapshot(names='topographic__elevation')
+    z[:] = 2.
+    grid.status_at_node[0] = CLOSED_BOUNDARY
+
+    assert type(snapshot) is RasterModelGrid
+    assert_array_equal(snapshot.at_node['topographic__elevation'], 1.)
+    assert 'water__discharge' not in snapshot.at_link
+    assert snapshot.status_at_node[0] != CLOSED_BOUNDARY
+    assert snapshot.number_of_nodes == 20
+
+
+@pytest.mark.parametrize('max_connectivity_memory', [None, 10000])
+def test_snapshot_does_not_share_status_caches(max_connectivity_memory):
+    grid = RasterModelGrid((4, 5),
+                           max_connectivity_memory=max_connectivity_memory)
+    active_links = grid.active_links.copy()
+    status_at_link = grid.status_at_link.copy()
+    _ = grid.patches_at_node
+
+    with BackgroundWriter(grid) as writer:
+        snapshot = writer.snapshot()
+    grid.status_at_node[6] = CLOSED_BOUNDARY
+    assert not np.all(grid.status_at_link == status_at_link)
+
+    assert_array_equal(snapshot.status_at_link, status_at_link)
+    assert_array_equal(snapshot.active_links, active_links)
+    assert snapshot.bc_set_code == grid.bc_set_code - 1
+    if max_connectivity_memory is not None:
+        assert (snapshot._connectivity_cache is not
+                grid._connectivity_cache)
+        assert sorted(snapshot._connectivity_cache.keys()) == sorted(
+            grid._connectivity_cache.keys())
+
+
+def test_write_while_fields_change(tmpdir):
+    grid = RasterModelGrid((4, 5))
+    z = grid.add_zeros('node', 'topographic__elevation')
+
+    with tmpdir.as_cwd():
+        with BackgroundWriter(grid) as writer:
+            for step in range(5):
+                z[:] = step
+                writer.write_esri_ascii('out{0}.asc'.format(step))
+                z[:] = -1.
+
+        for step in range(5):
+            (_, values) = read_esri_ascii('out{0}.asc'.format(step))
+            assert_array_equal(values, step)
+
+
+def test_save_grid(tmpdir):
+    grid = RasterModelGrid((4, 5))
+    grid.add_ones('node', 'topographic__elevation')
+    grid.add_ones('node', 'soil__depth')
+
+    with tmpdir.as_cwd():
+        with BackgroundWriter(grid) as writer:
+            writer.save_grid('out.grid', names='soil__depth')
+        saved = load_grid('out.grid', mmap_mode=None)
+
+    assert list(saved.at_node.keys()) == ['soil__depth']
+    assert_array_equal(saved.at_node['soil__depth'], 1.)
+
+
+def test_buffers_reused():
+    grid = RasterModelGrid((4, 5))
+    grid.add_zeros('node', 'topographic__elevation')
+    written = []
+
+    with BackgroundWriter(grid) as writer:
+        for _ in range(4):
+            writer.submit(lambda g: written.append(
+                g.at_node['topographic__elevation']))
+            writer.flush()
+
+    assert len(set(id(array) for array in written)) == 1
+
+
+def test_queue_is_bounded():
+    grid = RasterModelGrid((4, 5))
+    grid.add_zeros('node', 'topographic__elevation')
+    release = threading.Event()
+
+    writer = BackgroundWriter(grid, max_queued=1)
+    writer.submit(lambda g: release.wait())
+    writer.submit(lambda g: None)
+
+    submitted = threading.Event()
+
+    def submit():
+        writer.submit(lambda g: None)
+        submitted.set()
+
+    thread = threading.Thread(target=submit)
+    thread.start()
+    assert not submitted.wait(.2)
+
+    release.set()
+    thread.join()
+    assert submitted.is_set()
+    writer.close()
+
+
+def test_error_raised_in_main_thread():
+    grid = RasterModelGrid((4, 5))
+
+    def fail(grid):
+        raise RuntimeError('write failed')
+
+    writer = BackgroundWriter(grid)
+    writer.submit(fail)
+    with pytest.raises(RuntimeError):
+        writer.flush()
+    writer.flush()
+    writer.close()
+
+
+def test_write_after_close():
+    writer = BackgroundWriter(RasterModelGrid((4, 5)))
+    writer.close()
+    with pytest.raises(ValueError):
+        writer.submit(lambda g: None)
+
+
+def test_bad_max_queued():
+    with pytest.raises(ValueError):
+        BackgroundWriter(RasterModelGrid((4, 5)), max_queued=0)
@@ -345,5 +345,26 @@ def test_halo_keyword_no_nodata_value():
                                  -9999., -9999., -9999., -9999., -9999.]))
 
 
+@pytest.mark.parametrize('block_size', [1, 7, 1000])
+def test_read_in_blocks(block_size):
+    from landlab.io.esri_ascii import _read_asc_data
+
+    asc_file = StringIO('0. 1. 2. 3. 4.\n5. 6.\n\n7. 8. 9. 10. 11.\n')
+    data = _read_asc_data(asc_file, np.empty((4, 3)), block_size=block_size)
+    assert_array_equal(data, [[0., 1., 2.], [3., 4., 5.],
+                              [6., 7., 8.], [9., 10., 11.]])
+
+
+def test_reshape_is_contiguous():
+    (grid, field) = read_esri_ascii(os.path.join(_TEST_DATA_DIR,
+                                                 '4_x_3.asc'),
+                                    reshape=True, halo=1)
+    assert field.flags['C_CONTIGUOUS']
+    assert_array_equal(field[1:-1, 1:-1], [[9., 10., 11.],
+                                           [6., 7., 8.],
+                                           [3., 4., 5.],
+                                           [0., 1., 2.]])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,7 +1,10 @@
 #! /usr/bin/env python
-from landlab import RasterModelGrid
+from landlab import (CLOSED_BOUNDARY, HexModelGrid, RasterModelGrid,
+                     VoronoiDelaunayGrid)
 from landlab.components import FlowAccumulator
 import pickle 
+import numpy as np
+import pytest
 from numpy.testing import assert_array_equal
 import os
 from landlab.io.native_landlab import save_grid, load_grid
@@ -129,3 +132,131 @@ def test_save():
     #     raise
     # finally:
     #     os.remove('testsavedgrid.grid')
+
+
+def _grid_with_fields():
+    grid = RasterModelGrid((4, 5), spacing=(2., 3.), origin=(1., 10.))
+    grid.add_field('node', 'topographic__elevation', np.arange(20.),
+                   units='m')
+    grid.add_ones('link', 'water__discharge', dtype=int)
+    grid.at_grid['sea_level__elevation'] = 2.
+    grid.status_at_node[7] = CLOSED_BOUNDARY
+    return grid
+
+
+def _assert_same_grid(grid, expected):
+    assert type(grid) is type(expected)
+    assert grid.number_of_nodes == expected.number_of_nodes
+    assert_array_equal(grid.x_of_node, expected.x_of_node)
+    assert_array_equal(grid.y_of_node, expected.y_of_node)
+    assert_array_equal(grid.status_at_node, expected.status_at_node)
+    assert_array_equal(grid.active_links, expected.active_links)
+    for group in expected.groups:
+        assert sorted(grid[group]) == sorted(expected[group])
+        for name in expected[group]:
+            assert_array_equal(grid[group][name], expected[group][name])
+            assert (grid[group][name].dtype ==
+                    expected[group][name].dtype)
+            assert (grid.field_units(group, name) ==
+                    expected.field_units(group, name))
+
+
+@pytest.mark.parametrize('mmap_mode', ['c', 'r', None])
+def test_native_raster(tmpdir, mmap_mode):
+    grid = _grid_with_fields()
+    with tmpdir.as_cwd():
+        save_grid(grid, 'saved')
+        assert not _is_pickle('saved.grid')
+        loaded = load_grid('saved', mmap_mode=mmap_mode)
+
+    _assert_same_grid(loaded, grid)
+    assert (loaded.dy, loaded.dx) == (2., 3.)
+
+
+def test_native_voronoi(tmpdir):
+    np.random.seed(7)
+    grid = VoronoiDelaunayGrid(np.random.rand(20), np.random.rand(20))
+    grid.add_field('node', 'topographic__elevation',
+                   np.random.rand(grid.number_of_nodes))
+    grid.status_at_node[grid.core_nodes[0]] = CLOSED_BOUNDARY
+
+    with tmpdir.as_cwd():
+        save_grid(grid, 'saved.grid')
+        loaded = load_grid('saved.grid')
+
+    _assert_same_grid(loaded, grid)
+    assert_array_equal(loaded.nodes_at_link, grid.nodes_at_link)
+
+
+def test_native_fields_are_mapped(tmpdir):
+    grid = _grid_with_fields()
+    with tmpdir.as_cwd():
+        save_grid(grid, 'saved.grid')
+        loaded = load_grid('saved.grid')
+        z = loaded.at_node['topographic__elevation']
+        assert isinstance(z.base, np.memmap)
+
+        z[0] = 100.
+        reloaded = load_grid('saved.grid')
+
+    assert reloaded.at_node['topographic__elevation'][0] == 0.
+
+
+@pytest.mark.parametrize('mmap_mode', ['c', 'r+'])
+def test_native_save_over_mapped_file(tmpdir, mmap_mode):
+    grid = RasterModelGrid((250, 125))
+    grid.add_field('node', 'topographic__elevation',
+                   np.arange(grid.number_of_nodes, dtype=float))
+    with tmpdir.as_cwd():
+        save_grid(grid, 'saved.grid')
+        loaded = load_grid('saved.grid', mmap_mode=mmap_mode)
+        loaded.at_node['topographic__elevation'] += 1.
+        save_grid(loaded, 'saved.grid', clobber=True)
+        reloaded = load_grid('saved.grid')
+        assert os.listdir('.') == ['saved.grid']
+
+    assert_array_equal(reloaded.at_node['topographic__elevation'],
+                       np.arange(grid.number_of_nodes) + 1.)
+
+
+def test_native_read_only(tmpdir):
+    with tmpdir.as_cwd():
+        save_grid(_grid_with_fields(), 'saved.grid')
+        loaded = load_grid('saved.grid', mmap_mode='r')
+    with pytest.raises(ValueError):
+        loaded.at_node['topographic__elevation'][0] = 100.
+
+
+def test_save_as_pickle(tmpdir):
+    grid = _grid_with_fields()
+    with tmpdir.as_cwd():
+        save_grid(grid, 'saved.grid', format='pickle')
+        assert _is_pickle('saved.grid')
+        loaded = load_grid('saved.grid')
+
+    _assert_same_grid(loaded, grid)
+
+
+def test_other_grids_pickled(tmpdir):
+    grid = HexModelGrid(3, 3)
+    with tmpdir.as_cwd():
+        save_grid(grid, 'saved.grid')
+        assert _is_pickle('saved.grid')
+        with pytest.raises(ValueError):
+            save_grid(grid, 'saved.grid', clobber=True, format='native')
+
+
+def test_newer_version(tmpdir):
+    with tmpdir.as_cwd():
+        save_grid(_grid_with_fields(), 'saved.grid')
+        with open('saved.grid', 'rb') as fp:
+            contents = fp.read()
+        with open('saved.grid', 'wb') as fp:
+            fp.write(contents.replace(b'"version": 1', b'"version": 9'))
+        with pytest.raises(ValueError):
+            load_grid('saved.grid')
+
+
+def _is_pickle(path):
+    with open(path, 'rb') as fp:
+        return not fp.read(8) == b'\x93LANDLAB'
@@ -116,3 +116,21 @@ def test_write_then_read(tmpdir):
     assert_array_almost_equal(grid.node_x, new_grid.node_x)
     assert_array_almost_equal(grid.node_y, new_grid.node_y)
     assert_array_almost_equal(field, grid.at_node['air__temperature'])
+
+
+def test_data_written_as_savetxt(tmpdir):
+    grid = RasterModelGrid((40, 5))
+    grid.add_field('node', 'air__temperature',
+                   np.random.rand(grid.number_of_nodes))
+
+    with tmpdir.as_cwd():
+        write_esri_ascii('test.asc', grid)
+        with open('test.asc', 'r') as fp:
+            lines = fp.readlines()
+        np.savetxt('expected.txt',
+                   np.flipud(grid.at_node['air__temperature'].reshape(
+                       (40, 5))))
+        with open('expected.txt', 'r') as fp:
+            expected = fp.readlines()
+
+    assert lines[-40:] == expected
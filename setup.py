@@ -5,6 +5,7 @@ from setuptools.command.install import install
 from setuptools.command.develop import develop
 from distutils.extension import Extension
 import pkg_resources
+import sys
 
 import versioneer
 
@@ -12,17 +13,37 @@ import versioneer
 numpy_incl = pkg_resources.resource_filename('numpy', 'core/include')
 
 
+def openmp_flags():
+    """Compile and link flags for extensions that use OpenMP.
+
+    Apple's compilers do not support OpenMP, so the extensions are built
+    without it (and run on a single thread) on macOS.
+    """
+    if sys.platform == 'win32':
+        return dict(extra_compile_args=['/openmp'])
+    elif sys.platform == 'darwin':
+        return dict()
+    else:
+        return dict(extra_compile_args=['-fopenmp'],
+                    extra_link_args=['-fopenmp'])
+
+
 ext_modules = [
     Extension('landlab.ca.cfuncs',
               ['landlab/ca/cfuncs.pyx']),
     Extension('landlab.grid.cfuncs',
               ['landlab/grid/cfuncs.pyx']),
+    Extension('landlab.grid.ext.mappers',
+              ['landlab/grid/ext/mappers.pyx'],
+              **openmp_flags()),
     Extension('landlab.components.flexure.cfuncs',
               ['landlab/components/flexure/cfuncs.pyx']),
     Extension('landlab.components.flexure.ext.flexure1d',
               ['landlab/components/flexure/ext/flexure1d.pyx']),
     Extension('landlab.components.flow_accum.cfuncs',
               ['landlab/components/flow_accum/cfuncs.pyx']),
+    Extension('landlab.components.flow_routing.cfuncs',
+              ['landlab/components/flow_routing/cfuncs.pyx']),
     Extension('landlab.components.flow_director.cfuncs',
               ['landlab/components/flow_director/cfuncs.pyx']),
     Extension('landlab.components.stream_power.cfuncs',
@@ -33,6 +54,9 @@ ext_modules = [
               ['landlab/components/drainage_density/cfuncs.pyx']),
     Extension('landlab.components.erosion_deposition.cfuncs',
               ['landlab/components/erosion_deposition/cfuncs.pyx']),
+    Extension('landlab.components.overland_flow.cfuncs',
+              ['landlab/components/overland_flow/cfuncs.pyx'],
+              **openmp_flags()),
     Extension('landlab.utils.ext.jaggedarray',
               ['landlab/utils/ext/jaggedarray.pyx']),
     Extension('landlab.graph.structured_quad.ext.at_node',